@@ -0,0 +1,125 @@
+"""
+Micro-benchmark for validating pipeline activities against the recursive Activity union.
+
+Compares building a TypeAdapter per call (what ad-hoc validation costs), the cached
+adapter on Python objects, and the cached adapter straight from JSON bytes, for
+pipelines of 1, 100 and 2,000 activities with containers nested 5 levels deep.
+
+    python benchmarks/bench_activity_validation.py
+    python benchmarks/bench_activity_validation.py --record benchmarks/results.jsonl
+
+--record appends one JSON line per run (with the git commit) so results can be compared over time.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from src.fabricmcp_server.activity_types import Activity, ActivityListAdapter, validate_activities_json  # noqa: E402
+
+SIZES = (1, 100, 2000)
+NESTING_DEPTH = 5
+_CONTAINERS = ("ForEach", "IfCondition", "Until", "Switch")
+
+
+def _leaf(name: str) -> Dict[str, Any]:
+    return {"name": name, "type": "SetVariable", "typeProperties": {"variableName": "v", "value": "@utcnow()"}}
+
+
+def _wrap(kind: str, name: str, body: List[Dict[str, Any]]) -> Dict[str, Any]:
+    expression = {"value": "@true", "type": "Expression"}
+    if kind == "ForEach":
+        props = {"items": {"value": "@pipeline().parameters.items", "type": "Expression"}, "activities": body}
+    elif kind == "IfCondition":
+        props = {"expression": expression, "ifTrueActivities": body, "ifFalseActivities": []}
+    elif kind == "Until":
+        props = {"expression": expression, "activities": body}
+    else:
+        props = {"on": expression, "cases": [{"value": "a", "activities": body}], "defaultActivities": []}
+    return {"name": name, "type": kind, "typeProperties": props}
+
+
+def make_activities(count: int, depth: int = NESTING_DEPTH) -> List[Dict[str, Any]]:
+    """`count` activities in total: groups of `depth` nested containers around a leaf, padded with Waits."""
+    activities = []
+    group = depth + 1
+    for g in range(count // group):
+        node = _leaf(f"leaf_{g}")
+        for level in range(depth):
+            node = _wrap(_CONTAINERS[level % len(_CONTAINERS)], f"c_{g}_{level}", [node])
+        activities.append(node)
+    for i in range(count - len(activities) * group):
+        activities.append({
+            "name": f"wait_{i}", "type": "Wait", "typeProperties": {"waitTimeInSeconds": 1},
+            "dependsOn": [{"activity": f"wait_{i - 1}", "dependencyConditions": ["Succeeded"]}] if i else [],
+        })
+    return activities
+
+
+def _time(fn: Callable[[], Any], budget_seconds: float = 1.0) -> float:
+    """Best-of-N seconds per call, running for about `budget_seconds`."""
+    best = float("inf")
+    deadline = time.perf_counter() + budget_seconds
+    runs = 0
+    while runs < 3 or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+        runs += 1
+    return best
+
+
+def run() -> List[Dict[str, Any]]:
+    results = []
+    for size in SIZES:
+        activities = make_activities(size)
+        payload = json.dumps(activities).encode("utf-8")
+        timings = {
+            "fresh_adapter": _time(lambda: TypeAdapter(List[Activity]).validate_python(activities)),
+            "cached_python": _time(lambda: ActivityListAdapter.validate_python(activities)),
+            "cached_json": _time(lambda: validate_activities_json(payload)),
+        }
+        results.append({"activities": size, **{k: round(v * 1000, 3) for k, v in timings.items()}})
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--record", help="Append the results as a JSON line to this file.")
+    args = parser.parse_args()
+
+    results = run()
+    print(f"{'activities':>10} {'fresh adapter ms':>17} {'cached python ms':>17} {'cached json ms':>15}")
+    for r in results:
+        print(f"{r['activities']:>10} {r['fresh_adapter']:>17} {r['cached_python']:>17} {r['cached_json']:>15}")
+
+    if args.record:
+        record = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "results": results,
+        }
+        with open(args.record, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
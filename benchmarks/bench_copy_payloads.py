@@ -0,0 +1,141 @@
+"""
+Micro-benchmark for building Copy activity source/sink payloads as the connector count grows.
+
+Registers 10, 100 and 1,000 synthetic connectors and builds the payload of the last one
+registered, comparing a linear isinstance chain (how build_source_payload used to
+dispatch) with the ConnectorRegistry lookup, and a hand-written dict builder with the
+precompiled PayloadTemplate. The registry columns should stay flat as connectors grow.
+
+    python benchmarks/bench_copy_payloads.py
+    python benchmarks/bench_copy_payloads.py --record benchmarks/results.jsonl
+
+--record appends one JSON line per run (with the git commit) so results can be compared over time.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Literal, Tuple, Type
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from pydantic import BaseModel, create_model  # noqa: E402
+
+from src.fabricmcp_server.payload_templates import ConnectorRegistry, Slot  # noqa: E402
+
+SIZES = (10, 100, 1000)
+
+
+def _template(index: int) -> Dict[str, Any]:
+    return {
+        "type": f"Connector{index}Source",
+        "storeSettings": {"type": f"Connector{index}ReadSettings", "recursive": True},
+        "datasetSettings": {
+            "annotations": [],
+            "type": "Binary",
+            "typeProperties": {"location": {"type": f"Connector{index}Location", "folderPath": Slot("folder_path"), "fileName": Slot("file_name")}},
+            "externalReferences": {"connection": Slot("connection_id")},
+        },
+    }
+
+
+def _hand_written(index: int) -> Callable[[Any], Dict[str, Any]]:
+    def build(source: Any) -> Dict[str, Any]:
+        return {
+            "type": f"Connector{index}Source",
+            "storeSettings": {"type": f"Connector{index}ReadSettings", "recursive": True},
+            "datasetSettings": {
+                "annotations": [],
+                "type": "Binary",
+                "typeProperties": {"location": {"type": f"Connector{index}Location", "folderPath": source.folder_path, "fileName": source.file_name}},
+                "externalReferences": {"connection": source.connection_id},
+            },
+        }
+    return build
+
+
+def make_connectors(count: int) -> Tuple[List[Tuple[Type[BaseModel], Callable]], ConnectorRegistry, List[Type[BaseModel]]]:
+    chain, registry, models = [], ConnectorRegistry("Source"), []
+    for i in range(count):
+        model = create_model(
+            f"Connector{i}Source", connector_type=(Literal[f"C{i}"], ...),  # type: ignore[valid-type]
+            connection_id=(str, ...), folder_path=(str, ...), file_name=(str, ...),
+        )
+        chain.append((model, _hand_written(i)))
+        registry.register_template(model, _template(i))
+        models.append(model)
+    return chain, registry, models
+
+
+def _chain_build(chain: List[Tuple[Type[BaseModel], Callable]], source: Any) -> Dict[str, Any]:
+    for model, build in chain:
+        if isinstance(source, model):
+            return build(source)
+    raise NotImplementedError
+
+
+def _time(fn: Callable[[], Any], budget_seconds: float = 0.5, inner: int = 1000) -> float:
+    """Best-of-N seconds per call, running batches of `inner` calls for about `budget_seconds`."""
+    best = float("inf")
+    deadline = time.perf_counter() + budget_seconds
+    runs = 0
+    while runs < 3 or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        for _ in range(inner):
+            fn()
+        best = min(best, (time.perf_counter() - start) / inner)
+        runs += 1
+    return best
+
+
+def run() -> List[Dict[str, Any]]:
+    results = []
+    for size in SIZES:
+        chain, registry, models = make_connectors(size)
+        source = models[-1](connector_type=f"C{size - 1}", connection_id="conn", folder_path="in", file_name="data.bin")
+        hand_written = chain[-1][1]
+        assert registry.build(source) == _chain_build(chain, source) == hand_written(source)
+        timings = {
+            "isinstance_chain": _time(lambda: _chain_build(chain, source)),
+            "registry": _time(lambda: registry.build(source)),
+            "hand_written": _time(lambda: hand_written(source)),
+        }
+        results.append({"connectors": size, **{k: round(v * 1e6, 3) for k, v in timings.items()}})
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--record", help="Append the results as a JSON line to this file.")
+    args = parser.parse_args()
+
+    results = run()
+    print(f"{'connectors':>10} {'isinstance chain us':>20} {'registry us':>12} {'hand-written dict us':>21}")
+    for r in results:
+        print(f"{r['connectors']:>10} {r['isinstance_chain']:>20} {r['registry']:>12} {r['hand_written']:>21}")
+
+    if args.record:
+        record = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "results": results,
+        }
+        with open(args.record, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 # fabric_mcp_server/activity_types.py
 from __future__ import annotations
 from typing import List, Optional, Literal, Dict, Any, Union, Annotated
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, TypeAdapter, model_validator
 # Removed overfitted copy schemas - using flexible models
 from .common_schemas import Expression, PipelineReference, ExternalReferences, LinkedServiceReference, DatasetReference, TabularTranslator
 from .connection_types import (
@@ -137,6 +137,7 @@ class LookupProperties(BaseModel):
     """Defines the high-level configuration for a Lookup activity."""
     source: Dict[str, Any]  # Flexible source settings
     datasetSettings: Dict[str, Any]  # Flexible dataset settings
+    firstRowOnly: Optional[bool] = None
 
 class LookupActivity(BaseActivity):
     type: Literal["Lookup"]
@@ -216,6 +217,8 @@ class IfConditionActivity(BaseActivity):
 class ForEachProperties(BaseModel):
     activities: List["Activity"] = Field(default_factory=list)
     items: Optional[Any] = None  # Add later if you pass array/expr
+    isSequential: Optional[bool] = None
+    batchCount: Optional[int] = Field(None, ge=1, le=50, description="Iterations run in parallel (default 20) unless isSequential is set.")
 
 class ForEachActivity(BaseActivity):
     type: Literal["ForEach"]
@@ -442,4 +445,14 @@ ForEachProperties.model_rebuild()
 UntilProperties.model_rebuild()
 SwitchCase.model_rebuild()
 SwitchProperties.model_rebuild()
-FilterProperties.model_rebuild() 
\ No newline at end of file
+FilterProperties.model_rebuild() 
+
+# ---------- Cached validators ----------
+# Building a TypeAdapter for the recursive union compiles the whole schema, so it is done once here.
+# Use these instead of creating adapters per call.
+ActivityAdapter: TypeAdapter = TypeAdapter(Activity)
+ActivityListAdapter: TypeAdapter = TypeAdapter(List[Activity])
+
+def validate_activities_json(data: Union[str, bytes]) -> List[Activity]:
+    """Validates a JSON array of activities straight from text/bytes, without an intermediate dict."""
+    return ActivityListAdapter.validate_json(data)
@@ -6,62 +6,51 @@ import os
 import sys
 import argparse
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator, Dict
+from typing import AsyncIterator
 
 import dotenv
 import uvicorn
-from azure.identity.aio import DefaultAzureCredential
-from cachetools import TTLCache
-from fastmcp import Context, FastMCP
+from fastmcp import FastMCP
 
-from .fabric_api_client import FabricApiClient, FabricApiException, FabricAuthException
+# Session state lives in sessions.py; it is re-exported here for the tool modules.
+from .sessions import _active_clients, get_session_fabric_client, job_status_store, session_scope
+from .tool_schemas import CachedToolListMiddleware, compact_tool_schemas
 
 dotenv.load_dotenv()
 
+# jobs and versions read their settings at import, so they load after .env.
+from . import jobs  # noqa: E402
+from .versions import version_store  # noqa: E402
+
+__all__ = ["get_session_fabric_client", "job_status_store", "mcp_app", "session_scope"]
+
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 log_format = '%(asctime)s %(levelname)-8s %(name)s | %(message)s'
 logging.basicConfig(level=getattr(logging, LOG_LEVEL, logging.INFO), format=log_format, stream=sys.stderr, force=True)
 logger = logging.getLogger("fabricmcp_server.app")
-# In-memory store for long-running operation status URLs
-# Key: job_id (str), Value: status_url (str)
-job_status_store: Dict[str, str] = {}
-
-_active_clients: Dict[str, FabricApiClient] = {}
-_client_creation_locks: Dict[str, asyncio.Lock] = {}
-_global_lock = asyncio.Lock()
-
-async def _get_lock(session_id: str) -> asyncio.Lock:
-    async with _global_lock:
-        return _client_creation_locks.setdefault(session_id, asyncio.Lock())
-
-async def get_session_fabric_client(ctx: Context) -> FabricApiClient:
-    session_id = str(id(ctx.session))
-    
-    if client := _active_clients.get(session_id):
-        return client
-
-    creation_lock = await _get_lock(session_id)
-    async with creation_lock:
-        if client := _active_clients.get(session_id):
-            return client
-
-        logger.info(f"Creating new FabricApiClient for session {session_id}.")
-        base_url = os.getenv("FABRIC_API_BASE_URL", "https://api.fabric.microsoft.com")
-        try:
-            client = await FabricApiClient.create(base_url)
-            _active_clients[session_id] = client
-            return client
-        except (FabricAuthException, FabricApiException) as e:
-            logger.error(f"Failed to create FabricApiClient for session {session_id}: {e}")
-            raise
+
+# Seconds to wait for in-flight job polls before closing clients on shutdown
+SHUTDOWN_DRAIN_SECONDS = float(os.getenv("FABRIC_SHUTDOWN_DRAIN_SECONDS", "30"))
 
 @asynccontextmanager
 async def app_lifespan(app: FastMCP) -> AsyncIterator[None]:
     logger.info("FabricMCP Server starting up.")
+    restored = jobs.load_tracked_jobs()
+    for job in restored:
+        if job.status_url:
+            job_status_store[job.job_id] = job.status_url
+    if restored:
+        logger.info(f"Restored {len(restored)} outstanding jobs from the previous run.")
     yield
-    logger.info(f"FabricMCP Server shutting down. Closing {_active_clients.__len__()} clients.")
+    logger.info("FabricMCP Server shutting down. Draining in-flight job polls.")
+    await jobs.drain_inflight_polls(SHUTDOWN_DRAIN_SECONDS)
+    persisted = jobs.persist_tracked_jobs()
+    logger.info(f"Persisted {persisted} outstanding jobs.")
+    logger.info(f"Closing {_active_clients.__len__()} clients.")
     await asyncio.gather(*(client.close() for client in _active_clients.values()), return_exceptions=True)
     _active_clients.clear()
+    if version_store is not None:
+        version_store.close()
     logger.info("All active Fabric API clients closed.")
 
 mcp_app = FastMCP(
@@ -70,6 +59,7 @@ mcp_app = FastMCP(
     dependencies=["httpx", "azure-identity"],
     lifespan=app_lifespan,
 )
+mcp_app.add_middleware(CachedToolListMiddleware())
 
 def register_tools() -> None:
     logger.info("Registering tools...")
@@ -90,9 +80,13 @@ def register_tools() -> None:
         lakehouses.register_lakehouse_tools(mcp_app)
         logger.info("Successfully registered 'lakehouses' tools.")
 
-        # from .tools import universal_copy_activity
-        # universal_copy_activity.register_universal_copy_tools(mcp_app)
-        # logger.info("Successfully registered 'universal_copy_activity' tools.")
+        from .tools import configure_copy_activity
+        configure_copy_activity.register_copy_tools(mcp_app)
+        logger.info("Successfully registered 'configure_copy_activity' tools.")
+
+        from .tools import universal_copy_activity
+        universal_copy_activity.register_universal_copy_tools(mcp_app)
+        logger.info("Successfully registered 'universal_copy_activity' tools.")
 
         from .tools import connections
         connections.register_connection_tools(mcp_app)
@@ -102,6 +96,24 @@ def register_tools() -> None:
         datasets.register_dataset_tools(mcp_app)
         logger.info("Successfully registered 'datasets' tools.")
 
+        from .tools import jobs as job_tools
+        job_tools.register_job_tools(mcp_app)
+        logger.info("Successfully registered 'jobs' tools.")
+
+        from .tools import plans
+        plans.register_plan_tools(mcp_app)
+        logger.info("Successfully registered 'plans' tools.")
+
+        from .tools import versions
+        versions.register_version_tools(mcp_app)
+        logger.info("Successfully registered 'versions' tools.")
+
+        from .tools import metrics
+        metrics.register_metrics_tools(mcp_app)
+        logger.info("Successfully registered 'metrics' tools.")
+
+        compact_tool_schemas(mcp_app._tool_manager._tools)
+
     except Exception as exc:
         logger.exception(f"Error during tool registration: {exc}")
 
@@ -0,0 +1,254 @@
+"""
+Generation of metadata-driven bulk copy pipelines (many database tables into a Lakehouse).
+
+Two layouts are produced:
+
+- "foreach": a Lookup returns one row per table (schema, table, query, target) and
+  a ForEach runs a single parameterised Copy per row, `batchCount` at a time. The
+  definition stays the same size whatever the number of tables; only the Lookup
+  query grows by one short VALUES row per table.
+- "static": one Copy activity per table, split into `batch_count` chains. Activities
+  within a chain run one after another (on completion, so one failed table does
+  not skip the rest); the chains run in parallel. A run's status only comes from
+  its leaf activities, so each Copy also gets a Fail activity on its failure path:
+  a failed table still fails the run, naming the table. Each table gets its own row
+  in the run monitor, which is worth it for a few dozen tables, but the definition
+  grows linearly (two activities per table) and is capped by the pipeline activity limit.
+
+"auto" picks static up to STATIC_COPY_THRESHOLD tables and foreach above that.
+When row counts are known, the largest tables are started first and static chains
+are balanced by rows (longest-processing-time first).
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import re
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from .common_schemas import Expression
+from .flexible_copy_schemas import create_lakehouse_table_sink, create_sqlserver_source
+from .payload_cache import cached_model_payload
+from .pipeline_partition import MAX_ACTIVITIES_PER_PIPELINE
+
+logger = logging.getLogger(__name__)
+
+STATIC_COPY_THRESHOLD = 40
+DEFAULT_BATCH_COUNT = 20
+MAX_BATCH_COUNT = 50
+# A Lookup returns at most 5,000 rows.
+MAX_LOOKUP_ROWS = 5000
+MAX_ACTIVITY_NAME_LENGTH = 55
+
+LOOKUP_ACTIVITY_NAME = "Lookup_Tables"
+FOREACH_ACTIVITY_NAME = "ForEach_Table"
+
+_NAME_UNSAFE = re.compile(r"[^A-Za-z0-9_ -]")
+_TABLE_UNSAFE = re.compile(r"[^A-Za-z0-9_]")
+
+
+class BulkCopyTable(BaseModel):
+    schema_name: str = Field("dbo", description="Source schema.")
+    table_name: str = Field(..., description="Source table.")
+    target_table: Optional[str] = Field(None, description="Lakehouse table name. Defaults to the table name, prefixed with the schema when it is not 'dbo'.")
+    query: Optional[str] = Field(None, description="Source query. Defaults to SELECT * FROM the table.")
+    row_count: Optional[int] = Field(None, ge=0, description="Approximate row count, used to start large tables first and balance parallel chains.")
+
+
+class BulkCopyPlan(BaseModel):
+    pattern: Literal["foreach", "static"]
+    activities: List[Dict[str, Any]]
+    table_count: int
+    parallelism: int = Field(..., description="Tables copied at the same time.")
+    warnings: List[str] = Field(default_factory=list)
+
+
+def _quote_identifier(name: str) -> str:
+    return "[" + name.replace("]", "]]") + "]"
+
+
+def _quote_literal(value: Optional[str]) -> str:
+    return "NULL" if value is None else "N'" + value.replace("'", "''") + "'"
+
+
+def source_query(table: BulkCopyTable) -> str:
+    return table.query or f"SELECT * FROM {_quote_identifier(table.schema_name)}.{_quote_identifier(table.table_name)}"
+
+
+def target_table_name(table: BulkCopyTable) -> str:
+    if table.target_table:
+        return table.target_table
+    name = table.table_name if table.schema_name.lower() == "dbo" else f"{table.schema_name}_{table.table_name}"
+    return _TABLE_UNSAFE.sub("_", name)
+
+
+def _ordered(tables: List[BulkCopyTable]) -> List[BulkCopyTable]:
+    """Largest tables first; tables without a row count keep their order after them."""
+    if not any(t.row_count is not None for t in tables):
+        return list(tables)
+    return sorted(tables, key=lambda t: -(t.row_count if t.row_count is not None else -1))
+
+
+def _copy_activity(
+    name: str, connection_id: str, lakehouse_id: str, workspace_id: str, lakehouse_name: str,
+    schema: Any, table: Any, query: Any, target: Any, table_action: str, query_timeout: str,
+) -> Dict[str, Any]:
+    source = cached_model_payload(create_sqlserver_source, connection_id, query, schema=schema, table=table, queryTimeout=query_timeout)
+    sink = cached_model_payload(create_lakehouse_table_sink, lakehouse_id, workspace_id, target, lakehouse_name=lakehouse_name, table_action=table_action)
+    return {"name": name, "type": "Copy", "typeProperties": {"source": source, "sink": sink}}
+
+
+def _unique_names(tables: List[BulkCopyTable]) -> List[str]:
+    names, used = [], set()
+    for table in tables:
+        base = _NAME_UNSAFE.sub("_", f"Copy_{table.schema_name}_{table.table_name}")[:MAX_ACTIVITY_NAME_LENGTH]
+        name, n = base, 1
+        while name in used:
+            n += 1
+            suffix = f"_{n}"
+            name = base[:MAX_ACTIVITY_NAME_LENGTH - len(suffix)] + suffix
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _lookup_query(tables: List[BulkCopyTable]) -> str:
+    rows = ",\n".join(
+        f"({_quote_literal(t.schema_name)}, {_quote_literal(t.table_name)}, {_quote_literal(source_query(t))}, {_quote_literal(target_table_name(t))})"
+        for t in tables
+    )
+    return f"SELECT schema_name, table_name, source_query, target_table FROM (VALUES\n{rows}\n) AS t (schema_name, table_name, source_query, target_table)"
+
+
+def _foreach_activities(
+    tables: List[BulkCopyTable], batch_count: int, connection_id: str, lakehouse_id: str, workspace_id: str,
+    lakehouse_name: str, table_action: str, query_timeout: str,
+) -> List[Dict[str, Any]]:
+    lookup_source = create_sqlserver_source(
+        connection_id, _lookup_query(tables), schema=None, table=None, queryTimeout=query_timeout
+    ).model_dump(exclude_none=True)
+    lookup_dataset = lookup_source.pop("datasetSettings")
+    lookup_dataset.pop("typeProperties", None)
+    copy = _copy_activity(
+        "Copy_Table", connection_id, lakehouse_id, workspace_id, lakehouse_name,
+        schema=Expression(value="@item().schema_name"), table=Expression(value="@item().table_name"),
+        query=Expression(value="@item().source_query"), target=Expression(value="@item().target_table"),
+        table_action=table_action, query_timeout=query_timeout,
+    )
+    return [
+        {
+            "name": LOOKUP_ACTIVITY_NAME,
+            "type": "Lookup",
+            "typeProperties": {"source": lookup_source, "datasetSettings": lookup_dataset, "firstRowOnly": False},
+        },
+        {
+            "name": FOREACH_ACTIVITY_NAME,
+            "type": "ForEach",
+            "dependsOn": [{"activity": LOOKUP_ACTIVITY_NAME, "dependencyConditions": ["Succeeded"]}],
+            "typeProperties": {
+                "items": {"value": f"@activity('{LOOKUP_ACTIVITY_NAME}').output.value", "type": "Expression"},
+                "isSequential": False,
+                "batchCount": batch_count,
+                "activities": [copy],
+            },
+        },
+    ]
+
+
+def _chains(tables: List[BulkCopyTable], lanes: int) -> List[List[int]]:
+    """Splits table indexes into `lanes` chains, each next table going to the least-loaded chain."""
+    chains: List[List[int]] = [[] for _ in range(lanes)]
+    heap = [(0, lane) for lane in range(lanes)]
+    for index, table in enumerate(tables):
+        load, lane = heapq.heappop(heap)
+        chains[lane].append(index)
+        heapq.heappush(heap, (load + max(table.row_count if table.row_count is not None else 1, 1), lane))
+    return chains
+
+
+def _static_activities(
+    tables: List[BulkCopyTable], batch_count: int, connection_id: str, lakehouse_id: str, workspace_id: str,
+    lakehouse_name: str, table_action: str, query_timeout: str,
+) -> List[Dict[str, Any]]:
+    names = _unique_names(tables)
+    activities = []
+    for chain in _chains(tables, batch_count):
+        previous = None
+        for index in chain:
+            table = tables[index]
+            activity = _copy_activity(
+                names[index], connection_id, lakehouse_id, workspace_id, lakehouse_name,
+                schema=table.schema_name, table=table.table_name, query=source_query(table),
+                target=target_table_name(table), table_action=table_action, query_timeout=query_timeout,
+            )
+            if previous:
+                activity["dependsOn"] = [{"activity": previous, "dependencyConditions": ["Completed"]}]
+            activities.extend([activity, _fail_activity(activity["name"], table)])
+            previous = activity["name"]
+    return activities
+
+
+def _fail_activity(copy_name: str, table: BulkCopyTable) -> Dict[str, Any]:
+    """Fails the run when the Copy fails; without it the next Copy in the chain would hide the failure."""
+    return {
+        "name": "Fail" + copy_name[len("Copy"):],
+        "type": "Fail",
+        "dependsOn": [{"activity": copy_name, "dependencyConditions": ["Failed"]}],
+        "typeProperties": {
+            "message": f"Copy of {table.schema_name}.{table.table_name} failed: @{{activity('{copy_name}').error.message}}",
+            "errorCode": "BulkCopyTableFailed",
+        },
+    }
+
+
+def build_bulk_copy_activities(
+    tables: List[BulkCopyTable],
+    source_connection_id: str,
+    lakehouse_id: str,
+    lakehouse_workspace_id: str,
+    pattern: Literal["auto", "foreach", "static"] = "auto",
+    batch_count: int = DEFAULT_BATCH_COUNT,
+    lakehouse_name: str = "lakehouse",
+    table_action: Literal["Append", "Overwrite"] = "Overwrite",
+    query_timeout: str = "02:00:00",
+) -> BulkCopyPlan:
+    """
+    Activities that copy every table from a SQL Server connection into Lakehouse tables.
+    Raises ValueError if the tables cannot be copied with the requested pattern.
+    """
+    if not tables:
+        raise ValueError("No tables to copy.")
+    targets: Dict[str, str] = {}
+    for table in tables:
+        target = target_table_name(table).lower()
+        source = f"{table.schema_name}.{table.table_name}"
+        if target in targets:
+            raise ValueError(f"Tables {targets[target]} and {source} would both be copied to Lakehouse table '{target}'; set 'target_table'.")
+        targets[target] = source
+
+    max_static_tables = MAX_ACTIVITIES_PER_PIPELINE // 2  # a Copy and a Fail per table
+    if pattern == "auto":
+        pattern = "static" if len(tables) <= min(STATIC_COPY_THRESHOLD, max_static_tables) else "foreach"
+    if pattern == "static" and len(tables) > max_static_tables:
+        raise ValueError(
+            f"{len(tables)} tables need {2 * len(tables)} static activities, over the limit of {MAX_ACTIVITIES_PER_PIPELINE} per pipeline; use the foreach pattern."
+        )
+    if pattern == "foreach" and len(tables) > MAX_LOOKUP_ROWS:
+        raise ValueError(f"A Lookup returns at most {MAX_LOOKUP_ROWS} rows; split the {len(tables)} tables over several pipelines.")
+
+    ordered = _ordered(tables)
+    parallelism = max(1, min(batch_count, MAX_BATCH_COUNT, len(tables)))
+    build = _static_activities if pattern == "static" else _foreach_activities
+    activities = build(
+        ordered, parallelism, source_connection_id, lakehouse_id, lakehouse_workspace_id,
+        lakehouse_name, table_action, query_timeout,
+    )
+
+    warnings = []
+    if batch_count > MAX_BATCH_COUNT:
+        warnings.append(f"batch_count {batch_count} was lowered to the maximum of {MAX_BATCH_COUNT}.")
+    logger.info(f"Generated a {pattern} bulk copy of {len(tables)} tables ({len(activities)} top-level activities, parallelism {parallelism}).")
+    return BulkCopyPlan(pattern=pattern, activities=activities, table_count=len(tables), parallelism=parallelism, warnings=warnings)
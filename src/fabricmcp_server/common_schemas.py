@@ -25,6 +25,11 @@ class DatasetReference(BaseModel):
 class TabularTranslator(BaseModel):
     """Defines a schema mapping translator for a Copy activity."""
     type: Literal["TabularTranslator"] = "TabularTranslator"
+    mappings: Optional[List[Dict[str, Any]]] = Field(None, description="Column mappings: [{'source': {'name': ...}, 'sink': {'name': ...}}].")
+    typeConversion: Optional[bool] = None
+    typeConversionSettings: Optional[Dict[str, Any]] = None
+
+    model_config = {"extra": "allow"}
 
 class LinkedServiceReference(BaseModel):
     """Represents a reference to a Connection (Linked Service) item by name."""
@@ -2,81 +2,75 @@
 Connection types for Microsoft Fabric Data Pipelines.
 Based on verified round-trip testing of all 55 UI-available connection types.
 52/55 working with the simple pattern: {ConnectionType}Source -> {ConnectionType}Table
+
+The connectors, their category, activity/dataset type names and verified status live in
+connector_catalog.json, loaded once at import. Everything below is generated from it.
 """
 
-from typing import Dict, Any, Literal, Union, List, Optional
-from pydantic import BaseModel, Field
+import json
+from importlib import resources
+from types import MappingProxyType
+from typing import Dict, Any, Literal, Mapping, NamedTuple, Tuple, Type, Union, List, Optional
+from pydantic import BaseModel, Field, create_model
 
 # =============================================================================
-# ALL 52 VERIFIED WORKING CONNECTION TYPES
+# CONNECTOR CATALOG
 # =============================================================================
 
-# These 51 connection types passed round-trip testing with simple pattern
-VERIFIED_CONNECTION_TYPES = [
-    # Databases (24 working with simple pattern)
-    "SqlServer", "Oracle", "PostgreSql", "MySql", "Db2", "Teradata", "SapHana",
-    "AmazonRedshift", "Vertica", "AzureSqlDatabase", "AzureSqlDW",
-    "AzurePostgreSql", "AzureSqlMI", "AzureMySql", "Cassandra", "AmazonRDSSqlServer",
-    "Greenplum", "MariaDB", "MongoDbAtlas", "MongoDb", "CosmosDbMongoDb", "CosmosDb",
-    "AzureDatabricks", "Dataverse",
-    
-    # Storage (11 working)
-    "FileSystem", "Hdfs", "Ftp", "Sftp", "AzureTables", "AzureDataLakeStorageGen2",
-    "AzureBlobStorage", "AzureFileStorage", "AmazonS3", "AmazonS3Compatible",
-    "GoogleCloudStorage", "OracleCloudStorage",
-    
-    # Services (7 working)
-    "SharePointOnlineList", "Salesforce", "OData", "SalesforceServiceCloud",
-    "Dynamics365", "DynamicsAX", "DynamicsCRM", "ServiceNow",
-    
-    # Other (9 working)
-    "Odbc", "Http", "RestService", "SapBWOpenHub", "SapBWMessageServer",
-    "SapTableApplication", "SapTableMessage"
-]
-
-# 4 that don't work with simple pattern (need special handling)
-# GoogleBigQuery uses GoogleBigQueryObject instead of GoogleBigQueryTable
-SPECIAL_PATTERN_CONNECTIONS = ["GoogleBigQuery", "Snowflake", "AzureDataExplorer", "Office365"]
-
-class DatabaseConnectionRef(BaseModel):
-    """Database connection reference for externalReferences pattern."""
-    connection: str = Field(..., description="Connection ID/name")
-    connectionType: Literal[
-        # All database connections that use externalReferences
-        "SqlServer", "Oracle", "PostgreSql", "MySql", "Db2", "Teradata", "SapHana",
-        "GoogleBigQuery", "AmazonRedshift", "Vertica", "AzureSqlDatabase", "AzureSqlDW",
-        "AzurePostgreSql", "AzureSqlMI", "AzureMySql", "Cassandra", "AmazonRDSSqlServer",
-        "Greenplum", "MariaDB", "MongoDbAtlas", "MongoDb", "CosmosDbMongoDb", "CosmosDb",
-        "AzureDataExplorer", "AzureDatabricks", "Dataverse", "Snowflake"
-    ] = Field(..., description="Database connection type")
-
-class StorageConnectionRef(BaseModel):
-    """Storage connection reference for externalReferences pattern."""
-    connection: str = Field(..., description="Connection ID/name")
-    connectionType: Literal[
-        # All storage connections that use externalReferences
-        "FileSystem", "Hdfs", "Ftp", "Sftp", "AzureTables", "AzureDataLakeStorageGen2",
-        "AzureBlobStorage", "AzureFileStorage", "AmazonS3", "AmazonS3Compatible",
-        "GoogleCloudStorage", "OracleCloudStorage"
-    ] = Field(..., description="Storage connection type")
-
-class ServiceConnectionRef(BaseModel):
-    """Service connection reference for externalReferences pattern."""
-    connection: str = Field(..., description="Connection ID/name")
-    connectionType: Literal[
-        # All service connections that use externalReferences
-        "SharePointOnlineList", "Salesforce", "OData", "SalesforceServiceCloud",
-        "Dynamics365", "DynamicsAX", "DynamicsCRM", "Office365", "ServiceNow"
-    ] = Field(..., description="Service connection type")
-
-class OtherConnectionRef(BaseModel):
-    """Other connection types for externalReferences pattern."""
-    connection: str = Field(..., description="Connection ID/name")
-    connectionType: Literal[
-        # Other connection types
-        "Odbc", "Http", "RestService", "SapBWOpenHub", "SapBWMessageServer",
-        "SapTableApplication", "SapTableMessage"
-    ] = Field(..., description="Other connection type")
+CONNECTION_CATEGORIES = ("database", "storage", "service", "other")
+
+class ConnectorSpec(NamedTuple):
+    connector: str
+    category: str
+    source_type: Optional[str]
+    sink_type: Optional[str]
+    dataset_type: Optional[str]
+    special_pattern: Optional[str]
+    verified: bool
+
+def _load_catalog() -> Mapping[str, ConnectorSpec]:
+    raw = json.loads(resources.files(__package__).joinpath("connector_catalog.json").read_text(encoding="utf-8"))
+    catalog: Dict[str, ConnectorSpec] = {}
+    for entry in raw["connectors"]:
+        spec = ConnectorSpec(**entry)
+        if spec.connector in catalog:
+            raise ValueError(f"Connector '{spec.connector}' is listed twice in connector_catalog.json.")
+        if spec.category not in CONNECTION_CATEGORIES:
+            raise ValueError(f"Connector '{spec.connector}' has unknown category '{spec.category}'.")
+        catalog[spec.connector] = spec
+    return MappingProxyType(catalog)
+
+CONNECTORS: Mapping[str, ConnectorSpec] = _load_catalog()
+
+# Connection type names per category, in catalog order
+CATEGORY_CONNECTION_TYPES: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    category: tuple(name for name, spec in CONNECTORS.items() if spec.category == category)
+    for category in CONNECTION_CATEGORIES
+})
+
+# Connection types that passed round-trip testing and can be generated
+VERIFIED_CONNECTION_TYPES: Tuple[str, ...] = tuple(name for name, spec in CONNECTORS.items() if spec.verified)
+
+# Connection types whose type names differ from the simple pattern or are not known yet
+SPECIAL_PATTERN_CONNECTIONS: Tuple[str, ...] = tuple(name for name, spec in CONNECTORS.items() if spec.special_pattern)
+
+# =============================================================================
+# CONNECTION REFERENCE MODELS
+# =============================================================================
+
+def _connection_ref_model(name: str, category: str, doc: str) -> Type[BaseModel]:
+    return create_model(
+        name,
+        __doc__=doc,
+        __module__=__name__,
+        connection=(str, Field(..., description="Connection ID/name")),
+        connectionType=(Literal[CATEGORY_CONNECTION_TYPES[category]], Field(..., description=f"{category.capitalize()} connection type")),
+    )
+
+DatabaseConnectionRef = _connection_ref_model("DatabaseConnectionRef", "database", "Database connection reference for externalReferences pattern.")
+StorageConnectionRef = _connection_ref_model("StorageConnectionRef", "storage", "Storage connection reference for externalReferences pattern.")
+ServiceConnectionRef = _connection_ref_model("ServiceConnectionRef", "service", "Service connection reference for externalReferences pattern.")
+OtherConnectionRef = _connection_ref_model("OtherConnectionRef", "other", "Other connection types for externalReferences pattern.")
 
 # Union type for any connection reference
 ConnectionRef = Union[DatabaseConnectionRef, StorageConnectionRef, ServiceConnectionRef, OtherConnectionRef]
@@ -119,63 +113,49 @@ def build_fabric_linkedservice(
 # HELPER FUNCTIONS - Create activities using verified patterns
 # =============================================================================
 
+def _connector_for(connection_type: str) -> ConnectorSpec:
+    spec = CONNECTORS.get(connection_type)
+    if spec is None:
+        raise ValueError(f"Unknown connection type: {connection_type}")
+    if not spec.verified:
+        raise NotImplementedError(f"{connection_type} requires special pattern (not yet implemented): {spec.special_pattern}")
+    return spec
+
 def create_copy_source_from_connection(connection_type: str, connection_id: str = "placeholder") -> Dict[str, Any]:
     """
-    Create a Copy activity source using the verified simple pattern.
-    Pattern: {ConnectionType}Source with {ConnectionType}Table dataset
+    Create a Copy activity source using the catalog's verified type names.
+    Pattern: {ConnectionType}Source with {ConnectionType}Table dataset, unless the catalog says otherwise
     """
-    if connection_type not in VERIFIED_CONNECTION_TYPES:
-        if connection_type not in SPECIAL_PATTERN_CONNECTIONS:
-            raise ValueError(f"Unknown connection type: {connection_type}")
-        # Special patterns would be handled here when we get golden JSONs
-        raise NotImplementedError(f"{connection_type} requires special pattern (not yet implemented)")
-    
+    spec = _connector_for(connection_type)
     return {
-        "type": f"{connection_type}Source",
+        "type": spec.source_type,
         "datasetSettings": {
-            "type": f"{connection_type}Table",
+            "type": spec.dataset_type,
             "externalReferences": {"connection": connection_id}
         }
     }
 
 def create_copy_sink_from_connection(connection_type: str, connection_id: str = "placeholder") -> Dict[str, Any]:
     """
-    Create a Copy activity sink using the verified simple pattern.
-    Pattern: {ConnectionType}Sink with {ConnectionType}Table dataset
+    Create a Copy activity sink using the catalog's verified type names.
+    Pattern: {ConnectionType}Sink with {ConnectionType}Table dataset, unless the catalog says otherwise
     """
-    if connection_type not in VERIFIED_CONNECTION_TYPES:
-        if connection_type not in SPECIAL_PATTERN_CONNECTIONS:
-            raise ValueError(f"Unknown connection type: {connection_type}")
-        raise NotImplementedError(f"{connection_type} requires special pattern (not yet implemented)")
-    
+    spec = _connector_for(connection_type)
+    if spec.sink_type is None:
+        raise ValueError(f"{connection_type} cannot be used as a Copy sink.")
     return {
-        "type": f"{connection_type}Sink",
+        "type": spec.sink_type,
         "datasetSettings": {
-            "type": f"{connection_type}Table",
+            "type": spec.dataset_type,
             "externalReferences": {"connection": connection_id}
         }
     }
 
 def is_valid_connection_type(connection_type: str) -> bool:
     """Check if a connection type is valid (either verified or special pattern)."""
-    return connection_type in VERIFIED_CONNECTION_TYPES or connection_type in SPECIAL_PATTERN_CONNECTIONS
+    return connection_type in CONNECTORS
 
 def get_connection_category(connection_type: str) -> Optional[str]:
     """Get the category of a connection type."""
-    if connection_type in ["SqlServer", "Oracle", "PostgreSql", "MySql", "Db2", "Teradata", "SapHana",
-                           "GoogleBigQuery", "AmazonRedshift", "Vertica", "AzureSqlDatabase", "AzureSqlDW",
-                           "AzurePostgreSql", "AzureSqlMI", "AzureMySql", "Cassandra", "AmazonRDSSqlServer",
-                           "Greenplum", "MariaDB", "MongoDbAtlas", "MongoDb", "CosmosDbMongoDb", "CosmosDb",
-                           "AzureDataExplorer", "AzureDatabricks", "Dataverse", "Snowflake"]:
-        return "database"
-    elif connection_type in ["FileSystem", "Hdfs", "Ftp", "Sftp", "AzureTables", "AzureDataLakeStorageGen2",
-                             "AzureBlobStorage", "AzureFileStorage", "AmazonS3", "AmazonS3Compatible",
-                             "GoogleCloudStorage", "OracleCloudStorage"]:
-        return "storage"
-    elif connection_type in ["SharePointOnlineList", "Salesforce", "OData", "SalesforceServiceCloud",
-                             "Dynamics365", "DynamicsAX", "DynamicsCRM", "Office365", "ServiceNow"]:
-        return "service"
-    elif connection_type in ["Odbc", "Http", "RestService", "SapBWOpenHub", "SapBWMessageServer",
-                             "SapTableApplication", "SapTableMessage"]:
-        return "other"
-    return None
+    spec = CONNECTORS.get(connection_type)
+    return spec.category if spec else None
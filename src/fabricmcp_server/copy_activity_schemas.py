@@ -5,6 +5,9 @@ from typing import List, Optional, Literal, Dict, Any, Union, Annotated
 from pydantic import BaseModel, Field, model_validator, field_validator
 from enum import Enum
 
+from .flexible_copy_schemas import lakehouse_table_write_options
+from .payload_templates import ConnectorRegistry, PayloadTemplate, Slot
+
 # =============================================================================
 #  ENUMS AND SUPPORTING CLASSES
 # =============================================================================
@@ -370,6 +373,9 @@ class LakehouseSink(BaseModel):
     # Table-specific sink options
     table_action_option: str = "Append"  # Append, Overwrite, Upsert
     partition_option: str = "None"  # None, PartitionByKey
+    partition_columns: Optional[List[str]] = Field(None, description="Delta partition columns (implies PartitionByKey), outermost first")
+    upsert_keys: Optional[List[str]] = Field(None, description="Key columns for table_action_option='Upsert'")
+    apply_v_order: Optional[bool] = Field(None, description="Write V-Order optimized Parquet")
     
     # Write settings
     max_concurrent_connections: int = 1
@@ -383,8 +389,17 @@ class LakehouseSink(BaseModel):
             raise ValueError("table_config required when root_folder='Tables'")
         if self.root_folder == "Files" and not self.file_config:
             raise ValueError("file_config required when root_folder='Files'")
+        if self.root_folder == "Tables":
+            if self.partition_option == "PartitionByKey" and not self.partition_columns:
+                raise ValueError("partition_columns required when partition_option='PartitionByKey'")
+            self.table_write_options()
+        elif self.partition_columns or self.upsert_keys or self.apply_v_order is not None or self.partition_option != "None":
+            raise ValueError("partition, upsert and V-Order options only apply when root_folder='Tables'")
         return self
 
+    def table_write_options(self) -> Dict[str, Any]:
+        return lakehouse_table_write_options(self.table_action_option, self.partition_columns, self.upsert_keys, self.apply_v_order)
+
 # =============================================================================
 #  MASTER UNIONS & API PAYLOAD BUILDERS
 # =============================================================================
@@ -413,643 +428,675 @@ SinkConfig = Annotated[Union[
     LakehouseSink
 ], Field(discriminator="connector_type")]
 
+SOURCE_BUILDERS = ConnectorRegistry("Source")
+SINK_BUILDERS = ConnectorRegistry("Sink")
+
 def build_source_payload(source: SourceConfig) -> Dict[str, Any]:
     """Builds the final API-compliant JSON for a source."""
-    if isinstance(source, S3Source):
-        return {
-            "type": "BinarySource",
-            "storeSettings": {"type": "AmazonS3ReadSettings", "recursive": True},
-            "formatSettings": {"type": "BinaryReadSettings"},
-            "datasetSettings": {
-                "type": "Binary",
+    return SOURCE_BUILDERS.build(source)
+
+def build_sink_payload(sink: SinkConfig) -> Dict[str, Any]:
+    """Builds the final API-compliant JSON for a sink."""
+    return SINK_BUILDERS.build(sink)
+
+# =============================================================================
+#  SOURCE PAYLOADS
+# =============================================================================
+
+SOURCE_BUILDERS.register_template(S3Source, {
+    "type": "BinarySource",
+    "storeSettings": {"type": "AmazonS3ReadSettings", "recursive": True},
+    "formatSettings": {"type": "BinaryReadSettings"},
+    "datasetSettings": {
+        "type": "Binary",
+        "typeProperties": {
+            "location": {
+                "type": "AmazonS3Location",
+                "bucketName": Slot("bucket_name"),
+                "folderPath": Slot("folder_path"),
+                "fileName": Slot("file_name"),
+            }
+        },
+        "externalReferences": {"connection": Slot("connection_id")},
+    },
+})
+
+SOURCE_BUILDERS.register_template(LakehouseTableSource, {
+    "type": "LakehouseTableSource",
+    "datasetSettings": {
+        "type": "LakehouseTable",
+        "typeProperties": {"table": Slot("table_name")},
+        "linkedService": {
+            "name": Slot("lakehouse_name"),
+            "properties": {
+                "type": "Lakehouse",
                 "typeProperties": {
-                    "location": {
-                        "type": "AmazonS3Location",
-                        "bucketName": source.bucket_name,
-                        "folderPath": source.folder_path,
-                        "fileName": source.file_name,
-                    }
-                },
-                "externalReferences": {"connection": source.connection_id},
-            },
-        }
-    if isinstance(source, LakehouseTableSource):
-        return {
-            "type": "LakehouseTableSource",
-            "datasetSettings": {
-                "type": "LakehouseTable",
-                "typeProperties": {"table": source.table_name},
-                "linkedService": {
-                    "name": source.lakehouse_name,
-                    "properties": {
-                        "type": "Lakehouse",
-                        "typeProperties": {
-                            "workspaceId": source.workspace_id,
-                            "artifactId": source.lakehouse_id,
-                            "rootFolder": "Tables",
-                        }
-                    }
+                    "workspaceId": Slot("workspace_id"),
+                    "artifactId": Slot("lakehouse_id"),
+                    "rootFolder": "Tables",
                 }
             }
         }
-    if isinstance(source, SharePointSource):
-        payload = {
-            "type": "SharePointOnlineListSource",
-            "httpRequestTimeout": source.http_request_timeout,
-            "datasetSettings": {
-                "annotations": [],
-                "type": "SharePointOnlineListResource",
-                "schema": [],
-                "typeProperties": {
-                    "listName": source.list_name
-                },
-                "externalReferences": {
-                    "connection": source.connection_id
-                }
+    }
+})
+
+_SHAREPOINT_SOURCE = PayloadTemplate({
+    "type": "SharePointOnlineListSource",
+    "httpRequestTimeout": Slot("http_request_timeout"),
+    "datasetSettings": {
+        "annotations": [],
+        "type": "SharePointOnlineListResource",
+        "schema": [],
+        "typeProperties": {
+            "listName": Slot("list_name")
+        },
+        "externalReferences": {
+            "connection": Slot("connection_id")
+        }
+    }
+}, name="SharePointSource")
+
+@SOURCE_BUILDERS.register(SharePointSource)
+def _sharepoint_source(source: SharePointSource) -> Dict[str, Any]:
+    payload = _SHAREPOINT_SOURCE(source)
+    if source.query:
+        payload["query"] = source.query
+    return payload
+
+SOURCE_BUILDERS.register_template(HttpSource, {
+    "type": "DelimitedTextSource",
+    "storeSettings": {
+        "type": "HttpReadSettings",
+        "requestMethod": Slot("request_method"),
+        "requestTimeout": Slot("request_timeout"),
+        "maxConcurrentConnections": Slot("max_concurrent_connections"),
+        "additionalHeaders": Slot("additional_headers"),
+        "requestBody": Slot("request_body")
+    },
+    "formatSettings": {
+        "type": "DelimitedTextReadSettings",
+        "skipLineCount": 0,
+        "firstRowAsHeader": Slot("first_row_as_header"),
+        "columnDelimiter": Slot("column_delimiter"),
+        "quoteChar": Slot("quote_char"),
+        "escapeChar": Slot("escape_char")
+    },
+    "datasetSettings": {
+        "annotations": [],
+        "type": "DelimitedText",
+        "schema": [],
+        "typeProperties": {
+            "location": {
+                "type": "HttpServerLocation",
+                "relativeUrl": Slot("relative_url")
             }
+        },
+        "externalReferences": {
+            "connection": Slot("connection_id")
         }
-        if source.query:
-            payload["query"] = source.query
-        return payload
-    if isinstance(source, HttpSource):
-        return {
-            "type": "DelimitedTextSource",
-            "storeSettings": {
-                "type": "HttpReadSettings",
-                "requestMethod": source.request_method,
-                "requestTimeout": source.request_timeout,
-                "maxConcurrentConnections": source.max_concurrent_connections,
-                "additionalHeaders": source.additional_headers,
-                "requestBody": source.request_body
-            },
-            "formatSettings": {
-                "type": "DelimitedTextReadSettings",
-                "skipLineCount": 0,
-                "firstRowAsHeader": source.first_row_as_header,
-                "columnDelimiter": source.column_delimiter,
-                "quoteChar": source.quote_char,
-                "escapeChar": source.escape_char
-            },
-            "datasetSettings": {
-                "annotations": [],
-                "type": "DelimitedText",
-                "schema": [],
-                "typeProperties": {
-                    "location": {
-                        "type": "HttpServerLocation",
-                        "relativeUrl": source.relative_url
-                    }
-                },
-                "externalReferences": {
-                    "connection": source.connection_id
-                }
+    }
+})
+
+SOURCE_BUILDERS.register_template(RestSource, {
+    "type": "RestSource",
+    "httpRequestTimeout": Slot("http_request_timeout"),
+    "requestInterval": Slot("request_interval"),
+    "datasetSettings": {
+        "annotations": [],
+        "type": "RestResource",
+        "typeProperties": {
+            "relativeUrl": Slot("relative_url"),
+            "requestMethod": Slot("request_method"),
+            "requestBody": Slot("request_body"),
+            "additionalHeaders": Slot("additional_headers"),
+            "paginationRules": {
+                "supportRFC5988": Slot("support_rfc5988")
             }
+        },
+        "schema": [],
+        "externalReferences": {
+            "connection": Slot("connection_id")
         }
-    if isinstance(source, RestSource):
-        return {
-            "type": "RestSource",
-            "httpRequestTimeout": source.http_request_timeout,
-            "requestInterval": source.request_interval,
-            "datasetSettings": {
-                "annotations": [],
-                "type": "RestResource",
-                "typeProperties": {
-                    "relativeUrl": source.relative_url,
-                    "requestMethod": source.request_method,
-                    "requestBody": source.request_body,
-                    "additionalHeaders": source.additional_headers,
-                    "paginationRules": {
-                        "supportRFC5988": source.support_rfc5988
-                    }
-                },
-                "schema": [],
-                "externalReferences": {
-                    "connection": source.connection_id
-                }
+    }
+})
+
+@SOURCE_BUILDERS.register(FileSystemSource)
+def _file_system_source(source: FileSystemSource) -> Dict[str, Any]:
+    source_type = f"{source.file_format}Source"
+    store_settings = {
+        "type": "FileServerReadSettings",
+        "recursive": source.recursive,
+        "wildcardFolderPath": source.wildcard_folder_path,
+        "wildcardFileName": source.wildcard_file_name,
+        "enablePartitionDiscovery": source.enable_partition_discovery,
+        "deleteFilesAfterCompletion": source.delete_files_after_completion
+    }
+    if source.max_concurrent_connections:
+        store_settings["maxConcurrentConnections"] = source.max_concurrent_connections
+    
+    dataset_settings = {
+        "annotations": [],
+        "type": source.file_format,
+        "schema": [],
+        "typeProperties": {
+            "location": {
+                "type": "FileServerLocation",
+                "folderPath": source.folder_path,
+                "fileName": source.file_name
             }
+        },
+        "externalReferences": {
+            "connection": source.connection_id
         }
-    if isinstance(source, FileSystemSource):
-        source_type = f"{source.file_format}Source"
-        store_settings = {
-            "type": "FileServerReadSettings",
-            "recursive": source.recursive,
-            "wildcardFolderPath": source.wildcard_folder_path,
-            "wildcardFileName": source.wildcard_file_name,
-            "enablePartitionDiscovery": source.enable_partition_discovery,
-            "deleteFilesAfterCompletion": source.delete_files_after_completion
+    }
+    
+    payload = {
+        "type": source_type,
+        "storeSettings": store_settings,
+        "datasetSettings": dataset_settings
+    }
+    
+    if source.file_format == "DelimitedText":
+        payload["formatSettings"] = {
+            "type": "DelimitedTextReadSettings",
+            "firstRowAsHeader": source.first_row_as_header,
+            "columnDelimiter": source.column_delimiter,
+            "quoteChar": source.quote_char,
+            "escapeChar": source.escape_char
         }
-        if source.max_concurrent_connections:
-            store_settings["maxConcurrentConnections"] = source.max_concurrent_connections
+    
+    return payload
+
+@SOURCE_BUILDERS.register(MySqlSource)
+def _my_sql_source(source: MySqlSource) -> Dict[str, Any]:
+    payload = {
+        "type": "MySqlSource",
+        "datasetSettings": {
+            "annotations": [],
+            "type": "MySqlTable",
+            "schema": [],
+            "externalReferences": {
+                "connection": source.connection_id
+            }
+        }
+    }
+    
+    if source.table_name:
+        payload["datasetSettings"]["typeProperties"] = {"tableName": source.table_name}
+    if source.query:
+        payload["sqlReaderQuery"] = source.query
+    if source.additional_columns:
+        payload["additionalColumns"] = source.additional_columns
         
-        dataset_settings = {
+    return payload
+
+@SOURCE_BUILDERS.register(GoogleCloudStorageSource)
+def _google_cloud_storage_source(source: GoogleCloudStorageSource) -> Dict[str, Any]:
+    source_type = f"{source.file_format}Source"
+    store_settings = {
+        "type": "GoogleCloudStorageReadSettings",
+        "recursive": source.recursive,
+        "enablePartitionDiscovery": source.enable_partition_discovery,
+        "maxConcurrentConnections": source.max_concurrent_connections,
+        "deleteFilesAfterCompletion": source.delete_files_after_completion
+    }
+    
+    location = {
+        "type": "GoogleCloudStorageLocation",
+        "bucketName": source.bucket_name
+    }
+    
+    # Handle different path types
+    config = source.file_path_config
+    if config.path_type == GoogleCloudStoragePathType.FILE_PATH:
+        if config.object_key:
+            location["fileName"] = config.object_key
+    elif config.path_type == GoogleCloudStoragePathType.WILDCARD:
+        if config.wildcard_folder_path:
+            store_settings["wildcardFolderPath"] = config.wildcard_folder_path
+        if config.wildcard_file_name:
+            store_settings["wildcardFileName"] = config.wildcard_file_name
+    elif config.path_type == GoogleCloudStoragePathType.PREFIX:
+        if config.prefix:
+            store_settings["prefix"] = config.prefix
+    elif config.path_type == GoogleCloudStoragePathType.LIST_OF_FILES:
+        if config.file_list_path:
+            store_settings["fileListPath"] = config.file_list_path
+    
+    payload = {
+        "type": source_type,
+        "storeSettings": store_settings,
+        "datasetSettings": {
             "annotations": [],
             "type": source.file_format,
             "schema": [],
             "typeProperties": {
-                "location": {
-                    "type": "FileServerLocation",
-                    "folderPath": source.folder_path,
-                    "fileName": source.file_name
-                }
+                "location": location
             },
             "externalReferences": {
                 "connection": source.connection_id
             }
         }
-        
-        payload = {
-            "type": source_type,
-            "storeSettings": store_settings,
-            "datasetSettings": dataset_settings
-        }
-        
-        if source.file_format == "DelimitedText":
-            payload["formatSettings"] = {
-                "type": "DelimitedTextReadSettings",
-                "firstRowAsHeader": source.first_row_as_header,
-                "columnDelimiter": source.column_delimiter,
-                "quoteChar": source.quote_char,
-                "escapeChar": source.escape_char
-            }
-        
-        return payload
-    if isinstance(source, MySqlSource):
-        payload = {
-            "type": "MySqlSource",
-            "datasetSettings": {
-                "annotations": [],
-                "type": "MySqlTable",
-                "schema": [],
-                "externalReferences": {
-                    "connection": source.connection_id
-                }
-            }
-        }
-        
-        if source.table_name:
-            payload["datasetSettings"]["typeProperties"] = {"tableName": source.table_name}
-        if source.query:
-            payload["sqlReaderQuery"] = source.query
-        if source.additional_columns:
-            payload["additionalColumns"] = source.additional_columns
-            
-        return payload
-    if isinstance(source, GoogleCloudStorageSource):
-        source_type = f"{source.file_format}Source"
-        store_settings = {
-            "type": "GoogleCloudStorageReadSettings",
-            "recursive": source.recursive,
-            "enablePartitionDiscovery": source.enable_partition_discovery,
-            "maxConcurrentConnections": source.max_concurrent_connections,
-            "deleteFilesAfterCompletion": source.delete_files_after_completion
+    }
+    
+    if source.file_format == "DelimitedText":
+        payload["formatSettings"] = {
+            "type": "DelimitedTextReadSettings"
         }
-        
-        location = {
-            "type": "GoogleCloudStorageLocation",
-            "bucketName": source.bucket_name
+    elif source.file_format == "JSON":
+        payload["formatSettings"] = {
+            "type": "JsonReadSettings"
         }
-        
-        # Handle different path types
-        config = source.file_path_config
-        if config.path_type == GoogleCloudStoragePathType.FILE_PATH:
-            if config.object_key:
-                location["fileName"] = config.object_key
-        elif config.path_type == GoogleCloudStoragePathType.WILDCARD:
-            if config.wildcard_folder_path:
-                store_settings["wildcardFolderPath"] = config.wildcard_folder_path
-            if config.wildcard_file_name:
-                store_settings["wildcardFileName"] = config.wildcard_file_name
-        elif config.path_type == GoogleCloudStoragePathType.PREFIX:
-            if config.prefix:
-                store_settings["prefix"] = config.prefix
-        elif config.path_type == GoogleCloudStoragePathType.LIST_OF_FILES:
-            if config.file_list_path:
-                store_settings["fileListPath"] = config.file_list_path
-        
-        payload = {
-            "type": source_type,
-            "storeSettings": store_settings,
-            "datasetSettings": {
-                "annotations": [],
-                "type": source.file_format,
-                "schema": [],
-                "typeProperties": {
-                    "location": location
-                },
-                "externalReferences": {
-                    "connection": source.connection_id
+    
+    return payload
+
+@SOURCE_BUILDERS.register(LakehouseSource)
+def _lakehouse_source(source: LakehouseSource) -> Dict[str, Any]:
+    # Determine source type based on root folder and format
+    if source.root_folder == "Tables":
+        source_type = "LakehouseTableSource"
+        dataset_type = "LakehouseTable"
+    else:
+        # For files, use format from file_config
+        format_type = source.file_config.file_format if source.file_config else "DelimitedText"
+        if format_type == "JSON":
+            source_type = "JsonSource"
+            dataset_type = "Json"
+        elif format_type == "Binary":
+            source_type = "BinarySource" 
+            dataset_type = "Binary"
+        else:
+            source_type = "DelimitedTextSource"
+            dataset_type = "DelimitedText"
+    
+    base_config = {
+        "type": source_type,
+        "datasetSettings": {
+            "annotations": [],
+            "linkedService": {
+                "name": source.lakehouse_name,
+                "properties": {
+                    "annotations": [],
+                    "type": "Lakehouse",
+                    "typeProperties": {
+                        "workspaceId": source.workspace_id,
+                        "artifactId": source.artifact_id,
+                        "rootFolder": source.root_folder
+                    }
                 }
-            }
+            },
+            "type": dataset_type,
+            "schema": []
         }
+    }
+    
+    # Add type properties based on configuration
+    if source.root_folder == "Tables" and source.table_config:
+        base_config["datasetSettings"]["typeProperties"] = {
+            "table": source.table_config.table_name
+        }
+        if source.table_config.schema_name:
+            base_config["datasetSettings"]["typeProperties"]["schema"] = source.table_config.schema_name
+    elif source.root_folder == "Files" and source.file_config:
+        location_props = {}
+        if source.file_config.folder_path:
+            location_props["folderPath"] = source.file_config.folder_path
+        if source.file_config.file_name:
+            location_props["fileName"] = source.file_config.file_name
         
-        if source.file_format == "DelimitedText":
-            payload["formatSettings"] = {
-                "type": "DelimitedTextReadSettings"
-            }
-        elif source.file_format == "JSON":
-            payload["formatSettings"] = {
-                "type": "JsonReadSettings"
-            }
-        
-        return payload
-    if isinstance(source, LakehouseSource):
-        # Determine source type based on root folder and format
-        if source.root_folder == "Tables":
-            source_type = "LakehouseTableSource"
-            dataset_type = "LakehouseTable"
-        else:
-            # For files, use format from file_config
-            format_type = source.file_config.file_format if source.file_config else "DelimitedText"
-            if format_type == "JSON":
-                source_type = "JsonSource"
-                dataset_type = "Json"
-            elif format_type == "Binary":
-                source_type = "BinarySource" 
-                dataset_type = "Binary"
-            else:
-                source_type = "DelimitedTextSource"
-                dataset_type = "DelimitedText"
-        
-        base_config = {
-            "type": source_type,
-            "datasetSettings": {
-                "annotations": [],
-                "linkedService": {
-                    "name": source.lakehouse_name,
-                    "properties": {
-                        "annotations": [],
-                        "type": "Lakehouse",
-                        "typeProperties": {
-                            "workspaceId": source.workspace_id,
-                            "artifactId": source.artifact_id,
-                            "rootFolder": source.root_folder
-                        }
-                    }
-                },
-                "type": dataset_type,
-                "schema": []
+        base_config["datasetSettings"]["typeProperties"] = {
+            "location": {
+                "type": "LakehouseLocation",
+                **location_props
             }
         }
-        
-        # Add type properties based on configuration
-        if source.root_folder == "Tables" and source.table_config:
-            base_config["datasetSettings"]["typeProperties"] = {
-                "table": source.table_config.table_name
+    
+    return base_config
+
+# =============================================================================
+#  SINK PAYLOADS
+# =============================================================================
+
+SINK_BUILDERS.register_template(LakehouseFileSink, {
+    "type": "DelimitedTextSink",
+    "storeSettings": {"type": "LakehouseWriteSettings"},
+    "formatSettings": {"type": "DelimitedTextWriteSettings", "fileExtension": ".csv"},
+    "datasetSettings": {
+        "type": "DelimitedText",
+        "typeProperties": {
+            "location": {
+                "type": "LakehouseLocation",
+                "folderPath": Slot("folder_path"),
+                "fileName": Slot("file_name"),
             }
-            if source.table_config.schema_name:
-                base_config["datasetSettings"]["typeProperties"]["schema"] = source.table_config.schema_name
-        elif source.root_folder == "Files" and source.file_config:
-            location_props = {}
-            if source.file_config.folder_path:
-                location_props["folderPath"] = source.file_config.folder_path
-            if source.file_config.file_name:
-                location_props["fileName"] = source.file_config.file_name
-            
-            base_config["datasetSettings"]["typeProperties"] = {
-                "location": {
-                    "type": "LakehouseLocation",
-                    **location_props
+        },
+        "linkedService": {
+            "name": Slot("lakehouse_name"),
+            "properties": {
+                "type": "Lakehouse",
+                "typeProperties": {
+                    "workspaceId": Slot("workspace_id"),
+                    "artifactId": Slot("lakehouse_id"),
+                    "rootFolder": "Files",
                 }
             }
-        
-        return base_config
-    raise NotImplementedError(f"Source type '{source.connector_type}' is not supported.")
+        },
+    },
+})
 
-def build_sink_payload(sink: SinkConfig) -> Dict[str, Any]:
-    """Builds the final API-compliant JSON for a sink."""
-    if isinstance(sink, LakehouseFileSink):
-        return {
-            "type": "DelimitedTextSink",
-            "storeSettings": {"type": "LakehouseWriteSettings"},
-            "formatSettings": {"type": "DelimitedTextWriteSettings", "fileExtension": ".csv"},
-            "datasetSettings": {
-                "type": "DelimitedText",
+SINK_BUILDERS.register_template(DataWarehouseSink, {
+    "type": "DataWarehouseSink",
+    "allowCopyCommand": True,
+    "datasetSettings": {
+        "type": "DataWarehouseTable",
+        "typeProperties": {"table": Slot("table_name")},
+        "linkedService": {
+            "name": Slot("warehouse_name"),
+            "properties": {
+                "type": "DataWarehouse",
                 "typeProperties": {
-                    "location": {
-                        "type": "LakehouseLocation",
-                        "folderPath": sink.folder_path,
-                        "fileName": sink.file_name,
-                    }
-                },
-                "linkedService": {
-                    "name": sink.lakehouse_name,
-                    "properties": {
-                        "type": "Lakehouse",
-                        "typeProperties": {
-                            "workspaceId": sink.workspace_id,
-                            "artifactId": sink.lakehouse_id,
-                            "rootFolder": "Files",
-                        }
-                    }
-                },
+                    "workspaceId": Slot("workspace_id"),
+                    "artifactId": Slot("warehouse_id"),
+                }
+            }
+        },
+    },
+})
+
+SINK_BUILDERS.register_template(GCS_Sink, {
+    "type": "BinarySink",
+    "storeSettings": {"type": "GoogleCloudStorageWriteSettings"},
+    "datasetSettings": {
+        "type": "Binary",
+        "typeProperties": {
+            "location": {
+                "type": "GoogleCloudStorageLocation",
+                "bucketName": Slot("bucket_name"),
+                "folderPath": Slot("folder_path"),
+                "fileName": Slot("file_name"),
+            }
+        },
+        "externalReferences": {"connection": Slot("connection_id")},
+    },
+})
+
+@SINK_BUILDERS.register(S3Sink)
+def _s3_sink(sink: S3Sink) -> Dict[str, Any]:
+    store_settings_type = "AmazonS3CompatibleWriteSettings"
+    
+    location = {
+        "type": "AmazonS3Location",
+        "bucketName": sink.bucket_name
+    }
+    
+    if sink.file_config.folder_path:
+        location["folderPath"] = sink.file_config.folder_path
+    if sink.file_config.file_name:
+        location["fileName"] = sink.file_config.file_name
+    
+    payload = {
+        "type": sink.sink_type,
+        "storeSettings": {
+            "type": store_settings_type,
+            "maxConcurrentConnections": sink.max_concurrent_connections,
+            "copyBehavior": sink.copy_behavior
+        },
+        "datasetSettings": {
+            "annotations": [],
+            "type": sink.format_type,
+            "typeProperties": {
+                "location": location
             },
+            "schema": [],
+            "externalReferences": {
+                "connection": sink.connection_id
+            }
         }
-    if isinstance(sink, DataWarehouseSink):
-        return {
-            "type": "DataWarehouseSink",
-            "allowCopyCommand": True,
-            "datasetSettings": {
-                "type": "DataWarehouseTable",
-                "typeProperties": {"table": sink.table_name},
-                "linkedService": {
-                    "name": sink.warehouse_name,
-                    "properties": {
-                        "type": "DataWarehouse",
-                        "typeProperties": {
-                            "workspaceId": sink.workspace_id,
-                            "artifactId": sink.warehouse_id,
-                        }
-                    }
-                },
-            },
+    }
+    
+    # Add format settings based on format type
+    if sink.format_type == "DelimitedText":
+        payload["formatSettings"] = {
+            "type": "DelimitedTextWriteSettings",
+            "fileExtension": ".csv"
         }
-    if isinstance(sink, GCS_Sink):
-        return {
-            "type": "BinarySink",
-            "storeSettings": {"type": "GoogleCloudStorageWriteSettings"},
-            "datasetSettings": {
-                "type": "Binary",
-                "typeProperties": {
-                    "location": {
-                        "type": "GoogleCloudStorageLocation",
-                        "bucketName": sink.bucket_name,
-                        "folderPath": sink.folder_path,
-                        "fileName": sink.file_name,
-                    }
-                },
-                "externalReferences": {"connection": sink.connection_id},
-            },
+    elif sink.format_type == "Json":
+        payload["formatSettings"] = {
+            "type": "JsonWriteSettings"
         }
-    if isinstance(sink, S3Sink):
-        store_settings_type = "AmazonS3CompatibleWriteSettings"
-        
-        location = {
-            "type": "AmazonS3Location",
-            "bucketName": sink.bucket_name
+    
+    return payload
+
+@SINK_BUILDERS.register(RestSink)
+def _rest_sink(sink: RestSink) -> Dict[str, Any]:
+    payload = {
+        "type": "RestSink",
+        "httpRequestTimeout": sink.http_request_timeout,
+        "requestInterval": sink.request_interval,
+        "requestMethod": sink.request_method,
+        "writeBatchSize": sink.write_batch_size,
+        "httpCompressionType": sink.http_compression_type,
+        "datasetSettings": {
+            "annotations": [],
+            "type": "RestResource",
+            "typeProperties": {},
+            "schema": [],
+            "externalReferences": {
+                "connection": sink.connection_id
+            }
         }
+    }
+    
+    if sink.relative_url:
+        payload["datasetSettings"]["typeProperties"]["relativeUrl"] = sink.relative_url
+    if sink.additional_headers:
+        payload["additionalHeaders"] = sink.additional_headers
         
-        if sink.file_config.folder_path:
-            location["folderPath"] = sink.file_config.folder_path
-        if sink.file_config.file_name:
-            location["fileName"] = sink.file_config.file_name
-        
-        payload = {
-            "type": sink.sink_type,
-            "storeSettings": {
-                "type": store_settings_type,
-                "maxConcurrentConnections": sink.max_concurrent_connections,
-                "copyBehavior": sink.copy_behavior
+    return payload
+
+@SINK_BUILDERS.register(FileSystemSink)
+def _file_system_sink(sink: FileSystemSink) -> Dict[str, Any]:
+    sink_type = f"{sink.file_format}Sink"
+    store_settings = {
+        "type": "FileServerWriteSettings",
+        "copyBehavior": sink.copy_behavior
+    }
+    if sink.max_concurrent_connections:
+        store_settings["maxConcurrentConnections"] = sink.max_concurrent_connections
+    
+    location = {
+        "type": "FileServerLocation"
+    }
+    if sink.folder_path:
+        location["folderPath"] = sink.folder_path
+    if sink.file_name:
+        location["fileName"] = sink.file_name
+    
+    payload = {
+        "type": sink_type,
+        "storeSettings": store_settings,
+        "datasetSettings": {
+            "annotations": [],
+            "type": sink.file_format,
+            "schema": [],
+            "typeProperties": {
+                "location": location
             },
-            "datasetSettings": {
-                "annotations": [],
-                "type": sink.format_type,
-                "typeProperties": {
-                    "location": location
-                },
-                "schema": [],
-                "externalReferences": {
-                    "connection": sink.connection_id
-                }
+            "externalReferences": {
+                "connection": sink.connection_id
             }
         }
-        
-        # Add format settings based on format type
-        if sink.format_type == "DelimitedText":
-            payload["formatSettings"] = {
-                "type": "DelimitedTextWriteSettings",
-                "fileExtension": ".csv"
-            }
-        elif sink.format_type == "Json":
-            payload["formatSettings"] = {
-                "type": "JsonWriteSettings"
-            }
-        
-        return payload
-    if isinstance(sink, RestSink):
-        payload = {
-            "type": "RestSink",
-            "httpRequestTimeout": sink.http_request_timeout,
-            "requestInterval": sink.request_interval,
-            "requestMethod": sink.request_method,
-            "writeBatchSize": sink.write_batch_size,
-            "httpCompressionType": sink.http_compression_type,
-            "datasetSettings": {
-                "annotations": [],
-                "type": "RestResource",
-                "typeProperties": {},
-                "schema": [],
-                "externalReferences": {
-                    "connection": sink.connection_id
-                }
-            }
+    }
+    
+    if sink.file_format == "DelimitedText":
+        payload["formatSettings"] = {
+            "type": "DelimitedTextWriteSettings",
+            "fileExtension": sink.file_extension,
+            "firstRowAsHeader": sink.first_row_as_header,
+            "columnDelimiter": sink.column_delimiter,
+            "quoteChar": sink.quote_char,
+            "escapeChar": sink.escape_char
         }
-        
-        if sink.relative_url:
-            payload["datasetSettings"]["typeProperties"]["relativeUrl"] = sink.relative_url
-        if sink.additional_headers:
-            payload["additionalHeaders"] = sink.additional_headers
-            
-        return payload
-    if isinstance(sink, FileSystemSink):
+    
+    return payload
+
+@SINK_BUILDERS.register(GoogleCloudStorageSink)
+def _google_cloud_storage_sink(sink: GoogleCloudStorageSink) -> Dict[str, Any]:
+    # Determine sink type based on file format with correct capitalization
+    if sink.file_format == "JSON":
+        sink_type = "JsonSink"  # Use JsonSink, not JSONSink
+    else:
         sink_type = f"{sink.file_format}Sink"
-        store_settings = {
-            "type": "FileServerWriteSettings",
-            "copyBehavior": sink.copy_behavior
+    
+    # Build storeSettings
+    store_settings = {
+        "type": "GoogleCloudStorageWriteSettings",
+        "maxConcurrentConnections": sink.max_concurrent_connections,
+        "copyBehavior": sink.copy_behavior,
+        "blockSizeInMB": sink.block_size_mb
+    }
+    
+    # Add compression if specified
+    if sink.compression_codec:
+        store_settings["compressionCodec"] = sink.compression_codec
+    
+    # Build location
+    location = {
+        "type": "GoogleCloudStorageLocation",
+        "bucketName": sink.bucket_name
+    }
+    
+    if sink.folder_path:
+        location["folderPath"] = sink.folder_path
+    if sink.file_name:
+        location["fileName"] = sink.file_name
+    
+    # Build the base payload
+    payload = {
+        "type": sink_type,
+        "storeSettings": store_settings,
+        "datasetSettings": {
+            "annotations": [],
+            "type": sink.file_format,
+            "schema": [],
+            "typeProperties": {
+                "location": location
+            },
+            "externalReferences": {
+                "connection": sink.connection_id
+            }
         }
-        if sink.max_concurrent_connections:
-            store_settings["maxConcurrentConnections"] = sink.max_concurrent_connections
-        
-        location = {
-            "type": "FileServerLocation"
+    }
+    
+    # Add format-specific settings
+    if sink.file_format == "DelimitedText":
+        payload["formatSettings"] = {
+            "type": "DelimitedTextWriteSettings"
         }
-        if sink.folder_path:
-            location["folderPath"] = sink.folder_path
-        if sink.file_name:
-            location["fileName"] = sink.file_name
-        
-        payload = {
-            "type": sink_type,
-            "storeSettings": store_settings,
-            "datasetSettings": {
-                "annotations": [],
-                "type": sink.file_format,
-                "schema": [],
-                "typeProperties": {
-                    "location": location
-                },
-                "externalReferences": {
-                    "connection": sink.connection_id
-                }
-            }
+    elif sink.file_format == "JSON":
+        payload["formatSettings"] = {
+            "type": "JsonWriteSettings",
+            "filePattern": sink.json_file_pattern
         }
-        
-        if sink.file_format == "DelimitedText":
-            payload["formatSettings"] = {
-                "type": "DelimitedTextWriteSettings",
-                "fileExtension": sink.file_extension,
-                "firstRowAsHeader": sink.first_row_as_header,
-                "columnDelimiter": sink.column_delimiter,
-                "quoteChar": sink.quote_char,
-                "escapeChar": sink.escape_char
-            }
-        
-        return payload
-    if isinstance(sink, GoogleCloudStorageSink):
-        # Determine sink type based on file format with correct capitalization
-        if sink.file_format == "JSON":
-            sink_type = "JsonSink"  # Use JsonSink, not JSONSink
+    elif sink.file_format == "Parquet":
+        payload["formatSettings"] = {
+            "type": "ParquetWriteSettings"
+        }
+    
+    # Add metadata if specified
+    if sink.metadata:
+        payload["storeSettings"]["metadata"] = sink.metadata
+    
+    return payload
+
+@SINK_BUILDERS.register(LakehouseSink)
+def _lakehouse_sink(sink: LakehouseSink) -> Dict[str, Any]:
+    # Determine sink type based on root folder and format
+    if sink.root_folder == "Tables":
+        sink_type = "LakehouseTableSink"
+        dataset_type = "LakehouseTable"
+        store_settings_type = "LakehouseWriteSettings"
+    else:
+        # For files, use format from file_config
+        format_type = sink.file_config.file_format if sink.file_config else "DelimitedText"
+        if format_type == "JSON":
+            sink_type = "JsonSink"
+            dataset_type = "Json"
+            store_settings_type = "LakehouseWriteSettings"
+        elif format_type == "Binary":
+            sink_type = "BinarySink"
+            dataset_type = "Binary" 
+            store_settings_type = "LakehouseWriteSettings"
         else:
-            sink_type = f"{sink.file_format}Sink"
-        
-        # Build storeSettings
-        store_settings = {
-            "type": "GoogleCloudStorageWriteSettings",
+            sink_type = "DelimitedTextSink"
+            dataset_type = "DelimitedText"
+            store_settings_type = "LakehouseWriteSettings"
+    
+    # Base config - storeSettings only for file sinks, not table sinks
+    base_config = {
+        "type": sink_type,
+        "datasetSettings": {
+            "annotations": [],
+            "linkedService": {
+                "name": sink.lakehouse_name,
+                "properties": {
+                    "annotations": [],
+                    "type": "Lakehouse",
+                    "typeProperties": {
+                        "workspaceId": sink.workspace_id,
+                        "artifactId": sink.artifact_id,
+                        "rootFolder": sink.root_folder
+                    }
+                }
+            },
+            "type": dataset_type,
+            "schema": []
+        }
+    }
+    
+    # Add storeSettings only for file sinks (not table sinks)
+    if sink.root_folder == "Files":
+        base_config["storeSettings"] = {
+            "type": store_settings_type,
             "maxConcurrentConnections": sink.max_concurrent_connections,
             "copyBehavior": sink.copy_behavior,
             "blockSizeInMB": sink.block_size_mb
         }
-        
-        # Add compression if specified
-        if sink.compression_codec:
-            store_settings["compressionCodec"] = sink.compression_codec
-        
-        # Build location
-        location = {
-            "type": "GoogleCloudStorageLocation",
-            "bucketName": sink.bucket_name
-        }
-        
-        if sink.folder_path:
-            location["folderPath"] = sink.folder_path
-        if sink.file_name:
-            location["fileName"] = sink.file_name
-        
-        # Build the base payload
-        payload = {
-            "type": sink_type,
-            "storeSettings": store_settings,
-            "datasetSettings": {
-                "annotations": [],
-                "type": sink.file_format,
-                "schema": [],
-                "typeProperties": {
-                    "location": location
-                },
-                "externalReferences": {
-                    "connection": sink.connection_id
-                }
-            }
+    
+    # Add type properties based on configuration
+    if sink.root_folder == "Tables" and sink.table_config:
+        base_config["datasetSettings"]["typeProperties"] = {
+            "table": sink.table_config.table_name
         }
+        if sink.table_config.schema_name:
+            base_config["datasetSettings"]["typeProperties"]["schema"] = sink.table_config.schema_name
         
-        # Add format-specific settings
-        if sink.file_format == "DelimitedText":
-            payload["formatSettings"] = {
-                "type": "DelimitedTextWriteSettings"
-            }
-        elif sink.file_format == "JSON":
-            payload["formatSettings"] = {
-                "type": "JsonWriteSettings",
-                "filePattern": sink.json_file_pattern
-            }
-        elif sink.file_format == "Parquet":
-            payload["formatSettings"] = {
-                "type": "ParquetWriteSettings"
-            }
-        
-        # Add metadata if specified
-        if sink.metadata:
-            payload["storeSettings"]["metadata"] = sink.metadata
-        
-        return payload
-    if isinstance(sink, LakehouseSink):
-        # Determine sink type based on root folder and format
-        if sink.root_folder == "Tables":
-            sink_type = "LakehouseTableSink"
-            dataset_type = "LakehouseTable"
-            store_settings_type = "LakehouseWriteSettings"
-        else:
-            # For files, use format from file_config
-            format_type = sink.file_config.file_format if sink.file_config else "DelimitedText"
-            if format_type == "JSON":
-                sink_type = "JsonSink"
-                dataset_type = "Json"
-                store_settings_type = "LakehouseWriteSettings"
-            elif format_type == "Binary":
-                sink_type = "BinarySink"
-                dataset_type = "Binary" 
-                store_settings_type = "LakehouseWriteSettings"
-            else:
-                sink_type = "DelimitedTextSink"
-                dataset_type = "DelimitedText"
-                store_settings_type = "LakehouseWriteSettings"
+        # Add table action, partition and write options
+        base_config.update(sink.table_write_options())
+            
+    elif sink.root_folder == "Files" and sink.file_config:
+        location_props = {}
+        if sink.file_config.folder_path:
+            location_props["folderPath"] = sink.file_config.folder_path
+        if sink.file_config.file_name:
+            location_props["fileName"] = sink.file_config.file_name
         
-        # Base config - storeSettings only for file sinks, not table sinks
-        base_config = {
-            "type": sink_type,
-            "datasetSettings": {
-                "annotations": [],
-                "linkedService": {
-                    "name": sink.lakehouse_name,
-                    "properties": {
-                        "annotations": [],
-                        "type": "Lakehouse",
-                        "typeProperties": {
-                            "workspaceId": sink.workspace_id,
-                            "artifactId": sink.artifact_id,
-                            "rootFolder": sink.root_folder
-                        }
-                    }
-                },
-                "type": dataset_type,
-                "schema": []
+        base_config["datasetSettings"]["typeProperties"] = {
+            "location": {
+                "type": "LakehouseLocation",
+                **location_props
             }
         }
         
-        # Add storeSettings only for file sinks (not table sinks)
-        if sink.root_folder == "Files":
-            base_config["storeSettings"] = {
-                "type": store_settings_type,
-                "maxConcurrentConnections": sink.max_concurrent_connections,
-                "copyBehavior": sink.copy_behavior,
-                "blockSizeInMB": sink.block_size_mb
-            }
-        
-        # Add type properties based on configuration
-        if sink.root_folder == "Tables" and sink.table_config:
-            base_config["datasetSettings"]["typeProperties"] = {
-                "table": sink.table_config.table_name
+        # Add format settings for file sinks
+        if sink.file_config.file_format == "DelimitedText":
+            base_config["formatSettings"] = {
+                "type": "DelimitedTextWriteSettings",
+                "fileExtension": ".csv"
             }
-            if sink.table_config.schema_name:
-                base_config["datasetSettings"]["typeProperties"]["schema"] = sink.table_config.schema_name
-            
-            # Add table-specific properties
-            base_config["tableActionOption"] = sink.table_action_option
-            if sink.partition_option != "None":
-                base_config["partitionOption"] = sink.partition_option
-                
-        elif sink.root_folder == "Files" and sink.file_config:
-            location_props = {}
-            if sink.file_config.folder_path:
-                location_props["folderPath"] = sink.file_config.folder_path
-            if sink.file_config.file_name:
-                location_props["fileName"] = sink.file_config.file_name
-            
-            base_config["datasetSettings"]["typeProperties"] = {
-                "location": {
-                    "type": "LakehouseLocation",
-                    **location_props
-                }
+        elif sink.file_config.file_format == "JSON":
+            base_config["formatSettings"] = {
+                "type": "JsonWriteSettings"
             }
-            
-            # Add format settings for file sinks
-            if sink.file_config.file_format == "DelimitedText":
-                base_config["formatSettings"] = {
-                    "type": "DelimitedTextWriteSettings",
-                    "fileExtension": ".csv"
-                }
-            elif sink.file_config.file_format == "JSON":
-                base_config["formatSettings"] = {
-                    "type": "JsonWriteSettings"
-                }
-        
-        return base_config
\ No newline at end of file
+    
+    return base_config
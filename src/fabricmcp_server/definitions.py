@@ -0,0 +1,158 @@
+"""
+Decoded Data Pipeline definitions and a short-lived cache of them.
+
+Fabric returns item definitions as base64-encoded parts. Tools that edit a
+pipeline in place (e.g. patch_pipeline) work on the decoded `pipeline-content.json`
+and keep it cached per pipeline, so a sequence of small edits does not have to
+download and decode the full definition every time.
+
+For every item it has read or written, the module also remembers a hash of the
+deployed definition, so that updates which would not change anything can be skipped.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_CONTENT_PART = "pipeline-content.json"
+
+# Edits made outside this server (e.g. in the Fabric portal) are picked up after at most this long.
+DEFINITION_CACHE_TTL_SECONDS = float(os.getenv("FABRIC_DEFINITION_CACHE_TTL", "300"))
+
+_definition_cache: TTLCache = TTLCache(maxsize=128, ttl=DEFINITION_CACHE_TTL_SECONDS)
+
+# Key: (workspace_id, item_id), Value: hash of the deployed definition parts
+_deployed_hashes: TTLCache = TTLCache(maxsize=1024, ttl=DEFINITION_CACHE_TTL_SECONDS)
+
+# Hashes of updates still running as long-running operations.
+# Key: job_id, Value: ((workspace_id, item_id), hash)
+_pending_hashes: Dict[str, Tuple[Tuple[str, str], str]] = {}
+
+
+def canonical_json(value: Any) -> str:
+    """JSON text that is identical for equal values, regardless of key order or whitespace."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def hash_definition_parts(parts: List[Dict[str, Any]]) -> str:
+    """
+    Hash over the decoded definition parts. JSON parts are canonicalized first, so
+    re-indented or re-ordered content hashes the same. `.platform` is ignored.
+    """
+    digest = hashlib.sha256()
+    for part in sorted(parts, key=lambda p: p.get("path", "")):
+        if part.get("path") == ".platform":
+            continue
+        payload = part.get("payload") or ""
+        raw = base64.b64decode(payload) if part.get("payloadType", "InlineBase64") == "InlineBase64" else payload.encode("utf-8")
+        try:
+            body = canonical_json(json.loads(raw)).encode("utf-8")
+        except ValueError:
+            body = raw
+        digest.update(part.get("path", "").encode("utf-8") + b"\0" + body + b"\0")
+    return digest.hexdigest()
+
+
+class PipelineDefinition(BaseModel):
+    """A pipeline definition with its content part decoded; other parts are kept as returned."""
+    content: Dict[str, Any]
+    other_parts: List[Dict[str, Any]] = Field(default_factory=list)
+
+    @property
+    def activities(self) -> List[Dict[str, Any]]:
+        return self.content.setdefault("properties", {}).setdefault("activities", [])
+
+    def content_hash(self) -> str:
+        return hash_definition_parts(self.to_update_payload()["parts"])
+
+    def to_update_payload(self) -> Dict[str, Any]:
+        """The `definition` body for updateDefinition, with the content part re-encoded."""
+        encoded = base64.b64encode(json.dumps(self.content).encode("utf-8")).decode("utf-8")
+        return {"parts": [{"path": PIPELINE_CONTENT_PART, "payload": encoded, "payloadType": "InlineBase64"}, *self.other_parts]}
+
+
+def decode_pipeline_definition(response: Dict[str, Any]) -> PipelineDefinition:
+    """Decodes a getDefinition response. Raises ValueError if it has no pipeline content part."""
+    parts = (response.get("definition") or response).get("parts") or []
+    content = None
+    other_parts = []
+    for part in parts:
+        if part.get("path") == PIPELINE_CONTENT_PART:
+            content = json.loads(base64.b64decode(part["payload"]).decode("utf-8"))
+        elif part.get("path") != ".platform":
+            # .platform carries item metadata and is rejected by updateDefinition unless updateMetadata is set
+            other_parts.append(part)
+    if content is None:
+        raise ValueError(f"Definition has no '{PIPELINE_CONTENT_PART}' part.")
+    return PipelineDefinition(content=content, other_parts=other_parts)
+
+
+def _cache_key(workspace_id: str, pipeline_id: str) -> Tuple[str, str]:
+    return (workspace_id, pipeline_id)
+
+
+def remember_pipeline_definition(workspace_id: str, pipeline_id: str, definition: PipelineDefinition) -> None:
+    """Caches a definition that is known to be deployed."""
+    _definition_cache[_cache_key(workspace_id, pipeline_id)] = definition.model_copy(deep=True)
+    record_deployed_hash(workspace_id, pipeline_id, definition.content_hash())
+
+
+def forget_pipeline_definition(workspace_id: str, pipeline_id: str) -> None:
+    _definition_cache.pop(_cache_key(workspace_id, pipeline_id), None)
+    _deployed_hashes.pop(_cache_key(workspace_id, pipeline_id), None)
+
+
+# --- Deployed content hashes -------------------------------------------------
+
+def deployed_hash(workspace_id: str, item_id: str) -> Optional[str]:
+    """Hash of the last definition known to be deployed for the item, if still remembered."""
+    return _deployed_hashes.get(_cache_key(workspace_id, item_id))
+
+
+def record_deployed_hash(workspace_id: str, item_id: str, content_hash: str) -> None:
+    _deployed_hashes[_cache_key(workspace_id, item_id)] = content_hash
+
+
+def expect_deployed_hash(job_id: str, workspace_id: str, item_id: str, content_hash: str) -> None:
+    """Remembers the hash of an accepted update; it counts as deployed once the operation succeeds."""
+    _deployed_hashes.pop(_cache_key(workspace_id, item_id), None)
+    _pending_hashes[job_id] = (_cache_key(workspace_id, item_id), content_hash)
+
+
+def settle_deployed_hash(job_id: str, succeeded: bool) -> None:
+    """Called when a long-running update finished."""
+    pending = _pending_hashes.pop(job_id, None)
+    if pending is not None and succeeded:
+        _deployed_hashes[pending[0]] = pending[1]
+
+
+async def load_pipeline_definition(
+    client, workspace_id: str, pipeline_id: str, refresh: bool = False
+) -> PipelineDefinition:
+    """
+    Returns a private copy of the decoded definition, from the cache unless `refresh` is set.
+    Raises ValueError if the pipeline has no readable definition.
+    """
+    key = _cache_key(workspace_id, pipeline_id)
+    cached: Optional[PipelineDefinition] = None if refresh else _definition_cache.get(key)
+    if cached is not None:
+        logger.debug(f"Using cached definition for pipeline {pipeline_id}.")
+        return cached.model_copy(deep=True)
+
+    response = await client.get_item_definition(workspace_id=workspace_id, item_id=pipeline_id)
+    if not isinstance(response, dict):
+        raise ValueError("Pipeline definition not found or the API returned an empty response.")
+    definition = decode_pipeline_definition(response)
+    _definition_cache[key] = definition
+    record_deployed_hash(workspace_id, pipeline_id, definition.content_hash())
+    return definition.model_copy(deep=True)
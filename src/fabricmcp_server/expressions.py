@@ -0,0 +1,1005 @@
+"""
+Parser, type checker and evaluator for the pipeline expression language.
+
+A string value is an expression if it starts with "@" ("@@" escapes a literal "@"),
+and a string containing "@{...}" is interpolated. The language has literals,
+function calls, property access (`.name`, `?.name`) and indexing (`[expr]`):
+
+    @equals(pipeline().parameters.env, 'prod')
+    @{item().schema}.@{item().table}
+    @activity('Lookup_Tables').output.value[0]?.name
+
+Parsed expressions are cached (`parse_expression`), so re-validating a pipeline
+only pays for strings it has not seen before. `check_expression` infers the
+result type and reports unknown functions, wrong argument counts or types,
+undeclared parameters and variables, and misplaced item()/activity() calls;
+`evaluate_expression` computes the value offline from supplied parameters and
+variables. Functions that need the service (e.g. time zone conversion) are known
+to the checker but raise `RuntimeOnlyError` when evaluated.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Union
+from urllib.parse import quote, unquote
+
+from pydantic import BaseModel, Field
+
+ANY, STRING, INT, FLOAT, BOOL, ARRAY, OBJECT, NULL = "any", "string", "int", "float", "bool", "array", "object", "null"
+NUMBER = "int|float"
+
+
+class ExpressionError(ValueError):
+    """A syntax error, or an error evaluating an expression."""
+
+
+class RuntimeOnlyError(ExpressionError):
+    """The expression needs values that only exist while the pipeline runs (item(), activity outputs, ...)."""
+
+
+# --- AST ---------------------------------------------------------------------
+
+class Lit(NamedTuple):
+    value: Any
+
+
+class Call(NamedTuple):
+    name: str
+    args: Tuple[Any, ...]
+
+
+class Member(NamedTuple):
+    target: Any
+    name: str
+    safe: bool
+
+
+class Index(NamedTuple):
+    target: Any
+    index: Any
+    safe: bool
+
+
+class Template(NamedTuple):
+    """An interpolated string: literal text and expressions, concatenated."""
+    parts: Tuple[Any, ...]
+
+
+Node = Union[Lit, Call, Member, Index, Template]
+
+
+# --- Parser ------------------------------------------------------------------
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+    | (?P<string>'(?:[^']|'')*')
+    | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<punct>\?\.|\?\[|[().,\[\]])
+    )""", re.VERBOSE)
+
+
+def _tokenize(text: str) -> List[Tuple[str, str, int]]:
+    tokens = []
+    position = 0
+    while True:
+        while position < len(text) and text[position].isspace():
+            position += 1
+        if position >= len(text):
+            break
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise ExpressionError(f"Unexpected character {text[position:].lstrip()[:1]!r} at position {position}.")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind), match.start(kind)))
+        position = match.end()
+    tokens.append(("end", "", len(text)))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.i = 0
+
+    def _peek(self) -> Tuple[str, str, int]:
+        return self.tokens[self.i]
+
+    def _take(self, value: Optional[str] = None) -> Tuple[str, str, int]:
+        token = self.tokens[self.i]
+        if value is not None and token[1] != value:
+            found = "end of expression" if token[0] == "end" else repr(token[1])
+            raise ExpressionError(f"Expected {value!r} but found {found} at position {token[2]}.")
+        self.i += 1
+        return token
+
+    def parse(self) -> Node:
+        node = self._expression()
+        kind, value, position = self._peek()
+        if kind != "end":
+            raise ExpressionError(f"Unexpected {value!r} at position {position}.")
+        return node
+
+    def _expression(self) -> Node:
+        node = self._primary()
+        while True:
+            kind, value, position = self._peek()
+            if value in (".", "?."):
+                self._take()
+                name_kind, name, name_position = self._take()
+                if name_kind not in ("name", "number"):
+                    raise ExpressionError(f"Expected a property name after {value!r} at position {name_position}.")
+                node = Member(node, name, value == "?.")
+            elif value in ("[", "?["):
+                self._take()
+                index = self._expression()
+                self._take("]")
+                node = Index(node, index, value == "?[")
+            else:
+                return node
+
+    def _primary(self) -> Node:
+        kind, value, position = self._take()
+        if kind == "number":
+            return Lit(float(value) if any(c in value for c in ".eE") else int(value))
+        if kind == "string":
+            return Lit(value[1:-1].replace("''", "'"))
+        if kind == "name":
+            if self._peek()[1] == "(":
+                self._take("(")
+                args = []
+                if self._peek()[1] != ")":
+                    args.append(self._expression())
+                    while self._peek()[1] == ",":
+                        self._take(",")
+                        args.append(self._expression())
+                self._take(")")
+                return Call(value, tuple(args))
+            if value in ("true", "false"):
+                return Lit(value == "true")
+            if value == "null":
+                return Lit(None)
+            raise ExpressionError(f"'{value}' at position {position} is not a function call; strings need single quotes.")
+        if kind == "end":
+            raise ExpressionError("The expression is empty or ends too early.")
+        raise ExpressionError(f"Unexpected {value!r} at position {position}.")
+
+
+def _parse_template(text: str) -> Template:
+    parts: List[Any] = []
+    literal = []
+    i = 0
+    while i < len(text):
+        if text.startswith("@@{", i):
+            literal.append("@{")
+            i += 3
+            continue
+        if not text.startswith("@{", i):
+            literal.append(text[i])
+            i += 1
+            continue
+        # Find the closing brace, skipping quoted strings
+        j, quoted = i + 2, False
+        while j < len(text) and (quoted or text[j] != "}"):
+            if text[j] == "'":
+                quoted = not quoted
+            j += 1
+        if j >= len(text):
+            raise ExpressionError(f"Unclosed '@{{' at position {i}.")
+        if literal:
+            parts.append("".join(literal))
+            literal = []
+        try:
+            parts.append(_Parser(text[i + 2:j]).parse())
+        except ExpressionError as e:
+            raise ExpressionError(f"In '@{{{text[i + 2:j]}}}': {e}")
+        i = j + 1
+    if literal:
+        parts.append("".join(literal))
+    return Template(tuple(parts))
+
+
+def is_expression(value: Any) -> bool:
+    """Whether a string value is evaluated by the service rather than used literally."""
+    return isinstance(value, str) and (value.startswith("@") or "@{" in value)
+
+
+@lru_cache(maxsize=4096)
+def parse_expression(text: str) -> Node:
+    """Parses a string value; literal strings parse to `Lit`. Raises ExpressionError."""
+    if text.startswith("@@"):
+        return Lit(text[1:])
+    if text.startswith("@") and not text.startswith("@{"):
+        return _Parser(text[1:]).parse()
+    if "@{" in text:
+        return _parse_template(text)
+    return Lit(text)
+
+
+# --- Value helpers -----------------------------------------------------------
+
+def type_of(value: Any) -> str:
+    if value is None:
+        return NULL
+    if isinstance(value, bool):
+        return BOOL
+    if isinstance(value, int):
+        return INT
+    if isinstance(value, float):
+        return FLOAT
+    if isinstance(value, str):
+        return STRING
+    if isinstance(value, list):
+        return ARRAY
+    return OBJECT
+
+
+def to_string(value: Any) -> str:
+    """String conversion as done by string() and interpolation."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return str(value)
+
+
+def _compatible(actual: str, expected: str) -> bool:
+    if actual in (ANY, NULL) or expected == ANY:
+        return True
+    return actual in expected.split("|") or (actual == INT and FLOAT in expected.split("|"))
+
+
+def _require(value: Any, expected: str, function: str) -> Any:
+    if not _compatible(type_of(value), expected):
+        raise ExpressionError(f"{function}() expects {expected.replace('|', ' or ')} but got {type_of(value)} {to_string(value)!r}.")
+    return value
+
+
+# --- Date and time -----------------------------------------------------------
+
+_DEFAULT_TIME_FORMAT = "o"
+_TIME_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400, "week": 604800}
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if not isinstance(value, str):
+        raise ExpressionError(f"Expected a timestamp string but got {type_of(value)}.")
+    text = value.strip().replace("Z", "+00:00")
+    match = re.match(r"^(.*?\.\d{6})\d+(.*)$", text)
+    if match:
+        text = match.group(1) + match.group(2)
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        raise ExpressionError(f"'{value}' is not a valid ISO 8601 timestamp.")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+_FORMAT_TOKEN = re.compile(r"yyyy|yy|MM|M|dd|d|HH|H|hh|h|mm|m|ss|s|f{1,7}|tt|K|'[^']*'|\\.|.", re.DOTALL)
+
+
+def format_timestamp(moment: datetime, fmt: Optional[str] = None) -> str:
+    """Formats with a .NET date format string ('o', 's', 'u' or a custom pattern)."""
+    fmt = fmt or _DEFAULT_TIME_FORMAT
+    utc = moment.astimezone(timezone.utc)
+    if fmt == "o":
+        return utc.strftime("%Y-%m-%dT%H:%M:%S.") + f"{utc.microsecond:06d}0Z"
+    if fmt == "s":
+        fmt = "yyyy-MM-ddTHH:mm:ss"
+    elif fmt == "u":
+        fmt = "yyyy-MM-dd HH:mm:ssZ"
+    out = []
+    for token in _FORMAT_TOKEN.findall(fmt):
+        if token == "yyyy":
+            out.append(f"{utc.year:04d}")
+        elif token == "yy":
+            out.append(f"{utc.year % 100:02d}")
+        elif token in ("MM", "M"):
+            out.append(f"{utc.month:0{len(token)}d}")
+        elif token in ("dd", "d"):
+            out.append(f"{utc.day:0{len(token)}d}")
+        elif token in ("HH", "H"):
+            out.append(f"{utc.hour:0{len(token)}d}")
+        elif token in ("hh", "h"):
+            out.append(f"{(utc.hour % 12) or 12:0{len(token)}d}")
+        elif token in ("mm", "m"):
+            out.append(f"{utc.minute:0{len(token)}d}")
+        elif token in ("ss", "s"):
+            out.append(f"{utc.second:0{len(token)}d}")
+        elif token.startswith("f"):
+            out.append(f"{utc.microsecond:06d}0"[:len(token)])
+        elif token == "tt":
+            out.append("AM" if utc.hour < 12 else "PM")
+        elif token == "K":
+            out.append("Z")
+        elif token.startswith("'"):
+            out.append(token[1:-1])
+        elif token.startswith("\\"):
+            out.append(token[1:])
+        else:
+            out.append(token)
+    return "".join(out)
+
+
+def _shift(value: Any, seconds: float, fmt: Optional[str] = None) -> str:
+    return format_timestamp(_parse_timestamp(value) + timedelta(seconds=seconds), fmt)
+
+
+def _interval_seconds(interval: Any, unit: Any) -> float:
+    unit_name = str(unit).lower().rstrip("s")
+    if unit_name not in _TIME_UNITS:
+        raise ExpressionError(f"Unsupported time unit '{unit}'; use Second, Minute, Hour, Day or Week.")
+    return float(interval) * _TIME_UNITS[unit_name]
+
+
+def _runtime_only(name: str) -> Callable[..., Any]:
+    def impl(*args: Any) -> Any:
+        raise RuntimeOnlyError(f"{name}() can only be evaluated by the service.")
+    return impl
+
+
+# --- Function library --------------------------------------------------------
+
+class Function(NamedTuple):
+    params: Tuple[str, ...]
+    returns: str
+    impl: Optional[Callable[..., Any]]
+    optional: int = 0
+    variadic: Optional[str] = None
+
+
+def _int_div(a: Any, b: Any) -> Any:
+    if b == 0:
+        raise ExpressionError("div() by zero.")
+    if isinstance(a, int) and isinstance(b, int):
+        return int(a / b)
+    return a / b
+
+
+def _substring(text: str, start: int, length: Optional[int] = None) -> str:
+    if start < 0 or start > len(text) or (length is not None and (length < 0 or start + length > len(text))):
+        raise ExpressionError(f"substring() range {start}..{length} is outside the string of length {len(text)}.")
+    return text[start:] if length is None else text[start:start + length]
+
+
+def _contains(collection: Any, value: Any) -> bool:
+    if isinstance(collection, str):
+        return to_string(value) in collection
+    if isinstance(collection, dict):
+        return value in collection
+    return value in (collection or [])
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value) if not isinstance(value, str) else int(value.strip())
+    except (TypeError, ValueError):
+        raise ExpressionError(f"int() cannot convert {to_string(value)!r}.")
+
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ExpressionError(f"float() cannot convert {to_string(value)!r}.")
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        if value.lower() in ("true", "false"):
+            return value.lower() == "true"
+        raise ExpressionError(f"bool() cannot convert {value!r}.")
+    return bool(value)
+
+
+def _json(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError as e:
+        raise ExpressionError(f"json() got invalid JSON: {e}")
+
+
+def _union(*collections: Any) -> Any:
+    if all(isinstance(c, dict) for c in collections):
+        merged: Dict[str, Any] = {}
+        for c in collections:
+            merged.update(c)
+        return merged
+    result: List[Any] = []
+    for c in collections:
+        for v in c:
+            if v not in result:
+                result.append(v)
+    return result
+
+
+def _intersection(*collections: Any) -> Any:
+    if all(isinstance(c, dict) for c in collections):
+        first = collections[0]
+        return {k: v for k, v in first.items() if all(k in c and c[k] == v for c in collections[1:])}
+    result = []
+    for v in collections[0]:
+        if all(v in c for c in collections[1:]) and v not in result:
+            result.append(v)
+    return result
+
+
+def _first(collection: Any) -> Any:
+    return collection[0] if collection else None
+
+
+def _last(collection: Any) -> Any:
+    return collection[-1] if collection else None
+
+
+def _compare(op: Callable[[Any, Any], bool], name: str) -> Callable[[Any, Any], bool]:
+    def impl(a: Any, b: Any) -> bool:
+        if isinstance(a, str) != isinstance(b, str):
+            raise ExpressionError(f"{name}() cannot compare {type_of(a)} with {type_of(b)}.")
+        return op(a, b)
+    return impl
+
+
+FUNCTIONS: Dict[str, Function] = {
+    # String
+    "concat": Function((), STRING, lambda *a: "".join(to_string(v) for v in a), variadic=ANY),
+    "substring": Function((STRING, INT, INT), STRING, _substring, optional=1),
+    "replace": Function((STRING, STRING, STRING), STRING, lambda s, old, new: s.replace(old, new)),
+    "toLower": Function((STRING,), STRING, lambda s: s.lower()),
+    "toUpper": Function((STRING,), STRING, lambda s: s.upper()),
+    "trim": Function((STRING,), STRING, lambda s: s.strip()),
+    "indexOf": Function((STRING, STRING), INT, lambda s, t: s.lower().find(t.lower())),
+    "lastIndexOf": Function((STRING, STRING), INT, lambda s, t: s.lower().rfind(t.lower())),
+    "startsWith": Function((STRING, STRING), BOOL, lambda s, t: s.lower().startswith(t.lower())),
+    "endsWith": Function((STRING, STRING), BOOL, lambda s, t: s.lower().endswith(t.lower())),
+    "split": Function((STRING, STRING), ARRAY, lambda s, sep: s.split(sep)),
+    "guid": Function((STRING,), STRING, lambda fmt=None: str(uuid.uuid4()), optional=1),
+    "base64": Function((STRING,), STRING, lambda s: base64.b64encode(s.encode("utf-8")).decode("ascii")),
+    "base64ToString": Function((STRING,), STRING, lambda s: base64.b64decode(s).decode("utf-8")),
+    "encodeUriComponent": Function((STRING,), STRING, lambda s: quote(s, safe="")),
+    "uriComponentToString": Function((STRING,), STRING, unquote),
+    "decodeUriComponent": Function((STRING,), STRING, unquote),
+    "decodeBase64": Function((STRING,), STRING, lambda s: base64.b64decode(s).decode("utf-8")),
+    "uriComponent": Function((STRING,), STRING, lambda s: quote(s, safe="")),
+    "binary": Function((STRING,), ANY, _runtime_only("binary")),
+    "base64ToBinary": Function((STRING,), ANY, _runtime_only("base64ToBinary")),
+    "uriComponentToBinary": Function((STRING,), ANY, _runtime_only("uriComponentToBinary")),
+    "dataUri": Function((STRING,), STRING, _runtime_only("dataUri")),
+    "dataUriToBinary": Function((STRING,), ANY, _runtime_only("dataUriToBinary")),
+    "dataUriToString": Function((STRING,), STRING, _runtime_only("dataUriToString")),
+    "decodeDataUri": Function((STRING,), ANY, _runtime_only("decodeDataUri")),
+    "xml": Function((ANY,), ANY, _runtime_only("xml")),
+    "xpath": Function((ANY, STRING), ANY, _runtime_only("xpath")),
+    # Collections
+    "contains": Function((f"{STRING}|{ARRAY}|{OBJECT}", ANY), BOOL, _contains),
+    "length": Function((f"{STRING}|{ARRAY}",), INT, lambda c: len(c)),
+    "empty": Function((ANY,), BOOL, lambda c: c is None or (hasattr(c, "__len__") and len(c) == 0)),
+    "first": Function((f"{STRING}|{ARRAY}",), ANY, _first),
+    "last": Function((f"{STRING}|{ARRAY}",), ANY, _last),
+    "join": Function((ARRAY, STRING), STRING, lambda items, sep: sep.join(to_string(v) for v in items)),
+    "skip": Function((ARRAY, INT), ARRAY, lambda items, n: items[n:]),
+    "take": Function((f"{STRING}|{ARRAY}", INT), ANY, lambda items, n: items[:n]),
+    "union": Function((f"{ARRAY}|{OBJECT}", f"{ARRAY}|{OBJECT}"), ANY, _union, variadic=f"{ARRAY}|{OBJECT}"),
+    "intersection": Function((f"{ARRAY}|{OBJECT}", f"{ARRAY}|{OBJECT}"), ANY, _intersection, variadic=f"{ARRAY}|{OBJECT}"),
+    "createArray": Function((), ARRAY, lambda *a: list(a), variadic=ANY),
+    "range": Function((INT, INT), ARRAY, lambda start, count: list(range(start, start + count))),
+    # Logical
+    "equals": Function((ANY, ANY), BOOL, lambda a, b: a == b),
+    "less": Function((f"{NUMBER}|{STRING}", f"{NUMBER}|{STRING}"), BOOL, _compare(lambda a, b: a < b, "less")),
+    "lessOrEquals": Function((f"{NUMBER}|{STRING}", f"{NUMBER}|{STRING}"), BOOL, _compare(lambda a, b: a <= b, "lessOrEquals")),
+    "greater": Function((f"{NUMBER}|{STRING}", f"{NUMBER}|{STRING}"), BOOL, _compare(lambda a, b: a > b, "greater")),
+    "greaterOrEquals": Function((f"{NUMBER}|{STRING}", f"{NUMBER}|{STRING}"), BOOL, _compare(lambda a, b: a >= b, "greaterOrEquals")),
+    "and": Function((BOOL, BOOL), BOOL, lambda *a: all(a), variadic=BOOL),
+    "or": Function((BOOL, BOOL), BOOL, lambda *a: any(a), variadic=BOOL),
+    "not": Function((BOOL,), BOOL, lambda a: not a),
+    "if": Function((BOOL, ANY, ANY), ANY, lambda c, a, b: a if c else b),
+    "coalesce": Function((ANY,), ANY, lambda *a: next((v for v in a if v is not None), None), variadic=ANY),
+    # Conversion
+    "string": Function((ANY,), STRING, to_string),
+    "int": Function((ANY,), INT, _to_int),
+    "float": Function((ANY,), FLOAT, _to_float),
+    "bool": Function((ANY,), BOOL, _to_bool),
+    "json": Function((ANY,), ANY, _json),
+    "array": Function((ANY,), ARRAY, lambda v: [v]),
+    # Math
+    "add": Function((NUMBER, NUMBER), NUMBER, lambda a, b: a + b),
+    "sub": Function((NUMBER, NUMBER), NUMBER, lambda a, b: a - b),
+    "mul": Function((NUMBER, NUMBER), NUMBER, lambda a, b: a * b),
+    "div": Function((NUMBER, NUMBER), NUMBER, _int_div),
+    "mod": Function((NUMBER, NUMBER), NUMBER, lambda a, b: a % b if b else _int_div(a, b)),
+    "min": Function((f"{NUMBER}|{ARRAY}",), NUMBER, lambda *a: min(a[0] if len(a) == 1 else a), variadic=NUMBER),
+    "max": Function((f"{NUMBER}|{ARRAY}",), NUMBER, lambda *a: max(a[0] if len(a) == 1 else a), variadic=NUMBER),
+    "rand": Function((INT, INT), INT, _runtime_only("rand")),
+    # Date and time
+    "utcnow": Function((STRING,), STRING, lambda fmt=None: format_timestamp(datetime.now(timezone.utc), fmt), optional=1),
+    "formatDateTime": Function((STRING, STRING), STRING, lambda ts, fmt=None: format_timestamp(_parse_timestamp(ts), fmt), optional=1),
+    "addSeconds": Function((STRING, NUMBER, STRING), STRING, lambda ts, n, fmt=None: _shift(ts, n, fmt), optional=1),
+    "addMinutes": Function((STRING, NUMBER, STRING), STRING, lambda ts, n, fmt=None: _shift(ts, n * 60, fmt), optional=1),
+    "addHours": Function((STRING, NUMBER, STRING), STRING, lambda ts, n, fmt=None: _shift(ts, n * 3600, fmt), optional=1),
+    "addDays": Function((STRING, NUMBER, STRING), STRING, lambda ts, n, fmt=None: _shift(ts, n * 86400, fmt), optional=1),
+    "addToTime": Function((STRING, INT, STRING, STRING), STRING, lambda ts, n, unit, fmt=None: _shift(ts, _interval_seconds(n, unit), fmt), optional=1),
+    "subtractFromTime": Function((STRING, INT, STRING, STRING), STRING, lambda ts, n, unit, fmt=None: _shift(ts, -_interval_seconds(n, unit), fmt), optional=1),
+    "getFutureTime": Function((INT, STRING, STRING), STRING, lambda n, unit, fmt=None: format_timestamp(datetime.now(timezone.utc) + timedelta(seconds=_interval_seconds(n, unit)), fmt), optional=1),
+    "getPastTime": Function((INT, STRING, STRING), STRING, lambda n, unit, fmt=None: format_timestamp(datetime.now(timezone.utc) - timedelta(seconds=_interval_seconds(n, unit)), fmt), optional=1),
+    "startOfDay": Function((STRING, STRING), STRING, lambda ts, fmt=None: format_timestamp(_parse_timestamp(ts).replace(hour=0, minute=0, second=0, microsecond=0), fmt), optional=1),
+    "startOfHour": Function((STRING, STRING), STRING, lambda ts, fmt=None: format_timestamp(_parse_timestamp(ts).replace(minute=0, second=0, microsecond=0), fmt), optional=1),
+    "startOfMonth": Function((STRING, STRING), STRING, lambda ts, fmt=None: format_timestamp(_parse_timestamp(ts).replace(day=1, hour=0, minute=0, second=0, microsecond=0), fmt), optional=1),
+    "dayOfWeek": Function((STRING,), INT, lambda ts: _parse_timestamp(ts).isoweekday() % 7),
+    "dayOfMonth": Function((STRING,), INT, lambda ts: _parse_timestamp(ts).day),
+    "dayOfYear": Function((STRING,), INT, lambda ts: _parse_timestamp(ts).timetuple().tm_yday),
+    "ticks": Function((STRING,), INT, lambda ts: int((_parse_timestamp(ts) - datetime(1, 1, 1, tzinfo=timezone.utc)).total_seconds() * 10_000_000)),
+    "convertTimeZone": Function((STRING, STRING, STRING, STRING), STRING, _runtime_only("convertTimeZone"), optional=1),
+    "convertFromUtc": Function((STRING, STRING, STRING), STRING, _runtime_only("convertFromUtc"), optional=1),
+    "convertToUtc": Function((STRING, STRING, STRING), STRING, _runtime_only("convertToUtc"), optional=1),
+    # Pipeline scope; evaluated by the evaluator itself
+    "pipeline": Function((), OBJECT, None),
+    "variables": Function((STRING,), ANY, None),
+    "item": Function((), ANY, None),
+    "activity": Function((STRING,), OBJECT, None),
+    "trigger": Function((), OBJECT, None),
+    "dataset": Function((), OBJECT, None),
+    "linkedService": Function((), OBJECT, None),
+}
+
+# Case-insensitive lookup, as in the service
+_FUNCTIONS_BY_LOWER_NAME = {name.lower(): (name, fn) for name, fn in FUNCTIONS.items()}
+
+PIPELINE_SYSTEM_PROPERTIES = (
+    "DataFactory", "Pipeline", "PipelineName", "RunId", "TriggerId", "TriggerType", "TriggerTime", "TriggerName",
+    "TriggeredByPipelineName", "TriggeredByPipelineRunId", "GroupId",
+)
+_PIPELINE_OBJECT_PROPERTIES = ("parameters", "globalParameters", "libraryVariables")
+
+_PARAMETER_TYPES = {"string": STRING, "securestring": STRING, "int": INT, "integer": INT, "float": FLOAT,
+                    "bool": BOOL, "boolean": BOOL, "array": ARRAY, "object": OBJECT, "secureobject": OBJECT}
+
+
+def declared_type(declaration: Any) -> str:
+    """Type of a pipeline parameter or variable declaration ({'type': 'String', ...})."""
+    kind = (declaration or {}).get("type") if isinstance(declaration, dict) else None
+    return _PARAMETER_TYPES.get(str(kind).lower(), ANY)
+
+
+def _lookup_function(name: str) -> Tuple[str, Function]:
+    found = _FUNCTIONS_BY_LOWER_NAME.get(name.lower())
+    if found is None:
+        raise ExpressionError(f"Unknown function '{name}'.")
+    return found
+
+
+# --- Static checking ---------------------------------------------------------
+
+class CheckScope(BaseModel):
+    """What an expression may refer to at its location in the pipeline. None means 'not known; do not check'."""
+    parameters: Optional[Dict[str, str]] = Field(None, description="Declared parameter name -> type.")
+    variables: Optional[Dict[str, str]] = Field(None, description="Declared variable name -> type.")
+    activities: Optional[Set[str]] = Field(None, description="All activity names in the pipeline.")
+    is_upstream: Optional[Callable[[str], bool]] = Field(None, description="Whether an activity is guaranteed to have run before this location.")
+    item_available: bool = True
+
+
+class Issue(NamedTuple):
+    severity: str
+    message: str
+
+
+def _pipeline_path(node: Node) -> Optional[List[str]]:
+    """['parameters', 'x'] for pipeline().parameters.x; None if the node is not rooted at pipeline()."""
+    names: List[str] = []
+    while isinstance(node, Member):
+        names.append(node.name)
+        node = node.target
+    if isinstance(node, Call) and node.name.lower() == "pipeline":
+        return list(reversed(names))
+    return None
+
+
+def check_expression(node: Node, scope: Optional[CheckScope] = None) -> Tuple[str, List[Issue]]:
+    """Infers the result type of a parsed expression and collects problems."""
+    scope = scope or CheckScope()
+    issues: List[Issue] = []
+
+    def visit(n: Node) -> str:
+        if isinstance(n, Lit):
+            return type_of(n.value)
+        if isinstance(n, Template):
+            for part in n.parts:
+                if not isinstance(part, str):
+                    visit(part)
+            return STRING
+        if isinstance(n, Index):
+            visit(n.index)
+            target = visit(n.target)
+            if target not in (ANY, ARRAY, OBJECT, NULL):
+                issues.append(Issue("error", f"Cannot index into a {target}."))
+            return ANY
+        if isinstance(n, Member):
+            path = _pipeline_path(n)
+            if path is not None:
+                return _check_pipeline_path(path)
+            target = visit(n.target)
+            if target not in (ANY, OBJECT, NULL):
+                issues.append(Issue("error", f"Cannot read property '{n.name}' of a {target}."))
+            return ANY
+        return visit_call(n)
+
+    def _check_pipeline_path(path: List[str]) -> str:
+        head = path[0]
+        if head == "parameters" and len(path) >= 2 and scope.parameters is not None:
+            if path[1] not in scope.parameters:
+                issues.append(Issue("error", f"Pipeline parameter '{path[1]}' is not declared."))
+                return ANY
+            return scope.parameters[path[1]] if len(path) == 2 else ANY
+        if head in _PIPELINE_OBJECT_PROPERTIES:
+            return OBJECT if len(path) == 1 else ANY
+        if head in PIPELINE_SYSTEM_PROPERTIES:
+            if len(path) > 1:
+                issues.append(Issue("error", f"pipeline().{head} is a string and has no property '{path[1]}'."))
+            return STRING
+        issues.append(Issue("warning", f"pipeline().{head} is not a known pipeline property."))
+        return ANY
+
+    def visit_call(n: Call) -> str:
+        arg_types = [visit(a) for a in n.args]
+        try:
+            name, fn = _lookup_function(n.name)
+        except ExpressionError as e:
+            issues.append(Issue("error", str(e)))
+            return ANY
+        if name != n.name:
+            issues.append(Issue("warning", f"Function '{n.name}' is spelled '{name}'."))
+
+        required = len(fn.params) - fn.optional
+        if len(arg_types) < required or (fn.variadic is None and len(arg_types) > len(fn.params)):
+            expected = f"{required}" if not fn.optional and fn.variadic is None else (
+                f"at least {required}" if fn.variadic else f"{required} to {len(fn.params)}")
+            issues.append(Issue("error", f"{name}() takes {expected} arguments but got {len(arg_types)}."))
+            return fn.returns if "|" not in fn.returns else ANY
+        for position, actual in enumerate(arg_types):
+            expected = fn.params[position] if position < len(fn.params) else fn.variadic
+            if not _compatible(actual, expected):
+                issues.append(Issue("error", f"Argument {position + 1} of {name}() must be {expected.replace('|', ' or ')}, not {actual}."))
+
+        first_arg = n.args[0] if n.args else None
+        literal_name = first_arg.value if isinstance(first_arg, Lit) and isinstance(first_arg.value, str) else None
+        if name == "variables" and literal_name is not None and scope.variables is not None:
+            if literal_name not in scope.variables:
+                issues.append(Issue("error", f"Variable '{literal_name}' is not declared."))
+            else:
+                return scope.variables[literal_name]
+        if name == "activity" and literal_name is not None:
+            if scope.activities is not None and literal_name not in scope.activities:
+                issues.append(Issue("error", f"Activity '{literal_name}' does not exist."))
+            elif scope.is_upstream is not None and not scope.is_upstream(literal_name):
+                issues.append(Issue("warning", f"Activity '{literal_name}' is not upstream of this activity; its output may not exist yet."))
+        if name == "item" and not scope.item_available:
+            issues.append(Issue("error", "item() is only available inside a ForEach or in a Filter condition."))
+        if name in ("add", "sub", "mul", "div", "mod"):
+            return FLOAT if FLOAT in arg_types else (INT if all(t == INT for t in arg_types) else ANY)
+        if name in ("min", "max", "take", "union", "intersection"):
+            return ANY
+        return fn.returns
+
+    return visit(node), issues
+
+
+# --- Evaluation --------------------------------------------------------------
+
+class EvaluationContext(BaseModel):
+    """Values an expression is evaluated against. Missing runtime values raise RuntimeOnlyError."""
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+    variables: Dict[str, Any] = Field(default_factory=dict)
+    system: Dict[str, Any] = Field(default_factory=dict, description="pipeline() system properties, e.g. RunId or TriggerTime.")
+    activity_results: Dict[str, Any] = Field(default_factory=dict, description="activity('X') objects, e.g. {'output': {...}}.")
+    item: Any = None
+    has_item: bool = False
+
+
+class _RuntimeValues(dict):
+    """pipeline() / pipeline().parameters: properties without a value here are only known at run time."""
+
+    def __init__(self, values: Dict[str, Any], hint: str = ""):
+        super().__init__(values)
+        self.hint = hint
+
+
+def _member(target: Any, name: str, safe: bool) -> Any:
+    if target is None:
+        if safe:
+            return None
+        raise ExpressionError(f"Cannot read property '{name}' of null.")
+    if not isinstance(target, dict):
+        raise ExpressionError(f"Cannot read property '{name}' of a {type_of(target)}.")
+    if name in target:
+        return target[name]
+    for key, value in target.items():
+        if key.lower() == name.lower():
+            return value
+    if isinstance(target, _RuntimeValues):
+        raise RuntimeOnlyError(f"'{name}' has no value until the pipeline runs.{target.hint}")
+    if safe:
+        return None
+    raise ExpressionError(f"Property '{name}' does not exist; available: {', '.join(sorted(target)) or 'none'}.")
+
+
+def _index(target: Any, index: Any, safe: bool) -> Any:
+    if target is None and safe:
+        return None
+    if isinstance(target, list) and isinstance(index, int) and not isinstance(index, bool):
+        if -len(target) <= index < len(target):
+            return target[index]
+        if safe:
+            return None
+        raise ExpressionError(f"Index {index} is out of range for an array of length {len(target)}.")
+    if isinstance(target, dict) and isinstance(index, str):
+        return _member(target, index, safe)
+    raise ExpressionError(f"Cannot index a {type_of(target)} with a {type_of(index)}.")
+
+
+def evaluate(node: Node, context: EvaluationContext) -> Any:
+    if isinstance(node, Lit):
+        return node.value
+    if isinstance(node, Template):
+        return "".join(part if isinstance(part, str) else to_string(evaluate(part, context)) for part in node.parts)
+    if isinstance(node, Member):
+        return _member(evaluate(node.target, context), node.name, node.safe)
+    if isinstance(node, Index):
+        return _index(evaluate(node.target, context), evaluate(node.index, context), node.safe)
+
+    name, fn = _lookup_function(node.name)
+    if name == "if":
+        # Only the chosen branch is evaluated
+        if len(node.args) != 3:
+            raise ExpressionError(f"if() takes 3 arguments but got {len(node.args)}.")
+        condition = _require(evaluate(node.args[0], context), BOOL, "if")
+        return evaluate(node.args[1] if condition else node.args[2], context)
+    args = [evaluate(a, context) for a in node.args]
+
+    if name == "pipeline":
+        return _RuntimeValues({**context.system, "parameters": _RuntimeValues(context.parameters, " Pass a value in 'parameters' to evaluate it.")})
+    if name == "variables":
+        if args[0] not in context.variables:
+            raise RuntimeOnlyError(f"Variable '{args[0]}' has no value; pass it in 'variables'.")
+        return context.variables[args[0]]
+    if name == "item":
+        if not context.has_item:
+            raise RuntimeOnlyError("item() has no value outside a running ForEach or Filter.")
+        return context.item
+    if name == "activity":
+        if args[0] not in context.activity_results:
+            raise RuntimeOnlyError(f"The output of activity '{args[0]}' only exists at run time.")
+        return context.activity_results[args[0]]
+    if fn.impl is None:
+        raise RuntimeOnlyError(f"{name}() can only be evaluated by the service.")
+
+    required = len(fn.params) - fn.optional
+    if len(args) < required or (fn.variadic is None and len(args) > len(fn.params)):
+        raise ExpressionError(f"{name}() got {len(args)} arguments.")
+    for position, value in enumerate(args):
+        _require(value, fn.params[position] if position < len(fn.params) else fn.variadic, name)
+    try:
+        return fn.impl(*args)
+    except ExpressionError:
+        raise
+    except (ArithmeticError, TypeError, ValueError, IndexError, KeyError) as e:
+        raise ExpressionError(f"{name}() failed: {e}")
+
+
+def evaluate_expression(text: str, context: Optional[EvaluationContext] = None) -> Any:
+    """Parses (cached) and evaluates a string value."""
+    return evaluate(parse_expression(text), context or EvaluationContext())
+
+
+# --- Pipeline validation -----------------------------------------------------
+
+# typeProperties fields whose expression must produce a particular type
+EXPECTED_TYPES: Dict[Tuple[str, str], str] = {
+    ("IfCondition", "expression"): BOOL,
+    ("Until", "expression"): BOOL,
+    ("Filter", "condition"): BOOL,
+    ("Filter", "items"): ARRAY,
+    ("ForEach", "items"): ARRAY,
+    ("Switch", "on"): STRING,
+}
+_NOT_EVALUATED_KEYS = {"name", "type", "dependsOn", "description"}
+# Text like "@channel build done": a word after '@' that is not followed by a call, member or index
+_LITERAL_AT = re.compile(r"@(?:\s|[A-Za-z_]\w*(?:\s+[^\s(.\[?]|$))")
+
+
+class ExpressionFinding(BaseModel):
+    activity: Optional[str] = None
+    path: str
+    expression: str
+    severity: str
+    message: str
+
+
+class ExpressionEvaluation(BaseModel):
+    activity: str
+    path: str
+    expression: str
+    status: str = Field(..., description="'Evaluated', or 'RuntimeOnly' if it depends on run-time values.")
+    value: Any = None
+    message: Optional[str] = None
+
+
+class ExpressionReport(BaseModel):
+    valid: bool
+    expressions_checked: int
+    errors: List[ExpressionFinding] = Field(default_factory=list)
+    warnings: List[ExpressionFinding] = Field(default_factory=list)
+    evaluations: List[ExpressionEvaluation] = Field(default_factory=list, description="Values of the control-flow expressions (conditions, ForEach items, Switch on).")
+
+
+def _string_leaves(value: Any, path: str):
+    if isinstance(value, str):
+        yield path, value
+    elif isinstance(value, dict):
+        for key, child in value.items():
+            yield from _string_leaves(child, f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}")
+    elif isinstance(value, list):
+        for i, child in enumerate(value):
+            yield from _string_leaves(child, f"{path}/{i}")
+
+
+def _ancestor_masks(activities: List[Dict[str, Any]]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """Bit per activity, and the bitset of its transitive dependsOn ancestors within the list."""
+    bit = {a.get("name"): 1 << i for i, a in enumerate(activities)}
+    successors: Dict[str, List[str]] = {name: [] for name in bit}
+    indegree = {name: 0 for name in bit}
+    for a in activities:
+        for pred in {d.get("activity") for d in a.get("dependsOn") or []}:
+            if pred in bit:
+                successors[pred].append(a.get("name"))
+                indegree[a.get("name")] += 1
+    masks = {name: 0 for name in bit}
+    order = [name for name, degree in indegree.items() if degree == 0]
+    for name in order:
+        for succ in successors[name]:
+            masks[succ] |= masks[name] | bit[name]
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                order.append(succ)
+    return bit, masks
+
+
+def _upstream_check(bit: Dict[str, int], mask: int, enclosing: Callable[[str], bool]) -> Callable[[str], bool]:
+    return lambda name: bool(mask & bit.get(name, 0)) or enclosing(name)
+
+
+def pipeline_evaluation_context(
+    content: Dict[str, Any], parameter_values: Optional[Dict[str, Any]] = None, variable_values: Optional[Dict[str, Any]] = None
+) -> EvaluationContext:
+    """Context with the pipeline's declared default values, overridden by the given values."""
+    properties = content.get("properties") or {}
+    parameters = {k: v["defaultValue"] for k, v in (properties.get("parameters") or {}).items() if isinstance(v, dict) and "defaultValue" in v}
+    variables = {k: v["defaultValue"] for k, v in (properties.get("variables") or {}).items() if isinstance(v, dict) and "defaultValue" in v}
+    return EvaluationContext(parameters={**parameters, **(parameter_values or {})}, variables={**variables, **(variable_values or {})})
+
+
+def validate_pipeline_expressions(
+    content: Dict[str, Any],
+    parameter_values: Optional[Dict[str, Any]] = None,
+    variable_values: Optional[Dict[str, Any]] = None,
+    evaluate_control_flow: bool = True,
+) -> ExpressionReport:
+    """
+    Parses and type-checks every expression in a decoded pipeline-content.json, then evaluates the
+    control-flow expressions that do not depend on run-time values. Declared parameters and variables
+    are only checked if the definition has a 'parameters' / 'variables' section. Values missing from
+    the definition and the given values make an evaluation RuntimeOnly, not an error. With
+    evaluate_control_flow=False only syntax and static (function signature, reference) checks run.
+    """
+    # Imported here: pipeline_dag/pipeline_diff are only needed for whole-pipeline validation
+    from .pipeline_dag import child_scopes
+    from .pipeline_diff import own_fields
+
+    properties = content.get("properties") or {}
+    declared_parameters = properties.get("parameters")
+    declared_variables = properties.get("variables")
+    all_activities: Set[str] = set()
+
+    def collect(items: List[Dict[str, Any]]) -> None:
+        for a in items:
+            all_activities.add(a.get("name"))
+            for _, body in child_scopes(a):
+                collect(body)
+
+    collect(properties.get("activities") or [])
+
+    base_scope = CheckScope(
+        parameters={k: declared_type(v) for k, v in declared_parameters.items()} if isinstance(declared_parameters, dict) else None,
+        variables={k: declared_type(v) for k, v in declared_variables.items()} if isinstance(declared_variables, dict) else None,
+        activities=all_activities,
+    )
+    context = pipeline_evaluation_context(content, parameter_values, variable_values)
+    report = ExpressionReport(valid=True, expressions_checked=0)
+
+    def check_activity(activity: Dict[str, Any], upstream: Callable[[str], bool], in_iteration: bool) -> None:
+        name = activity.get("name")
+        kind = activity.get("type")
+        fields = own_fields(activity)
+        props = fields.get("typeProperties") or {}
+        body_names = {b.get("name") for _, body in child_scopes(activity) for b in body}
+        for key, value in fields.items():
+            if key in _NOT_EVALUATED_KEYS:
+                continue
+            for path, text in _string_leaves(value, f"/{key}"):
+                if not is_expression(text):
+                    continue
+                field = path.split("/")[2] if path.startswith("/typeProperties/") else None
+                expected = EXPECTED_TYPES.get((kind, field)) if field else None
+                item_ok = in_iteration or (kind == "Filter" and field == "condition")
+                visible = (lambda n: n in body_names or upstream(n)) if kind == "Until" and field == "expression" else upstream
+                check(name, path, text, base_scope.model_copy(update={"is_upstream": visible, "item_available": item_ok}), expected)
+        # A control-flow value written without '@' is a literal string, which never has the expected type
+        for (owner, field), expected in EXPECTED_TYPES.items():
+            if owner == kind and expected != STRING:
+                raw = props.get(field)
+                raw = raw.get("value") if isinstance(raw, dict) else raw
+                if isinstance(raw, str) and not is_expression(raw):
+                    report.errors.append(ExpressionFinding(
+                        activity=name, path=f"/typeProperties/{field}", expression=raw, severity="error",
+                        message=f"'{raw}' is a literal string; start it with '@' to make it an expression that returns {expected}.",
+                    ))
+
+    def check(activity: str, path: str, text: str, scope: CheckScope, expected: Optional[str]) -> None:
+        report.expressions_checked += 1
+        try:
+            node = parse_expression(text)
+        except ExpressionError as e:
+            if expected is None and _LITERAL_AT.match(text):
+                report.warnings.append(ExpressionFinding(
+                    activity=activity, path=path, expression=text, severity="warning",
+                    message=f"Starts with '@' but is not an expression ({e}); the service will try to evaluate it. Write '@@' to keep a literal '@'.",
+                ))
+            else:
+                report.errors.append(ExpressionFinding(activity=activity, path=path, expression=text, severity="error", message=str(e)))
+            return
+        result_type, issues = check_expression(node, scope)
+        if expected and not _compatible(result_type, expected):
+            issues.append(Issue("error", f"Must return {expected} but returns {result_type}."))
+        for severity, message in issues:
+            finding = ExpressionFinding(activity=activity, path=path, expression=text, severity=severity, message=message)
+            (report.errors if severity == "error" else report.warnings).append(finding)
+        if expected is None or not evaluate_control_flow or any(i.severity == "error" for i in issues):
+            return
+        try:
+            value = evaluate(node, context)
+        except RuntimeOnlyError as e:
+            report.evaluations.append(ExpressionEvaluation(activity=activity, path=path, expression=text, status="RuntimeOnly", message=str(e)))
+            return
+        except ExpressionError as e:
+            report.errors.append(ExpressionFinding(activity=activity, path=path, expression=text, severity="error", message=f"Evaluation failed: {e}"))
+            return
+        report.evaluations.append(ExpressionEvaluation(activity=activity, path=path, expression=text, status="Evaluated", value=value))
+        if not _compatible(type_of(value), expected):
+            report.errors.append(ExpressionFinding(
+                activity=activity, path=path, expression=text, severity="error",
+                message=f"Must return {expected} but returned {type_of(value)} {to_string(value)!r} with the given values.",
+            ))
+
+    def visit(items: List[Dict[str, Any]], enclosing_upstream: Callable[[str], bool], in_iteration: bool) -> None:
+        bit, masks = _ancestor_masks(items)
+        for activity in items:
+            upstream = _upstream_check(bit, masks.get(activity.get("name"), 0), enclosing_upstream)
+            check_activity(activity, upstream, in_iteration)
+            for _, body in child_scopes(activity):
+                visit(body, upstream, in_iteration or activity.get("type") == "ForEach")
+
+    visit(properties.get("activities") or [], lambda name: False, False)
+    report.valid = not report.errors
+    return report
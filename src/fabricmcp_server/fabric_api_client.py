@@ -128,9 +128,22 @@ class FabricApiClient:
             
         return response
 
-    async def run_item(self, workspace_id: str, item_id: str, job_type: str) -> Optional[httpx.Response]:
+    async def run_item(
+        self, workspace_id: str, item_id: str, job_type: str, execution_data: Optional[Dict[str, Any]] = None
+    ) -> Optional[httpx.Response]:
+        """
+        Starts an on-demand job for an item.
+        `execution_data` is sent as the job's `executionData` (e.g. {"parameters": {...}} for pipelines).
+        """
         path = f"/v1/workspaces/{workspace_id}/items/{item_id}/jobs/instances?jobType={job_type}"
         headers = await self._get_auth_header("https://api.fabric.microsoft.com/.default")
+        json_body = {"executionData": execution_data} if execution_data else None
+        return await self._make_request("POST", f"{self._base_url}{path}", json_body=json_body, headers=headers)
+
+    async def cancel_job_instance(self, workspace_id: str, item_id: str, job_instance_id: str) -> Optional[httpx.Response]:
+        """Requests cancellation of a running job instance. The service answers 202 Accepted."""
+        path = f"/v1/workspaces/{workspace_id}/items/{item_id}/jobs/instances/{job_instance_id}/cancel"
+        headers = await self._get_auth_header("https://api.fabric.microsoft.com/.default")
         return await self._make_request("POST", f"{self._base_url}{path}", headers=headers)
 
     async def poll_lro_status(self, operation_url: str) -> httpx.Response:
@@ -139,6 +152,14 @@ class FabricApiClient:
         response.raise_for_status()
         return response
     
+    async def get_operation_result(self, operation_url: str) -> Dict[str, Any]:
+        """Fetches the result of a succeeded long-running operation (e.g. the item created by createItem)."""
+        headers = await self._get_auth_header("https://api.fabric.microsoft.com/.default")
+        result = await self._make_request("GET", f"{operation_url.split('?')[0]}/result", headers=headers)
+        if not isinstance(result, dict):
+            raise FabricApiException(0, f"Operation {operation_url} returned no result.")
+        return result
+
     async def list_connections(self) -> Optional[List[Dict[str, Any]]]:
         """
         Lists all connections accessible by the current credential at the tenant level.
@@ -167,6 +188,36 @@ class FabricApiClient:
             return response_dict["value"]
         return []
 
+    async def get_job_instance(self, workspace_id: str, item_id: str, job_instance_id: str) -> Dict[str, Any]:
+        """Gets a job instance (e.g. a pipeline run) by its ID."""
+        url = f"{self._base_url}/v1/workspaces/{workspace_id}/items/{item_id}/jobs/instances/{job_instance_id}"
+        return await self.get_job_instance_status(url)
+
+    async def query_activity_runs(
+        self, workspace_id: str, job_instance_id: str, last_updated_after: str, last_updated_before: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Lists the activity runs of a pipeline run that were updated inside the given window (ISO-8601 UTC).
+        The endpoint may answer with a bare list or with a {"value": [...]} envelope.
+        """
+        url = f"{self._base_url}/v1/workspaces/{workspace_id}/datapipelines/pipelineruns/{job_instance_id}/queryactivityruns"
+        body = {
+            "filters": [],
+            "orderBy": [{"orderBy": "ActivityRunStart", "order": "ASC"}],
+            "lastUpdatedAfter": last_updated_after,
+            "lastUpdatedBefore": last_updated_before,
+        }
+        headers = await self._get_auth_header("https://api.fabric.microsoft.com/.default")
+        try:
+            response = await self._httpx_client.post(url, json=body, headers=headers)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise FabricApiException(e.response.status_code, "Failed to query activity runs", e.response.text) from e
+        except httpx.RequestError as e:
+            raise FabricApiException(0, f"HTTP request error: {e}")
+        data = response.json() if response.content else []
+        return data.get("value", []) if isinstance(data, dict) else data
+
     async def get_job_instance_status(self, job_instance_url: str) -> Dict[str, Any]:
         """Gets the status of a specific job instance (e.g., a pipeline or notebook run)."""
         headers = await self._get_auth_header("https://api.fabric.microsoft.com/.default")
@@ -237,6 +288,29 @@ class FabricApiClient:
         response = await self._make_request("GET", url, headers=headers)
         return response.get("paths", []) if response else []
 
+    async def list_onelake_paths(self, workspace_id: str, item_id: str, directory: str) -> List[Dict[str, Any]]:
+        """Lists the files and folders directly inside a OneLake directory (e.g. 'Tables/sales/_delta_log')."""
+        url = f"{self._onelake_url}/{workspace_id}"
+        params = {"resource": "filesystem", "recursive": "false", "directory": f"{item_id}/{directory.strip('/')}"}
+        headers = await self._get_auth_header("https://storage.azure.com/.default")
+        response = await self._make_request("GET", url, params=params, headers=headers, allow_404=True)
+        return response.get("paths", []) if isinstance(response, dict) else []
+
+    async def read_onelake_file(self, workspace_id: str, item_id: str, path: str, max_bytes: Optional[int] = None) -> bytes:
+        """Reads a OneLake file, or only its first `max_bytes` bytes."""
+        url = f"{self._onelake_url}/{workspace_id}/{item_id}/{path.lstrip('/')}"
+        headers = await self._get_auth_header("https://storage.azure.com/.default")
+        if max_bytes:
+            headers["Range"] = f"bytes=0-{max_bytes - 1}"
+        try:
+            response = await self._httpx_client.get(url, headers=headers)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise FabricApiException(e.response.status_code, f"Failed to read OneLake file '{path}'", e.response.text) from e
+        except httpx.RequestError as e:
+            raise FabricApiException(0, f"HTTP request error: {e}")
+        return response.content
+
     # --- NEW: Lakehouse-Specific API Methods ---
     async def load_table(self, workspace_id: str, lakehouse_id: str, table_name: str, payload: LoadTableRequest) -> Optional[httpx.Response]:
         """Initiates a 'Load to Table' operation in a specific Lakehouse."""
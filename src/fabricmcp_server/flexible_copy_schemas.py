@@ -17,9 +17,9 @@
 # - Azure Blob → Lakehouse File (200 OK)
 
 from __future__ import annotations
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Tuple, Union
 from pydantic import BaseModel, Field
-from .common_schemas import DatasetReference, TabularTranslator
+from .common_schemas import DatasetReference, Expression, TabularTranslator
 
 # =============================================================================
 # FLEXIBLE API-ALIGNED MODELS (Based on Real Working Patterns)
@@ -58,8 +58,8 @@ class LocationSettings(BaseModel):
 class TypeProperties(BaseModel):
     """Flexible type properties for datasets"""
     location: Optional[LocationSettings] = None
-    table: Optional[str] = None
-    schema: Optional[str] = None
+    table: Optional[Union[str, Expression]] = None
+    schema: Optional[Union[str, Expression]] = None
     artifactId: Optional[str] = None
     workspaceId: Optional[str] = None
     rootFolder: Optional[str] = None
@@ -83,6 +83,16 @@ class DatasetSettings(BaseModel):
     class Config:
         extra = "allow"
 
+class PartitionSettings(BaseModel):
+    """Settings for a partitioned (parallel) read from a database source"""
+    partitionColumnName: Optional[str] = Field(None, description="Integer or date/datetime column to split the read on (DynamicRange, Hash)")
+    partitionLowerBound: Optional[str] = Field(None, description="Minimum value of the partition column; detected automatically if omitted")
+    partitionUpperBound: Optional[str] = Field(None, description="Maximum value of the partition column; detected automatically if omitted")
+    partitionNames: Optional[List[str]] = Field(None, description="Physical partitions to read (PhysicalPartitionsOfTable); all if omitted")
+    # Allow any additional properties
+    class Config:
+        extra = "allow"
+
 class FlexibleSource(BaseModel):
     """Flexible source that matches real Fabric API patterns.
     
@@ -100,10 +110,13 @@ class FlexibleSource(BaseModel):
     formatSettings: Optional[FormatSettings] = Field(None, description="Format settings for file-based sources")
     datasetSettings: Optional[DatasetSettings] = Field(None, description="Dataset configuration. For external connections, include 'externalReferences': {'connection': 'connection_id'}")
     # SQL-specific properties
-    sqlReaderQuery: Optional[str] = None
+    sqlReaderQuery: Optional[Union[str, Expression]] = None
     oracleReaderQuery: Optional[str] = None
     queryTimeout: Optional[str] = None
     query: Optional[str] = None
+    # Partitioned read - see SOURCE_PARTITION_OPTIONS for what each source supports
+    partitionOption: Optional[str] = Field(None, description="'None', 'PhysicalPartitionsOfTable', 'DynamicRange' or 'Hash', depending on the source type")
+    partitionSettings: Optional[PartitionSettings] = None
     # Allow any additional properties
     class Config:
         extra = "allow"
@@ -136,6 +149,21 @@ class FlexibleSink(BaseModel):
     datasetSettings: Optional[DatasetSettings] = Field(None, description="Dataset configuration. For Lakehouse/DataWarehouse, include linkedService. For external, include externalReferences")
     # Table-specific properties
     tableOption: Optional[str] = Field(None, description="Table creation option, e.g., 'autoCreate'")
+    # Lakehouse table write options - see lakehouse_sink_errors
+    tableActionOption: Optional[str] = Field(None, description="LakehouseTableSink: 'Append', 'Overwrite' or 'Upsert'")
+    upsertSettings: Optional[Dict[str, Any]] = Field(None, description="LakehouseTableSink upsert: {'keys': [key columns]}")
+    partitionOption: Optional[str] = Field(None, description="LakehouseTableSink: 'PartitionByKey' to write Delta partitions")
+    partitionNameList: Optional[List[str]] = Field(None, description="Partition columns for PartitionByKey, outermost first")
+    applyVOrder: Optional[bool] = Field(None, description="Write V-Order optimized Parquet for faster reads")
+    # Allow any additional properties
+    class Config:
+        extra = "allow"
+
+class StagingSettings(BaseModel):
+    """Interim storage for a staged copy. Without externalReferences the workspace's built-in staging is used."""
+    externalReferences: Optional[Dict[str, str]] = Field(None, description="{'connection': id} of an Azure Blob Storage or ADLS Gen2 connection")
+    path: Optional[str] = Field(None, description="'container' or 'container/folder' for the interim data")
+    enableCompression: Optional[bool] = Field(None, description="Compress the interim data; helps when bandwidth between the stores is limited")
     # Allow any additional properties
     class Config:
         extra = "allow"
@@ -146,6 +174,9 @@ class FlexibleCopyProperties(BaseModel):
     sink: Optional[FlexibleSink] = None
     translator: Optional[Union[TabularTranslator, Dict[str, Any]]] = None
     enableStaging: Optional[bool] = None
+    stagingSettings: Optional[StagingSettings] = Field(None, description="Only used when enableStaging is true")
+    parallelCopies: Optional[int] = Field(None, ge=1, description="Maximum parallel reads; for a partitioned source, the number of partitions read at once")
+    dataIntegrationUnits: Optional[int] = Field(None, ge=2, le=256, description="Compute for the copy (2-256); omit to let the service decide")
     # Allow any additional properties
     class Config:
         extra = "allow"
@@ -211,6 +242,256 @@ def create_fabric_dataset_settings(service_type: str, artifact_id: str, workspac
         )
     )
 
+# =============================================================================
+# PARTITIONED READS (partitionOption per source type)
+# =============================================================================
+
+_SQL_FAMILY_OPTIONS = ("None", "PhysicalPartitionsOfTable", "DynamicRange")
+
+# Partition options each database source accepts. Sources not listed (e.g. Db2Source,
+# MySqlSource, PostgreSqlSource) have no partitioned read and always copy single-threaded.
+SOURCE_PARTITION_OPTIONS: Dict[str, tuple] = {
+    "SqlServerSource": _SQL_FAMILY_OPTIONS,
+    "AzureSqlSource": _SQL_FAMILY_OPTIONS,
+    "AzureSqlDWSource": _SQL_FAMILY_OPTIONS,
+    "OracleSource": _SQL_FAMILY_OPTIONS,
+    "AzurePostgreSqlSource": _SQL_FAMILY_OPTIONS,
+    "TeradataSource": ("None", "Hash", "DynamicRange"),
+}
+
+# Sources that can read a chosen list of physical partitions (partitionNames)
+_NAMED_PARTITION_SOURCES = ("OracleSource", "AzurePostgreSqlSource")
+
+# A custom query must contain the hooks the service replaces with each partition's condition,
+# otherwise every parallel read returns the whole result and rows are copied several times.
+# The SQL Server family takes one condition hook; Oracle, Teradata and PostgreSQL take the
+# column name and bounds separately.
+_SQL_FAMILY_RANGE_HOOKS = ("?DfDynamicRangePartitionCondition",)
+_COLUMN_RANGE_HOOKS = ("?DfRangePartitionColumnName", "?DfRangePartitionUpbound", "?DfRangePartitionLowbound")
+PARTITION_QUERY_HOOKS: Dict[Tuple[str, str], Tuple[str, ...]] = {
+    ("SqlServerSource", "DynamicRange"): _SQL_FAMILY_RANGE_HOOKS,
+    ("AzureSqlSource", "DynamicRange"): _SQL_FAMILY_RANGE_HOOKS,
+    ("AzureSqlDWSource", "DynamicRange"): _SQL_FAMILY_RANGE_HOOKS,
+    ("OracleSource", "DynamicRange"): _COLUMN_RANGE_HOOKS,
+    ("OracleSource", "PhysicalPartitionsOfTable"): ("?DfTabularPartitionName",),
+    ("AzurePostgreSqlSource", "DynamicRange"): _COLUMN_RANGE_HOOKS,
+    ("AzurePostgreSqlSource", "PhysicalPartitionsOfTable"): ("?DfTabularPartitionName",),
+    ("TeradataSource", "DynamicRange"): _COLUMN_RANGE_HOOKS,
+    ("TeradataSource", "Hash"): ("?DfHashPartitionCondition",),
+}
+
+def _reader_query(source: Dict[str, Any]) -> Any:
+    return source.get("sqlReaderQuery") or source.get("oracleReaderQuery") or source.get("query")
+
+def source_partition_errors(source: Dict[str, Any]) -> List[str]:
+    """Problems with the partitioned read settings of a Copy source payload"""
+    option = source.get("partitionOption")
+    if option in (None, "None") or isinstance(option, dict):  # dynamic content is checked at run time
+        return []
+    source_type = source.get("type")
+    supported = SOURCE_PARTITION_OPTIONS.get(source_type)
+    if supported is None:
+        return [f"{source_type} does not support partitioned reads (partitionOption '{option}')"]
+    if option not in supported:
+        return [f"{source_type} supports partitionOption {', '.join(supported)}; got '{option}'"]
+
+    errors = []
+    settings = source.get("partitionSettings") or {}
+    if option == "DynamicRange" and not settings.get("partitionColumnName"):
+        errors.append("DynamicRange partitioning needs partitionSettings.partitionColumnName")
+    lower, upper = settings.get("partitionLowerBound"), settings.get("partitionUpperBound")
+    if option != "DynamicRange" and (lower is not None or upper is not None):
+        errors.append(f"Partition bounds only apply to DynamicRange partitioning, not '{option}'")
+    elif lower is not None and upper is not None:
+        try:
+            if float(lower) >= float(upper):
+                errors.append(f"partitionLowerBound {lower} must be below partitionUpperBound {upper}")
+        except (TypeError, ValueError):
+            pass  # dates and expressions are compared by the service
+    if settings.get("partitionNames") and (option != "PhysicalPartitionsOfTable" or source_type not in _NAMED_PARTITION_SOURCES):
+        errors.append(f"partitionNames is only supported with PhysicalPartitionsOfTable on {', '.join(_NAMED_PARTITION_SOURCES)}")
+
+    query = _reader_query(source)
+    if isinstance(query, str) and query.strip():
+        hooks = PARTITION_QUERY_HOOKS.get((source_type, option))
+        missing = [h for h in hooks or () if h not in query]
+        if hooks is None:
+            errors.append(f"{source_type} reads physical partitions from the table; remove the query or use DynamicRange")
+        elif missing:
+            errors.append(
+                f"The {source_type} query must contain {', '.join(repr(h) for h in missing)} for {option} partitioning, "
+                "otherwise every partition reads all rows"
+            )
+    return errors
+
+# =============================================================================
+# STAGED COPY (enableStaging + stagingSettings)
+# =============================================================================
+
+# Sources a Warehouse can load with the COPY statement without staging
+_DIRECT_COPY_STORES = ("AzureBlobStorageReadSettings", "AzureBlobFSReadSettings")
+_DIRECT_COPY_FORMATS = ("DelimitedTextSource", "ParquetSource")
+
+def copy_staging_errors(type_properties: Dict[str, Any]) -> List[str]:
+    """Problems with the staging settings of a Copy activity payload"""
+    staging = type_properties.get("stagingSettings")
+    if not staging:
+        return []
+    errors = []
+    if type_properties.get("enableStaging") is not True:
+        errors.append("stagingSettings are ignored unless enableStaging is true")
+    path = staging.get("path")
+    if isinstance(path, str) and (path.startswith("/") or "\\" in path or "://" in path):
+        errors.append(f"Staging path '{path}' must be 'container' or 'container/folder'")
+    references = staging.get("externalReferences")
+    if references is not None and not (isinstance(references, dict) and references.get("connection")):
+        errors.append("stagingSettings.externalReferences needs a 'connection' ID")
+    return errors
+
+def copy_staging_warnings(type_properties: Dict[str, Any]) -> List[str]:
+    """Copies into a Warehouse that would not take the fast staged COPY path"""
+    sink = type_properties.get("sink") or {}
+    if sink.get("type") != "DataWarehouseSink" or type_properties.get("enableStaging") is True:
+        return []
+    source = type_properties.get("source") or {}
+    store = (source.get("storeSettings") or {}).get("type")
+    if store in _DIRECT_COPY_STORES and source.get("type") in _DIRECT_COPY_FORMATS:
+        return []
+    if sink.get("allowCopyCommand") is not True:
+        return ["DataWarehouseSink without allowCopyCommand loads through row inserts; set allowCopyCommand and enableStaging for bulk loads"]
+    return [f"The COPY statement cannot read a {source.get('type')} directly; set enableStaging to load it through staging"]
+
+def create_staging_settings(connection_id: Optional[str] = None, path: Optional[str] = None, enable_compression: bool = False) -> StagingSettings:
+    """Staging settings for a staged copy; without a connection the workspace's staging storage is used"""
+    settings = StagingSettings(
+        externalReferences={"connection": connection_id} if connection_id else None,
+        path=path,
+        enableCompression=enable_compression or None,
+    )
+    errors = copy_staging_errors({"enableStaging": True, "stagingSettings": settings.model_dump(exclude_none=True)})
+    if errors:
+        raise ValueError("; ".join(errors))
+    return settings
+
+# =============================================================================
+# LAKEHOUSE TABLE WRITES (table action, Delta partitions, V-Order)
+# =============================================================================
+
+LAKEHOUSE_TABLE_ACTIONS = ("Append", "Overwrite", "Upsert")
+# Write options no other sink has; SQL sinks use upsertSettings too (with writeBehavior 'upsert')
+_LAKEHOUSE_TABLE_WRITE_FIELDS = ("tableActionOption", "partitionNameList", "applyVOrder")
+
+def _mapped_sink_columns(translator: Any) -> Optional[set]:
+    mappings = translator.get("mappings") if isinstance(translator, dict) else None
+    if not mappings:
+        return None
+    return {((m.get("sink") or {}).get("name") or "").lower() for m in mappings}
+
+def lakehouse_sink_errors(sink: Dict[str, Any], translator: Any = None) -> List[str]:
+    """Problems with the table write options of a Copy sink payload; checked against the mapping if there is one"""
+    present = [f for f in _LAKEHOUSE_TABLE_WRITE_FIELDS if sink.get(f) is not None]
+    if sink.get("type") != "LakehouseTableSink":
+        return [f"{', '.join(present)} only apply to LakehouseTableSink, not {sink.get('type')}"] if present else []
+
+    errors = []
+    action = sink.get("tableActionOption")
+    if isinstance(action, str) and action not in LAKEHOUSE_TABLE_ACTIONS:
+        errors.append(f"tableActionOption must be one of {', '.join(LAKEHOUSE_TABLE_ACTIONS)}; got '{action}'")
+    keys = list((sink.get("upsertSettings") or {}).get("keys") or [])
+    if action == "Upsert" and not keys:
+        errors.append("Upsert needs upsertSettings.keys")
+    if keys and action != "Upsert":
+        errors.append("upsertSettings only apply when tableActionOption is 'Upsert'")
+
+    option = sink.get("partitionOption")
+    columns = list(sink.get("partitionNameList") or [])
+    if option not in (None, "None", "PartitionByKey"):
+        errors.append(f"partitionOption must be 'None' or 'PartitionByKey'; got '{option}'")
+    if option == "PartitionByKey" and not columns:
+        errors.append("PartitionByKey needs at least one column in partitionNameList")
+    if columns and option != "PartitionByKey":
+        errors.append("partitionNameList only applies with partitionOption 'PartitionByKey'")
+    if len({c.lower() for c in columns}) != len(columns):
+        errors.append("partitionNameList has duplicate columns")
+
+    mapped = _mapped_sink_columns(translator)
+    if mapped is not None:
+        missing = [c for c in columns + keys if isinstance(c, str) and c.lower() not in mapped]
+        if missing:
+            errors.append(f"Columns {', '.join(missing)} are not sink columns of the translator")
+    return errors
+
+def lakehouse_table_write_options(
+    table_action: Optional[str] = None,
+    partition_columns: Optional[List[str]] = None,
+    upsert_keys: Optional[List[str]] = None,
+    apply_v_order: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """LakehouseTableSink properties for the given write options. Raises ValueError if they do not fit together."""
+    options: Dict[str, Any] = {}
+    if table_action is not None:
+        options["tableActionOption"] = table_action
+    if upsert_keys:
+        options["upsertSettings"] = {"keys": list(upsert_keys)}
+    if partition_columns:
+        options["partitionOption"] = "PartitionByKey"
+        options["partitionNameList"] = list(partition_columns)
+    if apply_v_order is not None:
+        options["applyVOrder"] = apply_v_order
+    errors = lakehouse_sink_errors({"type": "LakehouseTableSink", **options})
+    if errors:
+        raise ValueError("; ".join(errors))
+    return options
+
+def copy_parallelism_warnings(type_properties: Dict[str, Any]) -> List[str]:
+    """Settings of a Copy activity that will not have the parallel effect they ask for"""
+    source = type_properties.get("source") or {}
+    parallel_copies = type_properties.get("parallelCopies")
+    if not isinstance(parallel_copies, int) or parallel_copies <= 1 or source.get("storeSettings"):
+        return []  # file sources are read in parallel by file
+    if source.get("partitionOption") in (None, "None"):
+        if source.get("type") in SOURCE_PARTITION_OPTIONS:
+            return [f"parallelCopies={parallel_copies} has no effect without a partitionOption; {source.get('type')} is read single-threaded"]
+        return [f"parallelCopies={parallel_copies} has no effect: {source.get('type')} does not support partitioned reads"]
+    return []
+
+def with_partitioned_read(
+    source: FlexibleSource,
+    partition_option: str,
+    partition_column: Optional[str] = None,
+    lower_bound: Optional[Any] = None,
+    upper_bound: Optional[Any] = None,
+    partition_names: Optional[List[str]] = None,
+) -> FlexibleSource:
+    """Returns the source with a partitioned read configured. Raises ValueError if the source type does not support it."""
+    settings = PartitionSettings(
+        partitionColumnName=partition_column,
+        partitionLowerBound=None if lower_bound is None else str(lower_bound),
+        partitionUpperBound=None if upper_bound is None else str(upper_bound),
+        partitionNames=partition_names,
+    )
+    partitioned = source.model_copy(update={
+        "partitionOption": partition_option,
+        "partitionSettings": settings if settings.model_dump(exclude_none=True) else None,
+    })
+    errors = source_partition_errors(partitioned.model_dump(exclude_none=True))
+    if errors:
+        raise ValueError("; ".join(errors))
+    return partitioned
+
+def _partitioned(source: FlexibleSource, kwargs: Dict[str, Any]) -> FlexibleSource:
+    """Applies the partition_* keyword arguments accepted by the database source builders"""
+    if kwargs.get("partition_option") in (None, "None"):
+        return source
+    return with_partitioned_read(
+        source,
+        kwargs["partition_option"],
+        partition_column=kwargs.get("partition_column"),
+        lower_bound=kwargs.get("partition_lower_bound"),
+        upper_bound=kwargs.get("partition_upper_bound"),
+        partition_names=kwargs.get("partition_names"),
+    )
+
 # =============================================================================
 # HELPER FUNCTIONS FOR COMMON PATTERNS (Using Centralized Builders)
 # =============================================================================
@@ -241,9 +522,32 @@ def create_lakehouse_table_sink(lakehouse_id: str, workspace_id: str, table_name
             workspace_id=workspace_id,
             table_name=table_name,
             service_name=kwargs.get("lakehouse_name", "test_lakehouse")
+        ),
+        **lakehouse_table_write_options(
+            table_action=kwargs.get("table_action"),
+            partition_columns=kwargs.get("partition_columns"),
+            upsert_keys=kwargs.get("upsert_keys"),
+            apply_v_order=kwargs.get("apply_v_order")
         )
     )
 
+def create_datawarehouse_table_sink(warehouse_id: str, workspace_id: str, table_name: str, **kwargs) -> FlexibleSink:
+    """Create Warehouse table sink loading with the COPY statement - USING CENTRALIZED BUILDER"""
+    dataset_settings = create_fabric_dataset_settings(
+        service_type="DataWarehouse",
+        artifact_id=warehouse_id,
+        workspace_id=workspace_id,
+        table_name=table_name,
+        service_name=kwargs.get("warehouse_name", "test_warehouse")
+    )
+    dataset_settings.typeProperties.schema = kwargs.get("schema", "dbo")
+    return FlexibleSink(
+        type="DataWarehouseSink",
+        datasetSettings=dataset_settings,
+        tableOption=kwargs.get("tableOption", "autoCreate"),
+        allowCopyCommand=kwargs.get("allow_copy_command", True)
+    )
+
 def create_azureblob_source(connection_id: str, **kwargs) -> FlexibleSource:
     """Create Azure Blob source matching real patterns - USING CENTRALIZED BUILDER"""
     return FlexibleSource(
@@ -262,7 +566,7 @@ def create_azureblob_source(connection_id: str, **kwargs) -> FlexibleSource:
 
 def create_sqlserver_source(connection_id: str, query: str, **kwargs) -> FlexibleSource:
     """Create SQL Server source - USING CENTRALIZED BUILDER"""
-    return FlexibleSource(
+    return _partitioned(FlexibleSource(
         type="SqlServerSource",
         sqlReaderQuery=query,
         queryTimeout=kwargs.get("queryTimeout", "02:00:00"),
@@ -272,11 +576,11 @@ def create_sqlserver_source(connection_id: str, query: str, **kwargs) -> Flexibl
             schema=kwargs.get("schema", "dbo"),
             table=kwargs.get("table", "test_table")
         )
-    )
+    ), kwargs)
 
 def create_oracle_source(connection_id: str, query: str, **kwargs) -> FlexibleSource:
     """Create Oracle source - USING CENTRALIZED BUILDER"""
-    return FlexibleSource(
+    return _partitioned(FlexibleSource(
         type="OracleSource",
         oracleReaderQuery=query,
         datasetSettings=create_database_dataset_settings(
@@ -285,7 +589,7 @@ def create_oracle_source(connection_id: str, query: str, **kwargs) -> FlexibleSo
             schema=kwargs.get("schema", "HR"),
             table=kwargs.get("table", "test_table")
         )
-    )
+    ), kwargs)
 
 # =============================================================================
 # ROUND-TRIP VERIFIED PATTERNS (Latest Session - API 200 + UI Persistence)
@@ -293,7 +597,7 @@ def create_oracle_source(connection_id: str, query: str, **kwargs) -> FlexibleSo
 
 def create_azuresqldatabase_source(connection_id: str, query: str, **kwargs) -> FlexibleSource:
     """Create Azure SQL Database source - ROUND-TRIP VERIFIED ✅ - USING CENTRALIZED BUILDER"""
-    return FlexibleSource(
+    return _partitioned(FlexibleSource(
         type="AzureSqlSource",
         sqlReaderQuery=query,
         queryTimeout=kwargs.get("queryTimeout", "02:00:00"),
@@ -303,11 +607,11 @@ def create_azuresqldatabase_source(connection_id: str, query: str, **kwargs) ->
             schema=kwargs.get("schema", "dbo"),
             table=kwargs.get("table", "test_table")
         )
-    )
+    ), kwargs)
 
 def create_teradata_source(connection_id: str, query: str, **kwargs) -> FlexibleSource:
     """Create Teradata source - ROUND-TRIP VERIFIED ✅ - USING CENTRALIZED BUILDER"""
-    return FlexibleSource(
+    return _partitioned(FlexibleSource(
         type="TeradataSource",
         sqlReaderQuery=query,
         queryTimeout=kwargs.get("queryTimeout", "02:00:00"),
@@ -317,11 +621,11 @@ def create_teradata_source(connection_id: str, query: str, **kwargs) -> Flexible
             schema=kwargs.get("schema", "DBC"),
             table=kwargs.get("table", "test_table")
         )
-    )
+    ), kwargs)
 
 def create_azuresqldw_source(connection_id: str, query: str, **kwargs) -> FlexibleSource:
     """Create Azure Synapse Analytics (SQL DW) source - ROUND-TRIP VERIFIED ✅ - USING CENTRALIZED BUILDER"""
-    return FlexibleSource(
+    return _partitioned(FlexibleSource(
         type="AzureSqlDWSource",
         sqlReaderQuery=query,
         queryTimeout=kwargs.get("queryTimeout", "02:00:00"),
@@ -331,11 +635,11 @@ def create_azuresqldw_source(connection_id: str, query: str, **kwargs) -> Flexib
             schema=kwargs.get("schema", "dbo"),
             table=kwargs.get("table", "test_table")
         )
-    )
+    ), kwargs)
 
 def create_postgresql_source(connection_id: str, query: str, **kwargs) -> FlexibleSource:
     """Create PostgreSQL source - ROUND-TRIP VERIFIED ✅ - USING CENTRALIZED BUILDER"""
-    return FlexibleSource(
+    return _partitioned(FlexibleSource(
         type="PostgreSqlSource",
         sqlReaderQuery=query,
         queryTimeout=kwargs.get("queryTimeout", "02:00:00"),
@@ -345,11 +649,11 @@ def create_postgresql_source(connection_id: str, query: str, **kwargs) -> Flexib
             schema=kwargs.get("schema", "public"),
             table=kwargs.get("table", "test_table")
         )
-    )
+    ), kwargs)
 
 def create_db2_source(connection_id: str, query: str, **kwargs) -> FlexibleSource:
     """Create IBM Db2 source - ROUND-TRIP VERIFIED ✅ - USING CENTRALIZED BUILDER"""
-    return FlexibleSource(
+    return _partitioned(FlexibleSource(
         type="Db2Source",
         sqlReaderQuery=query,
         queryTimeout=kwargs.get("queryTimeout", "02:00:00"),
@@ -359,7 +663,7 @@ def create_db2_source(connection_id: str, query: str, **kwargs) -> FlexibleSourc
             schema=kwargs.get("schema", "DB2ADMIN"),
             table=kwargs.get("table", "test_table")
         )
-    )
+    ), kwargs)
 
 # =============================================================================
 # PREVIOUSLY VERIFIED PATTERNS (Earlier Testing)
@@ -367,7 +671,7 @@ def create_db2_source(connection_id: str, query: str, **kwargs) -> FlexibleSourc
 
 def create_mysql_source(connection_id: str, query: str, **kwargs) -> FlexibleSource:
     """Create MySQL source - VERIFIED WORKING ✅ - USING CENTRALIZED BUILDER"""
-    return FlexibleSource(
+    return _partitioned(FlexibleSource(
         type="MySqlSource",
         sqlReaderQuery=query,
         queryTimeout=kwargs.get("queryTimeout", "02:00:00"),
@@ -377,11 +681,11 @@ def create_mysql_source(connection_id: str, query: str, **kwargs) -> FlexibleSou
             schema=kwargs.get("schema", "dbo"),
             table=kwargs.get("table", "test_table")
         )
-    )
+    ), kwargs)
 
 def create_azurepostgresql_source(connection_id: str, query: str, **kwargs) -> FlexibleSource:
     """Create Azure PostgreSQL source - ROUND-TRIP VERIFIED ✅ - USING CENTRALIZED BUILDER"""
-    return FlexibleSource(
+    return _partitioned(FlexibleSource(
         type="AzurePostgreSqlSource",
         sqlReaderQuery=query,
         queryTimeout=kwargs.get("queryTimeout", "02:00:00"),
@@ -391,7 +695,7 @@ def create_azurepostgresql_source(connection_id: str, query: str, **kwargs) -> F
             schema=kwargs.get("schema", "dbo"),
             table=kwargs.get("table", "test_table")
         )
-    )
+    ), kwargs)
 
 def create_googlecloudstorage_source(connection_id: str, **kwargs) -> FlexibleSource:
     """Create Google Cloud Storage source - ROUND-TRIP VERIFIED ✅ - USING CENTRALIZED BUILDER"""
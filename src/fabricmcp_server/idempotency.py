@@ -0,0 +1,133 @@
+"""
+Idempotency for tools that create items or start runs.
+
+A retried `create_fabric_item` or `run_pipeline` call must not create a second item
+or a second run. Each call is mapped to a key - the client-supplied idempotency key
+if there is one, otherwise (for tools that opt in) a hash of the tool name and its
+arguments - and the result of the first successful call is remembered in a bounded
+TTL cache. Repeats of the key get that result back; repeats that arrive while the
+first call is still in flight wait for it instead of calling Fabric again.
+
+Keys are scoped to the caller's session, so two clients never share results. An
+explicit key reused with different arguments is rejected rather than answered
+with the result of another call. Derived keys are opt-in for tools that start
+runs: an identical run started on purpose is not a retry.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Explicit keys are the client's promise that the call is a retry, so they are honoured
+# for much longer than derived keys, which only guard against quick automatic retries.
+EXPLICIT_KEY_TTL_SECONDS = float(os.getenv("FABRIC_IDEMPOTENCY_KEY_TTL", "3600"))
+DERIVED_KEY_WINDOW_SECONDS = float(os.getenv("FABRIC_IDEMPOTENCY_WINDOW", "120"))
+MAX_ENTRIES = int(os.getenv("FABRIC_IDEMPOTENCY_MAX_ENTRIES", "1024"))
+
+
+def derive_key(tool_name: str, arguments: Dict[str, Any]) -> str:
+    """Stable hash of a tool call; argument order does not matter."""
+    canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{tool_name}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+class IdempotencyConflict(ValueError):
+    """An explicit idempotency key was reused with different arguments."""
+
+
+class IdempotencyStore:
+    """Bounded store of recent results, keyed by idempotency key."""
+
+    def __init__(
+        self,
+        explicit_ttl: float = EXPLICIT_KEY_TTL_SECONDS,
+        derived_window: float = DERIVED_KEY_WINDOW_SECONDS,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self._explicit: TTLCache = TTLCache(maxsize=max_entries, ttl=explicit_ttl)
+        self._derived: Optional[TTLCache] = TTLCache(maxsize=max_entries, ttl=derived_window) if derived_window > 0 else None
+        self._inflight: Dict[str, Tuple[str, asyncio.Future]] = {}
+
+    async def run_once(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        call: Callable[[], Awaitable[Any]],
+        idempotency_key: Optional[str] = None,
+        scope: str = "",
+        derive: bool = True,
+    ) -> Any:
+        """
+        Runs `call` unless the same key succeeded recently or is running right now.
+        `scope` identifies the caller (session or credential); keys never match across scopes.
+        With `derive` False, calls without an explicit key always run.
+        Failures are not remembered, so a failed call can be retried with the same key.
+        Raises IdempotencyConflict if an explicit key is reused with different arguments.
+        """
+        arguments_hash = derive_key(tool_name, arguments)
+        if idempotency_key:
+            key, cache = f"{scope}:{tool_name}:{idempotency_key}", self._explicit
+        elif derive and self._derived is not None:
+            key, cache = f"{scope}:{arguments_hash}", self._derived
+        else:
+            return await call()
+
+        def check(original_hash: str) -> None:
+            if original_hash != arguments_hash:
+                raise IdempotencyConflict(
+                    f"Idempotency key '{idempotency_key}' was already used for a '{tool_name}' call with different arguments."
+                )
+
+        if key in cache:
+            original_hash, result = cache[key]
+            check(original_hash)
+            logger.info(f"Tool '{tool_name}': returning remembered result for duplicate call.")
+            return copy.deepcopy(result)
+
+        if (inflight := self._inflight.get(key)) is not None:
+            original_hash, pending = inflight
+            check(original_hash)
+            logger.info(f"Tool '{tool_name}': duplicate call is waiting for the in-flight original.")
+            try:
+                return copy.deepcopy(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                # Only swallow the original call being cancelled, not our own cancellation.
+                if not pending.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (arguments_hash, future)
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting; mark the exception as retrieved to avoid loop warnings.
+            future.exception()
+            raise
+        else:
+            cache[key] = (arguments_hash, result)
+            future.set_result(result)
+            return copy.deepcopy(result)
+        finally:
+            self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._explicit.clear()
+        if self._derived is not None:
+            self._derived.clear()
+
+
+idempotency_store = IdempotencyStore()
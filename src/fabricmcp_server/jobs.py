@@ -0,0 +1,176 @@
+"""
+Tracking of item jobs (pipeline runs, notebook runs, ...) started through this server.
+
+Tracked jobs can be cancelled individually or by filter, and the set of jobs that
+are still outstanding is persisted on shutdown and restored on the next start-up.
+Jobs seen finishing, and jobs older than the retention period, are pruned then.
+Long-running polls (e.g. watch_pipeline_run) register themselves here so that
+shutdown can let them finish their current poll before the clients are closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_STATE_FILE = "~/.fabricmcp/jobs.json"
+# Jobs started longer ago than this are no longer worth tracking across restarts
+JOB_RETENTION_HOURS = float(os.getenv("FABRIC_JOB_RETENTION_HOURS", "72"))
+
+# LRO statuses (Succeeded/Failed/Canceled) and job instance statuses (Completed/Cancelled/Deduped)
+FINISHED_STATUSES = frozenset({"Succeeded", "Failed", "Canceled", "Completed", "Cancelled", "Deduped"})
+
+
+class TrackedJob(BaseModel):
+    """A job instance started through this server that has not been seen finishing yet."""
+    job_id: str
+    workspace_id: str
+    item_id: str
+    job_type: str = "Pipeline"
+    status_url: Optional[str] = None
+    started_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    last_status: Optional[str] = None
+
+
+# Key: job_id (str), Value: TrackedJob
+tracked_jobs: Dict[str, TrackedJob] = {}
+
+_inflight_polls: Set[asyncio.Task] = set()
+_shutdown_event = asyncio.Event()
+
+
+def track_job(
+    job_id: str, workspace_id: str, item_id: str, job_type: str = "Pipeline", status_url: Optional[str] = None
+) -> TrackedJob:
+    job = TrackedJob(job_id=job_id, workspace_id=workspace_id, item_id=item_id, job_type=job_type, status_url=status_url)
+    tracked_jobs[job_id] = job
+    return job
+
+
+def untrack_job(job_id: str) -> Optional[TrackedJob]:
+    return tracked_jobs.pop(job_id, None)
+
+
+def record_job_status(job_id: str, status: Optional[str]) -> None:
+    """Notes the last status seen for a tracked job; a finished job stops being tracked."""
+    if status in FINISHED_STATUSES:
+        untrack_job(job_id)
+    elif (job := tracked_jobs.get(job_id)) is not None:
+        job.last_status = status
+
+
+def _outstanding(candidates: Iterable[TrackedJob]) -> List[TrackedJob]:
+    """The jobs that are neither seen finishing nor past the retention period."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=JOB_RETENTION_HOURS)
+    return [job for job in candidates if job.last_status not in FINISHED_STATUSES and job.started_at >= cutoff]
+
+
+def prune_tracked_jobs() -> int:
+    """Stops tracking finished and expired jobs. Returns the number of jobs dropped."""
+    keep = {job.job_id for job in _outstanding(tracked_jobs.values())}
+    dropped = [job_id for job_id in tracked_jobs if job_id not in keep]
+    for job_id in dropped:
+        del tracked_jobs[job_id]
+    return len(dropped)
+
+
+def find_jobs(
+    workspace_id: Optional[str] = None, item_id: Optional[str] = None, older_than_minutes: Optional[int] = None
+) -> List[TrackedJob]:
+    """Returns the tracked jobs matching every filter that is set."""
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=older_than_minutes) if older_than_minutes is not None else None
+    return [
+        job for job in tracked_jobs.values()
+        if (workspace_id is None or job.workspace_id == workspace_id)
+        and (item_id is None or job.item_id == item_id)
+        and (cutoff is None or job.started_at <= cutoff)
+    ]
+
+
+# --- Graceful shutdown -------------------------------------------------------
+
+def shutdown_requested() -> bool:
+    return _shutdown_event.is_set()
+
+
+async def wait_or_shutdown(seconds: float) -> bool:
+    """Sleeps for up to `seconds`; returns True early if the server is shutting down."""
+    try:
+        await asyncio.wait_for(_shutdown_event.wait(), timeout=seconds)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+
+@asynccontextmanager
+async def inflight_poll() -> AsyncIterator[None]:
+    """Marks the current task as an in-flight poll that shutdown should wait for."""
+    task = asyncio.current_task()
+    if task is not None:
+        _inflight_polls.add(task)
+    try:
+        yield
+    finally:
+        if task is not None:
+            _inflight_polls.discard(task)
+
+
+async def drain_inflight_polls(timeout: float) -> None:
+    """Signals shutdown and waits up to `timeout` seconds for in-flight polls to finish."""
+    _shutdown_event.set()
+    pending = [task for task in _inflight_polls if not task.done()]
+    if not pending:
+        return
+    logger.info(f"Waiting up to {timeout}s for {len(pending)} in-flight polls to finish.")
+    _, still_running = await asyncio.wait(pending, timeout=timeout)
+    if still_running:
+        logger.warning(f"{len(still_running)} polls did not finish before the shutdown deadline.")
+
+
+# --- Persistence -------------------------------------------------------------
+
+def _job_state_file() -> Path:
+    return Path(os.path.expanduser(os.getenv("FABRIC_JOB_STATE_FILE", DEFAULT_JOB_STATE_FILE)))
+
+
+def persist_tracked_jobs() -> int:
+    """Writes the outstanding jobs to the job state file. Returns the number of jobs written."""
+    path = _job_state_file()
+    if dropped := prune_tracked_jobs():
+        logger.info(f"Dropped {dropped} finished or expired jobs before persisting.")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = [job.model_dump(mode="json") for job in tracked_jobs.values()]
+        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    except OSError as e:
+        logger.error(f"Failed to persist outstanding jobs to {path}: {e}")
+        return 0
+    return len(tracked_jobs)
+
+
+def load_tracked_jobs() -> List[TrackedJob]:
+    """Restores the outstanding jobs persisted by a previous shutdown into `tracked_jobs`."""
+    path = _job_state_file()
+    if not path.exists():
+        return []
+    try:
+        persisted = [TrackedJob.model_validate(entry) for entry in json.loads(path.read_text(encoding="utf-8"))]
+    except (OSError, ValueError) as e:
+        logger.error(f"Ignoring unreadable job state file {path}: {e}")
+        return []
+    restored = _outstanding(persisted)
+    if len(restored) < len(persisted):
+        logger.info(f"Dropped {len(persisted) - len(restored)} finished or expired jobs from {path}.")
+    for job in restored:
+        tracked_jobs[job.job_id] = job
+    return restored
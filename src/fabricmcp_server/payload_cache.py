@@ -0,0 +1,145 @@
+"""
+Memoized Copy activity payload fragments.
+
+While refining a pipeline, agents regenerate the same source/sink configurations
+many times. Building them means validating the configuration into pydantic models
+and rendering the API payload, which is repeated work when nothing changed. The
+payload cache keys each fragment by a hash of its normalized configuration and
+keeps the most recently used ones in a bounded LRU cache.
+
+Cached fragments are shared between callers, so they are returned frozen:
+FrozenDict / FrozenList behave like dict / list (equality, JSON serialisation,
+pydantic validation) but refuse in-place changes. Copy the level you want to change
+(`{**fragment, "name": ...}`) or `thaw()` the whole fragment.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List
+
+from cachetools import LRUCache
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+# Number of fragments kept; 0 disables the cache.
+PAYLOAD_CACHE_SIZE = int(os.getenv("FABRIC_PAYLOAD_CACHE_SIZE", "1024"))
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is a shared cached payload fragment; copy it before changing it.")
+
+
+class FrozenDict(dict):
+    """A dict that refuses in-place changes."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """A list that refuses in-place changes."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively converts dicts and lists (and tuples) to their frozen counterparts."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """A mutable deep copy of a (possibly frozen) payload."""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [thaw(v) for v in value]
+    return value
+
+
+def config_hash(kind: str, config: Any) -> str:
+    """Stable hash of a configuration: key order and whitespace do not matter; models are dumped."""
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"), default=to_jsonable_python)
+    return hashlib.sha256(f"{kind}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+class PayloadCache:
+    """Bounded LRU cache of frozen payload fragments, with hit/miss counters."""
+
+    def __init__(self, max_entries: int = PAYLOAD_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._cache: LRUCache = LRUCache(maxsize=max(max_entries, 1))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, kind: str, config: Any, build: Callable[[], Any]) -> Any:
+        """
+        The frozen fragment for `config`, calling `build` only on a miss. `config` must
+        contain everything the fragment depends on. Exceptions from `build` are not cached.
+        """
+        if self.max_entries <= 0:
+            fragment = freeze(build())
+            with self._lock:
+                self.misses += 1
+            return fragment
+        key = config_hash(kind, config)
+        with self._lock:
+            fragment = self._cache.get(key)
+            if fragment is not None:
+                self.hits += 1
+                return fragment
+        fragment = freeze(build())
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = fragment
+        return fragment
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._cache) if self.max_entries > 0 else 0,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+payload_cache = PayloadCache()
+
+
+def cached_model_payload(build: Callable[..., BaseModel], *args: Any, **kwargs: Any) -> FrozenDict:
+    """
+    `build(*args, **kwargs).model_dump(exclude_none=True)`, memoized. For the
+    flexible_copy_schemas create_* helpers, whose result depends only on their arguments.
+    """
+    config: List[Any] = [args, kwargs]
+    return payload_cache.get_or_build(
+        f"{build.__module__}.{build.__qualname__}", config,
+        lambda: build(*args, **kwargs).model_dump(exclude_none=True),
+    )
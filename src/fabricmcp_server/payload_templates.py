@@ -0,0 +1,127 @@
+"""
+Connector registries and precompiled payload templates for Copy activity sources and sinks.
+
+A registry maps a model's `connector_type` discriminator to the function that builds
+its API payload, so building a payload is one dict lookup however many connectors
+are registered. Connectors whose payload is a fixed shape with a few values taken
+from the model are registered as a PayloadTemplate: the nested dict is compiled
+once, at import, into a single function that builds a fresh payload with the
+model's fields substituted, instead of re-walking the structure or deep-copying it
+on every build.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Dict, Iterator, List, Literal, Type, get_args, get_origin
+
+from pydantic import BaseModel
+
+PayloadBuilder = Callable[[Any], Dict[str, Any]]
+
+_CONSTANT_TYPES = (str, int, float, bool, type(None))
+
+
+class Slot:
+    """A placeholder in a PayloadTemplate, filled with the model's `field` attribute."""
+
+    __slots__ = ("field",)
+
+    def __init__(self, field: str):
+        if not field.isidentifier():
+            raise ValueError(f"Template slot '{field}' is not a valid field name.")
+        self.field = field
+
+    def __repr__(self) -> str:
+        return f"Slot({self.field!r})"
+
+
+class PayloadTemplate:
+    """
+    A payload shape compiled into a builder. Nested dicts and lists are rebuilt on every
+    call, so callers can modify the result; constants must be str, int, float, bool or None.
+    """
+
+    def __init__(self, template: Dict[str, Any], name: str = "payload"):
+        self.name = name
+        self.fields: List[str] = []
+        source = self._source(template)
+        code = compile(f"lambda m: {source}", f"<payload template {name}>", "eval")
+        self._build: PayloadBuilder = eval(code, {"__builtins__": {}})
+
+    def _source(self, value: Any) -> str:
+        if isinstance(value, Slot):
+            if value.field not in self.fields:
+                self.fields.append(value.field)
+            return f"m.{value.field}"
+        if isinstance(value, dict):
+            items = ", ".join(f"{self._key(k)}: {self._source(v)}" for k, v in value.items())
+            return "{" + items + "}"
+        if isinstance(value, list):
+            return "[" + ", ".join(self._source(v) for v in value) + "]"
+        if isinstance(value, _CONSTANT_TYPES) and not (isinstance(value, float) and not math.isfinite(value)):
+            return repr(value)
+        raise TypeError(f"Template '{self.name}' has an unsupported value {value!r}.")
+
+    def _key(self, key: Any) -> str:
+        if not isinstance(key, str):
+            raise TypeError(f"Template '{self.name}' has a non-string key {key!r}.")
+        return repr(key)
+
+    def __call__(self, model: Any) -> Dict[str, Any]:
+        return self._build(model)
+
+
+def connector_types(model: Type[BaseModel]) -> List[str]:
+    """The discriminator values of a model's `connector_type` Literal field."""
+    field = model.model_fields.get("connector_type")
+    if field is None or get_origin(field.annotation) is not Literal:
+        raise TypeError(f"{model.__name__} has no Literal 'connector_type' field.")
+    return list(get_args(field.annotation))
+
+
+class ConnectorRegistry:
+    """Payload builders keyed by connector_type."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._builders: Dict[str, PayloadBuilder] = {}
+        self._models: Dict[str, Type[BaseModel]] = {}
+
+    def register(self, model: Type[BaseModel]) -> Callable[[PayloadBuilder], PayloadBuilder]:
+        """Decorator registering a builder for every connector_type of `model`."""
+        def decorator(builder: PayloadBuilder) -> PayloadBuilder:
+            for key in connector_types(model):
+                if key in self._builders:
+                    raise ValueError(f"{self.kind} connector '{key}' is already registered to {self._models[key].__name__}.")
+                self._builders[key] = builder
+                self._models[key] = model
+            return builder
+        return decorator
+
+    def register_template(self, model: Type[BaseModel], template: Dict[str, Any]) -> PayloadTemplate:
+        """Registers a fixed payload shape whose Slots are filled from `model` fields."""
+        compiled = PayloadTemplate(template, name=f"{self.kind} {model.__name__}")
+        unknown = [f for f in compiled.fields if f not in model.model_fields]
+        if unknown:
+            raise ValueError(f"Template for {model.__name__} refers to unknown fields: {', '.join(unknown)}.")
+        self.register(model)(compiled)
+        return compiled
+
+    def build(self, config: Any) -> Dict[str, Any]:
+        builder = self._builders.get(getattr(config, "connector_type", None))
+        if builder is None:
+            raise NotImplementedError(f"{self.kind} type '{getattr(config, 'connector_type', None)}' is not supported.")
+        return builder(config)
+
+    def model(self, connector_type: str) -> Type[BaseModel]:
+        return self._models[connector_type]
+
+    def __contains__(self, connector_type: object) -> bool:
+        return connector_type in self._builders
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._builders)
+
+    def __len__(self) -> int:
+        return len(self._builders)
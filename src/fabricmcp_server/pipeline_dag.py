@@ -0,0 +1,253 @@
+"""
+Offline analysis of a pipeline's activity dependency graph.
+
+Every list of activities (the pipeline itself and each IfCondition, ForEach,
+Until and Switch body) is its own scope: `dependsOn` may only refer to
+activities of the same scope. For each scope the analyzer reports unknown
+references, cycles, topological levels (activities that can run side by side),
+the maximum parallel width and the critical path. All of it is linear in the
+number of activities and dependency edges.
+
+Works on plain activity dicts as they appear in pipeline-content.json; parsed
+`Activity` models can be passed through `model_dump(by_alias=True, exclude_none=True)`.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+ROOT_SCOPE = "pipeline"
+
+# Rough per-type durations used when no run history is available.
+DEFAULT_DURATION_ESTIMATES_SECONDS: Dict[str, float] = {
+    "Copy": 120.0,
+    "TridentNotebook": 300.0,
+    "DatabricksNotebook": 300.0,
+    "FabricSparkJobDefinition": 300.0,
+    "RefreshDataflow": 300.0,
+    "InvokePipeline": 300.0,
+    "SqlServerStoredProcedure": 60.0,
+    "Script": 60.0,
+    "Lookup": 20.0,
+    "GetMetadata": 10.0,
+    "WebActivity": 10.0,
+    "WebHook": 60.0,
+    "Teams": 5.0,
+    "Office365Outlook": 5.0,
+    "SetVariable": 1.0,
+    "AppendVariable": 1.0,
+    "Filter": 1.0,
+    "Fail": 1.0,
+}
+FALLBACK_DURATION_SECONDS = 30.0
+
+_TIMESPAN = re.compile(r"^(?:(\d+)\.)?(\d{1,2}):(\d{2}):(\d{2})$")
+
+
+class ScopeAnalysis(BaseModel):
+    """Graph facts for one list of sibling activities."""
+    scope: str
+    activity_count: int
+    levels: List[List[str]] = Field(default_factory=list, description="Topological levels; activities in one level do not depend on each other.")
+    max_parallel_width: int = 0
+    critical_path: List[str] = Field(default_factory=list)
+    critical_path_seconds: float = 0.0
+    cycles: List[List[str]] = Field(default_factory=list)
+    unknown_references: List[str] = Field(default_factory=list)
+
+
+class PipelineAnalysis(BaseModel):
+    valid: bool
+    errors: List[str] = Field(default_factory=list)
+    total_activities: int
+    duration_source: Dict[str, str] = Field(default_factory=dict, description="Per activity: 'history' or 'estimate'.")
+    scopes: List[ScopeAnalysis] = Field(default_factory=list)
+
+    @property
+    def root(self) -> ScopeAnalysis:
+        return self.scopes[0]
+
+
+def child_scopes(activity: Dict[str, Any]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+    """The nested activity lists of a container activity, labelled by where they live."""
+    props = activity.get("typeProperties") or {}
+    name = activity.get("name", "?")
+    kind = activity.get("type")
+    if kind == "IfCondition":
+        return [(f"{name}/ifTrueActivities", props.get("ifTrueActivities") or []),
+                (f"{name}/ifFalseActivities", props.get("ifFalseActivities") or [])]
+    if kind in ("ForEach", "Until"):
+        return [(f"{name}/activities", props.get("activities") or [])]
+    if kind == "Switch":
+        scopes = [(f"{name}/cases/{case.get('value')}", case.get("activities") or []) for case in props.get("cases") or []]
+        return scopes + [(f"{name}/defaultActivities", props.get("defaultActivities") or [])]
+    return []
+
+
+def dependency_graph(activities: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Activity name -> names it depends on, in declaration order."""
+    return {
+        a.get("name"): [d.get("activity") for d in a.get("dependsOn") or []]
+        for a in activities
+    }
+
+
+def estimate_duration_seconds(activity: Dict[str, Any]) -> float:
+    """Type-based estimate; Wait uses its configured wait time, and an explicit policy timeout caps the estimate."""
+    kind = activity.get("type")
+    props = activity.get("typeProperties") or {}
+    if kind == "Wait":
+        wait = props.get("waitTimeInSeconds")
+        return float(wait) if isinstance(wait, (int, float)) else FALLBACK_DURATION_SECONDS
+    estimate = DEFAULT_DURATION_ESTIMATES_SECONDS.get(kind, FALLBACK_DURATION_SECONDS)
+    timeout = timespan_seconds((activity.get("policy") or {}).get("timeout"))
+    return min(estimate, timeout) if timeout else estimate
+
+
+def timespan_seconds(value: Any) -> Optional[float]:
+    """Seconds in a "d.hh:mm:ss" / "hh:mm:ss" timespan, or None if it is not one."""
+    match = _TIMESPAN.match(value) if isinstance(value, str) else None
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return float(((days * 24 + hours) * 60 + minutes) * 60 + seconds)
+
+
+def _find_cycles(graph: Dict[str, List[str]], nodes: List[str]) -> List[List[str]]:
+    """Cycles among `nodes`, one per back edge found by an iterative DFS, in execution order."""
+    remaining = set(nodes)
+    state: Dict[str, int] = {}  # 1 = on stack, 2 = done
+    cycles = []
+    for start in nodes:
+        if start in state:
+            continue
+        stack: List[Tuple[str, int]] = [(start, 0)]
+        path: List[str] = []
+        while stack:
+            node, edge = stack.pop()
+            if edge == 0:
+                state[node] = 1
+                path.append(node)
+            preds = [p for p in graph.get(node, []) if p in remaining]
+            if edge < len(preds):
+                stack.append((node, edge + 1))
+                nxt = preds[edge]
+                if state.get(nxt) == 1:
+                    cycle = path[path.index(nxt):]
+                    cycles.append(list(reversed(cycle)) + [cycle[-1]] if len(cycle) > 1 else [nxt, nxt])
+                elif nxt not in state:
+                    stack.append((nxt, 0))
+            else:
+                state[node] = 2
+                path.pop()
+    return cycles
+
+
+def _analyze_scope(
+    scope: str, activities: List[Dict[str, Any]], durations: Dict[str, float]
+) -> ScopeAnalysis:
+    graph = dependency_graph(activities)
+    names = list(graph)
+    result = ScopeAnalysis(scope=scope, activity_count=len(activities))
+
+    for name, preds in graph.items():
+        for pred in preds:
+            if pred not in graph:
+                result.unknown_references.append(f"'{name}' depends on unknown activity '{pred}'")
+    known = {n: [p for p in preds if p in graph] for n, preds in graph.items()}
+
+    # Kahn's algorithm, tracking each node's level and longest finishing time.
+    successors: Dict[str, List[str]] = {n: [] for n in names}
+    indegree = {n: len(set(preds)) for n, preds in known.items()}
+    for n, preds in known.items():
+        for p in set(preds):
+            successors[p].append(n)
+
+    level = {n: 0 for n in names}
+    start = {n: 0.0 for n in names}
+    finish: Dict[str, float] = {}
+    best_pred: Dict[str, Optional[str]] = {n: None for n in names}
+    queue = deque(n for n in names if indegree[n] == 0)
+    ordered = []
+    while queue:
+        node = queue.popleft()
+        ordered.append(node)
+        finish[node] = start[node] + durations.get(node, 0.0)
+        for succ in successors[node]:
+            level[succ] = max(level[succ], level[node] + 1)
+            if best_pred[succ] is None or finish[node] > start[succ]:
+                start[succ], best_pred[succ] = finish[node], node
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                queue.append(succ)
+
+    if len(ordered) < len(names):
+        cyclic = [n for n in names if indegree[n] > 0]
+        result.cycles = _find_cycles(known, cyclic)
+
+    by_level: Dict[int, List[str]] = {}
+    for n in ordered:
+        by_level.setdefault(level[n], []).append(n)
+    result.levels = [by_level[i] for i in sorted(by_level)]
+    result.max_parallel_width = max((len(lvl) for lvl in result.levels), default=0)
+
+    if ordered:
+        end = max(ordered, key=lambda n: finish[n])
+        result.critical_path_seconds = round(finish[end], 3)
+        path = [end]
+        while best_pred[path[-1]] is not None:
+            path.append(best_pred[path[-1]])
+        result.critical_path = list(reversed(path))
+    return result
+
+
+def analyze_activities(
+    activities: List[Dict[str, Any]], history: Optional[Dict[str, float]] = None
+) -> PipelineAnalysis:
+    """
+    Analyzes the pipeline and all nested scopes.
+    `history` maps activity names to observed durations in seconds; other activities are estimated.
+    A container's duration is the critical path of its body (the longest branch for IfCondition/Switch,
+    one iteration for ForEach/Until) unless history has a duration for the container itself.
+    """
+    history = history or {}
+    durations: Dict[str, float] = {}
+    sources: Dict[str, str] = {}
+    scopes: List[ScopeAnalysis] = []
+    seen_names: Dict[str, int] = {}
+
+    def visit(scope: str, items: List[Dict[str, Any]]) -> ScopeAnalysis:
+        index = len(scopes)
+        scopes.append(None)  # reserve the slot so parents are listed before their bodies
+        for activity in items:
+            name = activity.get("name")
+            seen_names[name] = seen_names.get(name, 0) + 1
+            nested = [visit(label, body) for label, body in child_scopes(activity)]
+            if name in history:
+                durations[name], sources[name] = float(history[name]), "history"
+            elif nested:
+                durations[name], sources[name] = max(s.critical_path_seconds for s in nested), "estimate"
+            else:
+                durations[name], sources[name] = estimate_duration_seconds(activity), "estimate"
+        scopes[index] = _analyze_scope(scope, items, durations)
+        return scopes[index]
+
+    visit(ROOT_SCOPE, activities)
+
+    errors = [f"{s.scope}: {msg}" for s in scopes for msg in s.unknown_references]
+    errors += [f"{s.scope}: dependency cycle {' -> '.join(c)}" for s in scopes for c in s.cycles]
+    errors += [f"Activity name '{n}' is used {c} times; names must be unique in a pipeline." for n, c in seen_names.items() if c > 1]
+    return PipelineAnalysis(
+        valid=not errors,
+        errors=errors,
+        total_activities=sum(seen_names.values()),
+        duration_source=sources,
+        scopes=scopes,
+    )
@@ -0,0 +1,178 @@
+"""
+Structural diff of two pipeline definitions.
+
+Every activity gets a Merkle hash: the hash of its own fields plus the hashes of
+the activities nested in its IfCondition/ForEach/Until/Switch bodies. Activities
+are matched by name across all scopes (names are unique in a pipeline), so a
+change deep inside a container only changes the hashes on the path up to the
+root, and unchanged subtrees are skipped without being compared field by field.
+Building the index is linear in the size of the definitions; field-level diffs
+are only computed for activities whose own fields differ.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .definitions import canonical_json
+from .pipeline_dag import ROOT_SCOPE, child_scopes
+
+# Fields of a container activity that hold nested activities; they are compared through the children.
+_BODY_FIELDS = ("activities", "ifTrueActivities", "ifFalseActivities", "defaultActivities")
+
+
+class FieldChange(BaseModel):
+    """One difference, as a JSON Patch style operation relative to the activity (or pipeline)."""
+    op: str = Field(..., description="'add', 'remove' or 'replace'.")
+    path: str
+    before: Any = None
+    after: Any = None
+
+
+class ActivityDiff(BaseModel):
+    name: str
+    scope: str
+    previous_scope: Optional[str] = None
+    previous_name: Optional[str] = None
+    changes: List[FieldChange] = Field(default_factory=list)
+
+
+class DefinitionDiff(BaseModel):
+    identical: bool
+    base_hash: str
+    target_hash: str
+    added: List[ActivityDiff] = Field(default_factory=list)
+    removed: List[ActivityDiff] = Field(default_factory=list)
+    renamed: List[ActivityDiff] = Field(default_factory=list)
+    moved: List[ActivityDiff] = Field(default_factory=list, description="Activities now in a different scope.")
+    modified: List[ActivityDiff] = Field(default_factory=list)
+    pipeline_changes: List[FieldChange] = Field(default_factory=list, description="Parameters, variables and other pipeline properties.")
+
+
+class _Node:
+    __slots__ = ("name", "scope", "activity", "own", "own_hash", "merkle")
+
+    def __init__(self, name: str, scope: str, activity: Dict[str, Any], own: Dict[str, Any], own_hash: str, merkle: str):
+        self.name, self.scope, self.activity, self.own, self.own_hash, self.merkle = name, scope, activity, own, own_hash, merkle
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def own_fields(activity: Dict[str, Any]) -> Dict[str, Any]:
+    """The activity without its nested activity lists."""
+    if not child_scopes(activity):
+        return activity
+    props = dict(activity.get("typeProperties") or {})
+    for field in _BODY_FIELDS:
+        props.pop(field, None)
+    if "cases" in props:
+        props["cases"] = [{k: v for k, v in case.items() if k != "activities"} for case in props["cases"] or []]
+    return {**activity, "typeProperties": props}
+
+
+def _index(activities: List[Dict[str, Any]]) -> Tuple[Dict[str, _Node], str]:
+    """Name -> node for every activity in every scope, and the Merkle hash of the whole list."""
+    nodes: Dict[str, _Node] = {}
+
+    def visit(scope: str, items: List[Dict[str, Any]]) -> str:
+        hashes = []
+        for activity in items:
+            name = activity.get("name")
+            own = own_fields(activity)
+            own_hash = _sha(canonical_json(own))
+            body_hashes = [f"{label}={visit(label, body)}" for label, body in child_scopes(activity)]
+            merkle = _sha(own_hash + "|" + "|".join(body_hashes))
+            nodes[name] = _Node(name, scope, activity, own, own_hash, merkle)
+            hashes.append(merkle)
+        # Order of siblings does not matter to Fabric, only dependsOn does
+        return _sha("|".join(sorted(hashes)))
+
+    return nodes, visit(ROOT_SCOPE, activities)
+
+
+def _escape(key: str) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def field_diff(before: Any, after: Any, path: str = "") -> List[FieldChange]:
+    """Field-level differences between two JSON values; equal subtrees are not descended into."""
+    if before == after:
+        return []
+    if isinstance(before, dict) and isinstance(after, dict):
+        changes = []
+        for key in before:
+            if key not in after:
+                changes.append(FieldChange(op="remove", path=f"{path}/{_escape(key)}", before=before[key]))
+            else:
+                changes += field_diff(before[key], after[key], f"{path}/{_escape(key)}")
+        for key in after:
+            if key not in before:
+                changes.append(FieldChange(op="add", path=f"{path}/{_escape(key)}", after=after[key]))
+        return changes
+    if isinstance(before, list) and isinstance(after, list) and len(before) == len(after):
+        changes = []
+        for i, (b, a) in enumerate(zip(before, after)):
+            changes += field_diff(b, a, f"{path}/{i}")
+        return changes
+    return [FieldChange(op="replace", path=path or "/", before=before, after=after)]
+
+
+def diff_pipeline_contents(base: Dict[str, Any], target: Dict[str, Any]) -> DefinitionDiff:
+    """Compares two decoded `pipeline-content.json` documents."""
+    base_props = base.get("properties") or {}
+    target_props = target.get("properties") or {}
+    base_nodes, base_root = _index(base_props.get("activities") or [])
+    target_nodes, target_root = _index(target_props.get("activities") or [])
+
+    pipeline_changes = field_diff(
+        {**base, "properties": {k: v for k, v in base_props.items() if k != "activities"}},
+        {**target, "properties": {k: v for k, v in target_props.items() if k != "activities"}},
+    )
+    result = DefinitionDiff(
+        identical=base_root == target_root and not pipeline_changes,
+        base_hash=base_root, target_hash=target_root, pipeline_changes=pipeline_changes,
+    )
+    if base_root == target_root:
+        return result
+
+    removed = [n for name, n in base_nodes.items() if name not in target_nodes]
+    added = [n for name, n in target_nodes.items() if name not in base_nodes]
+
+    # An activity that only changed its name has the same fields apart from the name.
+    unnamed = {}
+    for node in removed:
+        unnamed.setdefault(_sha(canonical_json({**node.own, "name": None})), []).append(node)
+    renamed_from: Dict[str, _Node] = {}
+    for node in added:
+        candidates = unnamed.get(_sha(canonical_json({**node.own, "name": None})))
+        if candidates:
+            renamed_from[node.name] = candidates.pop(0)
+    renamed_away = {n.name for n in renamed_from.values()}
+
+    for node in removed:
+        if node.name not in renamed_away:
+            result.removed.append(ActivityDiff(name=node.name, scope=node.scope))
+    for node in added:
+        old = renamed_from.get(node.name)
+        if old is None:
+            result.added.append(ActivityDiff(name=node.name, scope=node.scope))
+        else:
+            result.renamed.append(ActivityDiff(
+                name=node.name, scope=node.scope, previous_name=old.name,
+                previous_scope=old.scope if old.scope != node.scope else None,
+            ))
+
+    for name, old in base_nodes.items():
+        new = target_nodes.get(name)
+        if new is None or old.merkle == new.merkle and old.scope == new.scope:
+            continue
+        if old.scope != new.scope:
+            result.moved.append(ActivityDiff(name=name, scope=new.scope, previous_scope=old.scope))
+        if old.own_hash != new.own_hash:
+            result.modified.append(ActivityDiff(name=name, scope=new.scope, changes=field_diff(old.own, new.own)))
+    return result
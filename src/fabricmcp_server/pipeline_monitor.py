@@ -0,0 +1,160 @@
+"""
+Incremental monitoring of Data Pipeline runs.
+
+A PipelineRunMonitor polls the job instance and its activity runs, and on each
+poll returns only the activity runs that are new or whose state changed since
+the previous poll, with per-activity row counts, throughput and duration.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# Job instance states after which a run will not change anymore
+TERMINAL_JOB_STATUSES = {"Completed", "Failed", "Cancelled", "Deduped"}
+
+# Activity runs are re-queried with this much overlap to absorb clock skew
+# between the service's lastUpdated timestamps and the local clock.
+_POLL_OVERLAP = timedelta(seconds=30)
+
+
+class ActivityRunSnapshot(BaseModel):
+    """Point-in-time view of a single activity run."""
+    activity_run_id: str
+    activity_name: str
+    activity_type: Optional[str] = None
+    status: Optional[str] = None
+    start: Optional[str] = None
+    end: Optional[str] = None
+    duration_ms: Optional[int] = None
+    rows_read: Optional[int] = None
+    rows_written: Optional[int] = None
+    throughput_kbps: Optional[float] = Field(None, description="Copy throughput as reported by the service (KB/s)")
+    error: Optional[str] = None
+
+    def fingerprint(self) -> Tuple[Any, ...]:
+        """The fields whose change makes the snapshot worth reporting again."""
+        return (self.status, self.end, self.duration_ms, self.rows_read, self.rows_written, self.throughput_kbps, self.error)
+
+
+def _to_iso(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def summarize_activity_run(raw: Dict[str, Any]) -> ActivityRunSnapshot:
+    """Maps a raw activity run from the API to an ActivityRunSnapshot."""
+    output = raw.get("output") or {}
+    if not isinstance(output, dict):
+        output = {}
+    error = raw.get("error") or {}
+    error_message = error.get("message") if isinstance(error, dict) else str(error)
+
+    return ActivityRunSnapshot(
+        activity_run_id=str(raw.get("activityRunId") or raw.get("id") or raw.get("activityName")),
+        activity_name=raw.get("activityName", "Unknown"),
+        activity_type=raw.get("activityType"),
+        status=raw.get("status"),
+        start=raw.get("activityRunStart"),
+        end=raw.get("activityRunEnd"),
+        duration_ms=raw.get("durationInMs"),
+        rows_read=output.get("rowsRead"),
+        rows_written=output.get("rowsCopied", output.get("rowsWritten")),
+        throughput_kbps=output.get("throughput"),
+        error=error_message or None,
+    )
+
+
+class PipelineRunMonitor:
+    """
+    Tracks a single pipeline run across polls.
+    Only activity runs updated since the previous poll are requested from the API.
+    """
+
+    def __init__(self, client, workspace_id: str, pipeline_id: str, job_id: str):
+        self._client = client
+        self.workspace_id = workspace_id
+        self.pipeline_id = pipeline_id
+        self.job_id = job_id
+        self.job_status: Optional[str] = None
+        self.failure_reason: Optional[Any] = None
+        self._updated_after: Optional[datetime] = None
+        self._fingerprints: Dict[str, Tuple[Any, ...]] = {}
+        self._activities: Dict[str, ActivityRunSnapshot] = {}
+
+    @property
+    def finished(self) -> bool:
+        return self.job_status in TERMINAL_JOB_STATUSES
+
+    @property
+    def activities(self) -> List[ActivityRunSnapshot]:
+        return list(self._activities.values())
+
+    async def poll(self) -> List[ActivityRunSnapshot]:
+        """Refreshes the run and returns the activity runs that are new or changed since the last poll."""
+        job = await self._client.get_job_instance(self.workspace_id, self.pipeline_id, self.job_id)
+        self.job_status = job.get("status")
+        self.failure_reason = job.get("failureReason")
+
+        now = datetime.now(timezone.utc)
+        if self._updated_after is None:
+            self._updated_after = (_parse_iso(job.get("startTimeUtc")) or now - timedelta(days=1)) - _POLL_OVERLAP
+        raw_runs = await self._client.query_activity_runs(
+            self.workspace_id, self.job_id, _to_iso(self._updated_after), _to_iso(now + _POLL_OVERLAP)
+        )
+        self._updated_after = now - _POLL_OVERLAP
+
+        changes = []
+        for raw in raw_runs:
+            snapshot = summarize_activity_run(raw)
+            fingerprint = snapshot.fingerprint()
+            if self._fingerprints.get(snapshot.activity_run_id) == fingerprint:
+                continue
+            self._fingerprints[snapshot.activity_run_id] = fingerprint
+            self._activities[snapshot.activity_run_id] = snapshot
+            changes.append(snapshot)
+
+        logger.debug(f"Run {self.job_id}: status={self.job_status}, {len(changes)} changed activity runs.")
+        return changes
+
+    def summary(self) -> Dict[str, Any]:
+        """Final or current view of the run, slowest activities first."""
+        ordered = sorted(self._activities.values(), key=lambda a: a.duration_ms or 0, reverse=True)
+        return {
+            "job_id": self.job_id,
+            "status": self.job_status,
+            "failure_reason": self.failure_reason,
+            "slowest_activity": ordered[0].activity_name if ordered else None,
+            "activities": [a.model_dump(exclude_none=True) for a in ordered],
+        }
+
+
+def format_activity_change(snapshot: ActivityRunSnapshot) -> str:
+    """One-line, human-readable progress message for an activity run change."""
+    parts = [f"{snapshot.activity_name} ({snapshot.activity_type or 'Activity'}): {snapshot.status}"]
+    if snapshot.duration_ms is not None:
+        parts.append(f"{snapshot.duration_ms / 1000:.1f}s")
+    if snapshot.rows_read is not None:
+        parts.append(f"read={snapshot.rows_read}")
+    if snapshot.rows_written is not None:
+        parts.append(f"written={snapshot.rows_written}")
+    if snapshot.throughput_kbps is not None:
+        parts.append(f"throughput={snapshot.throughput_kbps} KB/s")
+    if snapshot.error:
+        parts.append(f"error={snapshot.error}")
+    return ", ".join(parts)
@@ -0,0 +1,334 @@
+"""
+Rewrites a pipeline's `dependsOn` sets to expose more parallelism.
+
+Two rewrites are applied per scope (see pipeline_dag for scopes):
+
+* Transitive reduction: a "Succeeded" dependency on an activity that is already
+  implied by another chain of "Succeeded" dependencies is dropped. This never
+  changes when activities run, it only makes the graph readable.
+* Decoupling (opt-in): a serial "Succeeded" edge between two activities that do
+  not share data is replaced by the predecessor's own dependencies, so the two
+  can run side by side. Datasets are compared by store and normalised location:
+  a folder overlaps the files below it and a table overlaps queries that read it.
+  Anything that cannot be told from the definition counts as shared: activities
+  with side effects (notebooks, scripts, stored procedures, ...), datasets
+  without a known store and dynamic paths, tables or queries.
+
+Edges with Failed/Skipped/Completed conditions express control flow and are kept.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import re
+from typing import Any, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+from .expressions import is_expression
+from .pipeline_dag import analyze_activities, child_scopes, ROOT_SCOPE
+
+logger = logging.getLogger(__name__)
+
+# Activity types whose data access is fully described by their datasets, and types that touch no data.
+# Every other type (notebooks, scripts, web calls, control flow, Wait, ...) is treated as sharing data.
+_DATASET_TYPES = {"Copy", "Lookup", "GetMetadata", "Delete"}
+_VARIABLE_TYPES = {"SetVariable", "AppendVariable"}
+_DATA_FREE_TYPES = _VARIABLE_TYPES | {"Filter"}
+_VARIABLE_READ = re.compile(r"variables\(\s*'([^']+)'\s*\)")
+
+_QUERY_KEYS = ("sqlReaderQuery", "oracleReaderQuery", "query")
+_IDENTIFIER = r"(?:\[[^\]]+\]|\"[^\"]+\"|`[^`]+`|[\w$#]+)"
+_QUERY_TABLE = re.compile(rf"\b(?:from|join|into|update)\s+({_IDENTIFIER}(?:\s*\.\s*{_IDENTIFIER})*)", re.IGNORECASE)
+_IDENTIFIER_PART = re.compile(r"\[([^\]]+)\]|\"([^\"]+)\"|`([^`]+)`|([\w$#]+)")
+
+
+class DependencyChange(BaseModel):
+    scope: str
+    activity: str
+    removed: List[str] = Field(default_factory=list)
+    added: List[str] = Field(default_factory=list)
+    reason: str
+
+
+class OptimizationResult(BaseModel):
+    activities: List[Dict[str, Any]]
+    changes: List[DependencyChange] = Field(default_factory=list)
+    independent_chains: List[str] = Field(default_factory=list, description="Serial edges between activities that share no data.")
+    before_seconds: float
+    after_seconds: float
+    before_max_width: int
+    after_max_width: int
+
+
+def _succeeded_only(dependency: Dict[str, Any]) -> bool:
+    return list(dependency.get("dependencyConditions") or []) == ["Succeeded"]
+
+
+def _walk(value: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(value, dict):
+        yield value
+        for v in value.values():
+            yield from _walk(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _walk(v)
+
+
+class _Location(NamedTuple):
+    """A dataset: its store (by any of its identifiers) and a lower-cased path in it; () is the whole store."""
+    store: FrozenSet[Tuple[str, str]]
+    root_folder: Optional[str]  # Lakehouse 'tables' or 'files', which never overlap
+    kind: str  # "table": [schema.]table, "path": folders then file
+    path: Tuple[str, ...]
+
+
+def _dynamic(value: Any) -> bool:
+    return isinstance(value, dict) or is_expression(value)
+
+
+def _path(*values: Any) -> Tuple[str, ...]:
+    """Path components up to the first dynamic value or wildcard, which may match anything below it."""
+    parts: List[str] = []
+    for value in values:
+        if value is None:
+            continue
+        if _dynamic(value) or not isinstance(value, str):
+            break
+        for part in re.split(r"[\\/]", value):
+            part = part.strip().lower()
+            if "*" in part or "?" in part:
+                return tuple(parts)
+            if part:
+                parts.append(part)
+    return tuple(parts)
+
+
+def _table_path(schema: Any, table: Any) -> Tuple[str, ...]:
+    if not isinstance(table, str) or _dynamic(table):
+        return ()
+    parts = [next(p for p in m.groups() if p is not None).lower() for m in _IDENTIFIER_PART.finditer(table)]
+    if isinstance(schema, str) and schema and not _dynamic(schema) and len(parts) == 1:
+        parts.insert(0, schema.lower())
+    return tuple(parts)
+
+
+def _store(node: Dict[str, Any], settings: Dict[str, Any]) -> Optional[FrozenSet[Tuple[str, str]]]:
+    """Every identifier of the dataset's store; None if there is none or one is dynamic."""
+    linked = settings.get("linkedService") or {}
+    linked_properties = (linked.get("properties") or {}).get("typeProperties") or {}
+    references = settings.get("externalReferences") or node.get("externalReferences") or {}
+    identifiers = {
+        ("name", linked.get("name")),
+        ("artifact", linked_properties.get("artifactId")),
+        ("connection", references.get("connection")),
+    }
+    if any(_dynamic(value) for _, value in identifiers):
+        return None
+    store = frozenset((kind, value.lower()) for kind, value in identifiers if isinstance(value, str) and value)
+    return store or None
+
+
+def _dataset_locations(node: Dict[str, Any], settings: Dict[str, Any]) -> Optional[List[_Location]]:
+    store = _store(node, settings)
+    if store is None:
+        return None
+    root_folder = (((settings.get("linkedService") or {}).get("properties") or {}).get("typeProperties") or {}).get("rootFolder")
+    root_folder = root_folder.lower() if isinstance(root_folder, str) and not _dynamic(root_folder) else None
+    query = next((node[k] for k in _QUERY_KEYS if node.get(k)), None)
+    if query is not None:
+        tables = [] if _dynamic(query) or not isinstance(query, str) else _QUERY_TABLE.findall(query)
+        return [_Location(store, root_folder, "table", _table_path(None, t)) for t in tables] or [_Location(store, root_folder, "table", ())]
+
+    properties = settings.get("typeProperties") or {}
+    table = properties.get("table") or properties.get("tableName")
+    if table is not None:
+        return [_Location(store, root_folder, "table", _table_path(properties.get("schema"), table))]
+    location = properties.get("location") or properties
+    container = location.get("container") or location.get("bucketName") or location.get("fileSystem")
+    store_settings = node.get("storeSettings") or {}
+    if store_settings.get("wildcardFolderPath") is not None:
+        path = _path(container, store_settings["wildcardFolderPath"], "*")
+    else:
+        path = _path(container, location.get("folderPath"), location.get("fileName"))
+    return [_Location(store, root_folder, "path", path)]
+
+
+def _data_locations(activity: Dict[str, Any]) -> Optional[List[_Location]]:
+    """Every dataset the activity reads or writes; None if one of them cannot be told from the definition."""
+    locations: List[_Location] = []
+    for node in _walk(activity.get("typeProperties") or {}):
+        settings = node.get("datasetSettings")
+        if isinstance(settings, dict):
+            found = _dataset_locations(node, settings)
+            if found is None:
+                return None
+            locations.extend(found)
+        reference = node.get("dataset") or node.get("datasetReference")
+        if isinstance(reference, dict) and reference.get("referenceName"):
+            if _dynamic(reference["referenceName"]):
+                return None
+            locations.append(_Location(frozenset({("dataset", reference["referenceName"].lower())}), None, "path", ()))
+    if not locations and activity.get("type") in _DATASET_TYPES:
+        return None
+    return locations
+
+
+def _overlaps(a: _Location, b: _Location) -> bool:
+    if not a.store & b.store or (a.root_folder and b.root_folder and a.root_folder != b.root_folder):
+        return False
+    if a.kind != b.kind or not a.path or not b.path:
+        return True
+    short, long = sorted((a.path, b.path), key=len)
+    if a.kind == "table":  # a table without a schema may be in any schema
+        return long[len(long) - len(short):] == short
+    return long[:len(short)] == short
+
+
+def shares_data(upstream: Dict[str, Any], downstream: Dict[str, Any]) -> bool:
+    """Whether `downstream` may need something `upstream` produced; True unless the definitions show otherwise."""
+    known_types = _DATASET_TYPES | _DATA_FREE_TYPES
+    if upstream.get("type") not in known_types or downstream.get("type") not in known_types:
+        return True
+    text = json.dumps(downstream)
+    if re.search(r"activity\(\s*'" + re.escape(upstream.get("name", "")) + r"'\s*\)", text):
+        return True
+    if upstream.get("type") in _VARIABLE_TYPES:
+        variable = (upstream.get("typeProperties") or {}).get("variableName")
+        if variable in _VARIABLE_READ.findall(text):
+            return True
+        if downstream.get("type") in _VARIABLE_TYPES and (downstream.get("typeProperties") or {}).get("variableName") == variable:
+            return True
+    upstream_locations, downstream_locations = _data_locations(upstream), _data_locations(downstream)
+    if upstream_locations is None or downstream_locations is None:
+        return True
+    return any(_overlaps(a, b) for a in upstream_locations for b in downstream_locations)
+
+
+def _ancestors(graph: Dict[str, List[str]], order: List[str]) -> Dict[str, int]:
+    """Bitset of Succeeded-ancestors per activity, for a graph given in topological order."""
+    bit = {name: 1 << i for i, name in enumerate(order)}
+    ancestors: Dict[str, int] = {}
+    for name in order:
+        mask = 0
+        for pred in graph.get(name, []):
+            mask |= bit[pred] | ancestors[pred]
+        ancestors[name] = mask
+    return ancestors
+
+
+def _topological_order(graph: Dict[str, List[str]]) -> Optional[List[str]]:
+    indegree = {n: len(set(p)) for n, p in graph.items()}
+    successors: Dict[str, List[str]] = {n: [] for n in graph}
+    for n, preds in graph.items():
+        for p in set(preds):
+            successors[p].append(n)
+    order = [n for n, d in indegree.items() if d == 0]
+    for node in order:
+        for succ in successors[node]:
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                order.append(succ)
+    return order if len(order) == len(graph) else None
+
+
+def _optimize_scope(
+    scope: str, activities: List[Dict[str, Any]], decouple: bool,
+    changes: List[DependencyChange], independent: List[str],
+) -> None:
+    by_name = {a.get("name"): a for a in activities}
+    if len(by_name) != len(activities):
+        return
+    # Only Succeeded edges to known siblings take part; everything else is left as it is.
+    succeeded = {
+        name: [d["activity"] for d in a.get("dependsOn") or [] if _succeeded_only(d) and d.get("activity") in by_name]
+        for name, a in by_name.items()
+    }
+    full = {name: [d.get("activity") for d in a.get("dependsOn") or [] if d.get("activity") in by_name] for name, a in by_name.items()}
+    order = _topological_order(full)
+    if order is None:
+        logger.warning(f"Scope '{scope}' has a dependency cycle; not optimizing it.")
+        return
+
+    removed: Dict[str, List[str]] = {n: [] for n in by_name}
+    added: Dict[str, List[str]] = {n: [] for n in by_name}
+    reasons: Dict[str, Set[str]] = {n: set() for n in by_name}
+
+    for name in order:
+        pending = list(succeeded[name])
+        while pending:
+            pred = pending.pop(0)
+            if shares_data(by_name[pred], by_name[name]):
+                continue
+            independent.append(f"{scope}: {pred} -> {name}")
+            pred_deps = by_name[pred].get("dependsOn") or []
+            if not decouple or not all(_succeeded_only(d) for d in pred_deps):
+                continue
+            succeeded[name].remove(pred)
+            if pred in added[name]:
+                added[name].remove(pred)
+            else:
+                removed[name].append(pred)
+            reasons[name].add("no shared data")
+            # Keep waiting for what the predecessor waited for; those edges are checked in turn.
+            for inherited in succeeded[pred]:
+                if inherited not in succeeded[name]:
+                    succeeded[name].append(inherited)
+                    added[name].append(inherited)
+                    pending.append(inherited)
+
+    # Transitive reduction of the (possibly decoupled) Succeeded graph.
+    ancestors = _ancestors(succeeded, order)
+    bit = {name: 1 << i for i, name in enumerate(order)}
+    for name in order:
+        preds = succeeded[name]
+        implied = 0
+        for pred in preds:
+            implied |= ancestors[pred]
+        for pred in [p for p in preds if implied & bit[p]]:
+            preds.remove(pred)
+            if pred in added[name]:
+                added[name].remove(pred)
+            else:
+                removed[name].append(pred)
+                reasons[name].add("implied by another dependency chain")
+
+    for name, activity in by_name.items():
+        if not removed[name] and not added[name]:
+            continue
+        kept = [d for d in activity.get("dependsOn") or [] if not (_succeeded_only(d) and d.get("activity") in removed[name])]
+        kept += [{"activity": a, "dependencyConditions": ["Succeeded"]} for a in added[name]]
+        activity["dependsOn"] = kept
+        changes.append(DependencyChange(
+            scope=scope, activity=name, removed=removed[name], added=added[name], reason=", ".join(sorted(reasons[name])),
+        ))
+
+
+def optimize_dependencies(
+    activities: List[Dict[str, Any]], decouple_independent: bool = False, history: Optional[Dict[str, float]] = None
+) -> OptimizationResult:
+    """Returns rewritten copies of the activities, the changes made and the before/after runtime estimate."""
+    optimized = copy.deepcopy(activities)
+    changes: List[DependencyChange] = []
+    independent: List[str] = []
+
+    def visit(scope: str, items: List[Dict[str, Any]]) -> None:
+        _optimize_scope(scope, items, decouple_independent, changes, independent)
+        for activity in items:
+            for label, body in child_scopes(activity):
+                visit(label, body)
+
+    visit(ROOT_SCOPE, optimized)
+    before = analyze_activities(activities, history).root
+    after = analyze_activities(optimized, history).root
+    return OptimizationResult(
+        activities=optimized,
+        changes=changes,
+        independent_chains=independent,
+        before_seconds=before.critical_path_seconds,
+        after_seconds=after.critical_path_seconds,
+        before_max_width=before.max_parallel_width,
+        after_max_width=after.max_parallel_width,
+    )
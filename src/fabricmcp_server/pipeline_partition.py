@@ -0,0 +1,221 @@
+"""
+Splitting of oversized pipelines into child pipelines run by a parent.
+
+Fabric limits the number of activities in a pipeline (nested container bodies
+count too). The partitioner orders the top-level DAG so that connected chains
+stay together, then cuts that order into the fewest segments that fit the limit,
+choosing cut points that cross the fewest dependency edges and keep segments
+balanced. Because every segment is a contiguous slice of a topological order,
+dependencies between children only point forward and the parent is acyclic.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+from .pipeline_dag import child_scopes, dependency_graph
+
+logger = logging.getLogger(__name__)
+
+MAX_ACTIVITIES_PER_PIPELINE = int(os.getenv("FABRIC_MAX_PIPELINE_ACTIVITIES", "120"))
+
+_VARIABLE_READ = re.compile(r"variables\(\s*'([^']+)'\s*\)")
+
+
+class ChildPipeline(BaseModel):
+    name: str
+    activities: List[Dict[str, Any]]
+    activity_count: int = Field(..., description="Activities including nested container bodies.")
+    depends_on: List[str] = Field(default_factory=list, description="Names of child pipelines that must finish first.")
+
+
+class PartitionPlan(BaseModel):
+    children: List[ChildPipeline]
+    cross_edges: int = Field(0, description="Dependencies that now run between child pipelines.")
+    warnings: List[str] = Field(default_factory=list)
+
+
+def activity_weight(activity: Dict[str, Any]) -> int:
+    """The activity itself plus everything nested in it."""
+    return 1 + sum(activity_weight(a) for _, body in child_scopes(activity) for a in body)
+
+
+def _variables_set(activities: List[Dict[str, Any]]) -> Iterator[str]:
+    for activity in activities:
+        if activity.get("type") in ("SetVariable", "AppendVariable"):
+            name = (activity.get("typeProperties") or {}).get("variableName")
+            if isinstance(name, str):
+                yield name
+        for _, body in child_scopes(activity):
+            yield from _variables_set(body)
+
+
+def variables_used(activities: List[Dict[str, Any]]) -> Set[str]:
+    """Variables the activities (nested ones included) set or read; each pipeline must declare them."""
+    return set(_variables_set(activities)) | set(_VARIABLE_READ.findall(str(activities)))
+
+
+def _clustered_topological_order(activities: List[Dict[str, Any]]) -> List[str]:
+    """Topological order that emits each activity's successors right after it where possible (LIFO Kahn)."""
+    graph = dependency_graph(activities)
+    names = list(graph)
+    successors: Dict[str, List[str]] = {n: [] for n in names}
+    indegree = {n: 0 for n in names}
+    for name, preds in graph.items():
+        for pred in dict.fromkeys(preds):
+            if pred in successors:
+                successors[pred].append(name)
+                indegree[name] += 1
+    stack = [n for n in reversed(names) if indegree[n] == 0]
+    order = []
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        for succ in reversed(successors[node]):
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                stack.append(succ)
+    if len(order) != len(names):
+        raise ValueError("The activities contain a dependency cycle; run 'analyze_pipeline' for details.")
+    return order
+
+
+def _cut_points(weights: List[int], crossing: List[int], limit: int) -> List[int]:
+    """
+    Segment boundaries for the order: fewest segments first, then fewest crossing edges,
+    then the most even sizes. `crossing[i]` is the number of edges cut by a boundary before position i.
+    """
+    n = len(weights)
+    prefix = [0]
+    for w in weights:
+        prefix.append(prefix[-1] + w)
+    segments_needed = -(-prefix[-1] // limit)
+    target = prefix[-1] / max(segments_needed, 1)
+
+    best: List[Optional[Tuple[int, int, float]]] = [None] * (n + 1)
+    back = [0] * (n + 1)
+    best[0] = (0, 0, 0.0)
+    for end in range(1, n + 1):
+        start = end - 1
+        while start >= 0 and prefix[end] - prefix[start] <= limit:
+            if best[start] is not None:
+                segments, cuts, imbalance = best[start]
+                candidate = (
+                    segments + 1,
+                    cuts + (crossing[start] if start > 0 else 0),
+                    imbalance + (prefix[end] - prefix[start] - target) ** 2,
+                )
+                if best[end] is None or candidate < best[end]:
+                    best[end], back[end] = candidate, start
+            start -= 1
+    if best[n] is None:
+        raise ValueError(f"An activity is larger than the limit of {limit} activities and cannot be split.")
+
+    bounds = [n]
+    while bounds[-1] > 0:
+        bounds.append(back[bounds[-1]])
+    return list(reversed(bounds))
+
+
+def partition_activities(
+    pipeline_name: str, activities: List[Dict[str, Any]], max_activities: int = MAX_ACTIVITIES_PER_PIPELINE
+) -> PartitionPlan:
+    """Splits the top-level activities into child pipelines of at most `max_activities` each."""
+    by_name = {a["name"]: a for a in activities}
+    order = _clustered_topological_order(activities)
+    position = {name: i for i, name in enumerate(order)}
+    graph = dependency_graph(activities)
+
+    # crossing[i]: edges from before position i to at or after it
+    delta = [0] * (len(order) + 1)
+    for name, preds in graph.items():
+        for pred in dict.fromkeys(preds):
+            if pred in position:
+                delta[position[pred] + 1] += 1
+                delta[position[name] + 1] -= 1
+    crossing, running = [], 0
+    for i in range(len(order) + 1):
+        running += delta[i]
+        crossing.append(running)
+
+    bounds = _cut_points([activity_weight(by_name[n]) for n in order], crossing, max_activities)
+    segment_of = {}
+    children: List[ChildPipeline] = []
+    for index, (start, end) in enumerate(zip(bounds, bounds[1:]), start=1):
+        members = order[start:end]
+        child_name = f"{pipeline_name}_part{index:02d}"
+        for member in members:
+            segment_of[member] = child_name
+        children.append(ChildPipeline(
+            name=child_name,
+            activities=[dict(by_name[m]) for m in members],
+            activity_count=sum(activity_weight(by_name[m]) for m in members),
+        ))
+
+    warnings: List[str] = []
+    cross_edges = 0
+    for child in children:
+        upstream = []
+        for activity in child.activities:
+            kept = []
+            for dep in activity.get("dependsOn") or []:
+                source = segment_of.get(dep.get("activity"))
+                if source is None or source == child.name:
+                    kept.append(dep)
+                    continue
+                cross_edges += 1
+                if source not in upstream:
+                    upstream.append(source)
+                if list(dep.get("dependencyConditions") or []) != ["Succeeded"]:
+                    warnings.append(
+                        f"'{activity['name']}' depended on '{dep['activity']}' with {dep.get('dependencyConditions')}; "
+                        f"across pipelines it now waits for '{source}' to succeed."
+                    )
+            activity["dependsOn"] = kept
+            text = str(activity)
+            for other, other_child in segment_of.items():
+                if other_child != child.name and f"activity('{other}')" in text:
+                    warnings.append(f"'{activity['name']}' reads the output of '{other}', which is now in '{other_child}'.")
+        child.depends_on = upstream
+
+    variable_owner: Dict[str, str] = {}
+    for child in children:
+        for variable in _variables_set(child.activities):
+            variable_owner[variable] = child.name
+    for child in children:
+        for variable in set(_VARIABLE_READ.findall(str(child.activities))):
+            owner = variable_owner.get(variable)
+            if owner and owner != child.name:
+                warnings.append(f"Variable '{variable}' is set in '{owner}' but read in '{child.name}'; variables are not shared between pipelines.")
+
+    logger.info(f"Split '{pipeline_name}' into {len(children)} child pipelines with {cross_edges} cross-pipeline dependencies.")
+    return PartitionPlan(children=children, cross_edges=cross_edges, warnings=warnings)
+
+
+def build_parent_activities(
+    plan: PartitionPlan, child_ids: Dict[str, str], workspace_id: str, connection_id: str,
+    parameter_names: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """InvokePipeline activities that run the children in dependency order, forwarding the pipeline parameters."""
+    forwarded = {p: {"value": f"@pipeline().parameters.{p}", "type": "Expression"} for p in parameter_names or []}
+    return [
+        {
+            "name": f"Run_{child.name}",
+            "type": "InvokePipeline",
+            "dependsOn": [{"activity": f"Run_{d}", "dependencyConditions": ["Succeeded"]} for d in child.depends_on],
+            "typeProperties": {
+                "operationType": "InvokeFabricPipeline",
+                "workspaceId": workspace_id,
+                "pipelineId": child_ids[child.name],
+                "waitOnCompletion": True,
+                **({"parameters": forwarded} if forwarded else {}),
+            },
+            "externalReferences": {"connection": connection_id},
+        }
+        for child in plan.children
+    ]
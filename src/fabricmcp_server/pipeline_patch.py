@@ -0,0 +1,166 @@
+"""
+RFC 6902 (JSON Patch) operations on pipeline content, addressed by activity name.
+
+Paths are JSON Pointers relative to the pipeline's `properties`, e.g.
+`/activities/Copy_Orders/typeProperties/sink/tableActionOption`. Wherever a
+pointer steps into a list of named objects (activities, including the ones
+nested in ForEach/IfCondition/Until/Switch), the token may be the object's
+`name` instead of its index; `-` appends as usual.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class PatchError(ValueError):
+    """Raised when an operation cannot be applied; the document is left unchanged."""
+
+
+class PatchOperation(BaseModel):
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str = Field(..., description="JSON Pointer relative to the pipeline properties, e.g. '/activities/Copy_Orders/policy/retry'.")
+    value: Optional[Any] = Field(None, description="Value for add, replace and test.")
+    from_: Optional[str] = Field(None, alias="from", description="Source pointer for move and copy.")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+def _tokens(pointer: str) -> List[str]:
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(f"Invalid pointer '{pointer}': must start with '/'.")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _index(container: List[Any], token: str, pointer: str, for_add: bool = False) -> int:
+    if token == "-" and for_add:
+        return len(container)
+    if token.isdigit():
+        index = int(token)
+        if index > len(container) or (index == len(container) and not for_add):
+            raise PatchError(f"Index {index} out of range at '{pointer}'.")
+        return index
+    for index, element in enumerate(container):
+        if isinstance(element, dict) and element.get("name") == token:
+            return index
+    raise PatchError(f"No element named '{token}' at '{pointer}'.")
+
+
+def _resolve_parent(document: Any, pointer: str) -> Tuple[Any, str]:
+    tokens = _tokens(pointer)
+    if not tokens:
+        raise PatchError("Operations on the whole document are not supported.")
+    node = document
+    for token in tokens[:-1]:
+        if isinstance(node, list):
+            node = node[_index(node, token, pointer)]
+        elif isinstance(node, dict) and token in node:
+            node = node[token]
+        else:
+            raise PatchError(f"Path '{pointer}' does not exist.")
+    return node, tokens[-1]
+
+
+def _get(document: Any, pointer: str) -> Any:
+    parent, token = _resolve_parent(document, pointer)
+    if isinstance(parent, list):
+        return parent[_index(parent, token, pointer)]
+    if isinstance(parent, dict) and token in parent:
+        return parent[token]
+    raise PatchError(f"Path '{pointer}' does not exist.")
+
+
+def _add(document: Any, pointer: str, value: Any) -> None:
+    parent, token = _resolve_parent(document, pointer)
+    if isinstance(parent, list):
+        parent.insert(_index(parent, token, pointer, for_add=True), value)
+    elif isinstance(parent, dict):
+        parent[token] = value
+    else:
+        raise PatchError(f"Cannot add at '{pointer}': parent is not an object or array.")
+
+
+def _remove(document: Any, pointer: str) -> Any:
+    parent, token = _resolve_parent(document, pointer)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, token, pointer))
+    if isinstance(parent, dict) and token in parent:
+        return parent.pop(token)
+    raise PatchError(f"Path '{pointer}' does not exist.")
+
+
+def _top_level_activity(properties: Dict[str, Any], pointer: Optional[str]) -> Optional[Dict[str, Any]]:
+    """The top-level activity a pointer currently lands in, if any."""
+    tokens = _tokens(pointer) if pointer else []
+    activities = properties.get("activities")
+    if len(tokens) < 2 or tokens[0] != "activities" or not isinstance(activities, list) or not activities:
+        return None
+    try:
+        activity = activities[-1] if tokens[1] == "-" else activities[_index(activities, tokens[1], pointer)]
+    except PatchError:
+        return None
+    return activity if isinstance(activity, dict) else None
+
+
+def apply_pipeline_patch(
+    properties: Dict[str, Any], operations: List[PatchOperation]
+) -> Tuple[Dict[str, Any], Set[str]]:
+    """
+    Applies the operations atomically to a copy of the pipeline `properties`.
+    Returns the patched copy and the names of the top-level activities that were changed.
+    """
+    patched = copy.deepcopy(properties)
+    touched: List[Dict[str, Any]] = []
+
+    for number, operation in enumerate(operations, start=1):
+        if operation.op != "test":
+            # Activities edited in place are looked up before the operation, so that renames are followed.
+            # Inserting a whole activity does not edit the one currently at its position.
+            inserts = operation.op in ("add", "move", "copy") and len(_tokens(operation.path)) == 2
+            before = [] if inserts else [_top_level_activity(patched, operation.path)]
+            touched.extend(filter(None, before + [_top_level_activity(patched, operation.from_)]))
+        try:
+            if operation.op == "add":
+                _add(patched, operation.path, copy.deepcopy(operation.value))
+            elif operation.op == "remove":
+                _remove(patched, operation.path)
+            elif operation.op == "replace":
+                parent, token = _resolve_parent(patched, operation.path)
+                if isinstance(parent, list):
+                    parent[_index(parent, token, operation.path)] = copy.deepcopy(operation.value)
+                elif isinstance(parent, dict) and token in parent:
+                    parent[token] = copy.deepcopy(operation.value)
+                else:
+                    raise PatchError(f"Path '{operation.path}' does not exist.")
+            elif operation.op in ("move", "copy"):
+                if operation.from_ is None:
+                    raise PatchError(f"'{operation.op}' requires 'from'.")
+                value = _remove(patched, operation.from_) if operation.op == "move" else copy.deepcopy(_get(patched, operation.from_))
+                _add(patched, operation.path, value)
+            elif operation.op == "test":
+                if _get(patched, operation.path) != operation.value:
+                    raise PatchError(f"Test failed at '{operation.path}'.")
+        except PatchError as e:
+            raise PatchError(f"Operation {number} ({operation.op} {operation.path}): {e}") from None
+        if operation.op != "test":
+            # Covers activities that were added or replaced as a whole.
+            touched.extend(filter(None, [_top_level_activity(patched, operation.path)]))
+
+    remaining = {id(a) for a in patched.get("activities") or []}
+    return patched, {a.get("name") for a in touched if id(a) in remaining}
+
+
+def dangling_dependencies(activities: List[Dict[str, Any]]) -> List[str]:
+    """Messages for `dependsOn` entries that point at activities that do not exist."""
+    names = {a.get("name") for a in activities}
+    return [
+        f"Activity '{a.get('name')}' depends on unknown activity '{d.get('activity')}'."
+        for a in activities
+        for d in a.get("dependsOn") or []
+        if d.get("activity") not in names
+    ]
@@ -0,0 +1,435 @@
+"""
+Dry-run simulation of a pipeline with mocked activities.
+
+A discrete-event scheduler runs the activity graph on a virtual clock: an activity
+starts when all its dependencies have finished, and runs only if every dependency
+ended in one of the required conditions (otherwise it is Skipped). Containers run
+their bodies as nested scopes: ForEach in batches of `batchCount` (one at a time
+if sequential), Until until its condition holds, IfCondition/Switch on the chosen
+branch. Leaf activities take their modelled duration per attempt, with
+`policy.retry` attempts spaced by `policy.retryIntervalInSeconds`.
+
+Conditions, ForEach items and Switch values are evaluated with the expression
+evaluator, using the pipeline's parameter and variable values; SetVariable and
+AppendVariable update the variables as they complete, and mocked outputs are
+visible through activity('X').output. When a value only exists at run time, an
+explicit override is used, or an assumption is made and reported.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .expressions import EvaluationContext, ExpressionError, RuntimeOnlyError, evaluate_expression, pipeline_evaluation_context, to_string
+from .pipeline_dag import analyze_activities, child_scopes, estimate_duration_seconds, timespan_seconds
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FOREACH_BATCH_COUNT = 20
+MAX_FOREACH_BATCH_COUNT = 50
+DEFAULT_RETRY_INTERVAL_SECONDS = 30.0
+DEFAULT_MAX_UNTIL_ITERATIONS = 100
+_CONTAINERS = ("ForEach", "Until", "IfCondition", "Switch")
+
+
+class SimulationOptions(BaseModel):
+    durations: Dict[str, float] = Field(default_factory=dict, description="Seconds per attempt, keyed by activity name or activity type.")
+    history: Dict[str, float] = Field(default_factory=dict, description="Observed seconds per activity name from a previous run.")
+    outcomes: Dict[str, str] = Field(default_factory=dict, description="Activity name -> 'Failed' to make every attempt fail.")
+    failed_attempts: Dict[str, int] = Field(default_factory=dict, description="Activity name -> number of attempts that fail before one succeeds.")
+    outputs: Dict[str, Any] = Field(default_factory=dict, description="Mocked activity outputs, read by activity('X').output.")
+    branches: Dict[str, Any] = Field(default_factory=dict, description="IfCondition name -> true/false, or Switch name -> case value.")
+    iterations: Dict[str, int] = Field(default_factory=dict, description="ForEach item count or Until iteration count, by activity name.")
+    max_until_iterations: int = DEFAULT_MAX_UNTIL_ITERATIONS
+
+
+class SimulatedActivity(BaseModel):
+    """All runs of one activity (several for activities inside loops)."""
+    name: str
+    type: Optional[str] = None
+    runs: int = 0
+    statuses: Dict[str, int] = Field(default_factory=dict)
+    attempts: int = 0
+    first_start_seconds: Optional[float] = None
+    last_end_seconds: Optional[float] = None
+    busy_seconds: float = 0.0
+    duration_source: Optional[str] = None
+
+
+class SimulationResult(BaseModel):
+    status: str
+    makespan_seconds: float
+    peak_concurrency: int
+    peak_at_seconds: float
+    critical_path: List[str] = Field(default_factory=list, description="Activity runs that determined the end time, in order; loop iterations as 'Loop[2]/Copy'.")
+    activities: List[SimulatedActivity] = Field(default_factory=list)
+    assumptions: List[str] = Field(default_factory=list)
+
+
+class _Run:
+    __slots__ = ("name", "type", "label", "start", "end", "status", "attempts", "gate", "children")
+
+    def __init__(self, name: str, kind: Optional[str], label: str, start: float, gate: Optional["_Run"]):
+        self.name, self.type, self.label, self.start, self.gate = name, kind, label, start, gate
+        self.end = start
+        self.status = "Succeeded"
+        self.attempts = 0
+        self.children: List["_Run"] = []
+
+
+def _condition_met(status: str, conditions: List[str]) -> bool:
+    return status in conditions or ("Completed" in conditions and status in ("Succeeded", "Failed"))
+
+
+def _scope_status(activities: List[Dict[str, Any]], runs: Dict[str, _Run]) -> str:
+    """Fabric's rule: evaluate the leaves; a skipped leaf is replaced by its dependencies. Any failure fails the scope."""
+    has_dependents = {d.get("activity") for a in activities for d in a.get("dependsOn") or []}
+    preds = {a.get("name"): [d.get("activity") for d in a.get("dependsOn") or []] for a in activities}
+    pending = [a.get("name") for a in activities if a.get("name") not in has_dependents]
+    seen = set()
+    while pending:
+        name = pending.pop()
+        if name in seen or name not in runs:
+            continue
+        seen.add(name)
+        status = runs[name].status
+        if status == "Failed":
+            return "Failed"
+        if status == "Skipped":
+            pending.extend(preds.get(name, []))
+    return "Succeeded"
+
+
+class _Simulator:
+    def __init__(self, options: SimulationOptions, context: EvaluationContext):
+        self.options = options
+        self.context = context
+        self.now = 0.0
+        self.running = 0
+        self.peak = 0
+        self.peak_at = 0.0
+        self.assumptions: List[str] = []
+        self.sources: Dict[str, str] = {}
+        self.all_runs: List[_Run] = []
+        self._events: List[Tuple[float, int, Callable[[], None]]] = []
+        self._sequence = itertools.count()
+
+    def at(self, time: float, callback: Callable[[], None]) -> None:
+        heapq.heappush(self._events, (time, next(self._sequence), callback))
+
+    def run(self, activities: List[Dict[str, Any]]) -> Tuple[str, List[_Run]]:
+        outcome: Dict[str, Any] = {}
+
+        def done(status: str, runs: List[_Run]) -> None:
+            outcome["status"], outcome["runs"] = status, runs
+
+        self.run_scope(activities, "", None, self.context, done)
+        while self._events:
+            self.now, _, callback = heapq.heappop(self._events)
+            callback()
+        return outcome.get("status", "Failed"), outcome.get("runs", [])
+
+    def _assume(self, message: str) -> None:
+        if message not in self.assumptions:
+            self.assumptions.append(message)
+
+    def _evaluate(self, value: Any, context: EvaluationContext) -> Any:
+        """Evaluates an expression field ({'value': ..., 'type': 'Expression'} or a string). Raises RuntimeOnlyError."""
+        text = value.get("value") if isinstance(value, dict) else value
+        if not isinstance(text, str):
+            return text
+        try:
+            return evaluate_expression(text, context)
+        except RuntimeOnlyError:
+            raise
+        except ExpressionError as e:
+            raise RuntimeOnlyError(str(e))
+
+    # --- scopes -------------------------------------------------------------
+
+    def run_scope(
+        self, activities: List[Dict[str, Any]], prefix: str, parent_start: Optional[_Run],
+        context: EvaluationContext, on_done: Callable[[str, List[_Run]], None],
+    ) -> None:
+        if not activities:
+            self.at(self.now, lambda: on_done("Succeeded", []))
+            return
+        by_name = {a.get("name"): a for a in activities}
+        successors: Dict[str, List[str]] = {name: [] for name in by_name}
+        waiting = {}
+        for a in activities:
+            deps = {d.get("activity") for d in a.get("dependsOn") or []}
+            waiting[a.get("name")] = len(deps)
+            for dep in deps:
+                successors[dep].append(a.get("name"))
+        runs: Dict[str, _Run] = {}
+
+        def finished(run: _Run) -> None:
+            runs[run.name] = run
+            for succ in successors[run.name]:
+                waiting[succ] -= 1
+                if waiting[succ] == 0:
+                    ready(by_name[succ])
+            if len(runs) == len(by_name):
+                on_done(_scope_status(activities, runs), list(runs.values()))
+
+        def ready(activity: Dict[str, Any]) -> None:
+            deps = [(runs[d.get("activity")], list(d.get("dependencyConditions") or ["Succeeded"])) for d in activity.get("dependsOn") or []]
+            gate = max((r for r, _ in deps), key=lambda r: r.end, default=parent_start)
+            run = _Run(activity.get("name"), activity.get("type"), prefix + activity.get("name", "?"), self.now, gate)
+            self.all_runs.append(run)
+            if not all(_condition_met(r.status, conditions) for r, conditions in deps):
+                run.status = "Skipped"
+                self.at(self.now, lambda: finished(run))
+                return
+            self.start_activity(activity, run, context, lambda: finished(run))
+
+        for a in activities:
+            if waiting[a.get("name")] == 0:
+                ready(a)
+
+    # --- activities ---------------------------------------------------------
+
+    def start_activity(self, activity: Dict[str, Any], run: _Run, context: EvaluationContext, on_done: Callable[[], None]) -> None:
+        kind = activity.get("type")
+        if kind == "ForEach":
+            self._run_foreach(activity, run, context, on_done)
+        elif kind == "Until":
+            self._run_until(activity, run, context, on_done)
+        elif kind in ("IfCondition", "Switch"):
+            self._run_branch(activity, run, context, on_done)
+        else:
+            self._run_leaf(activity, run, context, on_done)
+
+    def _duration(self, activity: Dict[str, Any]) -> float:
+        name, kind = activity.get("name"), activity.get("type")
+        if name in self.options.durations:
+            self.sources[name] = "override"
+            return float(self.options.durations[name])
+        if name in self.options.history:
+            self.sources[name] = "history"
+            return float(self.options.history[name])
+        if kind in self.options.durations:
+            self.sources[name] = "override"
+            return float(self.options.durations[kind])
+        self.sources[name] = "estimate"
+        return estimate_duration_seconds(activity)
+
+    def _run_leaf(self, activity: Dict[str, Any], run: _Run, context: EvaluationContext, on_done: Callable[[], None]) -> None:
+        name = activity.get("name")
+        policy = activity.get("policy") or {}
+        try:
+            retries = max(int(policy.get("retry") or 0), 0)
+        except (TypeError, ValueError):
+            retries = 0
+        interval = float(policy.get("retryIntervalInSeconds") or DEFAULT_RETRY_INTERVAL_SECONDS)
+        per_attempt = self._duration(activity)
+
+        if self.options.outcomes.get(name) == "Failed":
+            run.attempts, run.status = retries + 1, "Failed"
+        else:
+            failing = self.options.failed_attempts.get(name, 0)
+            run.attempts = min(failing, retries) + 1
+            run.status = "Succeeded" if failing <= retries else "Failed"
+        total = run.attempts * per_attempt + (run.attempts - 1) * interval
+
+        self.running += 1
+        if self.running > self.peak:
+            self.peak, self.peak_at = self.running, self.now
+
+        def complete() -> None:
+            self.running -= 1
+            run.end = self.now
+            if run.status == "Succeeded":
+                self._apply_effects(activity, context)
+            on_done()
+
+        self.at(self.now + total, complete)
+
+    def _apply_effects(self, activity: Dict[str, Any], context: EvaluationContext) -> None:
+        name, kind = activity.get("name"), activity.get("type")
+        if name in self.options.outputs:
+            context.activity_results[name] = {"output": self.options.outputs[name], "status": "Succeeded"}
+        if kind not in ("SetVariable", "AppendVariable"):
+            return
+        props = activity.get("typeProperties") or {}
+        variable = props.get("variableName")
+        try:
+            value = self._evaluate(props.get("value"), context)
+        except RuntimeOnlyError:
+            self._assume(f"'{name}' sets '{variable}' from run-time values; the variable keeps its previous value.")
+            return
+        if kind == "SetVariable":
+            context.variables[variable] = value
+        else:
+            context.variables[variable] = list(context.variables.get(variable) or []) + [value]
+
+    def _finish_container(self, run: _Run, status: str, on_done: Callable[[], None]) -> None:
+        run.end = self.now
+        run.status = status
+        on_done()
+
+    def _run_foreach(self, activity: Dict[str, Any], run: _Run, context: EvaluationContext, on_done: Callable[[], None]) -> None:
+        name = activity.get("name")
+        props = activity.get("typeProperties") or {}
+        body = props.get("activities") or []
+        if name in self.options.iterations:
+            items: List[Any] = [None] * self.options.iterations[name]
+        else:
+            try:
+                items = self._evaluate(props.get("items"), context)
+                if not isinstance(items, list):
+                    raise RuntimeOnlyError("not an array")
+            except RuntimeOnlyError:
+                items = [None]
+                self._assume(f"ForEach '{name}' items are only known at run time; assumed 1 iteration (set 'iterations').")
+        batch = 1 if props.get("isSequential") else min(int(props.get("batchCount") or DEFAULT_FOREACH_BATCH_COUNT), MAX_FOREACH_BATCH_COUNT)
+
+        state = {"next": 0, "active": 0, "failed": False}
+
+        def launch() -> None:
+            while state["active"] < batch and state["next"] < len(items):
+                index = state["next"]
+                state["next"] += 1
+                state["active"] += 1
+                iteration_context = context.model_copy(update={"item": items[index], "has_item": True})
+                self.run_scope(body, f"{run.label}[{index}]/", run, iteration_context, iteration_done)
+
+        def iteration_done(status: str, runs: List[_Run]) -> None:
+            run.children.extend(runs)
+            state["active"] -= 1
+            state["failed"] |= status == "Failed"
+            if state["next"] < len(items):
+                launch()
+            elif state["active"] == 0:
+                self._finish_container(run, "Failed" if state["failed"] else "Succeeded", on_done)
+
+        if not items:
+            self.at(self.now, lambda: self._finish_container(run, "Succeeded", on_done))
+        else:
+            launch()
+
+    def _run_until(self, activity: Dict[str, Any], run: _Run, context: EvaluationContext, on_done: Callable[[], None]) -> None:
+        name = activity.get("name")
+        props = activity.get("typeProperties") or {}
+        body = props.get("activities") or []
+        timeout = timespan_seconds(props.get("timeout") or "0.12:00:00")
+        fixed = self.options.iterations.get(name)
+        state = {"count": 0}
+
+        def iterate() -> None:
+            state["count"] += 1
+            self.run_scope(body, f"{run.label}[{state['count'] - 1}]/", run, context, iteration_done)
+
+        def iteration_done(status: str, runs: List[_Run]) -> None:
+            run.children.extend(runs)
+            if status == "Failed":
+                return self._finish_container(run, "Failed", on_done)
+            if timeout is not None and self.now - run.start >= timeout:
+                self._assume(f"Until '{name}' hit its timeout of {timeout:.0f}s.")
+                return self._finish_container(run, "Failed", on_done)
+            if fixed is not None:
+                stop = state["count"] >= fixed
+            else:
+                try:
+                    stop = self._evaluate(props.get("expression"), context) is True
+                except RuntimeOnlyError:
+                    self._assume(f"Until '{name}' condition depends on run-time values; assumed 1 iteration (set 'iterations').")
+                    stop = True
+            if not stop and state["count"] >= self.options.max_until_iterations:
+                self._assume(f"Until '{name}' did not finish within {self.options.max_until_iterations} iterations; stopped there.")
+                stop = True
+            if stop:
+                self._finish_container(run, "Succeeded", on_done)
+            else:
+                iterate()
+
+        iterate()
+
+    def _run_branch(self, activity: Dict[str, Any], run: _Run, context: EvaluationContext, on_done: Callable[[], None]) -> None:
+        name, kind = activity.get("name"), activity.get("type")
+        props = activity.get("typeProperties") or {}
+        branches = dict(child_scopes(activity))
+        case_labels = {to_string(c.get("value")): f"{name}/cases/{c.get('value')}" for c in props.get("cases") or []}
+        field = "expression" if kind == "IfCondition" else "on"
+
+        def choose(value: Any) -> str:
+            if kind == "IfCondition":
+                return f"{name}/ifTrueActivities" if value is True else f"{name}/ifFalseActivities"
+            return case_labels.get(to_string(value), f"{name}/defaultActivities")
+
+        if name in self.options.branches:
+            label = choose(self.options.branches[name])
+        else:
+            try:
+                label = choose(self._evaluate(props.get(field), context))
+            except RuntimeOnlyError:
+                # Without a value, take the branch that takes longest
+                label = max(branches, key=lambda b: analyze_activities(branches[b]).root.critical_path_seconds if branches[b] else 0.0)
+                self._assume(f"{kind} '{name}' depends on run-time values; assumed the longest branch '{label}' (set 'branches').")
+
+        def branch_done(status: str, runs: List[_Run]) -> None:
+            run.children.extend(runs)
+            self._finish_container(run, status, on_done)
+
+        self.run_scope(branches.get(label) or [], f"{run.label}/", run, context, branch_done)
+
+
+def _critical_path(top_level: List[_Run]) -> List[str]:
+    def chain(last: Optional[_Run], boundary: Optional[_Run]) -> List[str]:
+        path: List[str] = []
+        node = last
+        while node is not None and node is not boundary:
+            labels = [node.label]
+            if node.children:
+                labels += chain(max(node.children, key=lambda r: r.end), node)
+            path = labels + path
+            node = node.gate
+        return path
+
+    if not top_level:
+        return []
+    return chain(max(top_level, key=lambda r: r.end), None)
+
+
+def simulate_pipeline(
+    content: Dict[str, Any], options: Optional[SimulationOptions] = None,
+    parameter_values: Optional[Dict[str, Any]] = None, variable_values: Optional[Dict[str, Any]] = None,
+) -> SimulationResult:
+    """Simulates a decoded pipeline-content.json. Raises ValueError if the dependency graph is invalid."""
+    options = options or SimulationOptions()
+    activities = (content.get("properties") or {}).get("activities") or []
+    analysis = analyze_activities(activities)
+    if not analysis.valid:
+        raise ValueError(f"The pipeline cannot be simulated: {'; '.join(analysis.errors)}")
+
+    simulator = _Simulator(options, pipeline_evaluation_context(content, parameter_values, variable_values))
+    status, top_level = simulator.run(activities)
+
+    summary: Dict[str, SimulatedActivity] = {}
+    for run in simulator.all_runs:
+        entry = summary.setdefault(run.name, SimulatedActivity(name=run.name, type=run.type, duration_source=simulator.sources.get(run.name)))
+        entry.runs += 1
+        entry.statuses[run.status] = entry.statuses.get(run.status, 0) + 1
+        entry.attempts += run.attempts
+        entry.first_start_seconds = run.start if entry.first_start_seconds is None else min(entry.first_start_seconds, run.start)
+        entry.last_end_seconds = run.end if entry.last_end_seconds is None else max(entry.last_end_seconds, run.end)
+        if run.type not in _CONTAINERS:
+            entry.busy_seconds += run.end - run.start
+
+    makespan = max((r.end for r in top_level), default=0.0)
+    logger.info(f"Simulated {len(simulator.all_runs)} activity runs; makespan {makespan:.1f}s, peak concurrency {simulator.peak}.")
+    return SimulationResult(
+        status=status,
+        makespan_seconds=round(makespan, 3),
+        peak_concurrency=simulator.peak,
+        peak_at_seconds=round(simulator.peak_at, 3),
+        critical_path=_critical_path(top_level),
+        activities=list(summary.values()),
+        assumptions=simulator.assumptions,
+    )
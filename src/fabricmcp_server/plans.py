@@ -0,0 +1,143 @@
+"""
+Dependency-ordered execution of multi-step tool plans.
+
+A plan is a list of steps, each naming a tool and its arguments. Arguments may
+reference the results of earlier steps with `${step_id.path.to.value}`; such a
+reference implies a dependency on that step, in addition to any listed in
+`depends_on`. Every step starts as soon as all of its dependencies succeeded,
+so independent steps run concurrently.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Set
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+_REFERENCE = re.compile(r"\$\{([A-Za-z0-9_\-]+)((?:\.[^.}]+)*)\}")
+
+
+class PlanError(ValueError):
+    """Raised for plans that cannot be executed (unknown steps, cycles, bad references)."""
+
+
+class PlanStep(BaseModel):
+    id: str = Field(..., description="Unique step ID, used in 'depends_on' and in ${step_id.field} references.")
+    tool: str = Field(..., description="Name of the tool to call, e.g. 'create_fabric_item'.")
+    arguments: Dict[str, Any] = Field(default_factory=dict, description="Tool arguments. String values may contain ${step_id.path} references to earlier results.")
+    depends_on: List[str] = Field(default_factory=list, description="Steps that must succeed before this one starts (besides referenced ones).")
+
+
+def _referenced_steps(value: Any) -> Set[str]:
+    if isinstance(value, str):
+        return {match.group(1) for match in _REFERENCE.finditer(value)}
+    if isinstance(value, dict):
+        return set().union(*(_referenced_steps(v) for v in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(_referenced_steps(v) for v in value)) if value else set()
+    return set()
+
+
+def _lookup(results: Dict[str, Any], step_id: str, path: str) -> Any:
+    value = results[step_id]
+    for part in filter(None, path.split(".")):
+        try:
+            value = value[int(part)] if isinstance(value, list) else value[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise PlanError(f"Reference '${{{step_id}{path}}}' does not resolve: no '{part}' in the result.")
+    return value
+
+
+def resolve_references(value: Any, results: Dict[str, Any]) -> Any:
+    """
+    Substitutes ${step_id.path} references with values from earlier results.
+    A string that is exactly one reference keeps the referenced value's type;
+    references embedded in longer strings are formatted into the string.
+    """
+    if isinstance(value, str):
+        whole = _REFERENCE.fullmatch(value)
+        if whole:
+            return _lookup(results, whole.group(1), whole.group(2))
+        return _REFERENCE.sub(lambda m: str(_lookup(results, m.group(1), m.group(2))), value)
+    if isinstance(value, dict):
+        return {k: resolve_references(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(v, results) for v in value]
+    return value
+
+
+def step_dependencies(steps: List[PlanStep]) -> Dict[str, Set[str]]:
+    """Explicit plus referenced dependencies per step; rejects duplicates, unknown steps and cycles."""
+    ids = [step.id for step in steps]
+    if len(ids) != len(set(ids)):
+        raise PlanError(f"Duplicate step IDs: {sorted({i for i in ids if ids.count(i) > 1})}")
+
+    dependencies = {step.id: set(step.depends_on) | _referenced_steps(step.arguments) for step in steps}
+    for step_id, deps in dependencies.items():
+        unknown = deps - dependencies.keys()
+        if unknown:
+            raise PlanError(f"Step '{step_id}' depends on unknown steps: {sorted(unknown)}")
+        if step_id in deps:
+            raise PlanError(f"Step '{step_id}' depends on itself.")
+
+    # Kahn's algorithm; anything left over sits on a cycle.
+    remaining = {k: set(v) for k, v in dependencies.items()}
+    while ready := [k for k, v in remaining.items() if not v]:
+        for k in ready:
+            del remaining[k]
+        for v in remaining.values():
+            v.difference_update(ready)
+    if remaining:
+        raise PlanError(f"Dependency cycle between steps: {sorted(remaining)}")
+    return dependencies
+
+
+async def execute_plan(
+    steps: List[PlanStep],
+    run_step: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+    max_concurrency: int = 4,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs the plan with `run_step(tool, arguments)`, starting each step once its dependencies succeeded.
+    Steps whose dependencies failed are skipped. Returns the outcome per step ID, in plan order.
+    """
+    dependencies = step_dependencies(steps)
+    by_id = {step.id: step for step in steps}
+    results: Dict[str, Any] = {}
+    outcomes: Dict[str, Dict[str, Any]] = {}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run(step: PlanStep) -> None:
+        async with semaphore:
+            try:
+                arguments = resolve_references(step.arguments, results)
+                logger.info(f"Plan step '{step.id}': calling '{step.tool}'.")
+                results[step.id] = await run_step(step.tool, arguments)
+                outcomes[step.id] = {"status": "Succeeded", "result": results[step.id]}
+            except Exception as e:
+                logger.warning(f"Plan step '{step.id}' failed: {e}")
+                outcomes[step.id] = {"status": "Failed", "error": str(e)}
+
+    pending = set(by_id)
+    running: Dict[asyncio.Task, str] = {}
+    while pending or running:
+        for step_id in sorted(pending):
+            deps = dependencies[step_id]
+            if any(outcomes.get(d, {}).get("status") in ("Failed", "Skipped") for d in deps):
+                outcomes[step_id] = {"status": "Skipped", "error": "A dependency did not succeed."}
+                pending.discard(step_id)
+            elif all(d in results for d in deps):
+                running[asyncio.create_task(_run(by_id[step_id]))] = step_id
+                pending.discard(step_id)
+        if not running:
+            continue
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            running.pop(task)
+
+    return {step.id: outcomes[step.id] for step in steps}
@@ -0,0 +1,375 @@
+"""
+Column mappings (TabularTranslator) for Copy activities, generated from source metadata.
+
+A source schema is read from a Lakehouse table's Delta log, inferred from a sample
+file in the Lakehouse (CSV or JSON, e.g. one uploaded with `upload_file_to_lakehouse`),
+or taken from a column list. Native types (SQL Server, Delta, ...) are normalised to
+the Copy activity's interim types, and the translator maps every column to a
+Lakehouse-safe name with an explicit sink type. If the target table already exists,
+its schema is read as well and conversions that can fail or lose data at run time
+are reported before the pipeline is deployed.
+
+Schemas read from OneLake are cached per item and table (or file) for
+FABRIC_SCHEMA_CACHE_TTL seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from cachetools import TTLCache
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_CACHE_TTL_SECONDS = float(os.getenv("FABRIC_SCHEMA_CACHE_TTL", "600"))
+SAMPLE_BYTES = 1024 * 1024
+SAMPLE_ROWS = 1000
+DELTA_LOG_BATCH = 16
+
+# Key: (kind, workspace_id, item_id, table or path), Value: List[ColumnSchema]
+_schema_cache: TTLCache = TTLCache(maxsize=256, ttl=SCHEMA_CACHE_TTL_SECONDS)
+
+INTERIM_TYPES = (
+    "Boolean", "Byte", "Int16", "Int32", "Int64", "Single", "Double", "Decimal",
+    "String", "DateTime", "DateTimeOffset", "TimeSpan", "Guid", "Byte[]",
+)
+
+_SQL_TYPES = {
+    "bit": "Boolean", "tinyint": "Byte", "smallint": "Int16", "int": "Int32", "integer": "Int32", "bigint": "Int64",
+    "real": "Single", "float": "Double", "double": "Double", "decimal": "Decimal", "numeric": "Decimal",
+    "money": "Decimal", "smallmoney": "Decimal", "char": "String", "varchar": "String", "nchar": "String",
+    "nvarchar": "String", "text": "String", "ntext": "String", "xml": "String", "sysname": "String",
+    "date": "DateTime", "datetime": "DateTime", "datetime2": "DateTime", "smalldatetime": "DateTime",
+    "datetimeoffset": "DateTimeOffset", "time": "TimeSpan", "uniqueidentifier": "Guid",
+    "binary": "Byte[]", "varbinary": "Byte[]", "image": "Byte[]", "timestamp": "Byte[]", "rowversion": "Byte[]",
+}
+
+_DELTA_TYPES = {
+    "boolean": "Boolean", "byte": "Int16", "short": "Int16", "integer": "Int32", "long": "Int64",
+    "float": "Single", "double": "Double", "decimal": "Decimal", "string": "String", "date": "DateTime",
+    "timestamp": "DateTime", "timestamp_ntz": "DateTime", "binary": "Byte[]",
+}
+
+# Lakehouse (Delta) column type written for each interim type
+_SINK_TYPES = {
+    "Boolean": "boolean", "Byte": "short", "Int16": "short", "Int32": "integer", "Int64": "long",
+    "Single": "float", "Double": "double", "String": "string", "DateTime": "timestamp",
+    "DateTimeOffset": "timestamp", "TimeSpan": "string", "Guid": "string", "Byte[]": "binary",
+}
+
+# Conversions that cannot fail or lose data
+_WIDENING = {
+    "Boolean": {"Byte", "Int16", "Int32", "Int64"},
+    "Byte": {"Int16", "Int32", "Int64", "Single", "Double", "Decimal"},
+    "Int16": {"Int32", "Int64", "Single", "Double", "Decimal"},
+    "Int32": {"Int64", "Double", "Decimal"},
+    "Int64": {"Decimal"},
+    "Single": {"Double"},
+    "DateTime": {"DateTimeOffset"},
+}
+
+# Characters Lakehouse tables do not accept in column names
+_COLUMN_UNSAFE = re.compile(r"[ ,;{}()\n\t=]+")
+_DECIMAL = re.compile(r"^\s*(?:decimal|numeric)\s*\(\s*(\d+)\s*(?:,\s*(\d+))?\s*\)\s*$", re.IGNORECASE)
+
+
+class ColumnSchema(BaseModel):
+    name: str
+    type: str = Field(..., description="Interim type (e.g. 'Int64', 'String') or the native type of the source (e.g. 'nvarchar', 'bigint', 'decimal(18,2)').")
+    nullable: bool = True
+    precision: Optional[int] = None
+    scale: Optional[int] = None
+    physical_type: Optional[str] = Field(None, description="The native type as read from the source.")
+
+
+class ColumnMappingReport(BaseModel):
+    translator: Dict[str, Any]
+    columns: List[ColumnSchema]
+    renamed: Dict[str, str] = Field(default_factory=dict, description="Source column -> sink column, where the name had to change.")
+    warnings: List[str] = Field(default_factory=list)
+
+
+def normalize_column(column: ColumnSchema, dialect: str = "sql") -> ColumnSchema:
+    """The column with `type` as an interim type; the native type is kept in `physical_type`."""
+    if column.type in INTERIM_TYPES:
+        return column
+    native = column.type.strip()
+    base = native.split("(", 1)[0].strip().lower()
+    precision, scale = column.precision, column.scale
+    decimal = _DECIMAL.match(native)
+    if decimal:
+        precision, scale = int(decimal.group(1)), int(decimal.group(2) or 0)
+    elif base == "money":
+        precision, scale = 19, 4
+    elif base == "smallmoney":
+        precision, scale = 10, 4
+    types = _DELTA_TYPES if dialect == "delta" else _SQL_TYPES
+    interim = types.get(base) or _SQL_TYPES.get(base) or _DELTA_TYPES.get(base)
+    if interim is None:
+        raise ValueError(f"Column '{column.name}' has unknown type '{column.type}'; use one of {', '.join(INTERIM_TYPES)}")
+    return column.model_copy(update={"type": interim, "precision": precision, "scale": scale, "physical_type": native})
+
+
+def sink_type(column: ColumnSchema) -> str:
+    """The Lakehouse column type for a normalised column."""
+    if column.type == "Decimal":
+        return f"decimal({column.precision or 38},{column.scale if column.scale is not None else 18})"
+    if column.type == "DateTime" and (column.physical_type or "").lower() == "date":
+        return "date"
+    return _SINK_TYPES[column.type]
+
+
+def lakehouse_column_name(name: str) -> str:
+    return _COLUMN_UNSAFE.sub("_", name.strip()) or "_"
+
+
+# =============================================================================
+# Reading schemas
+# =============================================================================
+
+def parse_delta_schema(schema_string: str) -> Tuple[List[ColumnSchema], List[str]]:
+    """Columns of a Delta `metaData.schemaString`; nested types are mapped as JSON strings."""
+    columns, warnings = [], []
+    for field in json.loads(schema_string).get("fields", []):
+        field_type = field.get("type")
+        if isinstance(field_type, dict):
+            warnings.append(f"Column '{field['name']}' is a {field_type.get('type')}; it is mapped as a JSON string")
+            columns.append(ColumnSchema(name=field["name"], type="String", nullable=field.get("nullable", True), physical_type=field_type.get("type")))
+            continue
+        columns.append(normalize_column(ColumnSchema(name=field["name"], type=field_type, nullable=field.get("nullable", True)), dialect="delta"))
+    return columns, warnings
+
+
+def _delta_table_path(table_name: str) -> str:
+    """'Tables/<table>', or 'Tables/<schema>/<table>' for schema-enabled Lakehouses."""
+    return "Tables/" + "/".join(p for p in table_name.split(".") if p)
+
+
+async def read_delta_schema(client, workspace_id: str, lakehouse_id: str, table_name: str) -> Tuple[List[ColumnSchema], List[str]]:
+    """
+    Reads the schema of a Lakehouse table from the newest commit in its Delta log that
+    changed metadata. Commits are read newest first, DELTA_LOG_BATCH at a time.
+    """
+    log_dir = f"{_delta_table_path(table_name)}/_delta_log"
+    paths = await client.list_onelake_paths(workspace_id, lakehouse_id, log_dir)
+    commits = sorted(
+        (p["name"].rsplit("/", 1)[-1] for p in paths if re.search(r"/\d{20}\.json$", p.get("name", ""))),
+        reverse=True,
+    )
+    if not commits:
+        raise ValueError(f"Table '{table_name}' has no Delta log in Lakehouse {lakehouse_id}")
+
+    for start in range(0, len(commits), DELTA_LOG_BATCH):
+        batch = commits[start:start + DELTA_LOG_BATCH]
+        contents = await asyncio.gather(*(client.read_onelake_file(workspace_id, lakehouse_id, f"{log_dir}/{c}") for c in batch))
+        for content in contents:  # newest first
+            for line in content.decode("utf-8").splitlines():
+                if '"metaData"' in line:
+                    metadata = json.loads(line).get("metaData")
+                    if metadata and metadata.get("schemaString"):
+                        return parse_delta_schema(metadata["schemaString"])
+    raise ValueError(f"The Delta log of '{table_name}' has no metadata in its JSON commits (it may only be in a checkpoint)")
+
+
+def _infer_value_type(value: str) -> str:
+    text = value.strip()
+    if text.lower() in ("true", "false"):
+        return "Boolean"
+    try:
+        number = int(text)
+        return "Int32" if -2**31 <= number < 2**31 else "Int64" if -2**63 <= number < 2**63 else "Decimal"
+    except ValueError:
+        pass
+    try:
+        float(text)
+        return "Double"
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        return "DateTimeOffset" if parsed.tzinfo else "DateTime"
+    except ValueError:
+        return "String"
+
+
+_NUMERIC_ORDER = ["Int32", "Int64", "Decimal", "Double"]
+
+
+def _merge_types(a: Optional[str], b: str) -> str:
+    if a is None or a == b:
+        return b
+    if a in _NUMERIC_ORDER and b in _NUMERIC_ORDER:
+        return _NUMERIC_ORDER[max(_NUMERIC_ORDER.index(a), _NUMERIC_ORDER.index(b))]
+    if {a, b} == {"DateTime", "DateTimeOffset"}:
+        return "DateTimeOffset"
+    return "String"
+
+
+def _infer_columns(names: List[str], rows: List[List[Any]]) -> List[ColumnSchema]:
+    types: List[Optional[str]] = [None] * len(names)
+    nullable = [False] * len(names)
+    for row in rows:
+        for i in range(len(names)):
+            value = row[i] if i < len(row) else None
+            if value is None or value == "":
+                nullable[i] = True
+            elif isinstance(value, bool):
+                types[i] = _merge_types(types[i], "Boolean")
+            elif isinstance(value, (dict, list)):
+                types[i] = "String"
+            else:
+                types[i] = _merge_types(types[i], _infer_value_type(str(value)))
+    return [
+        ColumnSchema(name=name, type=t or "String", nullable=nullable[i] or t is None, precision=38 if t == "Decimal" else None, scale=0 if t == "Decimal" else None)
+        for i, (name, t) in enumerate(zip(names, types))
+    ]
+
+
+def infer_csv_schema(text: str, delimiter: str = ",", sample_rows: int = SAMPLE_ROWS) -> List[ColumnSchema]:
+    """Columns of a delimited file with a header row, with types inferred from up to `sample_rows` rows."""
+    reader = csv.reader(io.StringIO(text), delimiter=delimiter)
+    header = next(reader, None)
+    if not header:
+        raise ValueError("The sample file is empty")
+    rows = [row for _, row in zip(range(sample_rows), reader)]
+    return _infer_columns(header, rows)
+
+
+def infer_json_schema(text: str, sample_rows: int = SAMPLE_ROWS) -> List[ColumnSchema]:
+    """Columns of a JSON array of objects or of JSON Lines, in order of first appearance."""
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        records = json.loads(stripped)
+    else:
+        records = [json.loads(line) for line in stripped.splitlines() if line.strip()]
+    records = [r for r in records[:sample_rows] if isinstance(r, dict)]
+    if not records:
+        raise ValueError("The sample file has no JSON objects")
+    names: Dict[str, None] = {}
+    for record in records:
+        names.update(dict.fromkeys(record))
+    order = list(names)
+    return _infer_columns(order, [[r.get(n) for n in order] for r in records])
+
+
+async def read_sample_file_schema(client, workspace_id: str, lakehouse_id: str, path: str, delimiter: Optional[str] = None) -> List[ColumnSchema]:
+    """Infers the schema of a CSV/TSV or JSON file in the Lakehouse from its first SAMPLE_BYTES bytes."""
+    data = await client.read_onelake_file(workspace_id, lakehouse_id, path, max_bytes=SAMPLE_BYTES)
+    text = data.decode("utf-8-sig", errors="replace")
+    truncated = len(data) >= SAMPLE_BYTES
+    extension = path.rsplit(".", 1)[-1].lower()
+    if extension in ("json", "jsonl", "ndjson"):
+        if truncated and not text.lstrip().startswith("["):
+            text = text.rsplit("\n", 1)[0]
+        elif truncated:
+            raise ValueError(f"'{path}' is a JSON array larger than {SAMPLE_BYTES} bytes; provide a smaller sample or the columns")
+        return infer_json_schema(text)
+    if extension in ("csv", "tsv", "txt"):
+        if truncated:
+            text = text.rsplit("\n", 1)[0]
+        return infer_csv_schema(text, delimiter or ("\t" if extension == "tsv" else ","))
+    raise ValueError(f"Cannot infer a schema from '.{extension}' files; use CSV, TSV or JSON, or provide the columns")
+
+
+async def get_delta_schema(client, workspace_id: str, lakehouse_id: str, table_name: str, refresh: bool = False) -> Tuple[List[ColumnSchema], List[str]]:
+    key = ("delta", workspace_id, lakehouse_id, table_name.lower())
+    if not refresh and key in _schema_cache:
+        return _schema_cache[key]
+    result = await read_delta_schema(client, workspace_id, lakehouse_id, table_name)
+    _schema_cache[key] = result
+    return result
+
+
+async def get_sample_file_schema(client, workspace_id: str, lakehouse_id: str, path: str, delimiter: Optional[str] = None, refresh: bool = False) -> List[ColumnSchema]:
+    key = ("file", workspace_id, lakehouse_id, f"{path}|{delimiter or ''}")
+    if not refresh and key in _schema_cache:
+        return _schema_cache[key]
+    result = await read_sample_file_schema(client, workspace_id, lakehouse_id, path, delimiter)
+    _schema_cache[key] = result
+    return result
+
+
+def forget_schemas() -> None:
+    _schema_cache.clear()
+
+
+# =============================================================================
+# Building the translator
+# =============================================================================
+
+def _conversion_warning(source: ColumnSchema, target: ColumnSchema) -> Optional[str]:
+    if source.type == target.type:
+        if source.type == "Decimal" and target.precision is not None and source.precision is not None:
+            source_integers = source.precision - (source.scale or 0)
+            target_integers = target.precision - (target.scale or 0)
+            if source_integers > target_integers or (source.scale or 0) > (target.scale or 0):
+                return f"decimal({source.precision},{source.scale}) does not fit decimal({target.precision},{target.scale})"
+        return None
+    if target.type == "String" or target.type in _WIDENING.get(source.type, ()):
+        return None
+    return f"{source.type} is converted to {target.type} and may fail or lose data"
+
+
+def build_tabular_translator(
+    columns: List[ColumnSchema],
+    target_columns: Optional[List[ColumnSchema]] = None,
+    renames: Optional[Dict[str, str]] = None,
+    allow_data_truncation: bool = True,
+) -> ColumnMappingReport:
+    """
+    A TabularTranslator mapping every source column. With `target_columns`, sink names and types
+    come from the existing table and risky conversions or unmapped columns are reported.
+    """
+    normalized = [normalize_column(c) for c in columns]
+    renames = renames or {}
+    targets = {c.name.lower(): normalize_column(c) for c in target_columns or []}
+    mappings, renamed, warnings, used = [], {}, [], set()
+
+    for column in normalized:
+        requested = renames.get(column.name) or lakehouse_column_name(column.name)
+        target = targets.get(requested.lower())
+        sink_name = target.name if target else requested
+        if sink_name.lower() in used:
+            raise ValueError(f"More than one source column maps to sink column '{sink_name}'")
+        used.add(sink_name.lower())
+        if sink_name != column.name:
+            renamed[column.name] = sink_name
+
+        source_entry = {"name": column.name, "type": column.type}
+        if column.physical_type:
+            source_entry["physicalType"] = column.physical_type
+        if target is not None:
+            sink_entry = {"name": sink_name, "type": target.type, "physicalType": target.physical_type or sink_type(target)}
+            problem = _conversion_warning(column, target)
+            if problem:
+                warnings.append(f"Column '{column.name}': {problem}")
+            if column.nullable and not target.nullable:
+                warnings.append(f"Column '{column.name}' may contain nulls but '{sink_name}' is not nullable")
+        elif targets:
+            warnings.append(f"Column '{column.name}' has no column '{sink_name}' in the target table")
+            continue
+        else:
+            sink_entry = {"name": sink_name, "type": column.type, "physicalType": sink_type(column)}
+        mappings.append({"source": source_entry, "sink": sink_entry})
+
+    mapped_targets = {m["sink"]["name"].lower() for m in mappings}
+    for name, target in targets.items():
+        if name not in mapped_targets and not target.nullable:
+            warnings.append(f"Target column '{target.name}' is not nullable and no source column maps to it")
+
+    translator = {
+        "type": "TabularTranslator",
+        "mappings": mappings,
+        "typeConversion": True,
+        "typeConversionSettings": {"allowDataTruncation": allow_data_truncation, "treatBooleanAsNumber": False},
+    }
+    return ColumnMappingReport(translator=translator, columns=normalized, renamed=renamed, warnings=warnings)
@@ -1,13 +1,19 @@
-# In src/fabricmcp_server/session.py (NEW FILE)
+# src/fabricmcp_server/sessions.py
+# Session-scoped state shared by app.py and the tool modules. Keeping it here (instead of
+# in app.py) means there is a single copy even when app.py runs as __main__.
 
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
 from typing import Dict
 
-from .fabric_api_client import FabricApiClient, FabricApiException
+from .fabric_api_client import FabricApiClient, FabricApiException, FabricAuthException
 from fastmcp import Context
 
+logger = logging.getLogger(__name__)
+
 # In-memory store for long-running operation status URLs
 # Key: job_id (str), Value: status_url (str)
 job_status_store: Dict[str, str] = {}
@@ -21,9 +27,13 @@ async def _get_lock(session_id: str) -> asyncio.Lock:
     async with _global_lock:
         return _client_creation_locks.setdefault(session_id, asyncio.Lock())
 
+def session_scope(ctx: Context) -> str:
+    """Identifies the MCP session (and so the credential) a tool call belongs to."""
+    return str(id(ctx.session))
+
 async def get_session_fabric_client(ctx: Context) -> FabricApiClient:
-    session_id = str(id(ctx.session))
-    
+    session_id = session_scope(ctx)
+
     if client := _active_clients.get(session_id):
         return client
 
@@ -33,7 +43,12 @@ async def get_session_fabric_client(ctx: Context) -> FabricApiClient:
             return client
 
         # Creating the client must happen here, inside the lock
-        base_url = "https://api.fabric.microsoft.com"
-        client = await FabricApiClient.create(base_url)
-        _active_clients[session_id] = client
-        return client
\ No newline at end of file
+        logger.info(f"Creating new FabricApiClient for session {session_id}.")
+        base_url = os.getenv("FABRIC_API_BASE_URL", "https://api.fabric.microsoft.com")
+        try:
+            client = await FabricApiClient.create(base_url)
+            _active_clients[session_id] = client
+            return client
+        except (FabricAuthException, FabricApiException) as e:
+            logger.error(f"Failed to create FabricApiClient for session {session_id}: {e}")
+            raise
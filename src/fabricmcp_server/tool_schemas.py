@@ -0,0 +1,149 @@
+"""
+Compaction of the JSON schemas advertised in tools/list.
+
+Tools that take `List[Activity]` carry the schema of the whole recursive Activity
+union (copy sources/sinks, connection literals, ...). The schemas are rewritten
+once after registration, according to FABRIC_TOOL_SCHEMA_MODE:
+
+* "full":    schemas are advertised as generated.
+* "dedupe":  (default) structurally identical `$defs` are merged and titles dropped.
+* "compact": additionally drops descriptions inside `$defs`, `default: null`, and
+             the `null` branch of optional fields.
+
+Only the advertised schema changes; arguments are still validated against the
+full pydantic models.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from fastmcp.server.middleware import Middleware
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_MODES = ("full", "dedupe", "compact")
+_REF_PREFIX = "#/$defs/"
+
+
+def schema_mode() -> str:
+    mode = os.getenv("FABRIC_TOOL_SCHEMA_MODE", "dedupe").lower()
+    if mode not in SCHEMA_MODES:
+        logger.warning(f"Unknown FABRIC_TOOL_SCHEMA_MODE '{mode}'; using 'dedupe'.")
+        return "dedupe"
+    return mode
+
+
+def _rewrite(node: Any, compact: bool, renames: Dict[str, str], in_defs: bool) -> Any:
+    if isinstance(node, list):
+        return [_rewrite(n, compact, renames, in_defs) for n in node]
+    if not isinstance(node, dict):
+        return node
+
+    result = {}
+    for key, value in node.items():
+        if key == "title" and isinstance(value, str):
+            continue
+        if compact and key == "default" and value is None:
+            continue
+        if compact and in_defs and key == "description" and isinstance(value, str):
+            continue
+        if key == "$ref" and isinstance(value, str) and value.startswith(_REF_PREFIX):
+            name = value[len(_REF_PREFIX):]
+            result[key] = _REF_PREFIX + renames.get(name, name)
+            continue
+        if key in ("properties", "$defs", "patternProperties") and isinstance(value, dict):
+            # Keys of these maps are names, not schema keywords
+            result[key] = {k: _rewrite(v, compact, renames, in_defs) for k, v in value.items()}
+            continue
+        result[key] = _rewrite(value, compact, renames, in_defs)
+
+    if compact:
+        for union in ("anyOf", "oneOf"):
+            branches = result.get(union)
+            if isinstance(branches, list) and {"type": "null"} in branches:
+                rest = [b for b in branches if b != {"type": "null"}]
+                if len(rest) == 1 and isinstance(rest[0], dict):
+                    del result[union]
+                    result = {**rest[0], **result}
+    return result
+
+
+def _merge_duplicate_defs(defs: Dict[str, Any]) -> Dict[str, str]:
+    """Maps names of duplicate definitions to one canonical name, until no more merge."""
+    renames: Dict[str, str] = {}
+    while True:
+        by_body: Dict[str, str] = {}
+        found = {}
+        for name in sorted(defs, key=lambda n: (len(n), n)):
+            if name in renames:
+                continue
+            body = json.dumps(_rewrite(defs[name], False, renames, True), sort_keys=True)
+            if body in by_body:
+                found[name] = by_body[body]
+            else:
+                by_body[body] = name
+        if not found:
+            return renames
+        renames.update(found)
+        # Collapse chains (a -> b -> c) so every rename points at a surviving definition.
+        for name, target in renames.items():
+            while target in renames:
+                target = renames[target]
+            renames[name] = target
+
+
+def compact_schema(schema: Optional[Dict[str, Any]], mode: str) -> Optional[Dict[str, Any]]:
+    """Returns the schema rewritten for `mode`; the input is not modified."""
+    if not schema or mode == "full":
+        return schema
+    compact = mode == "compact"
+    defs = schema.get("$defs") or {}
+    renames = _merge_duplicate_defs(defs)
+
+    result = {}
+    for key, value in schema.items():
+        if key == "title":
+            continue
+        if key == "$defs":
+            result[key] = {
+                name: _rewrite(body, compact, renames, True) for name, body in value.items() if name not in renames
+            }
+        elif key == "properties" and isinstance(value, dict):
+            # Top-level argument descriptions are what the model reads; always keep them.
+            result[key] = {k: _rewrite(v, compact, renames, False) for k, v in value.items()}
+        else:
+            result[key] = _rewrite(value, compact, renames, False)
+    return result
+
+
+def compact_tool_schemas(tools: Dict[str, Any], mode: Optional[str] = None) -> Dict[str, int]:
+    """Rewrites the advertised schemas of the given tools in place. Returns total sizes before/after in bytes."""
+    mode = mode or schema_mode()
+    before = after = 0
+    for tool in tools.values():
+        before += len(json.dumps(tool.parameters)) + len(json.dumps(tool.output_schema or {}))
+        tool.parameters = compact_schema(tool.parameters, mode)
+        if tool.output_schema:
+            tool.output_schema = compact_schema(tool.output_schema, "full" if mode == "full" else "dedupe")
+        after += len(json.dumps(tool.parameters)) + len(json.dumps(tool.output_schema or {}))
+    logger.info(f"Tool schemas ({mode}): {before} -> {after} bytes for {len(tools)} tools.")
+    return {"before": before, "after": after}
+
+
+class CachedToolListMiddleware(Middleware):
+    """Serves tools/list from a list built on first use; tools are only registered at startup."""
+
+    def __init__(self):
+        self._tools: Optional[List[Any]] = None
+
+    def invalidate(self) -> None:
+        self._tools = None
+
+    async def on_list_tools(self, context, call_next):
+        if self._tools is None:
+            self._tools = await call_next(context)
+        return list(self._tools)
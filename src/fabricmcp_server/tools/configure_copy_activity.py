@@ -1,14 +1,18 @@
-import base64
-import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Literal, Optional
 
 from fastmcp import FastMCP, Context
+from fastmcp.exceptions import ToolError
 from pydantic import Field
 
-from ..sessions import get_session_fabric_client
-from ..fabric_models import DefinitionPart
-from ..copy_activity_schemas import SourceModel, SinkModel
+from ..app import get_session_fabric_client, job_status_store
+from ..fabric_models import FabricApiException, FabricAuthException
+from ..copy_activity_schemas import SourceConfig, SinkConfig, build_source_payload, build_sink_payload
+from ..definitions import (
+    load_pipeline_definition, remember_pipeline_definition, forget_pipeline_definition, deployed_hash, expect_deployed_hash
+)
+from ..versions import snapshot_deployed_definition
+from ..schema_mapping import ColumnSchema, build_tabular_translator, get_delta_schema, get_sample_file_schema
 
 logger = logging.getLogger(__name__)
 
@@ -17,34 +21,34 @@ async def configure_copy_activity_impl(
     workspace_id: str = Field(..., description="Workspace ID"),
     pipeline_id: str = Field(..., description="Pipeline ID"),
     activity_name: str = Field(..., description="Exact name of the Copy activity to patch"),
-    source: Optional[SourceModel] = None,
-    sink: Optional[SinkModel] = None,
+    source: Optional[SourceConfig] = None,
+    sink: Optional[SinkConfig] = None,
     translator: Optional[Dict[str, Any]] = None,
     extra_type_properties: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Patch the given Copy activity.
     Only the dictionaries you pass are merged; everything else is untouched.
-    Enum-based models guarantee that 'type' contains a Fabric-valid string.
+    Discriminated source/sink models guarantee that 'type' contains a Fabric-valid string.
+    Returns status 'NoChange' without uploading if the result matches the deployed definition.
     """
 
     client = await get_session_fabric_client(ctx)
 
     # ------------------------------------------------------------------ pull
-    definition = await client.get_pipeline_definition(workspace_id, pipeline_id)
-    raw_payload = next(
-        p["payload"] for p in definition["parts"] if p["path"] == "pipeline-content.json"
-    )
-    pipeline_json = json.loads(base64.b64decode(raw_payload).decode("utf-8"))
+    try:
+        definition = await load_pipeline_definition(client, workspace_id, pipeline_id)
+    except ValueError as e:
+        raise ToolError(f"Failed to read pipeline definition: {e}")
 
     # ------------------------------------------------------------------ patch
-    for act in pipeline_json["properties"]["activities"]:
+    for act in definition.activities:
         if act["name"] == activity_name and act["type"] == "Copy":
             tp = act.setdefault("typeProperties", {})
             if source is not None:
-                tp["source"] = source.to_copy_activity_source()
+                tp["source"] = build_source_payload(source)
             if sink is not None:
-                tp["sink"] = sink.to_copy_activity_sink()
+                tp["sink"] = build_sink_payload(sink)
             if translator is not None:
                 tp["translator"] = translator
             if extra_type_properties:
@@ -53,24 +57,97 @@ async def configure_copy_activity_impl(
     else:
         return {"error": f"Copy activity '{activity_name}' not found in pipeline."}
 
+    if deployed_hash(workspace_id, pipeline_id) == definition.content_hash():
+        return {"status": "NoChange", "message": f"{activity_name} already has this configuration."}
+
     # ------------------------------------------------------------------ push
-    new_payload = base64.b64encode(json.dumps(pipeline_json).encode()).decode()
-    parts = [
-        DefinitionPart(
-            path="pipeline-content.json",
-            payload=new_payload,
-            payloadType="InlineBase64"
-        )
-    ]
-    await client.update_pipeline_definition(
-        workspace_id,
-        pipeline_id,
-        {"parts": [p.model_dump(by_alias=True) for p in parts]},
-    )
-
-    return {"status": "Succeeded", "message": f"{activity_name} updated."}
+    await snapshot_deployed_definition(client, workspace_id, pipeline_id, "DataPipeline", "configure_copy_activity")
+    try:
+        response = await client.update_pipeline_definition(workspace_id, pipeline_id, definition.to_update_payload())
+    except (FabricAuthException, FabricApiException) as e:
+        forget_pipeline_definition(workspace_id, pipeline_id)
+        raise ToolError(f"Failed to update pipeline: {e.response_text or str(e)}")
+    if response.status_code == 200:
+        remember_pipeline_definition(workspace_id, pipeline_id, definition)
+        return {"status": "Succeeded", "message": f"{activity_name} updated."}
+
+    forget_pipeline_definition(workspace_id, pipeline_id)
+    if response.status_code != 202:
+        raise ToolError(f"Failed to update pipeline. Status: {response.status_code}, Body: {response.text}")
+    operation_url = response.headers.get("Location") or response.headers.get("Operation-Location")
+    if not operation_url:
+        raise ToolError("API accepted the request but did not provide a status location URL.")
+
+    job_id = operation_url.split('/')[-1].split('?')[0]
+    job_status_store[job_id] = operation_url
+    expect_deployed_hash(job_id, workspace_id, pipeline_id, definition.content_hash())
+    return {
+        "status": "Accepted",
+        "job_id": job_id,
+        "message": f"{activity_name} update is in progress. Use 'get_operation_status' to track completion.",
+    }
+
+async def generate_copy_mapping_impl(
+    ctx: Context,
+    source_kind: Literal["lakehouse_table", "lakehouse_file", "columns"] = Field(..., description="Where to read the source schema from."),
+    workspace_id: Optional[str] = Field(None, description="Workspace of the source Lakehouse."),
+    lakehouse_id: Optional[str] = Field(None, description="Source Lakehouse, for 'lakehouse_table' and 'lakehouse_file'."),
+    table_name: Optional[str] = Field(None, description="Source table ('table' or 'schema.table'), for 'lakehouse_table'."),
+    file_path: Optional[str] = Field(None, description="Sample CSV/TSV/JSON file, e.g. 'Files/raw/sales.csv', for 'lakehouse_file'."),
+    delimiter: Optional[str] = Field(None, description="Column delimiter of a delimited sample file (default ',' or tab for .tsv)."),
+    columns: Optional[List[ColumnSchema]] = Field(None, description="Source columns with native or interim types, for 'columns'."),
+    target_workspace_id: Optional[str] = Field(None, description="Workspace of an existing target table (defaults to 'workspace_id')."),
+    target_lakehouse_id: Optional[str] = Field(None, description="Lakehouse of an existing target table whose columns and types the mapping should use."),
+    target_table_name: Optional[str] = Field(None, description="Existing target table to map onto and check conversions against."),
+    renames: Optional[Dict[str, str]] = Field(None, description="Source column -> sink column name overrides."),
+    allow_data_truncation: bool = Field(True, description="Whether values that do not fit the sink type are truncated instead of failing the copy."),
+    refresh: bool = Field(False, description="Re-read schemas instead of using cached ones.")
+) -> Dict[str, Any]:
+    """
+    Generates a complete TabularTranslator (column mapping with type conversion) for a Copy activity from
+    the source schema, read from a Lakehouse table's Delta log, inferred from a sample file, or given as a
+    column list. Pass the returned 'translator' to 'configure_copy_activity'. Warnings list conversions
+    that may fail at run time.
+    """
+    logger.info(f"Tool 'generate_copy_mapping' called (source={source_kind}).")
+    try:
+        warnings: List[str] = []
+        client = None
+        if source_kind == "columns":
+            if not columns:
+                raise ToolError("'columns' is required for source_kind 'columns'.")
+            source_columns = columns
+        else:
+            if not (workspace_id and lakehouse_id):
+                raise ToolError(f"'workspace_id' and 'lakehouse_id' are required for source_kind '{source_kind}'.")
+            client = await get_session_fabric_client(ctx)
+            if source_kind == "lakehouse_table":
+                if not table_name:
+                    raise ToolError("'table_name' is required for source_kind 'lakehouse_table'.")
+                source_columns, warnings = await get_delta_schema(client, workspace_id, lakehouse_id, table_name, refresh)
+            else:
+                if not file_path:
+                    raise ToolError("'file_path' is required for source_kind 'lakehouse_file'.")
+                source_columns = await get_sample_file_schema(client, workspace_id, lakehouse_id, file_path, delimiter, refresh)
+
+        target_columns = None
+        if target_table_name:
+            target_workspace = target_workspace_id or workspace_id
+            if not (target_workspace and target_lakehouse_id):
+                raise ToolError("'target_lakehouse_id' and a workspace are required with 'target_table_name'.")
+            client = client or await get_session_fabric_client(ctx)
+            target_columns, _ = await get_delta_schema(client, target_workspace, target_lakehouse_id, target_table_name, refresh)
+
+        report = build_tabular_translator(source_columns, target_columns, renames, allow_data_truncation)
+        return {**report.model_dump(), "warnings": warnings + report.warnings}
+
+    except ValueError as e:
+        raise ToolError(f"Failed to generate column mapping: {e}")
+    except (FabricAuthException, FabricApiException) as e:
+        raise ToolError(f"Failed to read schema: {e.response_text or str(e)}")
 
 # ------------------------------------------------------------------ registry
 def register_copy_tools(app: FastMCP):
     logger.info("Registering configure_copy_activity tool")
     app.tool(name="configure_copy_activity")(configure_copy_activity_impl)
+    app.tool(name="generate_copy_mapping")(generate_copy_mapping_impl)
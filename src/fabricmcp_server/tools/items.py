@@ -8,7 +8,10 @@ from fastmcp.exceptions import ToolError
 from pydantic import Field
 
 from ..fabric_models import ItemEntity, CreateItemRequest, FabricApiException, FabricAuthException
-from ..app import get_session_fabric_client, job_status_store
+from ..app import get_session_fabric_client, job_status_store, session_scope
+from .. import jobs
+from ..definitions import settle_deployed_hash
+from ..idempotency import IdempotencyConflict, idempotency_store
 
 logger = logging.getLogger(__name__)
 
@@ -61,26 +64,36 @@ async def create_fabric_item_impl(
     display_name: str = Field(..., description="The display name for the new item."),
     item_type: str = Field(..., description="The type of simple item to create (e.g., 'Lakehouse', 'Warehouse', 'DataPipeline', 'Notebook', 'Dataflow', any other Fabric item). For complex items like Notebooks, use the dedicated tool."),
     description: Optional[str] = Field(None, description="An optional description for the new item."),
+    idempotency_key: Optional[str] = Field(None, description="Optional client-chosen key. Retrying with the same key returns the original result instead of creating a duplicate item."),
 ) -> ItemEntity:
-    """Creates a simple new item in a specified Fabric workspace. Does not support complex definitions."""
+    """
+    Creates a simple new item in a specified Fabric workspace. Does not support complex definitions.
+    Identical calls made shortly after each other are treated as retries and return the first result.
+    """
     logger.info(f"Tool 'create_fabric_item' called to create '{display_name}' ({item_type}) in workspace {workspace_id}.")
     try:
         client = await get_session_fabric_client(ctx)
         payload = CreateItemRequest(displayName=display_name, type=item_type, description=description)
-        response = await client.create_item(workspace_id=workspace_id, payload=payload)
-        
-        if isinstance(response, ItemEntity):
-            logger.info(f"Successfully created item with ID: {response.id}")
-            return response.model_dump(by_alias=True)
 
-        if isinstance(response, httpx.Response):
-            return _process_fabric_response(response)
+        async def _create():
+            response = await client.create_item(workspace_id=workspace_id, payload=payload)
 
-        raise ToolError(str(response))
+            if isinstance(response, ItemEntity):
+                logger.info(f"Successfully created item with ID: {response.id}")
+                return response.model_dump(by_alias=True)
 
-        
-        raise ToolError(f"Unexpected response type from API: {type(response)}")
+            if isinstance(response, httpx.Response):
+                return _process_fabric_response(response)
+
+            raise ToolError(str(response))
+
+        return await idempotency_store.run_once(
+            "create_fabric_item", {"workspace_id": workspace_id, **payload.model_dump(by_alias=True)}, _create, idempotency_key,
+            scope=session_scope(ctx),
+        )
 
+    except IdempotencyConflict as e:
+        raise ToolError(str(e))
     except (FabricAuthException, FabricApiException) as e:
         raise ToolError(f"Failed to create Fabric item: {e}") from e
 
@@ -128,8 +141,10 @@ async def get_operation_status_impl(
         poll_data = response.json()
         status = poll_data.get("status")
 
-        if status in ("Succeeded", "Failed", "Canceled"):
+        jobs.record_job_status(job_id, status)
+        if status in jobs.FINISHED_STATUSES:
             job_status_store.pop(job_id, None)
+            settle_deployed_hash(job_id, succeeded=status in ("Succeeded", "Completed"))
         
         return poll_data
 
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from typing import Optional, List, Dict, Any
+
+import httpx
+from fastmcp import FastMCP, Context
+from fastmcp.exceptions import ToolError
+from pydantic import Field
+
+from ..fabric_models import FabricApiException, FabricAuthException
+from ..app import get_session_fabric_client, job_status_store
+from .. import jobs
+
+logger = logging.getLogger(__name__)
+
+async def _cancel(client, workspace_id: str, item_id: str, job_id: str) -> Dict[str, Any]:
+    """Sends one cancel request and stops tracking the job once the service accepts it."""
+    try:
+        response = await client.cancel_job_instance(workspace_id, item_id, job_id)
+    except (FabricAuthException, FabricApiException) as e:
+        return {"job_id": job_id, "status": "Failed", "error": e.response_text or str(e)}
+
+    if isinstance(response, httpx.Response) and response.status_code in (200, 202):
+        jobs.untrack_job(job_id)
+        job_status_store.pop(job_id, None)
+        return {"job_id": job_id, "status": "CancellationRequested"}
+    return {"job_id": job_id, "status": "Failed", "error": f"Unexpected response: {getattr(response, 'status_code', response)}"}
+
+async def list_tracked_jobs_impl(
+    ctx: Context,
+    workspace_id: Optional[str] = Field(None, description="Only list jobs in this workspace."),
+    item_id: Optional[str] = Field(None, description="Only list jobs of this item (e.g. a pipeline ID).")
+) -> List[Dict[str, Any]]:
+    """Lists the jobs started through this server that have not been seen finishing yet."""
+    logger.info("Tool 'list_tracked_jobs' called.")
+    return [job.model_dump(mode="json", exclude={"status_url"}) for job in jobs.find_jobs(workspace_id, item_id)]
+
+async def cancel_job_impl(
+    ctx: Context,
+    job_id: str = Field(..., description="The job ID returned by 'run_pipeline' (or another run tool)."),
+    workspace_id: Optional[str] = Field(None, description="Workspace of the job. Optional if the job was started through this server."),
+    item_id: Optional[str] = Field(None, description="Item (e.g. pipeline) of the job. Optional if the job was started through this server.")
+) -> Dict[str, Any]:
+    """Requests cancellation of a single running job."""
+    logger.info(f"Tool 'cancel_job' called for job {job_id}.")
+    tracked = jobs.tracked_jobs.get(job_id)
+    workspace_id = workspace_id or (tracked.workspace_id if tracked else None)
+    item_id = item_id or (tracked.item_id if tracked else None)
+    if not workspace_id or not item_id:
+        raise ToolError(f"Job '{job_id}' is not tracked by this server; provide workspace_id and item_id.")
+
+    client = await get_session_fabric_client(ctx)
+    result = await _cancel(client, workspace_id, item_id, job_id)
+    if result["status"] == "Failed":
+        raise ToolError(f"Failed to cancel job {job_id}: {result['error']}")
+    return result
+
+async def cancel_jobs_impl(
+    ctx: Context,
+    workspace_id: Optional[str] = Field(None, description="Cancel tracked jobs in this workspace."),
+    item_id: Optional[str] = Field(None, description="Cancel tracked jobs of this item (e.g. a pipeline ID)."),
+    older_than_minutes: Optional[int] = Field(None, ge=0, description="Cancel tracked jobs started at least this many minutes ago."),
+    max_concurrency: int = Field(8, ge=1, le=32, description="Maximum number of cancel requests in flight at once.")
+) -> Dict[str, Any]:
+    """
+    Cancels every tracked job matching all of the given filters, sending the requests concurrently.
+    At least one filter is required so that a bare call cannot cancel everything.
+    """
+    logger.info(f"Tool 'cancel_jobs' called (workspace={workspace_id}, item={item_id}, older_than={older_than_minutes}).")
+    if workspace_id is None and item_id is None and older_than_minutes is None:
+        raise ToolError("Provide at least one filter: workspace_id, item_id or older_than_minutes.")
+
+    matching = jobs.find_jobs(workspace_id, item_id, older_than_minutes)
+    if not matching:
+        return {"status": "NoMatchingJobs", "requested": 0, "results": []}
+
+    client = await get_session_fabric_client(ctx)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded_cancel(job: jobs.TrackedJob) -> Dict[str, Any]:
+        async with semaphore:
+            return await _cancel(client, job.workspace_id, job.item_id, job.job_id)
+
+    results = await asyncio.gather(*(_bounded_cancel(job) for job in matching))
+    cancelled = sum(1 for r in results if r["status"] == "CancellationRequested")
+    return {
+        "status": "Succeeded" if cancelled == len(results) else "PartiallySucceeded" if cancelled else "Failed",
+        "requested": len(results),
+        "cancelled": cancelled,
+        "results": results,
+    }
+
+def register_job_tools(app: FastMCP):
+    """Registers job tracking and cancellation tools with the MCP app."""
+    logger.info("Registering Fabric Job tools...")
+    app.tool(name="list_tracked_jobs")(list_tracked_jobs_impl)
+    app.tool(name="cancel_job")(cancel_job_impl)
+    app.tool(name="cancel_jobs")(cancel_jobs_impl)
+    logger.info("Fabric Job tools registration complete.")
@@ -0,0 +1,37 @@
+import asyncio
+import logging
+from typing import Any, Dict
+
+from fastmcp import FastMCP, Context
+
+from ..expressions import parse_expression
+from ..payload_cache import payload_cache
+from ..versions import version_store
+
+logger = logging.getLogger(__name__)
+
+async def get_server_metrics_impl(ctx: Context) -> Dict[str, Any]:
+    """
+    Reports this server's in-process cache statistics: the Copy payload cache (hit rate of
+    repeated source/sink builds), the expression parse cache and the definition version store.
+    """
+    logger.info("Tool 'get_server_metrics' called.")
+    parse = parse_expression.cache_info()
+    parse_lookups = parse.hits + parse.misses
+    return {
+        "payload_cache": payload_cache.stats(),
+        "expression_cache": {
+            "entries": parse.currsize,
+            "max_entries": parse.maxsize,
+            "hits": parse.hits,
+            "misses": parse.misses,
+            "hit_rate": round(parse.hits / parse_lookups, 4) if parse_lookups else None,
+        },
+        "version_store": await asyncio.to_thread(version_store.stats) if version_store is not None else None,
+    }
+
+def register_metrics_tools(app: FastMCP):
+    """Registers server metrics tools with the MCP app."""
+    logger.info("Registering server metrics tools...")
+    app.tool(name="get_server_metrics")(get_server_metrics_impl)
+    logger.info("Server metrics tools registration complete.")
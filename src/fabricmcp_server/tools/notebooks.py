@@ -11,6 +11,8 @@ from pydantic import BaseModel, Field
 
 from ..fabric_models import FabricApiException, FabricAuthException
 from ..app import get_session_fabric_client, job_status_store
+from ..definitions import deployed_hash, record_deployed_hash, expect_deployed_hash, hash_definition_parts
+from ..versions import snapshot_deployed_definition
 
 logger = logging.getLogger(__name__)
 
@@ -109,11 +111,12 @@ async def update_notebook_content_impl(
     workspace_id: str = Field(..., description="The ID of the notebook's workspace."),
     notebook_id: str = Field(..., description="The ID of the notebook to update."),
     lakehouse_id: str = Field(..., description="The ID of the Lakehouse attached to this notebook."),
-    cells: List[Dict[str, Any]] = Field(..., description="A list of cell objects in Jupyter Notebook format.")
+    cells: List[Dict[str, Any]] = Field(..., description="A list of cell objects in Jupyter Notebook format."),
+    force: bool = Field(False, description="If true, upload even if the content matches the last content uploaded by this server.")
 ) -> Dict[str, str]:
     """
     Updates a notebook's content. This is a long-running operation.
-    Returns a job_id to track the update status.
+    Returns a job_id to track the update status, or status 'NoChange' if the content is already deployed.
     """
     logger.info(f"Tool 'update_notebook_content' called for notebook {notebook_id}.")
     try:
@@ -137,9 +140,16 @@ async def update_notebook_content_impl(
             }
         }
 
+        content_hash = hash_definition_parts(definition_payload["definition"]["parts"])
+        if not force and deployed_hash(workspace_id, notebook_id) == content_hash:
+            logger.info(f"Notebook '{notebook_id}' already has this content; skipping update.")
+            return {"status": "NoChange", "message": "The deployed content is identical; nothing was uploaded."}
+
+        await snapshot_deployed_definition(client, workspace_id, notebook_id, "Notebook", "update_notebook_content")
         response = await client.update_item_definition(workspace_id, notebook_id, definition_payload)
 
         if response.status_code == 200:
+            record_deployed_hash(workspace_id, notebook_id, content_hash)
             return {"status": "Succeeded", "message": "Notebook content updated successfully."}
         
         elif response.status_code == 202:
@@ -149,7 +159,8 @@ async def update_notebook_content_impl(
             
             job_id = operation_url.split('/')[-1].split('?')[0]
             job_status_store[job_id] = operation_url
-            
+            expect_deployed_hash(job_id, workspace_id, notebook_id, content_hash)
+
             return {
                 "status": "Accepted", 
                 "job_id": job_id,
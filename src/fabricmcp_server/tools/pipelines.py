@@ -1,23 +1,46 @@
 # This is the final, definitive, and correct file: src/fabricmcp_server/tools/pipelines.py
 
+import asyncio
 import logging
+import time
 import json
 import base64
 import httpx
 import uuid
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 
 from fastmcp import FastMCP, Context
 from fastmcp.exceptions import ToolError
-from pydantic import Field
+from pydantic import Field, ValidationError
 
 # Correctly import all necessary components
 from ..fabric_models import (
     CreateItemRequest, DefinitionPart, ItemDefinitionForCreate, 
     FabricApiException, FabricAuthException, ItemEntity
 )
-from ..app import get_session_fabric_client, job_status_store
-from ..activity_types import Activity, CopyActivity, LookupActivity, GetMetadataActivity
+from ..app import get_session_fabric_client, job_status_store, session_scope
+from .. import jobs
+from ..idempotency import IdempotencyConflict, idempotency_store
+from ..activity_types import Activity, ActivityAdapter, ActivityListAdapter, CopyActivity, LookupActivity, GetMetadataActivity
+from ..flexible_copy_schemas import (
+    copy_parallelism_warnings, copy_staging_errors, copy_staging_warnings, lakehouse_sink_errors, source_partition_errors
+)
+from ..bulk_copy import DEFAULT_BATCH_COUNT, BulkCopyTable, build_bulk_copy_activities
+from ..pipeline_monitor import PipelineRunMonitor, format_activity_change
+from ..definitions import (
+    load_pipeline_definition, remember_pipeline_definition, forget_pipeline_definition, decode_pipeline_definition,
+    deployed_hash, record_deployed_hash, expect_deployed_hash, hash_definition_parts
+)
+from ..expressions import validate_pipeline_expressions
+from ..pipeline_dag import analyze_activities
+from ..pipeline_diff import diff_pipeline_contents
+from ..versions import snapshot_deployed_definition, version_store
+from ..pipeline_optimizer import optimize_dependencies
+from ..pipeline_simulator import SimulationOptions, simulate_pipeline
+from ..pipeline_partition import (
+    MAX_ACTIVITIES_PER_PIPELINE, activity_weight, partition_activities, build_parent_activities, variables_used
+)
+from ..pipeline_patch import PatchError, PatchOperation, apply_pipeline_patch, dangling_dependencies
 # Legacy import removed - using flexible models directly
 
 logger = logging.getLogger(__name__)
@@ -30,10 +53,12 @@ def _build_pipeline_definition_payload(
     pipeline_name: str,
     activities: List[Activity],
     strict: bool = True,
-    layout_only: bool = False
+    layout_only: bool = False,
+    parameters: Optional[Dict[str, Any]] = None,
+    variables: Optional[Dict[str, Any]] = None,
 ) -> tuple[str, List[str]]:
     """
-    Builds the final pipeline JSON definition payload. 
+    Builds the final pipeline JSON definition payload, with the given parameter and variable declarations.
     Returns: (base64_payload, list_of_warnings)
     """
     final_activities_json = []
@@ -52,6 +77,16 @@ def _build_pipeline_definition_payload(
                 else:
                     # Flexible models already contain correct API structure - no transformation needed
                     logger.info(f"Copy activity '{act.name}' using flexible API-aligned models")
+                    type_properties = activity_dict.get("typeProperties") or {}
+                    copy_errors = (
+                        source_partition_errors(type_properties.get("source") or {})
+                        + copy_staging_errors(type_properties)
+                        + lakehouse_sink_errors(type_properties.get("sink") or {}, type_properties.get("translator"))
+                    )
+                    if copy_errors:
+                        raise ValueError("; ".join(copy_errors))
+                    copy_warnings = copy_parallelism_warnings(type_properties) + copy_staging_warnings(type_properties)
+                    warnings.extend(f"Copy activity '{act.name}': {w}" for w in copy_warnings)
             
             elif isinstance(act, LookupActivity):
                 if layout_only:
@@ -75,48 +110,251 @@ def _build_pipeline_definition_payload(
 
         final_activities_json.append(activity_dict)
 
-    pipeline_struct = {"name": pipeline_name, "properties": {"activities": final_activities_json}}
+    # Catch broken dependency graphs here instead of as a 400 from Fabric
+    graph_errors = analyze_activities(final_activities_json).errors
+    if graph_errors and strict and not layout_only:
+        raise ToolError(f"Invalid activity dependencies: {'; '.join(graph_errors)}")
+    warnings.extend(graph_errors)
+
+    properties: Dict[str, Any] = {"activities": final_activities_json}
+    if parameters:
+        properties["parameters"] = parameters
+    if variables:
+        properties["variables"] = variables
+    pipeline_struct = {"name": pipeline_name, "properties": properties}
+    # Parameter, variable and system values only exist at run time: block on syntax and signatures only
+    expression_report = validate_pipeline_expressions(pipeline_struct, evaluate_control_flow=False)
+    expression_errors = [f"Activity '{e.activity}' {e.path}: {e.message}" for e in expression_report.errors]
+    if expression_errors and strict and not layout_only:
+        raise ToolError(f"Invalid expressions: {'; '.join(expression_errors)}")
+    warnings.extend(expression_errors)
+    warnings.extend(f"Activity '{w.activity}' {w.path}: {w.message}" for w in expression_report.warnings)
     return _encode_b64(pipeline_struct), warnings
 
+async def _create_pipeline_item(
+    client, workspace_id: str, pipeline_name: str, b64_payload: str, description: Optional[str]
+) -> Dict[str, Any]:
+    """Creates the pipeline item from an already encoded pipeline-content.json."""
+    definition = ItemDefinitionForCreate(
+        format="Trident.DataPipeline",
+        parts=[DefinitionPart(path="pipeline-content.json", payload=b64_payload, payloadType="InlineBase64")]
+    )
+    create_payload = CreateItemRequest(displayName=pipeline_name, type="DataPipeline", description=description, definition=definition)
+
+    response = await client.create_item(workspace_id, create_payload)
+
+    if isinstance(response, ItemEntity):
+        return response.model_dump(by_alias=True)
+    if isinstance(response, httpx.Response):
+        return {"status_code": response.status_code, "headers": dict(response.headers), "text": response.text}
+
+    raise ToolError(f"Unexpected response type: {type(response)}")
+
+async def _create_pipeline(
+    client, workspace_id: str, pipeline_name: str, activities: List[Activity], description: Optional[str],
+    parameters: Optional[Dict[str, Any]] = None,
+    variables: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Builds the definition payload and creates the pipeline item."""
+    b64_payload, warnings = _build_pipeline_definition_payload(
+        pipeline_name=pipeline_name,
+        activities=activities,
+        strict=True,
+        layout_only=False,
+        parameters=parameters,
+        variables=variables,
+    )
+
+    if warnings:
+        logger.warning(f"Pipeline build warnings: {warnings}")
+
+    return await _create_pipeline_item(client, workspace_id, pipeline_name, b64_payload, description)
+
 async def create_pipeline_impl(
     ctx: Context,
     workspace_id: str = Field(..., description="The ID of the workspace where the pipeline will be created."),
     pipeline_name: str = Field(..., description="Display name for the new data pipeline."),
     activities: List[Activity] = Field(default_factory=list, description="A list of activities to include in the pipeline."),
-    description: Optional[str] = Field(None, description="Optional description for the pipeline.")
+    description: Optional[str] = Field(None, description="Optional description for the pipeline."),
+    idempotency_key: Optional[str] = Field(None, description="Optional client-chosen key. Retrying with the same key returns the original result instead of creating another pipeline.")
 ) -> Dict[str, Any]:
     """Creates a new Data Pipeline with a specified list of activities."""
     logger.info(f"Tool 'create_pipeline' called for '{pipeline_name}'.")
     try:
         client = await get_session_fabric_client(ctx)
+        arguments = {
+            "workspace_id": workspace_id, "pipeline_name": pipeline_name, "description": description,
+            "activities": [a.model_dump(by_alias=True, mode="json") for a in activities],
+        }
+        return await idempotency_store.run_once(
+            "create_pipeline", arguments,
+            lambda: _create_pipeline(client, workspace_id, pipeline_name, activities, description),
+            idempotency_key,
+            scope=session_scope(ctx),
+        )
 
-        b64_payload, warnings = _build_pipeline_definition_payload(
-            pipeline_name=pipeline_name,
-            activities=activities,
-            strict=True,
-            layout_only=False
+    except IdempotencyConflict as e:
+        raise ToolError(str(e))
+    except (FabricAuthException, FabricApiException) as e:
+        raise ToolError(f"Failed to create pipeline: {e.response_text or str(e)}")
+
+async def _created_item_id(client, created: Dict[str, Any], poll_interval_seconds: float = 2.0, timeout: float = 300.0) -> str:
+    """The ID of a created item, waiting for the creation to finish if it was accepted as a long-running operation."""
+    if created.get("id"):
+        return created["id"]
+    operation_url = (created.get("headers") or {}).get("location")
+    if created.get("status_code") != 202 or not operation_url:
+        raise ToolError(f"Item creation returned no item ID: {created}")
+    job_id = operation_url.split('/')[-1].split('?')[0]
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        status = (await client.poll_lro_status(operation_url)).json().get("status")
+        if status == "Succeeded":
+            return (await client.get_operation_result(operation_url))["id"]
+        if status in ("Failed", "Canceled"):
+            raise ToolError(f"Item creation {status.lower()} (job {job_id}).")
+        if asyncio.get_running_loop().time() > deadline:
+            job_status_store[job_id] = operation_url
+            raise ToolError(
+                f"Item creation did not finish within {timeout:g}s (status {status}). "
+                f"Use 'get_operation_status' with job_id '{job_id}' to track it."
+            )
+        await asyncio.sleep(poll_interval_seconds)
+
+async def create_partitioned_pipeline_impl(
+    ctx: Context,
+    workspace_id: str = Field(..., description="The ID of the workspace where the pipelines will be created."),
+    pipeline_name: str = Field(..., description="Display name of the parent pipeline; children are named '<name>_partNN'."),
+    activities: List[Activity] = Field(..., description="All activities of the pipeline, as for 'create_pipeline'."),
+    invoke_connection_id: str = Field(..., description="ID of the Fabric connection the parent's InvokePipeline activities use."),
+    parameters: Optional[Dict[str, Any]] = Field(None, description="Pipeline parameter declarations, copied to every child and forwarded by the parent."),
+    variables: Optional[Dict[str, Any]] = Field(None, description="Pipeline variable declarations, e.g. {'done': {'type': 'Boolean'}}. Each child gets the ones its activities use."),
+    max_activities_per_pipeline: int = Field(MAX_ACTIVITIES_PER_PIPELINE, ge=2, description="Maximum activities per pipeline, nested activities included."),
+    description: Optional[str] = Field(None, description="Optional description for the parent pipeline."),
+    max_concurrency: int = Field(4, ge=1, le=16, description="Maximum number of child pipelines created at once.")
+) -> Dict[str, Any]:
+    """
+    Creates a pipeline that is too large for a single Fabric pipeline as a set of child pipelines plus a
+    parent that runs them with InvokePipeline activities in dependency order. Children are created concurrently.
+    If the activities fit in one pipeline, a single pipeline is created.
+    """
+    logger.info(f"Tool 'create_partitioned_pipeline' called for '{pipeline_name}' with {len(activities)} top-level activities.")
+    activity_dicts = [a.model_dump(by_alias=True, exclude_none=True) for a in activities]
+    total = sum(activity_weight(a) for a in activity_dicts)
+    variables = variables or {}
+    if undeclared := sorted(variables_used(activity_dicts) - set(variables)):
+        raise ToolError(f"Variables {', '.join(undeclared)} are used but not declared in 'variables'.")
+
+    try:
+        client = await get_session_fabric_client(ctx)
+        if total <= max_activities_per_pipeline:
+            created = await _create_pipeline(client, workspace_id, pipeline_name, activities, description, parameters, variables)
+            return {"status": "Created", "split": False, "total_activities": total, "pipeline": created}
+
+        # Validate before creating anything
+        _build_pipeline_definition_payload(pipeline_name, activities, strict=True, parameters=parameters, variables=variables)
+        try:
+            plan = partition_activities(pipeline_name, activity_dicts, max_activities_per_pipeline)
+        except ValueError as e:
+            raise ToolError(f"Cannot split pipeline: {e}")
+        if len(plan.children) > max_activities_per_pipeline:
+            raise ToolError(f"The pipeline would need {len(plan.children)} children, more than a parent can invoke.")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        child_properties = {"parameters": parameters} if parameters else {}
+
+        async def _create_child(child) -> str:
+            async with semaphore:
+                properties = {"activities": child.activities, **child_properties}
+                if child_variables := {v: variables[v] for v in sorted(variables_used(child.activities))}:
+                    properties["variables"] = child_variables
+                content = {"name": child.name, "properties": properties}
+                created = await _create_pipeline_item(client, workspace_id, child.name, _encode_b64(content), f"Part of '{pipeline_name}'.")
+                return await _created_item_id(client, created)
+
+        child_ids = await asyncio.gather(*(_create_child(c) for c in plan.children), return_exceptions=True)
+        failed = {c.name: str(r) for c, r in zip(plan.children, child_ids) if isinstance(r, BaseException)}
+        created_children = {c.name: r for c, r in zip(plan.children, child_ids) if not isinstance(r, BaseException)}
+        if failed:
+            raise ToolError(f"Failed to create child pipelines {failed}; already created: {created_children}")
+
+        parent_activities = build_parent_activities(plan, created_children, workspace_id, invoke_connection_id, list(parameters or {}))
+        parent_content = {"name": pipeline_name, "properties": {"activities": parent_activities, **child_properties}}
+        parent = await _create_pipeline_item(client, workspace_id, pipeline_name, _encode_b64(parent_content), description)
+
+        return {
+            "status": "Created",
+            "split": True,
+            "total_activities": total,
+            "pipeline": parent,
+            "children": [
+                {"name": c.name, "id": created_children[c.name], "activity_count": c.activity_count, "depends_on": c.depends_on}
+                for c in plan.children
+            ],
+            "cross_pipeline_dependencies": plan.cross_edges,
+            "warnings": plan.warnings,
+        }
+
+    except (FabricAuthException, FabricApiException) as e:
+        raise ToolError(f"Failed to create partitioned pipeline: {e.response_text or str(e)}")
+
+async def create_bulk_copy_pipeline_impl(
+    ctx: Context,
+    workspace_id: str = Field(..., description="The ID of the workspace where the pipeline will be created."),
+    pipeline_name: str = Field(..., description="Display name for the new data pipeline."),
+    source_connection_id: str = Field(..., description="ID of the SQL Server connection to copy from."),
+    lakehouse_id: str = Field(..., description="ID of the destination Lakehouse."),
+    tables: List[BulkCopyTable] = Field(..., min_length=1, description="Tables to copy."),
+    lakehouse_workspace_id: Optional[str] = Field(None, description="Workspace of the Lakehouse, if different from 'workspace_id'."),
+    lakehouse_name: str = Field("lakehouse", description="Display name of the Lakehouse, used in the linked service."),
+    pattern: Literal["auto", "foreach", "static"] = Field("auto", description="'foreach' (Lookup + one parameterised Copy), 'static' (one Copy per table) or 'auto' to choose by table count."),
+    batch_count: int = Field(DEFAULT_BATCH_COUNT, ge=1, le=50, description="Tables copied in parallel."),
+    table_action: Literal["Append", "Overwrite"] = Field("Overwrite", description="What to do with data already in the Lakehouse tables."),
+    description: Optional[str] = Field(None, description="Optional description for the pipeline."),
+    idempotency_key: Optional[str] = Field(None, description="Optional client-chosen key. Retrying with the same key returns the original result instead of creating another pipeline.")
+) -> Dict[str, Any]:
+    """
+    Generates and creates a pipeline that copies many SQL Server tables into Lakehouse tables in one call.
+    Large table lists become a Lookup + ForEach whose size does not depend on the number of tables;
+    small ones become one Copy activity per table, run in 'batch_count' parallel chains, plus a Fail
+    activity per table so that a failed table still fails the run.
+    """
+    logger.info(f"Tool 'create_bulk_copy_pipeline' called for '{pipeline_name}' with {len(tables)} tables.")
+    try:
+        plan = build_bulk_copy_activities(
+            tables, source_connection_id, lakehouse_id, lakehouse_workspace_id or workspace_id,
+            pattern=pattern, batch_count=batch_count, lakehouse_name=lakehouse_name, table_action=table_action,
         )
-        
-        if warnings:
-            logger.warning(f"Pipeline build warnings: {warnings}")
+        activities = ActivityListAdapter.validate_python(plan.activities)
+    except (ValueError, ValidationError) as e:
+        raise ToolError(f"Cannot generate bulk copy pipeline: {e}")
 
-        definition = ItemDefinitionForCreate(
-            format="Trident.DataPipeline",
-            parts=[DefinitionPart(path="pipeline-content.json", payload=b64_payload, payloadType="InlineBase64")]
+    try:
+        client = await get_session_fabric_client(ctx)
+        arguments = {
+            "workspace_id": workspace_id, "pipeline_name": pipeline_name, "description": description,
+            "activities": plan.activities,
+        }
+        created = await idempotency_store.run_once(
+            "create_bulk_copy_pipeline", arguments,
+            lambda: _create_pipeline(client, workspace_id, pipeline_name, activities, description),
+            idempotency_key,
+            scope=session_scope(ctx),
         )
-        create_payload = CreateItemRequest(displayName=pipeline_name, type="DataPipeline", description=description, definition=definition)
-        
-        response = await client.create_item(workspace_id, create_payload)
-        
-        if isinstance(response, ItemEntity):
-            return response.model_dump(by_alias=True)
-        if isinstance(response, httpx.Response):
-             return {"status_code": response.status_code, "headers": dict(response.headers), "text": response.text}
-        
-        raise ToolError(f"Unexpected response type: {type(response)}")
+        return {
+            "status": "Created",
+            "pattern": plan.pattern,
+            "table_count": plan.table_count,
+            "parallelism": plan.parallelism,
+            "activity_count": len(plan.activities),
+            "warnings": plan.warnings,
+            "pipeline": created,
+        }
 
+    except IdempotencyConflict as e:
+        raise ToolError(str(e))
     except (FabricAuthException, FabricApiException) as e:
-        raise ToolError(f"Failed to create pipeline: {e.response_text or str(e)}")
+        raise ToolError(f"Failed to create bulk copy pipeline: {e.response_text or str(e)}")
 
 async def update_pipeline_impl(
     ctx: Context,
@@ -125,11 +363,13 @@ async def update_pipeline_impl(
     pipeline_name: str = Field(..., description="The current or new name of the pipeline."),
     activities: List[Activity] = Field(..., description="The complete, final list of activities for the pipeline."),
     strict: bool = Field(True, description="If true, fail if any activity lacks a proper builder. If false, emit warnings."),
-    layout_only: bool = Field(False, description="If true, create minimal scaffolds that pass validation but may not run.")
+    layout_only: bool = Field(False, description="If true, create minimal scaffolds that pass validation but may not run."),
+    force: bool = Field(False, description="If true, upload even if the content matches the last known deployed definition.")
 ) -> Dict[str, Any]:
     """
     Updates a Data Pipeline's definition with a new list of activities.
     This replaces all existing activities with the provided list.
+    Returns status 'NoChange' without calling the API if the content matches what is already deployed.
     """
     logger.info(f"Tool 'update_pipeline' called for pipeline '{pipeline_id}' (strict={strict}, layout_only={layout_only}).")
     try:
@@ -144,7 +384,13 @@ async def update_pipeline_impl(
         
         parts = [{"path": "pipeline-content.json", "payload": b64_payload, "payloadType": "InlineBase64"}]
         definition = {"parts": parts}
-        
+
+        content_hash = hash_definition_parts(parts)
+        if not force and deployed_hash(workspace_id, pipeline_id) == content_hash:
+            logger.info(f"Pipeline '{pipeline_id}' already has this definition; skipping update.")
+            return {"status": "NoChange", "warnings": warnings, "message": "The deployed definition is identical; nothing was uploaded."}
+
+        await snapshot_deployed_definition(client, workspace_id, pipeline_id, "DataPipeline", "update_pipeline")
         response = await client.update_pipeline_definition(
             workspace_id=workspace_id,
             pipeline_id=pipeline_id,
@@ -152,45 +398,468 @@ async def update_pipeline_impl(
         )
         
         result = {"status": "Unknown", "warnings": warnings}
-        
-        if response.status_code in [200, 202]:
+        forget_pipeline_definition(workspace_id, pipeline_id)
+
+        if response.status_code == 200:
+            record_deployed_hash(workspace_id, pipeline_id, content_hash)
             result["status"] = "Succeeded"
-            result["message"] = "Pipeline definition update accepted."
-            if layout_only:
-                result["message"] += " Activities created as layout scaffolds - manual configuration required."
-            return result
+            result["message"] = "Pipeline definition updated."
+        elif response.status_code == 202:
+            operation_url = response.headers.get("Location") or response.headers.get("Operation-Location")
+            if not operation_url:
+                raise ToolError("API accepted the request but did not provide a status location URL.")
+
+            job_id = operation_url.split('/')[-1].split('?')[0]
+            job_status_store[job_id] = operation_url
+            expect_deployed_hash(job_id, workspace_id, pipeline_id, content_hash)
+            result["status"] = "Accepted"
+            result["job_id"] = job_id
+            result["message"] = "Pipeline definition update is in progress. Use 'get_operation_status' to track completion."
         else:
             raise ToolError(f"Failed to update pipeline. Status: {response.status_code}, Body: {response.text}")
+        if layout_only:
+            result["message"] += " Activities created as layout scaffolds - manual configuration required."
+        return result
 
     except (FabricAuthException, FabricApiException) as e:
         raise ToolError(f"Failed to update pipeline: {e.response_text or str(e)}")
 
-# (The run_pipeline_impl tool remains unchanged)
+def _validate_activities(activities: List[Dict[str, Any]]) -> List[str]:
+    """Validates activities against the typed models. Returns warnings for types without a model."""
+    warnings = []
+    for activity in activities:
+        try:
+            ActivityAdapter.validate_python(activity)
+        except ValidationError as e:
+            if any(err["type"] == "union_tag_invalid" for err in e.errors()):
+                warnings.append(f"Activity '{activity.get('name')}' has type '{activity.get('type')}', which is not validated.")
+                continue
+            raise ToolError(f"Activity '{activity.get('name')}' is invalid after the patch: {e}")
+    return warnings
+
+def _track_accepted_update(response: httpx.Response, workspace_id: str, pipeline_id: str, content_hash: str) -> str:
+    """
+    Registers an accepted (202) updateDefinition operation and returns its job ID. The content only counts as
+    deployed once the operation succeeds, so the cached definition is dropped until then.
+    """
+    forget_pipeline_definition(workspace_id, pipeline_id)
+    operation_url = response.headers.get("Location") or response.headers.get("Operation-Location")
+    if not operation_url:
+        raise ToolError("API accepted the request but did not provide a status location URL.")
+    job_id = operation_url.split('/')[-1].split('?')[0]
+    job_status_store[job_id] = operation_url
+    expect_deployed_hash(job_id, workspace_id, pipeline_id, content_hash)
+    return job_id
+
+async def patch_pipeline_impl(
+    ctx: Context,
+    workspace_id: str = Field(..., description="ID of the pipeline's workspace."),
+    pipeline_id: str = Field(..., description="ID of the pipeline to patch."),
+    operations: List[PatchOperation] = Field(..., min_length=1, description="RFC 6902 operations. Paths are relative to the pipeline properties and may use activity names, e.g. '/activities/Copy_Orders/policy/retry'."),
+    refresh: bool = Field(False, description="If true, re-download the definition instead of using the cached copy.")
+) -> Dict[str, Any]:
+    """
+    Applies small edits to a Data Pipeline without resending its activities, e.g.
+    {"op": "replace", "path": "/activities/Copy_Orders/typeProperties/sink/tableActionOption", "value": "Overwrite"}.
+    All operations are applied atomically and uploaded in a single update; only the changed activities are re-validated.
+    """
+    logger.info(f"Tool 'patch_pipeline' called for pipeline '{pipeline_id}' with {len(operations)} operations.")
+    try:
+        client = await get_session_fabric_client(ctx)
+        try:
+            definition = await load_pipeline_definition(client, workspace_id, pipeline_id, refresh=refresh)
+        except ValueError as e:
+            raise ToolError(f"Failed to read pipeline definition: {e}")
+
+        try:
+            properties, touched = apply_pipeline_patch(definition.content.get("properties", {}), operations)
+        except PatchError as e:
+            raise ToolError(f"Patch not applied: {e}")
+
+        activities = properties.get("activities") or []
+        warnings = _validate_activities([a for a in activities if a.get("name") in touched])
+        if dangling := dangling_dependencies(activities):
+            raise ToolError(f"Patch not applied: {' '.join(dangling)}")
+
+        definition.content["properties"] = properties
+        if deployed_hash(workspace_id, pipeline_id) == definition.content_hash():
+            return {"status": "NoChange", "message": "The patch does not change the deployed definition; nothing was uploaded.", "changed_activities": [], "warnings": warnings}
+
+        await snapshot_deployed_definition(client, workspace_id, pipeline_id, "DataPipeline", "patch_pipeline")
+        response = await client.update_pipeline_definition(workspace_id, pipeline_id, definition.to_update_payload())
+        result = {"changed_activities": sorted(touched), "warnings": warnings}
+        if response.status_code == 200:
+            remember_pipeline_definition(workspace_id, pipeline_id, definition)
+            return {"status": "Succeeded", "message": f"Applied {len(operations)} operations.", **result}
+        if response.status_code == 202:
+            job_id = _track_accepted_update(response, workspace_id, pipeline_id, definition.content_hash())
+            return {
+                "status": "Accepted",
+                "job_id": job_id,
+                "message": f"Applying {len(operations)} operations. Use 'get_operation_status' to track completion.",
+                **result,
+            }
+        forget_pipeline_definition(workspace_id, pipeline_id)
+        raise ToolError(f"Failed to patch pipeline. Status: {response.status_code}, Body: {response.text}")
+
+    except (FabricAuthException, FabricApiException) as e:
+        forget_pipeline_definition(workspace_id, pipeline_id)
+        raise ToolError(f"Failed to patch pipeline: {e.response_text or str(e)}")
+
+async def _start_pipeline_run(
+    client, workspace_id: str, pipeline_id: str, parameters: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Submits a single pipeline run and registers its status URL in the job store."""
+    execution_data = {"parameters": parameters} if parameters else None
+    response = await client.run_item(workspace_id, pipeline_id, "Pipeline", execution_data=execution_data)
+
+    if isinstance(response, httpx.Response) and response.status_code == 202:
+        operation_url = response.headers.get("Location")
+        if not operation_url:
+            raise ToolError("API did not provide a status location.")
+        job_id = operation_url.split('/')[-1]
+        job_status_store[job_id] = operation_url
+        jobs.track_job(job_id, workspace_id, pipeline_id, "Pipeline", operation_url)
+        return {"status": "Accepted", "job_id": job_id, "message": "Pipeline execution started."}
+
+    raise ToolError(f"Unexpected response from API: {response}")
+
 async def run_pipeline_impl(
     ctx: Context, 
     workspace_id: str = Field(..., description="The ID of the workspace containing the pipeline."),
-    pipeline_id: str = Field(..., description="The ID of the Data Pipeline to execute.")
+    pipeline_id: str = Field(..., description="The ID of the Data Pipeline to execute."),
+    parameters: Optional[Dict[str, Any]] = Field(None, description="Optional pipeline parameter values, e.g. {'partition_date': '2024-01-31'}."),
+    idempotency_key: Optional[str] = Field(None, description="Optional client-chosen key. Retrying with the same key returns the original job instead of starting another run."),
+    deduplicate: bool = Field(False, description="If true, an identical call made shortly after another is treated as a retry and returns the first run's job, even without an idempotency_key.")
 ) -> Dict[str, Any]:
-    # ... existing implementation is correct ...
+    """
+    Starts a Data Pipeline run, optionally passing values for the pipeline's parameters.
+    Every call starts a new run unless it repeats an idempotency_key (or 'deduplicate' is set).
+    """
     logger.info(f"Tool 'run_pipeline' called for pipeline '{pipeline_id}'.")
     try:
         client = await get_session_fabric_client(ctx)
-        response = await client.run_item(workspace_id, pipeline_id, "Pipeline")
-
-        if isinstance(response, httpx.Response):
-            if response.status_code == 202:
-                operation_url = response.headers.get("Location")
-                if not operation_url:
-                    raise ToolError("API did not provide a status location.")
-                job_id = operation_url.split('/')[-1]
-                job_status_store[job_id] = operation_url
-                return {"status": "Accepted", "job_id": job_id, "message": "Pipeline execution started."}
-        
-        raise ToolError(f"Unexpected response from API: {response}")
+        return await idempotency_store.run_once(
+            "run_pipeline",
+            {"workspace_id": workspace_id, "pipeline_id": pipeline_id, "parameters": parameters},
+            lambda: _start_pipeline_run(client, workspace_id, pipeline_id, parameters),
+            idempotency_key,
+            scope=session_scope(ctx),
+            derive=deduplicate,
+        )
 
+    except IdempotencyConflict as e:
+        raise ToolError(str(e))
     except (FabricAuthException, FabricApiException) as e:
         raise ToolError(f"Failed to run pipeline: {e.response_text or str(e)}")
 
+async def run_pipeline_sweep_impl(
+    ctx: Context,
+    workspace_id: str = Field(..., description="The ID of the workspace containing the pipeline."),
+    pipeline_id: str = Field(..., description="The ID of the Data Pipeline to execute."),
+    parameter_sets: List[Dict[str, Any]] = Field(..., min_length=1, description="One parameter dict per run, e.g. one per partition date for a backfill."),
+    max_concurrency: int = Field(4, ge=1, le=32, description="Maximum number of run submissions in flight at once.")
+) -> Dict[str, Any]:
+    """
+    Launches one run of the same pipeline per parameter set, submitting up to `max_concurrency` at a time.
+    A failed submission does not stop the sweep; each result reports its own status.
+    """
+    logger.info(f"Tool 'run_pipeline_sweep' called for pipeline '{pipeline_id}' with {len(parameter_sets)} parameter sets.")
+    client = await get_session_fabric_client(ctx)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _submit(index: int, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                run = await _start_pipeline_run(client, workspace_id, pipeline_id, parameters)
+            except (FabricAuthException, FabricApiException) as e:
+                run = {"status": "Failed", "error": e.response_text or str(e)}
+            except ToolError as e:
+                run = {"status": "Failed", "error": str(e)}
+        return {"index": index, "parameters": parameters, **run}
+
+    runs = await asyncio.gather(*(_submit(i, p) for i, p in enumerate(parameter_sets)))
+    accepted = sum(1 for run in runs if run["status"] == "Accepted")
+    return {
+        "status": "Accepted" if accepted == len(runs) else "PartiallyAccepted" if accepted else "Failed",
+        "submitted": len(runs),
+        "accepted": accepted,
+        "failed": len(runs) - accepted,
+        "runs": runs,
+    }
+
+async def watch_pipeline_run_impl(
+    ctx: Context,
+    workspace_id: str = Field(..., description="The ID of the workspace containing the pipeline."),
+    pipeline_id: str = Field(..., description="The ID of the Data Pipeline that was run."),
+    job_id: str = Field(..., description="The job ID returned by 'run_pipeline'."),
+    poll_interval_seconds: int = Field(10, ge=2, le=300, description="Seconds to wait between polls."),
+    timeout_minutes: int = Field(60, ge=1, le=24 * 60, description="Stop watching (without cancelling the run) after this long.")
+) -> Dict[str, Any]:
+    """
+    Watches a pipeline run until it finishes, streaming each new or changed activity run
+    (status, duration, rows read/written, throughput) as a progress notification.
+    Returns the final run status with all activity runs, slowest first.
+    """
+    logger.info(f"Tool 'watch_pipeline_run' called for job '{job_id}' of pipeline '{pipeline_id}'.")
+    try:
+        client = await get_session_fabric_client(ctx)
+        monitor = PipelineRunMonitor(client, workspace_id, pipeline_id, job_id)
+        deadline = asyncio.get_running_loop().time() + timeout_minutes * 60
+        notifications = 0
+
+        async with jobs.inflight_poll():
+            while True:
+                changes = await monitor.poll()
+                for snapshot in changes:
+                    notifications += 1
+                    await ctx.report_progress(progress=notifications, message=format_activity_change(snapshot))
+                if monitor.finished:
+                    break
+                jobs.record_job_status(job_id, monitor.job_status)
+                if asyncio.get_running_loop().time() >= deadline:
+                    return {**monitor.summary(), "message": f"Stopped watching after {timeout_minutes} minutes; the run is still {monitor.job_status}."}
+                if await jobs.wait_or_shutdown(poll_interval_seconds):
+                    return {**monitor.summary(), "message": f"Server is shutting down; the run is still {monitor.job_status}."}
+
+        job_status_store.pop(job_id, None)
+        jobs.untrack_job(job_id)
+        return monitor.summary()
+
+    except (FabricAuthException, FabricApiException) as e:
+        raise ToolError(f"Failed to watch pipeline run: {e.response_text or str(e)}")
+    except httpx.HTTPStatusError as e:
+        raise ToolError(f"Failed to watch pipeline run: {e.response.text or str(e)}")
+
+async def _activity_durations_from_run(client, workspace_id: str, pipeline_id: str, job_id: str) -> Dict[str, float]:
+    """Observed activity durations (seconds) of a finished or running pipeline run."""
+    monitor = PipelineRunMonitor(client, workspace_id, pipeline_id, job_id)
+    await monitor.poll()
+    return {a.activity_name: a.duration_ms / 1000 for a in monitor.activities if a.duration_ms is not None}
+
+async def analyze_pipeline_impl(
+    ctx: Context,
+    workspace_id: Optional[str] = Field(None, description="Workspace of a deployed pipeline to analyze."),
+    pipeline_id: Optional[str] = Field(None, description="ID of a deployed pipeline to analyze. Ignored if 'activities' is given."),
+    activities: Optional[List[Activity]] = Field(None, description="Activities to analyze offline, e.g. before calling 'create_pipeline'."),
+    job_id: Optional[str] = Field(None, description="A previous run of the pipeline whose activity durations weight the critical path. Without it, durations are estimated by activity type.")
+) -> Dict[str, Any]:
+    """
+    Checks a pipeline's dependency graph without running it: unknown dependsOn references, cycles,
+    topological levels, maximum parallel width and the critical path, including nested
+    IfCondition/ForEach/Until/Switch bodies.
+    """
+    logger.info(f"Tool 'analyze_pipeline' called (pipeline={pipeline_id}, offline={activities is not None}).")
+    if activities is None and not (workspace_id and pipeline_id):
+        raise ToolError("Provide either 'activities' or both 'workspace_id' and 'pipeline_id'.")
+    if job_id and not (workspace_id and pipeline_id):
+        raise ToolError("'job_id' requires 'workspace_id' and 'pipeline_id'.")
+
+    try:
+        client = await get_session_fabric_client(ctx) if (activities is None or job_id) else None
+        if activities is not None:
+            activity_dicts = [a.model_dump(by_alias=True, exclude_none=True) for a in activities]
+        else:
+            try:
+                activity_dicts = (await load_pipeline_definition(client, workspace_id, pipeline_id)).activities
+            except ValueError as e:
+                raise ToolError(f"Failed to read pipeline definition: {e}")
+
+        history = await _activity_durations_from_run(client, workspace_id, pipeline_id, job_id) if job_id else None
+        return analyze_activities(activity_dicts, history).model_dump()
+
+    except (FabricAuthException, FabricApiException) as e:
+        raise ToolError(f"Failed to analyze pipeline: {e.response_text or str(e)}")
+
+async def optimize_pipeline_dependencies_impl(
+    ctx: Context,
+    workspace_id: str = Field(..., description="ID of the pipeline's workspace."),
+    pipeline_id: str = Field(..., description="ID of the pipeline to optimize."),
+    decouple_independent: bool = Field(False, description="If true, also break serial chains between activities that share no data so they can run in parallel."),
+    apply: bool = Field(False, description="If true, upload the rewritten dependencies. If false, only propose them."),
+    job_id: Optional[str] = Field(None, description="A previous run whose activity durations are used for the runtime estimate.")
+) -> Dict[str, Any]:
+    """
+    Removes redundant dependsOn edges (transitive reduction) and flags serial chains that do not share data.
+    Returns the proposed dependency changes with an end-to-end runtime estimate before and after.
+    """
+    logger.info(f"Tool 'optimize_pipeline_dependencies' called for pipeline '{pipeline_id}' (apply={apply}).")
+    try:
+        client = await get_session_fabric_client(ctx)
+        try:
+            definition = await load_pipeline_definition(client, workspace_id, pipeline_id)
+        except ValueError as e:
+            raise ToolError(f"Failed to read pipeline definition: {e}")
+
+        history = await _activity_durations_from_run(client, workspace_id, pipeline_id, job_id) if job_id else None
+        result = optimize_dependencies(definition.activities, decouple_independent, history)
+        summary = result.model_dump(exclude={"activities"})
+        if not result.changes:
+            return {"status": "NoChange", **summary}
+        if not apply:
+            return {"status": "Proposed", **summary}
+
+        definition.content["properties"]["activities"] = result.activities
+        await snapshot_deployed_definition(client, workspace_id, pipeline_id, "DataPipeline", "optimize_pipeline_dependencies")
+        response = await client.update_pipeline_definition(workspace_id, pipeline_id, definition.to_update_payload())
+        if response.status_code == 200:
+            remember_pipeline_definition(workspace_id, pipeline_id, definition)
+            return {"status": "Applied", **summary}
+        if response.status_code == 202:
+            job_id = _track_accepted_update(response, workspace_id, pipeline_id, definition.content_hash())
+            return {"status": "Accepted", "job_id": job_id, **summary}
+        forget_pipeline_definition(workspace_id, pipeline_id)
+        raise ToolError(f"Failed to update pipeline. Status: {response.status_code}, Body: {response.text}")
+
+    except (FabricAuthException, FabricApiException) as e:
+        forget_pipeline_definition(workspace_id, pipeline_id)
+        raise ToolError(f"Failed to optimize pipeline: {e.response_text or str(e)}")
+
+def _local_pipeline_content(definition: Dict[str, Any]) -> Dict[str, Any]:
+    """Accepts pipeline-content.json, a get_pipeline_definition result (decoded or not) or {'activities': [...]}."""
+    parts = (definition.get("definition") or definition).get("parts")
+    if parts is not None:
+        for part in parts:
+            if part.get("path") == "pipeline-content.json":
+                payload = part.get("payload")
+                return payload if isinstance(payload, dict) else json.loads(base64.b64decode(payload).decode("utf-8"))
+        raise ToolError("The definition has no 'pipeline-content.json' part.")
+    if "properties" in definition:
+        return definition
+    if "activities" in definition:
+        return {"properties": definition}
+    raise ToolError("Unrecognized definition; expected pipeline-content.json with a 'properties' object.")
+
+async def _pipeline_content_for_diff(
+    ctx: Context, side: str, workspace_id: Optional[str], pipeline_id: Optional[str],
+    definition: Optional[Dict[str, Any]], version_id: Optional[int]
+) -> Dict[str, Any]:
+    if definition is not None:
+        return _local_pipeline_content(definition)
+    if version_id is not None:
+        if version_store is None:
+            raise ToolError("The definition version store is disabled (FABRIC_VERSION_STORE=off).")
+        try:
+            _, stored = await asyncio.to_thread(version_store.get, version_id)
+        except KeyError as e:
+            raise ToolError(str(e.args[0]))
+        return _local_pipeline_content(stored)
+    if not (workspace_id and pipeline_id):
+        raise ToolError(f"Provide '{side}_definition', '{side}_version_id', or both '{side}_workspace_id' and '{side}_pipeline_id'.")
+    client = await get_session_fabric_client(ctx)
+    try:
+        return (await load_pipeline_definition(client, workspace_id, pipeline_id, refresh=True)).content
+    except ValueError as e:
+        raise ToolError(f"Failed to read pipeline definition: {e}")
+
+async def diff_pipeline_definitions_impl(
+    ctx: Context,
+    base_workspace_id: Optional[str] = Field(None, description="Workspace of the deployed pipeline to compare from."),
+    base_pipeline_id: Optional[str] = Field(None, description="Deployed pipeline to compare from."),
+    base_definition: Optional[Dict[str, Any]] = Field(None, description="Local definition to compare from (pipeline-content.json or a get_pipeline_definition result). Takes precedence over the IDs."),
+    base_version_id: Optional[int] = Field(None, description="Saved version to compare from, see 'list_definition_versions'. Takes precedence over the pipeline IDs."),
+    target_workspace_id: Optional[str] = Field(None, description="Workspace of the deployed pipeline to compare to."),
+    target_pipeline_id: Optional[str] = Field(None, description="Deployed pipeline to compare to."),
+    target_definition: Optional[Dict[str, Any]] = Field(None, description="Local definition to compare to. Takes precedence over the IDs."),
+    target_version_id: Optional[int] = Field(None, description="Saved version to compare to. Takes precedence over the pipeline IDs.")
+) -> Dict[str, Any]:
+    """
+    Structural diff of two pipeline definitions: deployed, saved versions or local. Activities are matched by name,
+    including those nested in container bodies, and reported as added, removed, renamed, moved
+    (to another scope) or modified with field-level changes.
+    """
+    logger.info(f"Tool 'diff_pipeline_definitions' called ({base_pipeline_id or 'local'} -> {target_pipeline_id or 'local'}).")
+    try:
+        base = await _pipeline_content_for_diff(ctx, "base", base_workspace_id, base_pipeline_id, base_definition, base_version_id)
+        target = await _pipeline_content_for_diff(ctx, "target", target_workspace_id, target_pipeline_id, target_definition, target_version_id)
+        return diff_pipeline_contents(base, target).model_dump(exclude_none=True)
+
+    except (FabricAuthException, FabricApiException) as e:
+        raise ToolError(f"Failed to diff pipeline definitions: {e.response_text or str(e)}")
+
+async def validate_expressions_impl(
+    ctx: Context,
+    workspace_id: Optional[str] = Field(None, description="Workspace of a deployed pipeline to check."),
+    pipeline_id: Optional[str] = Field(None, description="ID of a deployed pipeline to check. Ignored if 'definition' is given."),
+    definition: Optional[Dict[str, Any]] = Field(None, description="Local definition to check (pipeline-content.json with 'properties', or {'activities': [...]})."),
+    parameters: Optional[Dict[str, Any]] = Field(None, description="Parameter values to evaluate with; declared default values are used otherwise."),
+    variables: Optional[Dict[str, Any]] = Field(None, description="Variable values to evaluate with.")
+) -> Dict[str, Any]:
+    """
+    Parses and type-checks every expression in a pipeline without running it: syntax, unknown functions,
+    argument types, undeclared parameters/variables, item() outside a loop and references to activities
+    that do not run first. Conditions, ForEach/Filter items and Switch values are also evaluated with the
+    given parameter and variable values.
+    """
+    logger.info(f"Tool 'validate_expressions' called (pipeline={pipeline_id}, offline={definition is not None}).")
+    if definition is not None:
+        content = _local_pipeline_content(definition)
+    elif workspace_id and pipeline_id:
+        try:
+            client = await get_session_fabric_client(ctx)
+            content = (await load_pipeline_definition(client, workspace_id, pipeline_id)).content
+        except ValueError as e:
+            raise ToolError(f"Failed to read pipeline definition: {e}")
+        except (FabricAuthException, FabricApiException) as e:
+            raise ToolError(f"Failed to validate expressions: {e.response_text or str(e)}")
+    else:
+        raise ToolError("Provide either 'definition' or both 'workspace_id' and 'pipeline_id'.")
+
+    started = time.perf_counter()
+    report = validate_pipeline_expressions(content, parameters, variables)
+    return {**report.model_dump(exclude_none=True), "elapsed_ms": round((time.perf_counter() - started) * 1000, 3)}
+
+async def simulate_pipeline_impl(
+    ctx: Context,
+    workspace_id: Optional[str] = Field(None, description="Workspace of a deployed pipeline to simulate."),
+    pipeline_id: Optional[str] = Field(None, description="ID of a deployed pipeline to simulate. Ignored if 'definition' is given."),
+    definition: Optional[Dict[str, Any]] = Field(None, description="Local definition to simulate (pipeline-content.json with 'properties', or {'activities': [...]})."),
+    parameters: Optional[Dict[str, Any]] = Field(None, description="Parameter values; declared default values are used otherwise."),
+    variables: Optional[Dict[str, Any]] = Field(None, description="Initial variable values."),
+    durations: Optional[Dict[str, float]] = Field(None, description="Seconds per attempt, keyed by activity name or activity type (e.g. {'Copy': 600})."),
+    outputs: Optional[Dict[str, Any]] = Field(None, description="Mocked outputs by activity name, e.g. {'Lookup_Tables': {'value': [...]}} to drive a ForEach."),
+    outcomes: Optional[Dict[str, str]] = Field(None, description="Activity name -> 'Failed' to simulate a failing activity (all retries fail)."),
+    failed_attempts: Optional[Dict[str, int]] = Field(None, description="Activity name -> attempts that fail before one succeeds, to exercise retry policies."),
+    branches: Optional[Dict[str, Any]] = Field(None, description="IfCondition name -> true/false, or Switch name -> case value, when the condition needs run-time values."),
+    iterations: Optional[Dict[str, int]] = Field(None, description="ForEach item count or Until iteration count by activity name, when it needs run-time values."),
+    job_id: Optional[str] = Field(None, description="A previous run of the deployed pipeline whose activity durations are used.")
+) -> Dict[str, Any]:
+    """
+    Simulates a pipeline run locally without using capacity: dependency conditions, ForEach batches,
+    Until loops, IfCondition/Switch branches and retry policies, with mocked activity durations and
+    outputs. Reports the predicted end-to-end time, peak concurrency, the critical path and any
+    assumptions made for values that only exist at run time.
+    """
+    logger.info(f"Tool 'simulate_pipeline' called (pipeline={pipeline_id}, offline={definition is not None}).")
+    if job_id and not (workspace_id and pipeline_id):
+        raise ToolError("'job_id' requires 'workspace_id' and 'pipeline_id'.")
+    try:
+        history = None
+        if definition is not None:
+            content = _local_pipeline_content(definition)
+        elif workspace_id and pipeline_id:
+            client = await get_session_fabric_client(ctx)
+            try:
+                content = (await load_pipeline_definition(client, workspace_id, pipeline_id)).content
+            except ValueError as e:
+                raise ToolError(f"Failed to read pipeline definition: {e}")
+        else:
+            raise ToolError("Provide either 'definition' or both 'workspace_id' and 'pipeline_id'.")
+        if job_id:
+            history = await _activity_durations_from_run(await get_session_fabric_client(ctx), workspace_id, pipeline_id, job_id)
+
+        options = SimulationOptions(
+            durations=durations or {}, history=history or {}, outputs=outputs or {}, outcomes=outcomes or {},
+            failed_attempts=failed_attempts or {}, branches=branches or {}, iterations=iterations or {},
+        )
+        try:
+            return simulate_pipeline(content, options, parameters, variables).model_dump()
+        except ValueError as e:
+            raise ToolError(str(e))
+
+    except (FabricAuthException, FabricApiException) as e:
+        raise ToolError(f"Failed to simulate pipeline: {e.response_text or str(e)}")
+
 async def get_pipeline_definition_impl(
     ctx: Context,
     workspace_id: str = Field(..., description="The ID of the Fabric workspace containing the pipeline."),
@@ -215,6 +884,7 @@ async def get_pipeline_definition_impl(
 
         if decode_payload and 'definition' in definition and 'parts' in definition['definition']:
             try:
+                remember_pipeline_definition(workspace_id, pipeline_id, decode_pipeline_definition(definition))
                 # Find the specific part for the pipeline content
                 content_part = next(
                     part for part in definition['definition']['parts'] 
@@ -243,7 +913,17 @@ async def get_pipeline_definition_impl(
 def register_pipeline_tools(app: FastMCP):
     logger.info("Registering Fabric Pipeline tools...")
     app.tool(name="create_pipeline")(create_pipeline_impl)
+    app.tool(name="create_partitioned_pipeline")(create_partitioned_pipeline_impl)
+    app.tool(name="create_bulk_copy_pipeline")(create_bulk_copy_pipeline_impl)
     app.tool(name="update_pipeline")(update_pipeline_impl)
+    app.tool(name="patch_pipeline")(patch_pipeline_impl)
     app.tool(name="run_pipeline")(run_pipeline_impl)
+    app.tool(name="run_pipeline_sweep")(run_pipeline_sweep_impl)
+    app.tool(name="watch_pipeline_run")(watch_pipeline_run_impl)
     app.tool(name="get_pipeline_definition")(get_pipeline_definition_impl)
+    app.tool(name="analyze_pipeline")(analyze_pipeline_impl)
+    app.tool(name="optimize_pipeline_dependencies")(optimize_pipeline_dependencies_impl)
+    app.tool(name="diff_pipeline_definitions")(diff_pipeline_definitions_impl)
+    app.tool(name="validate_expressions")(validate_expressions_impl)
+    app.tool(name="simulate_pipeline")(simulate_pipeline_impl)
     logger.info("Fabric Pipeline tools registration complete.")
\ No newline at end of file
@@ -0,0 +1,63 @@
+import json
+import logging
+from typing import List, Dict, Any
+
+from fastmcp import FastMCP, Context
+from fastmcp.exceptions import ToolError
+from pydantic import Field
+
+from ..plans import PlanError, PlanStep, execute_plan
+
+logger = logging.getLogger(__name__)
+
+def _tool_result_value(tool, result) -> Any:
+    """Turns a ToolResult back into the plain value the tool returned, so later steps can reference it."""
+    structured = result.structured_content
+    if structured is not None:
+        if tool.output_schema and tool.output_schema.get("x-fastmcp-wrap-result"):
+            return structured.get("result")
+        return structured
+    text = "".join(getattr(block, "text", "") for block in result.content)
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+async def execute_plan_impl(
+    ctx: Context,
+    steps: List[PlanStep] = Field(..., min_length=1, description="Steps to run. Independent steps run concurrently; use 'depends_on' or ${step_id.field} references to order them."),
+    max_concurrency: int = Field(4, ge=1, le=16, description="Maximum number of steps running at once.")
+) -> Dict[str, Any]:
+    """
+    Executes several tool calls in one request, e.g. create a lakehouse, upload files, load tables and run a pipeline.
+    Arguments can use results of earlier steps, e.g. "lakehouse_id": "${create_lh.id}".
+    A failed step does not stop unrelated steps; steps depending on it are skipped.
+    """
+    logger.info(f"Tool 'execute_plan' called with {len(steps)} steps.")
+    tools = await ctx.fastmcp.get_tools()
+
+    unknown = sorted({s.tool for s in steps if s.tool not in tools or s.tool == "execute_plan"})
+    if unknown:
+        raise ToolError(f"Plan uses unknown or unsupported tools: {unknown}")
+
+    async def _run_step(tool_name: str, arguments: Dict[str, Any]) -> Any:
+        tool = tools[tool_name]
+        return _tool_result_value(tool, await tool.run(arguments))
+
+    try:
+        outcomes = await execute_plan(steps, _run_step, max_concurrency)
+    except PlanError as e:
+        raise ToolError(f"Invalid plan: {e}")
+
+    succeeded = sum(1 for o in outcomes.values() if o["status"] == "Succeeded")
+    return {
+        "status": "Succeeded" if succeeded == len(outcomes) else "PartiallySucceeded" if succeeded else "Failed",
+        "succeeded": succeeded,
+        "total": len(outcomes),
+        "steps": outcomes,
+    }
+
+def register_plan_tools(app: FastMCP):
+    logger.info("Registering Fabric Plan tools...")
+    app.tool(name="execute_plan")(execute_plan_impl)
+    logger.info("Fabric Plan tools registration complete.")
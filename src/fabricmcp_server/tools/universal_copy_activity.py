@@ -4,22 +4,31 @@ Universal Copy Activity Tool - True Modular Design
 This module implements the user's desired modularity:
 - Individual source models for each source type (SharePoint, S3, Lakehouse)
 - Individual sink models for each sink type (Lakehouse, S3)  
-- Universal copy activity tool that accepts any source + sink combination
+- Universal copy activity tool that accepts any source + sink combination, or a batch of
+  source + sink pairs emitted as parallel Copy activities, with a dry-run mode
 - Proper handling of file path types and table vs file configurations
 """
 
+import base64
 import json
 import logging
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Type, Union
 from enum import Enum
 
+import httpx
 from fastmcp import FastMCP, Context
+from fastmcp.exceptions import ToolError
 from pydantic import BaseModel, Field, model_validator, field_validator
 
-from ..fabric_models import ItemDefinitionForCreate, CreateItemRequest, DefinitionPart
-from ..sessions import get_session_fabric_client
+from ..app import get_session_fabric_client, job_status_store, session_scope
+from ..fabric_models import FabricApiException, FabricAuthException, ItemDefinitionForCreate, ItemEntity, CreateItemRequest, DefinitionPart
+from ..flexible_copy_schemas import copy_staging_errors, create_staging_settings, lakehouse_table_write_options
+from ..idempotency import IdempotencyConflict, idempotency_store
+from ..payload_cache import payload_cache
+from ..pipeline_partition import MAX_ACTIVITIES_PER_PIPELINE
+from ..schema_mapping import ColumnSchema, build_tabular_translator
 
 logger = logging.getLogger(__name__)
 
@@ -769,6 +778,9 @@ class LakehouseSink(BaseModel):
     # Table-specific sink options
     table_action_option: str = "Append"  # Append, Overwrite, Upsert
     partition_option: str = "None"  # None, PartitionByKey
+    partition_columns: Optional[List[str]] = Field(None, description="Delta partition columns (implies PartitionByKey), outermost first")
+    upsert_keys: Optional[List[str]] = Field(None, description="Key columns for table_action_option='Upsert'")
+    apply_v_order: Optional[bool] = Field(None, description="Write V-Order optimized Parquet")
     
     # Write settings
     max_concurrent_connections: int = 1
@@ -782,7 +794,16 @@ class LakehouseSink(BaseModel):
             raise ValueError("table_config required when root_folder='Tables'")
         if self.root_folder == "Files" and not self.file_config:
             raise ValueError("file_config required when root_folder='Files'")
+        if self.root_folder == "Tables":
+            if self.partition_option == "PartitionByKey" and not self.partition_columns:
+                raise ValueError("partition_columns required when partition_option='PartitionByKey'")
+            self.table_write_options()
+        elif self.partition_columns or self.upsert_keys or self.apply_v_order is not None or self.partition_option != "None":
+            raise ValueError("partition, upsert and V-Order options only apply when root_folder='Tables'")
         return self
+
+    def table_write_options(self) -> Dict[str, Any]:
+        return lakehouse_table_write_options(self.table_action_option, self.partition_columns, self.upsert_keys, self.apply_v_order)
     
     def to_copy_activity_sink(self) -> Dict[str, Any]:
         """Generate Lakehouse sink JSON based on configuration"""
@@ -847,10 +868,8 @@ class LakehouseSink(BaseModel):
             if self.table_config.schema_name:
                 base_config["datasetSettings"]["typeProperties"]["schema"] = self.table_config.schema_name
                 
-            # Add table action options
-            base_config["tableActionOption"] = self.table_action_option
-            if self.partition_option != "None":
-                base_config["partitionOption"] = self.partition_option
+            # Add table action, partition and write options
+            base_config.update(self.table_write_options())
                 
         elif self.root_folder == "Files" and self.file_config:
             base_config["datasetSettings"]["typeProperties"] = {
@@ -1191,6 +1210,16 @@ class GoogleCloudStorageSink(BaseModel):
 # COPY ACTIVITY CONFIGURATION
 # =============================================================================
 
+class StagingConfiguration(BaseModel):
+    """Interim storage for a staged copy (e.g. bulk loads into a Warehouse)"""
+    connection_id: Optional[str] = Field(None, description="Azure Blob Storage or ADLS Gen2 connection; omit to use the workspace staging storage")
+    path: Optional[str] = Field(None, description="'container' or 'container/folder' for the interim data")
+    enable_compression: bool = Field(False, description="Compress the interim data")
+
+    def to_staging_settings(self) -> Dict[str, Any]:
+        return create_staging_settings(self.connection_id, self.path, self.enable_compression).model_dump(exclude_none=True)
+
+
 class CopyActivityConfig(BaseModel):
     """Additional copy activity components beyond source/sink"""
     activity_name: str = "Copy Activity"
@@ -1201,14 +1230,24 @@ class CopyActivityConfig(BaseModel):
     secure_output: bool = False
     secure_input: bool = False
     enable_staging: bool = False
+    staging: Optional[StagingConfiguration] = None
     enable_logging: bool = False
     
     # Translator configuration
     enable_schema_mapping: bool = False
     translator: Optional[Dict[str, Any]] = None
+    source_columns: Optional[List[ColumnSchema]] = Field(None, description="Source schema to generate the mapping from when no translator is given")
     
+    @model_validator(mode='after')
+    def validate_staging(self):
+        if self.staging is not None and not self.enable_staging:
+            raise ValueError("'staging' is only used when enable_staging is true")
+        return self
+
     def get_translator(self) -> Optional[Dict[str, Any]]:
         """Generate translator only when needed"""
+        if self.enable_schema_mapping and not self.translator and self.source_columns:
+            return build_tabular_translator(self.source_columns).translator
         if self.enable_schema_mapping and self.translator:
             return {
                 "type": "TabularTranslator",
@@ -1222,151 +1261,215 @@ class CopyActivityConfig(BaseModel):
         return None
 
 
+# =============================================================================
+# CONNECTOR REGISTRY
+# =============================================================================
+
+# source_type / sink_type names accepted by the tool (case-insensitive).
+SOURCE_MODELS: Dict[str, Type[BaseModel]] = {
+    "SharePoint": SharePointSource,
+    "S3": S3Source,
+    "Lakehouse": LakehouseSource,
+    "HTTP": HttpSource,
+    "REST": RestSource,
+    "FileSystem": FileSystemSource,
+    "MySQL": MySqlSource,
+    "GoogleCloudStorage": GoogleCloudStorageSource,
+}
+
+SINK_MODELS: Dict[str, Type[BaseModel]] = {
+    "Lakehouse": LakehouseSink,
+    "S3": S3Sink,
+    "REST": RestSink,
+    "FileSystem": FileSystemSink,
+    "GoogleCloudStorage": GoogleCloudStorageSink,
+}
+
+_SOURCE_MODELS_BY_NAME = {name.lower(): model for name, model in SOURCE_MODELS.items()}
+_SINK_MODELS_BY_NAME = {name.lower(): model for name, model in SINK_MODELS.items()}
+
+
 # =============================================================================
 # UNIVERSAL COPY ACTIVITY TOOL
 # =============================================================================
 
+class UniversalCopy(BaseModel):
+    """One source -> sink Copy activity of a universal copy pipeline"""
+    source_type: str = Field(..., description=f"Type of source: {', '.join(SOURCE_MODELS)}")
+    source_config: Dict[str, Any] = Field(..., description="Source configuration dictionary")
+    sink_type: str = Field(..., description=f"Type of sink: {', '.join(SINK_MODELS)}")
+    sink_config: Dict[str, Any] = Field(..., description="Sink configuration dictionary")
+    activity_config: Optional[Dict[str, Any]] = Field(None, description="Optional copy activity configuration")
+
+
+def build_universal_copy_activity(copy: UniversalCopy) -> Dict[str, Any]:
+    """Compiles one source/sink pair into a Copy activity. Raises ValueError on invalid configuration."""
+    source_model = _SOURCE_MODELS_BY_NAME.get(copy.source_type.lower())
+    if source_model is None:
+        raise ValueError(f"Unsupported source type: {copy.source_type}. Supported: {', '.join(SOURCE_MODELS)}")
+    sink_model = _SINK_MODELS_BY_NAME.get(copy.sink_type.lower())
+    if sink_model is None:
+        raise ValueError(f"Unsupported sink type: {copy.sink_type}. Supported: {', '.join(SINK_MODELS)}")
+    source = source_model(**copy.source_config)
+    sink = sink_model(**copy.sink_config)
+    config = CopyActivityConfig(**(copy.activity_config or {}))
+
+    copy_activity = {
+        "name": config.activity_name,
+        "type": "Copy",
+        "description": config.description,
+        "dependsOn": [],
+        "policy": {
+            "timeout": config.timeout,
+            "retry": config.retry_count,
+            "retryIntervalInSeconds": config.retry_interval_seconds,
+            "secureOutput": config.secure_output,
+            "secureInput": config.secure_input
+        },
+        "typeProperties": {
+            "source": source.to_copy_activity_source(),
+            "sink": sink.to_copy_activity_sink(),
+            "enableStaging": config.enable_staging
+        }
+    }
+
+    if config.staging is not None:
+        copy_activity["typeProperties"]["stagingSettings"] = config.staging.to_staging_settings()
+    staging_errors = copy_staging_errors(copy_activity["typeProperties"])
+    if staging_errors:
+        raise ValueError("; ".join(staging_errors))
+
+    translator = config.get_translator()
+    if translator:
+        copy_activity["typeProperties"]["translator"] = translator
+    return copy_activity
+
+
+def build_universal_copy_pipeline(copies: List[UniversalCopy], description: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Compiles source/sink pairs into one pipeline definition with a Copy activity per pair.
+    The activities have no dependencies, so they run in parallel; duplicate names get a numeric suffix.
+    Activities are shared frozen fragments from the payload cache, copied only at the top level.
+    """
+    if not copies:
+        raise ValueError("No source/sink pairs to copy.")
+    if len(copies) > MAX_ACTIVITIES_PER_PIPELINE:
+        raise ValueError(f"{len(copies)} Copy activities exceed the limit of {MAX_ACTIVITIES_PER_PIPELINE} per pipeline.")
+
+    activities, used = [], set()
+    for index, copy in enumerate(copies):
+        try:
+            activity = payload_cache.get_or_build(
+                "universal_copy_activity",
+                [copy.source_type.lower(), copy.source_config, copy.sink_type.lower(), copy.sink_config, copy.activity_config],
+                lambda: build_universal_copy_activity(copy),
+            )
+        except ValueError as e:
+            if len(copies) == 1:
+                raise
+            raise ValueError(f"Copy {index} ({copy.source_type} to {copy.sink_type}): {e}")
+        name, n = activity["name"], 1
+        while name in used:
+            n += 1
+            name = f"{activity['name']} {n}"
+        used.add(name)
+        activities.append({**activity, "name": name})
+
+    routes = list(dict.fromkeys(f"{c.source_type} to {c.sink_type}" for c in copies))
+    return {
+        "properties": {
+            "activities": activities,
+            "description": description or f"Universal copy pipeline: {', '.join(routes)}",
+            "concurrency": 1,
+            "annotations": ["Universal", "CopyData", *(r.replace(" to ", "To") for r in routes)],
+            "folder": {
+                "name": "Universal Copy Pipelines"
+            }
+        }
+    }
+
+
 async def create_universal_copy_pipeline_impl(
     ctx: Context,
-    workspace_id: str,
-    pipeline_name: str,
-    source_type: str,
-    source_config: Dict[str, Any],
-    sink_type: str,
-    sink_config: Dict[str, Any],
-    activity_config: Optional[Dict[str, Any]] = None,
-    description: Optional[str] = None
+    workspace_id: str = Field(..., description="Target workspace ID"),
+    pipeline_name: str = Field(..., description="Name for the pipeline"),
+    source_type: Optional[str] = Field(None, description=f"Type of source: {', '.join(SOURCE_MODELS)}"),
+    source_config: Optional[Dict[str, Any]] = Field(None, description="Source configuration dictionary"),
+    sink_type: Optional[str] = Field(None, description=f"Type of sink: {', '.join(SINK_MODELS)}"),
+    sink_config: Optional[Dict[str, Any]] = Field(None, description="Sink configuration dictionary"),
+    activity_config: Optional[Dict[str, Any]] = Field(None, description="Optional copy activity configuration"),
+    copies: Optional[List[UniversalCopy]] = Field(None, description="Batch form: several source/sink pairs, created as parallel Copy activities of one pipeline. Use instead of the single source/sink arguments."),
+    description: Optional[str] = Field(None, description="Optional pipeline description"),
+    dry_run: bool = Field(False, description="If true, return the compiled pipeline definition without calling Fabric."),
+    idempotency_key: Optional[str] = Field(None, description="Optional client-chosen key. Retrying with the same key returns the original result instead of creating another pipeline.")
 ) -> Dict[str, Any]:
     """
-    Universal copy pipeline tool - accepts any source + any sink combination
-    
-    Args:
-        workspace_id: Target workspace ID
-        pipeline_name: Name for the pipeline
-        source_type: Type of source (SharePoint, S3, Lakehouse, HTTP, REST, FileSystem, MySQL)
-        source_config: Source configuration dictionary
-        sink_type: Type of sink (Lakehouse, S3, REST, FileSystem)
-        sink_config: Sink configuration dictionary  
-        activity_config: Optional copy activity configuration
-        description: Optional pipeline description
+    Universal copy pipeline tool - accepts any source + any sink combination.
+    Pass source_type/source_config/sink_type/sink_config for one Copy activity, or 'copies' for
+    several that run in parallel. Returns the created pipeline's ID, not its definition.
     """
-    
+    single = (source_type, source_config, sink_type, sink_config)
+    logger.info(f"Tool 'create_universal_copy_pipeline' called for '{pipeline_name}' ({len(copies) if copies else 1} copies, dry_run={dry_run}).")
+    if copies and any(v is not None for v in (*single, activity_config)):
+        raise ToolError("Pass either 'copies' or the single source/sink arguments, not both.")
     try:
-        client = await get_session_fabric_client(ctx)
-        
-        # Parse source configuration
-        if source_type.lower() == "sharepoint":
-            source = SharePointSource(**source_config)
-        elif source_type.lower() == "s3":
-            source = S3Source(**source_config)
-        elif source_type.lower() == "lakehouse":
-            source = LakehouseSource(**source_config)
-        elif source_type.lower() == "http":
-            source = HttpSource(**source_config)
-        elif source_type.lower() == "rest":
-            source = RestSource(**source_config)
-        elif source_type.lower() == "filesystem":
-            source = FileSystemSource(**source_config)
-        elif source_type.lower() == "mysql":
-            source = MySqlSource(**source_config)
-        elif source_type.lower() == "googlecloudstorage":
-            source = GoogleCloudStorageSource(**source_config)
-        else:
-            raise ValueError(f"Unsupported source type: {source_type}. Supported: SharePoint, S3, Lakehouse, HTTP, REST, FileSystem, MySQL, GoogleCloudStorage")
-            
-        # Parse sink configuration  
-        if sink_type.lower() == "lakehouse":
-            sink = LakehouseSink(**sink_config)
-        elif sink_type.lower() == "s3":
-            sink = S3Sink(**sink_config)
-        elif sink_type.lower() == "rest":
-            sink = RestSink(**sink_config)
-        elif sink_type.lower() == "filesystem":
-            sink = FileSystemSink(**sink_config)
-        elif sink_type.lower() == "googlecloudstorage":
-            sink = GoogleCloudStorageSink(**sink_config)
-        else:
-            raise ValueError(f"Unsupported sink type: {sink_type}. Supported: Lakehouse, S3, REST, FileSystem, GoogleCloudStorage")
-            
-        # Parse activity configuration
-        if activity_config:
-            config = CopyActivityConfig(**activity_config)
-        else:
-            config = CopyActivityConfig()
-        
-        # Generate source and sink JSON from the models
-        source_json = source.to_copy_activity_source()
-        sink_json = sink.to_copy_activity_sink()
-        
-        # Build complete copy activity JSON
-        copy_activity = {
-            "name": config.activity_name,
-            "type": "Copy",
-            "description": config.description,
-            "dependsOn": [],
-            "policy": {
-                "timeout": config.timeout,
-                "retry": config.retry_count,
-                "retryIntervalInSeconds": config.retry_interval_seconds,
-                "secureOutput": config.secure_output,
-                "secureInput": config.secure_input
-            },
-            "typeProperties": {
-                "source": source_json,
-                "sink": sink_json,
-                "enableStaging": config.enable_staging
-            }
-        }
-        
-        # Add translator if configured
-        translator = config.get_translator()
-        if translator:
-            copy_activity["typeProperties"]["translator"] = translator
-            
-        # Build complete pipeline definition
-        pipeline_structure = {
-            "properties": {
-                "activities": [copy_activity],
-                "description": description or f"Universal copy pipeline: {source_type} to {sink_type}",
-                "concurrency": 1,
-                "annotations": ["Universal", "CopyData", f"{source_type}To{sink_type}"],
-                "folder": {
-                    "name": "Universal Copy Pipelines"
-                }
-            }
+        if not copies:
+            if any(v is None for v in single):
+                raise ValueError("source_type, source_config, sink_type and sink_config are required unless 'copies' is given.")
+            copies = [UniversalCopy(
+                source_type=source_type, source_config=source_config,
+                sink_type=sink_type, sink_config=sink_config, activity_config=activity_config,
+            )]
+        pipeline_structure = build_universal_copy_pipeline(copies, description)
+    except ValueError as e:
+        raise ToolError(f"Cannot build universal copy pipeline: {e}")
+
+    content = json.dumps(pipeline_structure, separators=(",", ":"))
+    activity_names = [a["name"] for a in pipeline_structure["properties"]["activities"]]
+    if dry_run:
+        return {
+            "status": "DryRun",
+            "pipeline_name": pipeline_name,
+            "activities": activity_names,
+            "payload_bytes": len(content.encode("utf-8")),
+            "pipeline_definition": pipeline_structure,
         }
-        
-        # Create pipeline via Fabric API
-        import base64
-        pipeline_json = json.dumps(pipeline_structure, indent=2)
-        b64_payload = base64.b64encode(pipeline_json.encode("utf-8")).decode("utf-8")
-        
+
+    async def _create() -> Dict[str, Any]:
+        b64_payload = base64.b64encode(content.encode("utf-8")).decode("utf-8")
         create_request = CreateItemRequest(
             displayName=pipeline_name,
             type="DataPipeline",
+            description=pipeline_structure["properties"]["description"],
             definition=ItemDefinitionForCreate(
+                format="Trident.DataPipeline",
                 parts=[DefinitionPart(path="pipeline-content.json", payload=b64_payload, payloadType="InlineBase64")]
             )
         )
-        
-        response = await client.create_item(workspace_id, create_request.model_dump(by_alias=True, exclude_none=True))
-        
-        return {
-            "pipeline_id": response.id,
-            "pipeline_name": response.display_name,
-            "workspace_id": workspace_id,
-            "source_type": source_type,
-            "sink_type": sink_type,
-            "status": "Created successfully",
-            "pipeline_definition": pipeline_structure
-        }
-        
-    except Exception as e:
-        return {
-            "error": f"Failed to create universal copy pipeline: {str(e)}",
-            "source_type": source_type,
-            "sink_type": sink_type
-        }
+        response = await client.create_item(workspace_id, create_request)
+        result = {"workspace_id": workspace_id, "pipeline_name": pipeline_name, "activities": activity_names}
+
+        if isinstance(response, ItemEntity):
+            return {"status": "Created", "pipeline_id": response.id, **result}
+        if isinstance(response, httpx.Response) and response.status_code == 202:
+            operation_url = response.headers.get("Location") or response.headers.get("Operation-Location")
+            if operation_url:
+                job_id = operation_url.split('/')[-1].split('?')[0]
+                job_status_store[job_id] = operation_url
+                return {"status": "Accepted", "job_id": job_id, **result, "message": "Use 'get_operation_status' to track completion."}
+        raise ToolError(f"Unexpected response creating pipeline: {getattr(response, 'status_code', response)}")
+
+    try:
+        client = await get_session_fabric_client(ctx)
+        arguments = {"workspace_id": workspace_id, "pipeline_name": pipeline_name, "definition": pipeline_structure}
+        return await idempotency_store.run_once(
+            "create_universal_copy_pipeline", arguments, _create, idempotency_key, scope=session_scope(ctx)
+        )
+
+    except IdempotencyConflict as e:
+        raise ToolError(str(e))
+    except (FabricAuthException, FabricApiException) as e:
+        raise ToolError(f"Failed to create universal copy pipeline: {e.response_text or str(e)}")
 
 
 # =============================================================================
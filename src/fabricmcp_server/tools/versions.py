@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from typing import Any, Dict
+
+from fastmcp import FastMCP, Context
+from fastmcp.exceptions import ToolError
+from pydantic import Field
+
+from ..fabric_models import FabricApiException, FabricAuthException
+from ..app import get_session_fabric_client, job_status_store
+from ..definitions import expect_deployed_hash, forget_pipeline_definition, hash_definition_parts, record_deployed_hash
+from ..versions import fetch_item_definition, version_store
+
+logger = logging.getLogger(__name__)
+
+def _require_store():
+    if version_store is None:
+        raise ToolError("The definition version store is disabled (FABRIC_VERSION_STORE=off).")
+    return version_store
+
+async def list_definition_versions_impl(
+    ctx: Context,
+    workspace_id: str = Field(..., description="The ID of the item's workspace."),
+    item_id: str = Field(..., description="The ID of the pipeline or notebook."),
+    limit: int = Field(20, ge=1, le=500, description="Maximum number of versions to return, newest first.")
+) -> Dict[str, Any]:
+    """
+    Lists the saved versions of an item's definition. A version is saved before every update
+    made through this server, so the newest version is what was deployed before the last update.
+    """
+    logger.info(f"Tool 'list_definition_versions' called for item {item_id}.")
+    store = _require_store()
+    versions = await asyncio.to_thread(store.list, workspace_id, item_id, limit)
+    return {"versions": [v.model_dump() for v in versions]}
+
+async def rollback_definition_impl(
+    ctx: Context,
+    workspace_id: str = Field(..., description="The ID of the item's workspace."),
+    item_id: str = Field(..., description="The ID of the pipeline or notebook to roll back."),
+    version_id: int = Field(..., description="The version to restore, from 'list_definition_versions'.")
+) -> Dict[str, Any]:
+    """
+    Restores a saved definition version. The definition deployed right now is saved as a new
+    version first, so a rollback can itself be undone.
+    """
+    logger.info(f"Tool 'rollback_definition' called for item {item_id} (version {version_id}).")
+    store = _require_store()
+    try:
+        version, definition = await asyncio.to_thread(store.get, version_id)
+    except KeyError as e:
+        raise ToolError(str(e.args[0]))
+    if (version.workspace_id, version.item_id) != (workspace_id, item_id):
+        raise ToolError(f"Version {version_id} belongs to item {version.item_id} in workspace {version.workspace_id}.")
+
+    try:
+        client = await get_session_fabric_client(ctx)
+        current = await fetch_item_definition(client, workspace_id, item_id)
+        if hash_definition_parts(current.get("parts") or []) == version.content_hash:
+            return {"status": "NoChange", "message": f"Version {version_id} is already deployed."}
+        backup = await asyncio.to_thread(store.save, workspace_id, item_id, version.item_type, current, f"rollback_definition to version {version_id}")
+
+        response = await client.update_item_definition(workspace_id, item_id, {"definition": definition})
+        forget_pipeline_definition(workspace_id, item_id)
+        result = {"restored_version": version_id, "previous_version": backup.version_id if backup else None}
+
+        if response.status_code == 200:
+            record_deployed_hash(workspace_id, item_id, version.content_hash)
+            return {"status": "Succeeded", **result}
+        if response.status_code == 202:
+            operation_url = response.headers.get("Location") or response.headers.get("Operation-Location")
+            if not operation_url:
+                raise ToolError("API accepted the request but did not provide a status location URL.")
+            job_id = operation_url.split('/')[-1].split('?')[0]
+            job_status_store[job_id] = operation_url
+            expect_deployed_hash(job_id, workspace_id, item_id, version.content_hash)
+            return {"status": "Accepted", "job_id": job_id, **result, "message": "Use 'get_operation_status' to track completion."}
+        raise ToolError(f"API returned an unexpected status code: {response.status_code} - {response.text}")
+
+    except (FabricAuthException, FabricApiException) as e:
+        raise ToolError(f"Failed to roll back definition: {e.response_text or str(e)}")
+
+def register_version_tools(app: FastMCP):
+    """Registers definition version history tools with the MCP app."""
+    logger.info("Registering definition version tools...")
+    app.tool(name="list_definition_versions")(list_definition_versions_impl)
+    app.tool(name="rollback_definition")(rollback_definition_impl)
+    logger.info("Definition version tools registration complete.")
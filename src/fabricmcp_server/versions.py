@@ -0,0 +1,204 @@
+"""
+Local version history of item definitions.
+
+Before a tool overwrites a pipeline or notebook definition, the definition that
+is currently deployed is saved here, so a bad update can be rolled back. Blobs
+are content-addressed by `hash_definition_parts` and stored zlib-compressed in
+SQLite: identical definitions are stored once, and a snapshot that matches the
+item's latest version does not add a row, so the store only grows with actual
+changes.
+
+The database lives at FABRIC_VERSION_STORE (default ~/.fabricmcp/versions.db);
+set it to "off" to disable snapshots.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel
+
+from .definitions import hash_definition_parts
+from .fabric_models import FabricApiException, FabricAuthException
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VERSION_STORE = "~/.fabricmcp/versions.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+    version_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    workspace_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    item_type TEXT,
+    hash TEXT NOT NULL REFERENCES blobs(hash),
+    created_at TEXT NOT NULL,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS versions_by_item ON versions (workspace_id, item_id, version_id);
+"""
+
+
+class DefinitionVersion(BaseModel):
+    version_id: int
+    workspace_id: str
+    item_id: str
+    item_type: Optional[str] = None
+    content_hash: str
+    created_at: str
+    reason: Optional[str] = None
+
+
+def _without_platform(definition: Dict[str, Any]) -> Dict[str, Any]:
+    """.platform holds item metadata; updateDefinition rejects it unless updateMetadata is set."""
+    return {**definition, "parts": [p for p in definition.get("parts") or [] if p.get("path") != ".platform"]}
+
+
+class VersionStore:
+    """SQLite-backed store of definition snapshots. Safe to use from several threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def save(
+        self, workspace_id: str, item_id: str, item_type: Optional[str], definition: Dict[str, Any], reason: Optional[str] = None
+    ) -> Optional[DefinitionVersion]:
+        """Stores the definition as the item's newest version. Returns None if it equals the latest version."""
+        definition = _without_platform(definition)
+        content_hash = hash_definition_parts(definition["parts"])
+        with self._lock:
+            db = self._db()
+            latest = db.execute(
+                "SELECT hash FROM versions WHERE workspace_id = ? AND item_id = ? ORDER BY version_id DESC LIMIT 1",
+                (workspace_id, item_id),
+            ).fetchone()
+            if latest and latest[0] == content_hash:
+                return None
+            blob = zlib.compress(json.dumps(definition, separators=(",", ":")).encode("utf-8"), 9)
+            created_at = datetime.now(timezone.utc).isoformat()
+            with db:
+                db.execute("INSERT OR IGNORE INTO blobs (hash, data) VALUES (?, ?)", (content_hash, blob))
+                cursor = db.execute(
+                    "INSERT INTO versions (workspace_id, item_id, item_type, hash, created_at, reason) VALUES (?, ?, ?, ?, ?, ?)",
+                    (workspace_id, item_id, item_type, content_hash, created_at, reason),
+                )
+        return DefinitionVersion(
+            version_id=cursor.lastrowid, workspace_id=workspace_id, item_id=item_id, item_type=item_type,
+            content_hash=content_hash, created_at=created_at, reason=reason,
+        )
+
+    def list(self, workspace_id: str, item_id: str, limit: int = 20) -> List[DefinitionVersion]:
+        """The item's versions, newest first."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT version_id, workspace_id, item_id, item_type, hash, created_at, reason FROM versions "
+                "WHERE workspace_id = ? AND item_id = ? ORDER BY version_id DESC LIMIT ?",
+                (workspace_id, item_id, limit),
+            ).fetchall()
+        return [self._version(row) for row in rows]
+
+    def get(self, version_id: int) -> Tuple[DefinitionVersion, Dict[str, Any]]:
+        """The version and its definition. Raises KeyError if it does not exist."""
+        with self._lock:
+            row = self._db().execute(
+                "SELECT v.version_id, v.workspace_id, v.item_id, v.item_type, v.hash, v.created_at, v.reason, b.data "
+                "FROM versions v JOIN blobs b ON b.hash = v.hash WHERE v.version_id = ?",
+                (version_id,),
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Version {version_id} does not exist.")
+        return self._version(row), json.loads(zlib.decompress(row[7]).decode("utf-8"))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            db = self._db()
+            versions = db.execute("SELECT COUNT(*) FROM versions").fetchone()[0]
+            blobs, size = db.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM blobs").fetchone()
+        return {"versions": versions, "blobs": blobs, "stored_bytes": size}
+
+    @staticmethod
+    def _version(row) -> DefinitionVersion:
+        return DefinitionVersion(
+            version_id=row[0], workspace_id=row[1], item_id=row[2], item_type=row[3],
+            content_hash=row[4], created_at=row[5], reason=row[6],
+        )
+
+
+def _store_path() -> Optional[str]:
+    path = os.getenv("FABRIC_VERSION_STORE", DEFAULT_VERSION_STORE)
+    if path.lower() in ("", "off", "none"):
+        return None
+    return os.path.expanduser(path)
+
+
+_store_location = _store_path()
+version_store: Optional[VersionStore] = VersionStore(_store_location) if _store_location else None
+
+
+async def fetch_item_definition(client, workspace_id: str, item_id: str, poll_interval_seconds: float = 1.0, timeout: float = 60.0) -> Dict[str, Any]:
+    """The item's current `definition`, waiting if getDefinition runs as a long-running operation."""
+    response = await client.get_item_definition(workspace_id=workspace_id, item_id=item_id)
+    if isinstance(response, httpx.Response) and response.status_code == 202:
+        operation_url = response.headers.get("Location") or response.headers.get("Operation-Location")
+        if not operation_url:
+            raise FabricApiException(202, "getDefinition was accepted without a status location.")
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            status = (await client.poll_lro_status(operation_url)).json().get("status")
+            if status == "Succeeded":
+                response = await client.get_operation_result(operation_url)
+                break
+            if status in ("Failed", "Canceled") or asyncio.get_running_loop().time() > deadline:
+                raise FabricApiException(0, f"getDefinition did not succeed (status {status}).")
+            await asyncio.sleep(poll_interval_seconds)
+    if not isinstance(response, dict) or not (response.get("definition") or {}).get("parts"):
+        raise FabricApiException(0, "The item has no readable definition.")
+    return response["definition"]
+
+
+async def snapshot_deployed_definition(client, workspace_id: str, item_id: str, item_type: Optional[str], reason: str) -> Optional[DefinitionVersion]:
+    """
+    Saves the currently deployed definition before it is overwritten. Never raises: a failed
+    snapshot is logged and the write goes ahead.
+    """
+    if version_store is None:
+        return None
+    try:
+        definition = await fetch_item_definition(client, workspace_id, item_id)
+        version = await asyncio.to_thread(version_store.save, workspace_id, item_id, item_type, definition, reason)
+    except (FabricAuthException, FabricApiException, httpx.HTTPError, OSError, sqlite3.Error, ValueError) as e:
+        logger.warning(f"Could not snapshot the definition of {item_id} before '{reason}': {e}")
+        return None
+    if version is not None:
+        logger.info(f"Saved version {version.version_id} of {item_id} before '{reason}'.")
+    return version
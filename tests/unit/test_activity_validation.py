@@ -0,0 +1,19 @@
+import json
+
+from src.fabricmcp_server.activity_types import ActivityListAdapter, ForEachActivity, validate_activities_json
+
+
+def test_json_and_python_paths_validate_nested_activities_alike():
+    activities = [{
+        "name": "Loop", "type": "ForEach",
+        "typeProperties": {"activities": [{
+            "name": "Check", "type": "IfCondition",
+            "typeProperties": {"ifTrueActivities": [{"name": "Pause", "type": "Wait", "typeProperties": {"waitTimeInSeconds": 3}}]},
+        }]},
+    }]
+
+    from_json = validate_activities_json(json.dumps(activities).encode("utf-8"))
+
+    assert isinstance(from_json[0], ForEachActivity)
+    assert from_json == ActivityListAdapter.validate_python(activities)
+    assert from_json[0].typeProperties.activities[0].typeProperties.ifTrueActivities[0].typeProperties.waitTimeInSeconds == 3
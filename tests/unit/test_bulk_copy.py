@@ -0,0 +1,53 @@
+import pytest
+
+from src.fabricmcp_server.activity_types import ActivityListAdapter
+from src.fabricmcp_server.bulk_copy import BulkCopyTable, build_bulk_copy_activities
+
+
+def _tables(n, **kwargs):
+    return [BulkCopyTable(schema_name="sales", table_name=f"T{i}", **kwargs) for i in range(n)]
+
+
+def test_large_table_lists_use_one_parameterised_copy():
+    plan = build_bulk_copy_activities(_tables(300), "conn", "lh", "ws", batch_count=16)
+
+    assert plan.pattern == "foreach"
+    lookup, foreach = plan.activities
+    assert lookup["typeProperties"]["firstRowOnly"] is False
+    assert "(N'sales', N'T299', N'SELECT * FROM [sales].[T299]', N'sales_T299')" in lookup["typeProperties"]["source"]["sqlReaderQuery"]
+    assert foreach["typeProperties"]["batchCount"] == 16
+    copy = foreach["typeProperties"]["activities"][0]
+    assert copy["typeProperties"]["source"]["sqlReaderQuery"] == {"value": "@item().source_query", "type": "Expression"}
+    assert copy["typeProperties"]["sink"]["datasetSettings"]["typeProperties"]["table"]["value"] == "@item().target_table"
+
+    # The fields the generator relies on survive validation through the Activity models.
+    validated = [a.model_dump(by_alias=True, exclude_none=True) for a in ActivityListAdapter.validate_python(plan.activities)]
+    assert validated == plan.activities
+
+
+def test_small_table_lists_use_balanced_static_chains():
+    sizes = [900, 100, 500, 400, 300, 200]
+    tables = [BulkCopyTable(table_name=f"T{i}", row_count=rows) for i, rows in enumerate(sizes)]
+
+    plan = build_bulk_copy_activities(tables, "conn", "lh", "ws", batch_count=2)
+
+    assert plan.pattern == "static" and plan.parallelism == 2
+    by_name = {a["name"]: a for a in plan.activities}
+    assert set(by_name) == {f"{kind}_dbo_T{i}" for i in range(6) for kind in ("Copy", "Fail")}
+    chain_starts = [a["name"] for a in plan.activities if "dependsOn" not in a]
+    assert chain_starts == ["Copy_dbo_T0", "Copy_dbo_T2"]
+    assert by_name["Copy_dbo_T3"]["dependsOn"] == [{"activity": "Copy_dbo_T2", "dependencyConditions": ["Completed"]}]
+    assert by_name["Copy_dbo_T0"]["typeProperties"]["sink"]["datasetSettings"]["typeProperties"]["table"] == "T0"
+
+    # Chains continue past a failed table, so each Copy's failure path fails the run itself.
+    fail = by_name["Fail_dbo_T2"]
+    assert fail["dependsOn"] == [{"activity": "Copy_dbo_T2", "dependencyConditions": ["Failed"]}]
+    assert fail["typeProperties"]["message"] == "Copy of dbo.T2 failed: @{activity('Copy_dbo_T2').error.message}"
+    ActivityListAdapter.validate_python(plan.activities)
+
+
+def test_rejects_colliding_targets_and_oversized_static_plans():
+    with pytest.raises(ValueError, match="set 'target_table'"):
+        build_bulk_copy_activities([BulkCopyTable(table_name="a_b"), BulkCopyTable(schema_name="a", table_name="b")], "c", "l", "w")
+    with pytest.raises(ValueError, match="foreach pattern"):
+        build_bulk_copy_activities(_tables(500), "c", "l", "w", pattern="static")
@@ -0,0 +1,39 @@
+import pytest
+from pydantic import ValidationError
+
+from src.fabricmcp_server.connection_types import (
+    CONNECTORS,
+    DatabaseConnectionRef,
+    ServiceConnectionRef,
+    VERIFIED_CONNECTION_TYPES,
+    create_copy_sink_from_connection,
+    create_copy_source_from_connection,
+    get_connection_category,
+    is_valid_connection_type,
+)
+
+
+def test_catalog_drives_lookups_and_reference_models():
+    assert len(CONNECTORS) == 55 and len(VERIFIED_CONNECTION_TYPES) == 52
+    assert is_valid_connection_type("Snowflake") and not is_valid_connection_type("Nope")
+    assert get_connection_category("GoogleBigQuery") == "database"
+    assert get_connection_category("Nope") is None
+    assert ServiceConnectionRef(connection="c", connectionType="Office365").connectionType == "Office365"
+    with pytest.raises(ValidationError):
+        DatabaseConnectionRef(connection="c", connectionType="AmazonS3")
+    with pytest.raises(TypeError):
+        CONNECTORS["New"] = CONNECTORS["SqlServer"]
+
+
+def test_copy_payloads_use_catalog_type_names():
+    assert create_copy_source_from_connection("SqlServer", "c") == {
+        "type": "SqlServerSource",
+        "datasetSettings": {"type": "SqlServerTable", "externalReferences": {"connection": "c"}},
+    }
+    assert create_copy_source_from_connection("GoogleBigQuery")["datasetSettings"]["type"] == "GoogleBigQueryObject"
+    with pytest.raises(ValueError, match="cannot be used as a Copy sink"):
+        create_copy_sink_from_connection("GoogleBigQuery")
+    with pytest.raises(NotImplementedError):
+        create_copy_source_from_connection("Snowflake")
+    with pytest.raises(ValueError, match="Unknown connection type"):
+        create_copy_sink_from_connection("Nope")
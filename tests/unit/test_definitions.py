@@ -0,0 +1,25 @@
+import base64
+import json
+
+from src.fabricmcp_server.definitions import decode_pipeline_definition, hash_definition_parts
+
+
+def _part(path, value, **dumps_kwargs):
+    payload = base64.b64encode(json.dumps(value, **dumps_kwargs).encode("utf-8")).decode("utf-8")
+    return {"path": path, "payload": payload, "payloadType": "InlineBase64"}
+
+
+def test_hash_ignores_formatting_key_order_and_platform_part():
+    content = {"name": "p", "properties": {"activities": [{"name": "W", "type": "Wait"}]}}
+    deployed = {"definition": {"parts": [
+        _part("pipeline-content.json", content, indent=2),
+        _part(".platform", {"metadata": {"displayName": "p"}}),
+    ]}}
+    reordered = {"properties": {"activities": [{"type": "Wait", "name": "W"}]}, "name": "p"}
+
+    definition = decode_pipeline_definition(deployed)
+
+    assert definition.content_hash() == hash_definition_parts(deployed["definition"]["parts"])
+    assert definition.content_hash() == hash_definition_parts([_part("pipeline-content.json", reordered, sort_keys=True)])
+    definition.activities[0]["type"] = "Fail"
+    assert definition.content_hash() != hash_definition_parts(deployed["definition"]["parts"])
@@ -0,0 +1,71 @@
+import pytest
+
+from src.fabricmcp_server.expressions import (
+    EvaluationContext, ExpressionError, check_expression, evaluate_expression, parse_expression,
+    validate_pipeline_expressions,
+)
+
+
+def test_evaluates_functions_properties_and_interpolation():
+    context = EvaluationContext(parameters={"env": "prod", "days": 2}, variables={"tables": ["a", "b"]})
+
+    assert evaluate_expression("@equals(toUpper(pipeline().parameters.env), 'PROD')", context) is True
+    assert evaluate_expression("@{pipeline().parameters.env}/@{length(variables('tables'))}.csv", context) == "prod/2.csv"
+    assert evaluate_expression("@addDays('2024-02-28T00:00:00Z', pipeline().parameters.days, 'yyyy-MM-dd')", context) == "2024-03-01"
+    assert evaluate_expression("@json('{\"rows\": [{\"id\": 7}]}').rows[0]?.missing", context) is None
+    assert evaluate_expression("@@not an expression") == "@not an expression"
+
+
+def test_syntax_and_type_errors():
+    with pytest.raises(ExpressionError):
+        parse_expression("@concat('a', ")
+    _, issues = check_expression(parse_expression("@add('1', lenght('abc'))"))
+    assert [i.message for i in issues] == ["Unknown function 'lenght'.", "Argument 1 of add() must be int or float, not string."]
+
+
+def test_pipeline_validation_checks_declarations_scopes_and_control_flow():
+    content = {"properties": {
+        "parameters": {"env": {"type": "String", "defaultValue": "dev"}},
+        "variables": {"done": {"type": "Boolean"}},
+        "activities": [
+            {"name": "Lookup", "type": "Lookup", "typeProperties": {"source": {"query": "@concat('select ', pipeline().parameters.region)"}}},
+            {"name": "Branch", "type": "IfCondition", "dependsOn": [{"activity": "Lookup", "dependencyConditions": ["Succeeded"]}],
+             "typeProperties": {"expression": {"value": "@equals(pipeline().parameters.env, 'prod')", "type": "Expression"},
+                                "ifTrueActivities": [{"name": "Set", "type": "SetVariable", "typeProperties": {"variableName": "done", "value": "@item()"}}]}},
+            {"name": "Loop", "type": "ForEach", "typeProperties": {"items": {"value": "@activity('Lookup').output.value", "type": "Expression"}, "activities": []}},
+            {"name": "Stop", "type": "Until", "typeProperties": {"expression": {"value": "true", "type": "Expression"}, "activities": []}},
+        ],
+    }}
+
+    report = validate_pipeline_expressions(content)
+
+    assert [(e.activity, e.message) for e in report.errors] == [
+        ("Lookup", "Pipeline parameter 'region' is not declared."),
+        ("Set", "item() is only available inside a ForEach or in a Filter condition."),
+        ("Stop", "'true' is a literal string; start it with '@' to make it an expression that returns bool."),
+    ]
+    assert [(w.activity, w.message) for w in report.warnings] == [
+        ("Loop", "Activity 'Lookup' is not upstream of this activity; its output may not exist yet."),
+    ]
+    evaluated = {e.activity: (e.status, e.value) for e in report.evaluations}
+    assert evaluated["Branch"] == ("Evaluated", False)
+    assert evaluated["Loop"][0] == "RuntimeOnly"
+
+
+def test_missing_run_time_values_are_not_errors():
+    content = {"properties": {
+        "parameters": {"tables": {"type": "Array"}},
+        "activities": [
+            {"name": "Loop", "type": "ForEach", "typeProperties": {"items": {"value": "@pipeline().parameters.tables", "type": "Expression"}, "activities": []}},
+            {"name": "Manual", "type": "IfCondition", "typeProperties": {"expression": {"value": "@equals(pipeline().TriggerType, 'Manual')", "type": "Expression"}}},
+            {"name": "Notify", "type": "WebActivity", "typeProperties": {"url": "https://example.com", "method": "POST", "body": "@channel build done"}},
+        ],
+    }}
+
+    report = validate_pipeline_expressions(content)
+
+    assert report.errors == []
+    assert [w.activity for w in report.warnings] == ["Notify"] and "'@@'" in report.warnings[0].message
+    assert {e.activity: e.status for e in report.evaluations} == {"Loop": "RuntimeOnly", "Manual": "RuntimeOnly"}
+    evaluated = validate_pipeline_expressions(content, parameter_values={"tables": ["a"]}).evaluations[0]
+    assert (evaluated.status, evaluated.value) == ("Evaluated", ["a"])
@@ -0,0 +1,143 @@
+import pytest
+from fastmcp.exceptions import ToolError
+
+from src.fabricmcp_server.activity_types import ActivityAdapter
+from src.fabricmcp_server.copy_activity_schemas import LakehouseSink, build_sink_payload
+from src.fabricmcp_server.flexible_copy_schemas import (
+    copy_parallelism_warnings, create_azurepostgresql_source, create_datawarehouse_table_sink, create_db2_source, create_lakehouse_table_sink,
+    create_oracle_source, create_sqlserver_source, create_staging_settings, create_teradata_source, lakehouse_sink_errors,
+)
+from src.fabricmcp_server.tools.pipelines import _build_pipeline_definition_payload
+from src.fabricmcp_server.tools.universal_copy_activity import CopyActivityConfig
+
+
+def test_builders_configure_partitioned_reads():
+    source = create_sqlserver_source(
+        "conn", "SELECT * FROM dbo.Sales WHERE ?DfDynamicRangePartitionCondition",
+        partition_option="DynamicRange", partition_column="SaleId", partition_lower_bound=1, partition_upper_bound=5_000_000,
+    ).model_dump(exclude_none=True)
+    assert source["partitionOption"] == "DynamicRange"
+    assert source["partitionSettings"] == {"partitionColumnName": "SaleId", "partitionLowerBound": "1", "partitionUpperBound": "5000000"}
+
+    oracle = create_oracle_source("conn", None, partition_option="PhysicalPartitionsOfTable", partition_names=["P2024", "P2025"])
+    assert oracle.partitionSettings.partitionNames == ["P2024", "P2025"]
+    assert create_teradata_source("conn", None, partition_option="Hash").partitionOption == "Hash"
+    assert create_sqlserver_source("conn", "SELECT 1").partitionOption is None
+    assert create_oracle_source(
+        "conn", "SELECT * FROM T PARTITION(\"?DfTabularPartitionName\")", partition_option="PhysicalPartitionsOfTable",
+    ).partitionOption == "PhysicalPartitionsOfTable"
+    assert create_teradata_source("conn", "SELECT * FROM T WHERE ?DfHashPartitionCondition", partition_option="Hash").partitionOption == "Hash"
+
+
+@pytest.mark.parametrize("build, match", [
+    (lambda: create_db2_source("conn", "SELECT * FROM T", partition_option="DynamicRange", partition_column="ID"), "does not support partitioned reads"),
+    (lambda: create_sqlserver_source("conn", None, partition_option="Hash"), "supports partitionOption"),
+    (lambda: create_sqlserver_source("conn", None, partition_option="DynamicRange"), "partitionColumnName"),
+    (lambda: create_sqlserver_source("conn", "SELECT * FROM T", partition_option="DynamicRange", partition_column="ID"), r"\?DfDynamicRangePartitionCondition"),
+    (lambda: create_oracle_source("conn", "SELECT * FROM T WHERE ?DfDynamicRangePartitionCondition", partition_option="DynamicRange", partition_column="ID"), r"\?DfRangePartitionColumnName"),
+    (lambda: create_teradata_source("conn", "SELECT * FROM T WHERE ?DfRangePartitionColumnName >= ?DfRangePartitionLowbound", partition_option="DynamicRange", partition_column="ID"), r"\?DfRangePartitionUpbound"),
+    (lambda: create_sqlserver_source("conn", None, partition_option="DynamicRange", partition_column="ID", partition_lower_bound=9, partition_upper_bound=1), "must be below"),
+    (lambda: create_sqlserver_source("conn", None, partition_option="PhysicalPartitionsOfTable", partition_names=["p1"]), "partitionNames"),
+])
+def test_partitioned_reads_are_validated_per_connector(build, match):
+    with pytest.raises(ValueError, match=match):
+        build()
+
+
+RANGE_QUERY = "SELECT * FROM T WHERE ?DfRangePartitionColumnName <= ?DfRangePartitionUpbound AND ?DfRangePartitionColumnName >= ?DfRangePartitionLowbound"
+
+
+@pytest.mark.parametrize("build", [create_oracle_source, create_teradata_source, create_azurepostgresql_source])
+def test_range_partitioned_queries_use_column_and_bound_hooks(build):
+    source = build("conn", RANGE_QUERY, partition_option="DynamicRange", partition_column="ID", partition_lower_bound=1, partition_upper_bound=100)
+    assert source.partitionSettings.partitionColumnName == "ID"
+
+
+def _copy(source, **type_properties):
+    sink = create_lakehouse_table_sink("lh", "ws", "t").model_dump(exclude_none=True)
+    return {"name": "Copy", "type": "Copy", "typeProperties": {"source": source, "sink": sink, **type_properties}}
+
+
+def test_pipeline_payload_checks_copy_parallelism():
+    plain = create_sqlserver_source("conn", "SELECT * FROM T").model_dump(exclude_none=True)
+    assert copy_parallelism_warnings(_copy(plain, parallelCopies=8)["typeProperties"]) == [
+        "parallelCopies=8 has no effect without a partitionOption; SqlServerSource is read single-threaded"
+    ]
+
+    _, warnings = _build_pipeline_definition_payload("p", [ActivityAdapter.validate_python(_copy(plain, parallelCopies=8, dataIntegrationUnits=32))])
+    assert warnings == ["Copy activity 'Copy': parallelCopies=8 has no effect without a partitionOption; SqlServerSource is read single-threaded"]
+
+    db2 = {**create_db2_source("conn", "SELECT * FROM T").model_dump(exclude_none=True), "partitionOption": "DynamicRange"}
+    with pytest.raises(ToolError, match="Db2Source does not support partitioned reads"):
+        _build_pipeline_definition_payload("p", [ActivityAdapter.validate_python(_copy(db2))])
+
+
+def _warehouse_copy(**type_properties):
+    source = create_sqlserver_source("conn", "SELECT * FROM dbo.Sales").model_dump(exclude_none=True)
+    sink = create_datawarehouse_table_sink("wh", "ws", "Sales").model_dump(exclude_none=True)
+    return ActivityAdapter.validate_python({"name": "Load", "type": "Copy", "typeProperties": {"source": source, "sink": sink, **type_properties}})
+
+
+def test_staged_warehouse_loads():
+    staging = create_staging_settings("blob-conn", "staging/sales", enable_compression=True).model_dump(exclude_none=True)
+    assert staging == {"externalReferences": {"connection": "blob-conn"}, "path": "staging/sales", "enableCompression": True}
+
+    _, warnings = _build_pipeline_definition_payload("p", [_warehouse_copy(enableStaging=True, stagingSettings=staging)])
+    assert warnings == []
+    _, warnings = _build_pipeline_definition_payload("p", [_warehouse_copy()])
+    assert warnings == ["Copy activity 'Load': The COPY statement cannot read a SqlServerSource directly; set enableStaging to load it through staging"]
+
+    with pytest.raises(ToolError, match="ignored unless enableStaging"):
+        _build_pipeline_definition_payload("p", [_warehouse_copy(stagingSettings=staging)])
+    with pytest.raises(ValueError, match="'container' or 'container/folder'"):
+        create_staging_settings(path="/staging/sales")
+
+
+def test_universal_copy_config_staging():
+    config = CopyActivityConfig(enable_staging=True, staging={"path": "staging"})
+    assert config.staging.to_staging_settings() == {"path": "staging"}
+    with pytest.raises(ValueError, match="enable_staging"):
+        CopyActivityConfig(staging={"connection_id": "blob-conn"})
+
+
+def test_lakehouse_table_sink_write_options():
+    sink = create_lakehouse_table_sink(
+        "lh", "ws", "sales", table_action="Upsert", upsert_keys=["id"], partition_columns=["year", "month"], apply_v_order=True,
+    ).model_dump(exclude_none=True)
+    assert {k: sink[k] for k in ("tableActionOption", "upsertSettings", "partitionOption", "partitionNameList", "applyVOrder")} == {
+        "tableActionOption": "Upsert", "upsertSettings": {"keys": ["id"]},
+        "partitionOption": "PartitionByKey", "partitionNameList": ["year", "month"], "applyVOrder": True,
+    }
+
+    with pytest.raises(ValueError, match="Upsert needs upsertSettings.keys"):
+        create_lakehouse_table_sink("lh", "ws", "sales", table_action="Upsert")
+    with pytest.raises(ValueError, match="must be one of"):
+        create_lakehouse_table_sink("lh", "ws", "sales", table_action="Merge")
+
+    # The partition columns must exist in the column mapping, and the options only fit Lakehouse table sinks.
+    translator = {"type": "TabularTranslator", "mappings": [{"source": {"name": "id"}, "sink": {"name": "id"}}]}
+    plain = create_sqlserver_source("conn", "SELECT * FROM T").model_dump(exclude_none=True)
+    partitioned = {**_copy(plain), "typeProperties": {"source": plain, "sink": sink, "translator": translator}}
+    with pytest.raises(ToolError, match="year, month are not sink columns"):
+        _build_pipeline_definition_payload("p", [ActivityAdapter.validate_python(partitioned)])
+    warehouse = {**create_datawarehouse_table_sink("wh", "ws", "t").model_dump(exclude_none=True), "applyVOrder": True}
+    with pytest.raises(ToolError, match="only apply to LakehouseTableSink"):
+        _build_pipeline_definition_payload("p", [ActivityAdapter.validate_python({**_copy(plain), "typeProperties": {"source": plain, "sink": warehouse}})])
+    sql_upsert = {"type": "AzureSqlSink", "writeBehavior": "upsert", "upsertSettings": {"useTempDB": True, "keys": ["id"]}}
+    assert lakehouse_sink_errors(sql_upsert) == []
+
+
+def test_connector_sink_models_carry_write_options():
+    table_sink = LakehouseSink(
+        connector_type="LakehouseSink", lakehouse_name="lh", workspace_id="ws", artifact_id="a", root_folder="Tables",
+        table_config={"table_name": "sales"}, table_action_option="Overwrite", partition_columns=["region"], apply_v_order=False,
+    )
+    payload = build_sink_payload(table_sink)
+    assert (payload["tableActionOption"], payload["partitionOption"], payload["partitionNameList"], payload["applyVOrder"]) == (
+        "Overwrite", "PartitionByKey", ["region"], False,
+    )
+    with pytest.raises(ValueError, match="only apply when root_folder='Tables'"):
+        LakehouseSink(
+            connector_type="LakehouseSink", lakehouse_name="lh", workspace_id="ws", artifact_id="a",
+            file_config={"file_name": "x.csv"}, partition_columns=["region"],
+        )
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from src.fabricmcp_server.idempotency import IdempotencyConflict, IdempotencyStore
+
+
+async def test_duplicate_calls_reuse_the_first_result():
+    store = IdempotencyStore(explicit_ttl=60, derived_window=60, max_entries=8)
+    calls = 0
+
+    async def start_run():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"job_id": f"job-{calls}"}
+
+    args = {"pipeline_id": "p", "parameters": {"b": 2, "a": 1}}
+    concurrent = await asyncio.gather(*(store.run_once("run_pipeline", args, start_run) for _ in range(3)))
+    reordered = await store.run_once("run_pipeline", {"parameters": {"a": 1, "b": 2}, "pipeline_id": "p"}, start_run)
+    keyed = [await store.run_once("run_pipeline", {"pipeline_id": "other"}, start_run, idempotency_key="k") for _ in range(2)]
+
+    assert calls == 2
+    assert {r["job_id"] for r in concurrent} == {"job-1"} and reordered["job_id"] == "job-1"
+    assert keyed == [{"job_id": "job-2"}, {"job_id": "job-2"}]
+
+
+async def test_failures_are_not_remembered():
+    store = IdempotencyStore(explicit_ttl=60, derived_window=60, max_entries=8)
+    outcomes = [RuntimeError("throttled"), {"id": "item-1"}]
+
+    async def create():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    with pytest.raises(RuntimeError):
+        await store.run_once("create_fabric_item", {}, create, idempotency_key="k")
+    assert await store.run_once("create_fabric_item", {}, create, idempotency_key="k") == {"id": "item-1"}
+
+
+async def test_keys_are_scoped_and_bound_to_their_arguments():
+    store = IdempotencyStore(explicit_ttl=60, derived_window=60, max_entries=8)
+    calls = 0
+
+    async def start_run():
+        nonlocal calls
+        calls += 1
+        return {"job_id": f"job-{calls}"}
+
+    args = {"pipeline_id": "p"}
+    first = await store.run_once("run_pipeline", args, start_run, idempotency_key="k", scope="session-1")
+    other_session = await store.run_once("run_pipeline", args, start_run, idempotency_key="k", scope="session-2")
+    assert (first["job_id"], other_session["job_id"]) == ("job-1", "job-2")
+    with pytest.raises(IdempotencyConflict, match="different arguments"):
+        await store.run_once("run_pipeline", {"pipeline_id": "q"}, start_run, idempotency_key="k", scope="session-1")
+
+    # Without opting in to derived keys, identical calls are deliberate re-runs.
+    reruns = [await store.run_once("run_pipeline", args, start_run, scope="session-1", derive=False) for _ in range(2)]
+    assert [r["job_id"] for r in reruns] == ["job-3", "job-4"]
@@ -0,0 +1,110 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastmcp.exceptions import ToolError
+
+from src.fabricmcp_server import jobs
+from src.fabricmcp_server.tools import jobs as job_tools
+
+
+@pytest.fixture(autouse=True)
+def isolated_jobs(monkeypatch, tmp_path):
+    monkeypatch.setattr(jobs, "tracked_jobs", {})
+    monkeypatch.setenv("FABRIC_JOB_STATE_FILE", str(tmp_path / "jobs.json"))
+    yield
+    jobs._shutdown_event.clear()
+
+
+def _track(job_id, workspace_id="ws", item_id="p1", minutes_ago=0, **fields):
+    job = jobs.track_job(job_id, workspace_id, item_id, status_url=f"https://api/operations/{job_id}")
+    job.started_at = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return job
+
+
+def test_find_jobs_applies_every_filter():
+    _track("a", minutes_ago=90)
+    _track("b", item_id="p2", minutes_ago=5)
+    _track("c", workspace_id="other", minutes_ago=120)
+
+    assert [j.job_id for j in jobs.find_jobs(workspace_id="ws")] == ["a", "b"]
+    assert [j.job_id for j in jobs.find_jobs(workspace_id="ws", older_than_minutes=60)] == ["a"]
+    assert [j.job_id for j in jobs.find_jobs(item_id="p1")] == ["a", "c"]
+    assert jobs.find_jobs(workspace_id="ws", item_id="p2", older_than_minutes=60) == []
+
+
+async def test_cancel_jobs_needs_a_filter_and_cancels_only_matches(monkeypatch):
+    _track("a", minutes_ago=90)
+    _track("b", minutes_ago=5)
+    cancelled = []
+
+    class _Client:
+        async def cancel_job_instance(self, workspace_id, item_id, job_id):
+            cancelled.append(job_id)
+            return httpx.Response(202)
+
+    async def get_client(ctx):
+        return _Client()
+
+    monkeypatch.setattr(job_tools, "get_session_fabric_client", get_client)
+    with pytest.raises(ToolError, match="at least one filter"):
+        await job_tools.cancel_jobs_impl(None, None, None, None, 8)
+
+    result = await job_tools.cancel_jobs_impl(None, "ws", None, 60, 8)
+
+    assert (result["status"], result["cancelled"], cancelled) == ("Succeeded", 1, ["a"])
+    assert list(jobs.tracked_jobs) == ["b"]
+
+
+def test_persist_and_load_round_trip_drops_finished_and_expired_jobs():
+    running = _track("running", minutes_ago=10, last_status="InProgress")
+    _track("old", minutes_ago=jobs.JOB_RETENTION_HOURS * 60 + 1)
+    _track("done", last_status="Completed")
+
+    assert jobs.persist_tracked_jobs() == 1
+    assert list(jobs.tracked_jobs) == ["running"]
+
+    jobs.tracked_jobs.clear()
+    assert jobs.load_tracked_jobs() == [running]
+    assert jobs.tracked_jobs == {"running": running}
+
+    # Files written before pruning existed are pruned on load as well.
+    state_file = jobs._job_state_file()
+    stale = [{**running.model_dump(mode="json"), "job_id": "stale", "last_status": "Failed"}]
+    state_file.write_text(json.dumps(stale), encoding="utf-8")
+    assert jobs.load_tracked_jobs() == []
+
+
+def test_finished_status_stops_tracking():
+    _track("a")
+    jobs.record_job_status("a", "InProgress")
+    assert jobs.tracked_jobs["a"].last_status == "InProgress"
+    jobs.record_job_status("a", "Cancelled")
+    assert jobs.tracked_jobs == {}
+
+
+async def test_drain_signals_polls_and_waits_for_them():
+    finished = []
+
+    async def poll():
+        async with jobs.inflight_poll():
+            stopped_early = await jobs.wait_or_shutdown(60)
+            finished.append(stopped_early)
+
+    async def stuck_poll():
+        async with jobs.inflight_poll():
+            await asyncio.sleep(60)
+
+    watcher, stuck = asyncio.create_task(poll()), asyncio.create_task(stuck_poll())
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(jobs.drain_inflight_polls(timeout=0.05), timeout=5)
+
+    assert jobs.shutdown_requested() and finished == [True] and watcher.done()
+    assert not stuck.done()
+    stuck.cancel()
+    await asyncio.gather(stuck, return_exceptions=True)
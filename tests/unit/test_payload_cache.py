@@ -0,0 +1,51 @@
+import copy
+import json
+
+import pytest
+
+from src.fabricmcp_server.flexible_copy_schemas import create_lakehouse_table_sink
+from src.fabricmcp_server.payload_cache import PayloadCache, cached_model_payload, config_hash, payload_cache, thaw
+
+
+def test_cache_returns_shared_frozen_fragments_and_counts_hits():
+    cache = PayloadCache(max_entries=2)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"type": "X", "schema": [], "nested": {"a": 1}}
+
+    first = cache.get_or_build("k", {"b": 1, "a": [1, 2]}, build)
+    assert cache.get_or_build("k", {"a": [1, 2], "b": 1}, build) is first
+    assert len(builds) == 1 and cache.stats()["hit_rate"] == 0.5
+    assert first == {"type": "X", "schema": [], "nested": {"a": 1}}
+    assert json.loads(json.dumps(first)) == first
+    for mutate in (lambda: first.update(x=1), lambda: first["nested"].pop("a"), lambda: first["schema"].append(1)):
+        with pytest.raises(TypeError, match="shared cached payload fragment"):
+            mutate()
+    copied = thaw(first)
+    copied["nested"]["a"] = 2
+    assert first["nested"]["a"] == 1 and copy.deepcopy(first) == first
+
+    cache.get_or_build("k2", 1, build)
+    cache.get_or_build("k3", 1, build)
+    cache.get_or_build("k", {"b": 1, "a": [1, 2]}, build)
+    assert cache.stats()["entries"] == 2 and len(builds) == 4
+    assert config_hash("k", {"a": 1}) != config_hash("other", {"a": 1})
+
+
+def test_disabled_cache_always_builds():
+    cache = PayloadCache(max_entries=0)
+    assert cache.get_or_build("k", 1, lambda: {"a": [1]}) == {"a": [1]}
+    assert cache.get_or_build("k", 1, lambda: {"a": [2]}) == {"a": [2]}
+    assert cache.stats() == {"entries": 0, "max_entries": 0, "hits": 0, "misses": 2, "hit_rate": 0.0}
+
+
+def test_flexible_helper_payloads_are_memoized_by_arguments():
+    first = cached_model_payload(create_lakehouse_table_sink, "lh", "ws", "orders", table_action="Overwrite")
+    hits = payload_cache.stats()["hits"]
+    assert cached_model_payload(create_lakehouse_table_sink, "lh", "ws", "orders", table_action="Overwrite") is first
+    assert payload_cache.stats()["hits"] == hits + 1
+    other = cached_model_payload(create_lakehouse_table_sink, "lh", "ws", "orders", table_action="Append")
+    assert other["tableActionOption"] == "Append" and first["tableActionOption"] == "Overwrite"
+    assert first == create_lakehouse_table_sink("lh", "ws", "orders", table_action="Overwrite").model_dump(exclude_none=True)
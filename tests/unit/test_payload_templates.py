@@ -0,0 +1,52 @@
+from typing import Literal, get_args
+
+import pytest
+from pydantic import BaseModel
+
+from src.fabricmcp_server.copy_activity_schemas import (
+    SINK_BUILDERS,
+    SOURCE_BUILDERS,
+    S3Source,
+    SinkConfig,
+    SourceConfig,
+    build_source_payload,
+)
+from src.fabricmcp_server.payload_templates import ConnectorRegistry, PayloadTemplate, Slot, connector_types
+
+
+class _Source(BaseModel):
+    connector_type: Literal["A", "B"]
+    path: str
+
+
+def test_template_substitutes_fields_into_fresh_payloads():
+    template = PayloadTemplate({"type": "X", "location": {"path": Slot("path")}, "schema": [], "n": 1.5})
+    first = template(_Source(connector_type="A", path="in"))
+    assert first == {"type": "X", "location": {"path": "in"}, "schema": [], "n": 1.5}
+    first["location"]["path"] = "changed"
+    first["schema"].append("col")
+    assert template(_Source(connector_type="A", path="in")) == {"type": "X", "location": {"path": "in"}, "schema": [], "n": 1.5}
+    assert template.fields == ["path"]
+
+
+def test_registry_dispatches_on_every_connector_type_and_rejects_mistakes():
+    registry = ConnectorRegistry("Source")
+    registry.register_template(_Source, {"path": Slot("path")})
+    assert set(registry) == {"A", "B"}
+    assert registry.build(_Source(connector_type="B", path="p")) == {"path": "p"}
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register(_Source)(lambda s: {})
+    with pytest.raises(ValueError, match="unknown fields: missing"):
+        ConnectorRegistry("Sink").register_template(_Source, {"x": Slot("missing")})
+    with pytest.raises(TypeError):
+        PayloadTemplate({"x": object()})
+
+
+def test_every_copy_connector_has_a_builder():
+    for union, registry in ((SourceConfig, SOURCE_BUILDERS), (SinkConfig, SINK_BUILDERS)):
+        for model in get_args(get_args(union)[0]):
+            assert all(key in registry for key in connector_types(model)), model.__name__
+    payload = build_source_payload(S3Source(connector_type="S3", connection_id="c", bucket_name="b", folder_path="f", file_name="n"))
+    assert payload["datasetSettings"]["typeProperties"]["location"]["bucketName"] == "b"
+    with pytest.raises(NotImplementedError, match="Source type 'A' is not supported"):
+        build_source_payload(_Source(connector_type="A", path="p"))
@@ -0,0 +1,39 @@
+from src.fabricmcp_server.pipeline_dag import analyze_activities
+
+
+def _after(*names):
+    return [{"activity": n, "dependencyConditions": ["Succeeded"]} for n in names]
+
+
+def test_levels_width_and_critical_path_use_history_over_estimates():
+    activities = [
+        {"name": "Lookup_Tables", "type": "Lookup"},
+        {"name": "Copy_Big", "type": "Copy", "dependsOn": _after("Lookup_Tables")},
+        {"name": "Wait_Short", "type": "Wait", "typeProperties": {"waitTimeInSeconds": 5}, "dependsOn": _after("Lookup_Tables")},
+        {"name": "Notify", "type": "SetVariable", "dependsOn": _after("Copy_Big", "Wait_Short")},
+    ]
+
+    analysis = analyze_activities(activities, history={"Copy_Big": 900})
+
+    assert analysis.valid
+    assert analysis.root.levels == [["Lookup_Tables"], ["Copy_Big", "Wait_Short"], ["Notify"]]
+    assert analysis.root.max_parallel_width == 2
+    assert analysis.root.critical_path == ["Lookup_Tables", "Copy_Big", "Notify"]
+    assert analysis.root.critical_path_seconds == 20 + 900 + 1
+
+
+def test_cycles_and_unknown_references_are_found_in_nested_scopes():
+    activities = [{
+        "name": "Loop", "type": "ForEach",
+        "typeProperties": {"activities": [
+            {"name": "A", "type": "Wait", "dependsOn": _after("B")},
+            {"name": "B", "type": "Wait", "dependsOn": _after("A", "Missing")},
+        ]},
+    }]
+
+    analysis = analyze_activities(activities)
+
+    assert not analysis.valid
+    assert analysis.scopes[1].scope == "Loop/activities"
+    assert analysis.scopes[1].cycles == [["B", "A", "B"]]
+    assert analysis.scopes[1].unknown_references == ["'B' depends on unknown activity 'Missing'"]
@@ -0,0 +1,50 @@
+from src.fabricmcp_server.pipeline_diff import diff_pipeline_contents
+
+
+def _wait(name, seconds=1, after=()):
+    return {
+        "name": name, "type": "Wait", "typeProperties": {"waitTimeInSeconds": seconds},
+        "dependsOn": [{"activity": a, "dependencyConditions": ["Succeeded"]} for a in after],
+    }
+
+
+def _pipeline(activities, **properties):
+    return {"properties": {"activities": activities, **properties}}
+
+
+def _loop(body):
+    return {"name": "Loop", "type": "ForEach", "typeProperties": {"items": {"value": "@range(1,3)", "type": "Expression"}, "activities": body}}
+
+
+def test_identical_definitions_ignore_sibling_order():
+    diff = diff_pipeline_contents(_pipeline([_wait("A"), _wait("B")]), _pipeline([_wait("B"), _wait("A")]))
+
+    assert diff.identical
+    assert diff.base_hash == diff.target_hash
+
+
+def test_nested_change_is_reported_on_the_changed_activity_only():
+    base = _pipeline([_wait("Start"), _loop([_wait("Inner", 1), _wait("Other")])])
+    target = _pipeline([_wait("Start"), _loop([_wait("Inner", 5), _wait("Other")])])
+
+    diff = diff_pipeline_contents(base, target)
+
+    assert [m.name for m in diff.modified] == ["Inner"]
+    assert diff.modified[0].scope == "Loop/activities"
+    assert [c.model_dump() for c in diff.modified[0].changes] == [
+        {"op": "replace", "path": "/typeProperties/waitTimeInSeconds", "before": 1, "after": 5}
+    ]
+    assert not diff.added and not diff.removed and not diff.moved
+
+
+def test_added_removed_renamed_moved_and_pipeline_properties():
+    base = _pipeline([_wait("Keep"), _wait("Old", 7), _wait("Gone", 3), _loop([])], parameters={"p": {"type": "string"}})
+    target = _pipeline([_wait("New", 7), _wait("Fresh", 9), _loop([_wait("Keep")])], parameters={})
+
+    diff = diff_pipeline_contents(base, target)
+
+    assert [(r.previous_name, r.name) for r in diff.renamed] == [("Old", "New")]
+    assert [a.name for a in diff.added] == ["Fresh"]
+    assert [r.name for r in diff.removed] == ["Gone"]
+    assert [(m.name, m.previous_scope, m.scope) for m in diff.moved] == [("Keep", "pipeline", "Loop/activities")]
+    assert [c.path for c in diff.pipeline_changes] == ["/properties/parameters/p"]
@@ -0,0 +1,32 @@
+from src.fabricmcp_server.pipeline_monitor import PipelineRunMonitor
+
+
+class _FakeClient:
+    def __init__(self, polls):
+        self._polls = polls
+        self._index = 0
+
+    async def get_job_instance(self, workspace_id, item_id, job_instance_id):
+        return {"status": self._polls[self._index][0], "startTimeUtc": "2024-01-01T00:00:00Z"}
+
+    async def query_activity_runs(self, workspace_id, job_instance_id, last_updated_after, last_updated_before):
+        runs = self._polls[self._index][1]
+        self._index += 1
+        return runs
+
+
+async def test_monitor_reports_only_new_or_changed_activity_runs():
+    running = {"activityRunId": "1", "activityName": "Copy_Orders", "activityType": "Copy", "status": "InProgress"}
+    done = {**running, "status": "Succeeded", "durationInMs": 4000, "output": {"rowsRead": 7, "rowsCopied": 7}}
+    monitor = PipelineRunMonitor(
+        _FakeClient([("InProgress", [running]), ("InProgress", [running]), ("Completed", [done])]),
+        "ws", "pipeline", "job",
+    )
+
+    assert [c.status for c in await monitor.poll()] == ["InProgress"]
+    assert await monitor.poll() == []
+    changes = await monitor.poll()
+
+    assert monitor.finished
+    assert changes[0].rows_written == 7 and changes[0].duration_ms == 4000
+    assert monitor.summary()["slowest_activity"] == "Copy_Orders"
@@ -0,0 +1,65 @@
+import pytest
+
+from src.fabricmcp_server.pipeline_optimizer import optimize_dependencies, shares_data
+
+
+def _after(*names, condition="Succeeded"):
+    return [{"activity": n, "dependencyConditions": [condition]} for n in names]
+
+
+def _dataset(type_properties, root_folder="Tables"):
+    linked = {"name": "lh", "properties": {"type": "Lakehouse", "typeProperties": {"artifactId": "LH-1", "rootFolder": root_folder}}}
+    return {"type": "LakehouseTable", "linkedService": linked, "typeProperties": type_properties}
+
+
+def _copy(name, table, depends_on=None, source=None):
+    sink = {"type": "LakehouseTableSink", "datasetSettings": _dataset({"table": table})}
+    return {"name": name, "type": "Copy", "dependsOn": depends_on or [], "typeProperties": {"source": source or {}, "sink": sink}}
+
+
+def _file_source(folder, file_name=None):
+    return {"type": "ParquetSource", "datasetSettings": _dataset({"location": {"type": "LakehouseLocation", "folderPath": folder, "fileName": file_name}}, "Files")}
+
+
+def _query_source(query):
+    return {"type": "LakehouseTableSource", "query": query, "datasetSettings": _dataset({})}
+
+
+def test_redundant_edges_are_removed_and_independent_chains_decoupled():
+    activities = [
+        {"name": "Start", "type": "Wait", "typeProperties": {"waitTimeInSeconds": 1}},
+        _copy("Copy_A", "a", _after("Start")),
+        _copy("Copy_B", "b", _after("Copy_A", "Start")),
+        {"name": "OnFail", "type": "Fail", "dependsOn": _after("Copy_B", condition="Failed")},
+    ]
+
+    proposed = optimize_dependencies(activities)
+    assert [(c.activity, c.removed) for c in proposed.changes] == [("Copy_B", ["Start"])]
+    assert proposed.independent_chains == ["pipeline: Copy_A -> Copy_B"]
+
+    decoupled = optimize_dependencies(activities, decouple_independent=True)
+    copy_b = next(a for a in decoupled.activities if a["name"] == "Copy_B")
+    assert copy_b["dependsOn"] == _after("Start")
+    assert decoupled.after_seconds < decoupled.before_seconds
+    assert decoupled.after_max_width == 2
+    assert activities[2]["dependsOn"] == _after("Copy_A", "Start")
+
+
+def _file_sink(name, folder, file_name=None):
+    sink = {"type": "ParquetSink", "datasetSettings": _file_source(folder, file_name)["datasetSettings"]}
+    return {"name": name, "type": "Copy", "typeProperties": {"source": {}, "sink": sink}}
+
+
+@pytest.mark.parametrize("upstream, downstream, shared", [
+    (_copy("A", "orders"), _copy("B", "customers"), False),
+    (_copy("A", "orders"), _copy("B", "other", source=_query_source("SELECT o.* FROM [dbo].[Orders] o JOIN items i ON 1 = 1")), True),
+    (_copy("A", "orders"), _copy("B", "other", source=_query_source("SELECT * FROM customers")), False),
+    (_file_sink("A", "raw/sales"), _copy("B", "other", source=_file_source("raw", None)), True),
+    (_file_sink("A", "raw/sales", "day1.parquet"), _copy("B", "other", source=_file_source("raw/sales", "day2.parquet")), False),
+    (_copy("A", {"value": "@pipeline().parameters.table", "type": "Expression"}), _copy("B", "customers"), True),
+    (_copy("A", "orders"), _copy("B", "other", source=_query_source({"value": "@pipeline().parameters.query", "type": "Expression"})), True),
+    (_copy("A", "orders"), {"name": "B", "type": "Copy", "typeProperties": {"sink": {"datasetSettings": {"typeProperties": {"table": "x"}}}}}, True),
+    (_copy("A", "orders"), {"name": "B", "type": "ExecuteDataFlow", "typeProperties": {}}, True),
+])
+def test_shared_data_compares_locations_and_treats_unknowns_as_shared(upstream, downstream, shared):
+    assert shares_data(upstream, downstream) is shared
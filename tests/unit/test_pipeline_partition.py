@@ -0,0 +1,26 @@
+from src.fabricmcp_server.pipeline_partition import build_parent_activities, partition_activities
+
+
+def _chain(prefix, length):
+    return [
+        {"name": f"{prefix}{i}", "type": "Wait",
+         "dependsOn": [{"activity": f"{prefix}{i - 1}", "dependencyConditions": ["Succeeded"]}] if i else []}
+        for i in range(length)
+    ]
+
+
+def test_independent_chains_become_balanced_children_with_few_cross_edges():
+    activities = _chain("a", 8) + _chain("b", 8) + [{
+        "name": "done", "type": "Wait",
+        "dependsOn": [{"activity": n, "dependencyConditions": ["Succeeded"]} for n in ("a7", "b7")],
+    }]
+
+    plan = partition_activities("load", activities, max_activities=9)
+
+    assert [c.activity_count for c in plan.children] == [8, 9]
+    assert plan.cross_edges == 1
+    assert plan.children[1].depends_on == ["load_part01"]
+
+    parent = build_parent_activities(plan, {"load_part01": "id-1", "load_part02": "id-2"}, "ws", "conn")
+    assert parent[1]["dependsOn"] == [{"activity": "Run_load_part01", "dependencyConditions": ["Succeeded"]}]
+    assert parent[0]["typeProperties"]["pipelineId"] == "id-1"
@@ -0,0 +1,35 @@
+import pytest
+
+from src.fabricmcp_server.pipeline_patch import PatchError, PatchOperation, apply_pipeline_patch
+
+
+def _properties():
+    return {
+        "activities": [
+            {"name": "Wait_1", "type": "Wait", "typeProperties": {"waitTimeInSeconds": 1}},
+            {"name": "Loop", "type": "ForEach", "typeProperties": {"activities": [{"name": "Inner", "type": "Wait"}]}},
+        ]
+    }
+
+
+def test_patch_addresses_activities_by_name_and_reports_touched_ones():
+    original = _properties()
+    patched, touched = apply_pipeline_patch(original, [
+        PatchOperation(op="replace", path="/activities/Loop/typeProperties/activities/Inner/name", value="Inner_2"),
+        PatchOperation(op="replace", path="/activities/Wait_1/name", value="Wait_2"),
+        PatchOperation(op="add", path="/activities/-", value={"name": "New", "type": "Wait"}),
+        PatchOperation(op="test", path="/activities/0/name", value="Wait_2"),
+    ])
+
+    assert [a["name"] for a in patched["activities"]] == ["Wait_2", "Loop", "New"]
+    assert patched["activities"][1]["typeProperties"]["activities"][0]["name"] == "Inner_2"
+    assert touched == {"Wait_2", "Loop", "New"}
+    assert original == _properties()
+
+
+def test_failed_operation_rejects_the_whole_patch():
+    with pytest.raises(PatchError, match="Operation 2"):
+        apply_pipeline_patch(_properties(), [
+            PatchOperation(op="remove", path="/activities/Wait_1"),
+            PatchOperation(op="replace", path="/activities/Wait_1/policy", value={}),
+        ])
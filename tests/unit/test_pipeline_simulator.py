@@ -0,0 +1,59 @@
+from src.fabricmcp_server.pipeline_simulator import SimulationOptions, simulate_pipeline
+
+
+def _after(*names, condition="Succeeded"):
+    return [{"activity": n, "dependencyConditions": [condition]} for n in names]
+
+
+def _pipeline(activities, **properties):
+    return {"properties": {"activities": activities, **properties}}
+
+
+def test_foreach_batches_retries_and_mocked_outputs():
+    content = _pipeline([
+        {"name": "Lookup", "type": "Lookup"},
+        {"name": "Loop", "type": "ForEach", "dependsOn": _after("Lookup"), "typeProperties": {
+            "items": {"value": "@activity('Lookup').output.value", "type": "Expression"}, "batchCount": 2,
+            "activities": [{"name": "Copy", "type": "Copy", "policy": {"retry": 2, "retryIntervalInSeconds": 10}}],
+        }},
+    ])
+    options = SimulationOptions(durations={"Lookup": 5, "Copy": 100}, outputs={"Lookup": {"value": [1, 2, 3]}}, failed_attempts={"Copy": 1})
+
+    result = simulate_pipeline(content, options)
+
+    # Each item takes 100 + 10 + 100 seconds; three items in batches of two run in two waves.
+    assert result.status == "Succeeded"
+    assert result.makespan_seconds == 5 + 2 * 210
+    assert result.peak_concurrency == 2
+    assert result.critical_path == ["Lookup", "Loop", "Loop[2]/Copy"]
+    copy = next(a for a in result.activities if a.name == "Copy")
+    assert (copy.runs, copy.attempts) == (3, 6)
+    assert result.assumptions == []
+
+
+def test_branches_until_variables_and_failure_handling():
+    content = _pipeline([
+        {"name": "Branch", "type": "IfCondition", "typeProperties": {
+            "expression": {"value": "@pipeline().parameters.full", "type": "Expression"},
+            "ifTrueActivities": [{"name": "Long", "type": "Wait", "typeProperties": {"waitTimeInSeconds": 300}}],
+            "ifFalseActivities": [{"name": "Short", "type": "Wait", "typeProperties": {"waitTimeInSeconds": 10}}],
+        }},
+        {"name": "Count", "type": "Until", "typeProperties": {
+            "expression": {"value": "@greaterOrEquals(length(variables('seen')), 3)", "type": "Expression"},
+            "activities": [{"name": "Append", "type": "AppendVariable", "typeProperties": {"variableName": "seen", "value": "x"}}],
+        }},
+        {"name": "Load", "type": "Copy", "dependsOn": _after("Count")},
+        {"name": "Alert", "type": "WebActivity", "dependsOn": _after("Load", condition="Failed")},
+    ], parameters={"full": {"type": "Bool", "defaultValue": True}}, variables={"seen": {"type": "Array", "defaultValue": []}})
+    options = SimulationOptions(durations={"AppendVariable": 1, "Copy": 60, "WebActivity": 2}, outcomes={"Load": "Failed"})
+
+    result = simulate_pipeline(content, options, parameter_values={"full": False})
+
+    runs = {a.name: a for a in result.activities}
+    assert "Long" not in runs and runs["Short"].runs == 1
+    assert runs["Append"].runs == 3
+    assert runs["Load"].statuses == {"Failed": 1}
+    assert runs["Alert"].statuses == {"Succeeded": 1}
+    # Try-catch: the failure is handled by a leaf that succeeded, so the run succeeds.
+    assert result.status == "Succeeded"
+    assert result.makespan_seconds == 3 + 60 + 2
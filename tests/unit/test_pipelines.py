@@ -0,0 +1,199 @@
+import asyncio
+import base64
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastmcp.exceptions import ToolError
+
+from src.fabricmcp_server import definitions
+from src.fabricmcp_server.activity_types import ActivityListAdapter
+from src.fabricmcp_server.fabric_models import ItemEntity
+from src.fabricmcp_server.pipeline_patch import PatchOperation
+from src.fabricmcp_server.tools import configure_copy_activity, pipelines
+
+
+class _FakeClient:
+    async def create_item(self, workspace_id, request):
+        self.request = request
+        self.created = getattr(self, "created", []) + [request]
+        return ItemEntity(id="pipeline-id", displayName=request.display_name)
+
+    async def update_pipeline_definition(self, workspace_id, pipeline_id, definition):
+        return httpx.Response(202, headers={"Location": "https://api.fabric.microsoft.com/v1/operations/op-1"})
+
+
+def test_create_and_update_pipeline_with_parameterised_foreach(monkeypatch):
+    client = _FakeClient()
+
+    async def get_client(ctx):
+        return client
+
+    async def no_snapshot(*args):
+        return None
+
+    monkeypatch.setattr(pipelines, "get_session_fabric_client", get_client)
+    monkeypatch.setattr(pipelines, "snapshot_deployed_definition", no_snapshot)
+    activities = ActivityListAdapter.validate_python([
+        {"name": "Loop", "type": "ForEach", "typeProperties": {
+            "items": {"value": "@pipeline().parameters.tables", "type": "Expression"},
+            "activities": [{"name": "Wait", "type": "Wait", "typeProperties": {"waitTimeInSeconds": 1}}],
+        }},
+        {"name": "Manual", "type": "IfCondition", "typeProperties": {
+            "expression": {"value": "@equals(pipeline().TriggerType, 'Manual')", "type": "Expression"},
+        }},
+    ])
+
+    ctx = SimpleNamespace(session=object())
+    result = asyncio.run(pipelines.create_pipeline_impl(ctx, "ws", "p", activities, None, None))
+
+    assert result["id"] == "pipeline-id"
+    content = json.loads(base64.b64decode(client.request.definition.parts[0].payload))
+    assert content["properties"]["activities"][0]["typeProperties"]["items"]["value"] == "@pipeline().parameters.tables"
+
+    # An accepted (202) update is only deployed once its operation succeeds
+    result = asyncio.run(pipelines.update_pipeline_impl(None, "ws", "pipeline-id", "p", activities, True, False, False))
+    assert (result["status"], result["job_id"]) == ("Accepted", "op-1")
+    assert definitions.deployed_hash("ws", "pipeline-id") is None
+    definitions.settle_deployed_hash("op-1", succeeded=True)
+    assert definitions.deployed_hash("ws", "pipeline-id") is not None
+
+
+def test_created_item_id_gives_up_with_the_job_id():
+    class _SlowClient:
+        async def poll_lro_status(self, url):
+            return httpx.Response(200, json={"status": "Running"})
+
+    created = {"status_code": 202, "headers": {"location": "https://api.fabric.microsoft.com/v1/operations/op-2?x=1"}}
+    with pytest.raises(ToolError, match="job_id 'op-2'"):
+        asyncio.run(pipelines._created_item_id(_SlowClient(), created, poll_interval_seconds=0.01, timeout=0.02))
+    assert pipelines.job_status_store["op-2"] == created["headers"]["location"]
+
+
+def _cached_pipeline(pipeline_id, activities):
+    definition = definitions.PipelineDefinition(content={"name": "p", "properties": {"activities": activities}})
+    definitions.remember_pipeline_definition("ws", pipeline_id, definition)
+    return definition
+
+
+def test_configure_copy_activity_tracks_an_accepted_update(monkeypatch):
+    async def get_client(ctx):
+        return _FakeClient()
+
+    async def no_snapshot(*args):
+        return None
+
+    monkeypatch.setattr(configure_copy_activity, "get_session_fabric_client", get_client)
+    monkeypatch.setattr(configure_copy_activity, "snapshot_deployed_definition", no_snapshot)
+    _cached_pipeline("copy-pipeline", [{"name": "Copy", "type": "Copy", "typeProperties": {"source": {}, "sink": {}}}])
+
+    result = asyncio.run(configure_copy_activity.configure_copy_activity_impl(
+        None, "ws", "copy-pipeline", "Copy", None, None, None, {"parallelCopies": 4},
+    ))
+
+    assert (result["status"], result["job_id"]) == ("Accepted", "op-1")
+    assert configure_copy_activity.job_status_store["op-1"].endswith("/operations/op-1")
+    assert definitions.deployed_hash("ws", "copy-pipeline") is None
+    assert definitions._cache_key("ws", "copy-pipeline") not in definitions._definition_cache
+
+
+def test_patch_pipeline_tracks_an_accepted_update(monkeypatch):
+    async def get_client(ctx):
+        return _FakeClient()
+
+    async def no_snapshot(*args):
+        return None
+
+    monkeypatch.setattr(pipelines, "get_session_fabric_client", get_client)
+    monkeypatch.setattr(pipelines, "snapshot_deployed_definition", no_snapshot)
+    _cached_pipeline("patched", [{"name": "Wait", "type": "Wait", "typeProperties": {"waitTimeInSeconds": 1}}])
+    operations = [PatchOperation(op="replace", path="/activities/Wait/typeProperties/waitTimeInSeconds", value=5)]
+
+    result = asyncio.run(pipelines.patch_pipeline_impl(None, "ws", "patched", operations, False))
+
+    assert (result["status"], result["job_id"], result["changed_activities"]) == ("Accepted", "op-1", ["Wait"])
+    assert definitions.deployed_hash("ws", "patched") is None
+    assert definitions._cache_key("ws", "patched") not in definitions._definition_cache
+
+
+def test_optimize_pipeline_dependencies_tracks_an_accepted_update(monkeypatch):
+    async def get_client(ctx):
+        return _FakeClient()
+
+    async def no_snapshot(*args):
+        return None
+
+    monkeypatch.setattr(pipelines, "get_session_fabric_client", get_client)
+    monkeypatch.setattr(pipelines, "snapshot_deployed_definition", no_snapshot)
+    wait = {"type": "Wait", "typeProperties": {"waitTimeInSeconds": 1}}
+    after_a = [{"activity": "A", "dependencyConditions": ["Succeeded"]}]
+    after_a_and_b = [*after_a, {"activity": "B", "dependencyConditions": ["Succeeded"]}]
+    _cached_pipeline("optimized", [
+        {"name": "A", **wait}, {"name": "B", **wait, "dependsOn": after_a}, {"name": "C", **wait, "dependsOn": after_a_and_b},
+    ])
+
+    result = asyncio.run(pipelines.optimize_pipeline_dependencies_impl(None, "ws", "optimized", False, True, None))
+
+    assert (result["status"], result["job_id"]) == ("Accepted", "op-1")
+    assert definitions.deployed_hash("ws", "optimized") is None
+    assert definitions._cache_key("ws", "optimized") not in definitions._definition_cache
+
+
+def test_partitioned_pipeline_that_fits_keeps_its_parameters(monkeypatch):
+    client = _FakeClient()
+
+    async def get_client(ctx):
+        return client
+
+    monkeypatch.setattr(pipelines, "get_session_fabric_client", get_client)
+    activities = ActivityListAdapter.validate_python([{"name": "Loop", "type": "ForEach", "typeProperties": {
+        "items": {"value": "@pipeline().parameters.tables", "type": "Expression"}, "activities": [],
+    }}])
+    parameters = {"tables": {"type": "Array", "defaultValue": ["a"]}}
+
+    result = asyncio.run(pipelines.create_partitioned_pipeline_impl(
+        None, "ws", "p", activities, "conn", parameters=parameters, variables=None, max_activities_per_pipeline=120, description=None, max_concurrency=4,
+    ))
+
+    assert result["split"] is False
+    content = json.loads(base64.b64decode(client.request.definition.parts[0].payload))
+    assert content["properties"]["parameters"] == parameters
+
+
+def test_partitioned_pipeline_children_declare_the_variables_they_use(monkeypatch):
+    client = _FakeClient()
+
+    async def get_client(ctx):
+        return client
+
+    monkeypatch.setattr(pipelines, "get_session_fabric_client", get_client)
+    chains = [
+        {"name": f"{prefix}{i}", "type": "Wait", "typeProperties": {"waitTimeInSeconds": 1},
+         "dependsOn": [{"activity": f"{prefix}{i - 1}", "dependencyConditions": ["Succeeded"]}] if i else []}
+        for prefix in ("a", "b") for i in range(4)
+    ]
+    flag = {"name": "Flag", "type": "SetVariable", "typeProperties": {"variableName": "done", "value": "yes"},
+            "dependsOn": [{"activity": "b3", "dependencyConditions": ["Succeeded"]}]}
+    activities = ActivityListAdapter.validate_python(chains + [flag])
+    variables = {"done": {"type": "String"}, "unused": {"type": "String"}}
+
+    with pytest.raises(ToolError, match="done are used but not declared"):
+        asyncio.run(pipelines.create_partitioned_pipeline_impl(
+            None, "ws", "p", activities, "conn", parameters=None, variables=None,
+            max_activities_per_pipeline=5, description=None, max_concurrency=4,
+        ))
+    assert not hasattr(client, "created")
+
+    result = asyncio.run(pipelines.create_partitioned_pipeline_impl(
+        None, "ws", "p", activities, "conn", parameters=None, variables=variables,
+        max_activities_per_pipeline=5, description=None, max_concurrency=4,
+    ))
+
+    assert result["split"] is True
+    contents = {
+        r.display_name: json.loads(base64.b64decode(r.definition.parts[0].payload))["properties"] for r in client.created
+    }
+    assert contents["p_part01"].get("variables") is None
+    assert contents["p_part02"]["variables"] == {"done": {"type": "String"}}
+    assert "variables" not in contents["p"]
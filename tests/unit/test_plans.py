@@ -0,0 +1,32 @@
+import pytest
+
+from src.fabricmcp_server.plans import PlanError, PlanStep, execute_plan
+
+
+async def test_plan_resolves_references_and_skips_dependents_of_failed_steps():
+    calls = []
+
+    async def run_step(tool, arguments):
+        calls.append((tool, arguments))
+        if tool == "run_pipeline":
+            raise RuntimeError("capacity paused")
+        return {"id": "lh-1"} if tool == "create_fabric_item" else f"uploaded {arguments['file']}"
+
+    outcomes = await execute_plan(
+        [
+            PlanStep(id="lh", tool="create_fabric_item", arguments={"display_name": "LH"}),
+            PlanStep(id="up", tool="upload_file_to_lakehouse", arguments={"lakehouse_id": "${lh.id}", "file": "${lh.id}/a.csv"}),
+            PlanStep(id="run", tool="run_pipeline", depends_on=["up"]),
+            PlanStep(id="watch", tool="watch_pipeline_run", arguments={"job_id": "${run.job_id}"}),
+        ],
+        run_step,
+    )
+
+    assert calls[1] == ("upload_file_to_lakehouse", {"lakehouse_id": "lh-1", "file": "lh-1/a.csv"})
+    assert [o["status"] for o in outcomes.values()] == ["Succeeded", "Succeeded", "Failed", "Skipped"]
+
+
+async def test_plan_rejects_cycles():
+    steps = [PlanStep(id="a", tool="t", arguments={"x": "${b.id}"}), PlanStep(id="b", tool="t", depends_on=["a"])]
+    with pytest.raises(PlanError, match="cycle"):
+        await execute_plan(steps, None)
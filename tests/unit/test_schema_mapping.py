@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from src.fabricmcp_server import schema_mapping
+from src.fabricmcp_server.schema_mapping import ColumnSchema, build_tabular_translator, get_delta_schema, infer_csv_schema
+
+
+class FakeOneLake:
+    def __init__(self, files):
+        self.files = files
+        self.reads = []
+
+    async def list_onelake_paths(self, workspace_id, item_id, directory):
+        prefix = f"{item_id}/{directory}/"
+        return [{"name": name} for name in self.files if name.startswith(prefix)]
+
+    async def read_onelake_file(self, workspace_id, item_id, path, max_bytes=None):
+        self.reads.append(path)
+        return self.files[f"{item_id}/{path}"].encode()
+
+
+def _schema(*fields):
+    return json.dumps({"type": "struct", "fields": [{"name": n, "type": t, "nullable": True, "metadata": {}} for n, t in fields]})
+
+
+def _commit(*actions):
+    return "\n".join(json.dumps(a) for a in actions)
+
+
+async def test_delta_schema_comes_from_the_newest_metadata_and_is_cached():
+    log = "lh/Tables/sales/_delta_log"
+    client = FakeOneLake({
+        f"{log}/00000000000000000000.json": _commit({"protocol": {}}, {"metaData": {"schemaString": _schema(("id", "integer"))}}),
+        f"{log}/00000000000000000001.json": _commit({"metaData": {"schemaString": _schema(("id", "long"), ("amount", "decimal(10,2)"), ("tags", {"type": "array"}))}}),
+        f"{log}/00000000000000000002.json": _commit({"add": {"path": "part-0.parquet"}}),
+    })
+    schema_mapping.forget_schemas()
+
+    columns, warnings = await get_delta_schema(client, "ws", "lh", "sales")
+    assert [(c.name, c.type, c.physical_type) for c in columns] == [
+        ("id", "Int64", "long"), ("amount", "Decimal", "decimal(10,2)"), ("tags", "String", "array"),
+    ]
+    assert (columns[1].precision, columns[1].scale) == (10, 2)
+    assert warnings == ["Column 'tags' is a array; it is mapped as a JSON string"]
+
+    reads = len(client.reads)
+    await get_delta_schema(client, "ws", "lh", "Sales")
+    assert len(client.reads) == reads
+
+
+def test_csv_inference_and_generated_translator():
+    columns = infer_csv_schema("order id,qty,price,shipped,when\n1,5,9.5,true,2024-01-02T10:00:00\n2,,10,false,2024-01-03\n3,3000000000,1,true,x\n")
+    assert [(c.name, c.type, c.nullable) for c in columns] == [
+        ("order id", "Int32", False), ("qty", "Int64", True), ("price", "Double", False),
+        ("shipped", "Boolean", False), ("when", "String", False),
+    ]
+
+    report = build_tabular_translator(columns, allow_data_truncation=False)
+    assert report.renamed == {"order id": "order_id"}
+    assert report.translator["mappings"][0] == {
+        "source": {"name": "order id", "type": "Int32"}, "sink": {"name": "order_id", "type": "Int32", "physicalType": "integer"},
+    }
+    assert report.translator["typeConversionSettings"]["allowDataTruncation"] is False
+
+
+def test_mapping_onto_an_existing_table_reports_risky_conversions():
+    source = [
+        ColumnSchema(name="Id", type="bigint", nullable=False),
+        ColumnSchema(name="Amount", type="decimal(18,4)"),
+        ColumnSchema(name="Created", type="date"),
+        ColumnSchema(name="Extra", type="nvarchar"),
+    ]
+    target = [
+        ColumnSchema(name="id", type="integer", nullable=False, physical_type="integer"),
+        ColumnSchema(name="amount", type="decimal(10,2)"),
+        ColumnSchema(name="created", type="timestamp", physical_type="timestamp"),
+        ColumnSchema(name="region", type="string", nullable=False),
+    ]
+    target = [schema_mapping.normalize_column(c, dialect="delta") for c in target]
+
+    report = build_tabular_translator(source, target)
+
+    assert [m["sink"]["name"] for m in report.translator["mappings"]] == ["id", "amount", "created"]
+    assert report.warnings == [
+        "Column 'Id': Int64 is converted to Int32 and may fail or lose data",
+        "Column 'Amount': decimal(18,4) does not fit decimal(10,2)",
+        "Column 'Extra' has no column 'Extra' in the target table",
+        "Target column 'region' is not nullable and no source column maps to it",
+    ]
+    with pytest.raises(ValueError, match="unknown type"):
+        build_tabular_translator([ColumnSchema(name="g", type="geography")])
@@ -0,0 +1,52 @@
+import asyncio
+
+from src.fabricmcp_server.tool_schemas import CachedToolListMiddleware, compact_schema
+
+
+def _schema():
+    return {
+        "title": "Args",
+        "type": "object",
+        "properties": {
+            "source": {"$ref": "#/$defs/mod_a__Location", "description": "Where to read from."},
+            "sink": {"anyOf": [{"$ref": "#/$defs/mod_b__Location"}, {"type": "null"}], "default": None},
+        },
+        "$defs": {
+            "mod_a__Location": {"title": "Location", "type": "object", "properties": {"path": {"type": "string", "description": "Path."}}},
+            "mod_b__Location": {"title": "Location", "type": "object", "properties": {"path": {"type": "string", "description": "Path."}}},
+        },
+    }
+
+
+def test_dedupe_merges_identical_defs_and_rewrites_refs():
+    schema = compact_schema(_schema(), "dedupe")
+
+    assert list(schema["$defs"]) == ["mod_a__Location"]
+    assert schema["properties"]["sink"]["anyOf"][0] == {"$ref": "#/$defs/mod_a__Location"}
+    assert "title" not in schema and "title" not in schema["$defs"]["mod_a__Location"]
+    assert schema["$defs"]["mod_a__Location"]["properties"]["path"]["description"] == "Path."
+
+
+def test_compact_collapses_optional_fields_but_keeps_argument_descriptions():
+    original = _schema()
+    schema = compact_schema(original, "compact")
+
+    assert schema["properties"]["source"]["description"] == "Where to read from."
+    assert schema["properties"]["sink"] == {"$ref": "#/$defs/mod_a__Location"}
+    assert schema["$defs"]["mod_a__Location"]["properties"]["path"] == {"type": "string"}
+    assert compact_schema(original, "full") == _schema()
+
+
+def test_tool_list_is_built_once():
+    calls = []
+
+    async def call_next(context):
+        calls.append(context)
+        return ["tool"]
+
+    middleware = CachedToolListMiddleware()
+    first = asyncio.run(middleware.on_list_tools(None, call_next))
+    second = asyncio.run(middleware.on_list_tools(None, call_next))
+
+    assert first == second == ["tool"]
+    assert len(calls) == 1
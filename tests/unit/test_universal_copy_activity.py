@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+from fastmcp.exceptions import ToolError
+
+from src.fabricmcp_server.activity_types import ActivityListAdapter
+from src.fabricmcp_server.tools.universal_copy_activity import (
+    UniversalCopy,
+    build_universal_copy_pipeline,
+    create_universal_copy_pipeline_impl,
+)
+
+SHAREPOINT = {"connection_id": "sp-conn", "list_name": "Orders"}
+LAKEHOUSE_TABLE = {"lakehouse_name": "lh", "workspace_id": "ws", "artifact_id": "lh-id", "root_folder": "Tables", "table_config": {"table_name": "orders"}}
+
+
+def _run(**kwargs):
+    args = {
+        "workspace_id": "ws", "pipeline_name": "p", "source_type": None, "source_config": None, "sink_type": None,
+        "sink_config": None, "activity_config": None, "copies": None, "description": None, "dry_run": True, "idempotency_key": None,
+    }
+    return asyncio.run(create_universal_copy_pipeline_impl(None, **{**args, **kwargs}))
+
+
+def test_batch_emits_parallel_uniquely_named_copies():
+    copies = [UniversalCopy(source_type="SharePoint", source_config=SHAREPOINT, sink_type="lakehouse", sink_config=LAKEHOUSE_TABLE)] * 3
+    pipeline = build_universal_copy_pipeline(copies)
+    activities = pipeline["properties"]["activities"]
+    assert [a["name"] for a in activities] == ["Copy Activity", "Copy Activity 2", "Copy Activity 3"]
+    assert all(a["dependsOn"] == [] for a in activities)
+    assert pipeline["properties"]["annotations"] == ["Universal", "CopyData", "SharePointTolakehouse"]
+    ActivityListAdapter.validate_python(activities)
+
+    bad = UniversalCopy(source_type="Nope", source_config={}, sink_type="Lakehouse", sink_config=LAKEHOUSE_TABLE)
+    with pytest.raises(ValueError, match="Copy 1 \\(Nope to Lakehouse\\): Unsupported source type"):
+        build_universal_copy_pipeline([copies[0], bad])
+
+
+def test_dry_run_returns_compiled_definition_without_a_client():
+    result = _run(source_type="SharePoint", source_config=SHAREPOINT, sink_type="Lakehouse", sink_config=LAKEHOUSE_TABLE)
+    assert result["status"] == "DryRun" and result["activities"] == ["Copy Activity"]
+    sink = result["pipeline_definition"]["properties"]["activities"][0]["typeProperties"]["sink"]
+    assert sink["datasetSettings"]["typeProperties"] == {"table": "orders"}
+
+    with pytest.raises(ToolError, match="required unless 'copies'"):
+        _run(source_type="SharePoint", source_config=SHAREPOINT)
+    with pytest.raises(ToolError, match="not both"):
+        _run(source_type="SharePoint", copies=[UniversalCopy(source_type="SharePoint", source_config=SHAREPOINT, sink_type="Lakehouse", sink_config=LAKEHOUSE_TABLE)])
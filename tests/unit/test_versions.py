@@ -0,0 +1,32 @@
+import base64
+import json
+
+from src.fabricmcp_server.versions import VersionStore
+
+
+def _definition(activities, indent=None):
+    content = json.dumps({"properties": {"activities": activities}}, indent=indent)
+    return {"parts": [
+        {"path": "pipeline-content.json", "payload": base64.b64encode(content.encode()).decode(), "payloadType": "InlineBase64"},
+        {"path": ".platform", "payload": base64.b64encode(b"{}").decode(), "payloadType": "InlineBase64"},
+    ]}
+
+
+def test_unchanged_snapshots_add_no_versions_and_blobs_are_shared(tmp_path):
+    store = VersionStore(str(tmp_path / "versions.db"))
+    v1 = _definition([{"name": "A", "type": "Wait"}])
+    v2 = _definition([{"name": "B", "type": "Wait"}])
+
+    first = store.save("ws", "p1", "DataPipeline", v1, "update_pipeline")
+    assert store.save("ws", "p1", "DataPipeline", _definition([{"name": "A", "type": "Wait"}], indent=2)) is None
+    store.save("ws", "p1", "DataPipeline", v2)
+    store.save("ws", "p1", "DataPipeline", v1)
+    store.save("ws", "p2", "DataPipeline", v1)
+
+    assert [v.version_id for v in store.list("ws", "p1")] == [3, 2, 1]
+    assert store.stats()["blobs"] == 2
+
+    version, definition = store.get(first.version_id)
+    assert version.reason == "update_pipeline"
+    assert [p["path"] for p in definition["parts"]] == ["pipeline-content.json"]
+    store.close()